@@ -120,6 +120,8 @@ private[spark] abstract class BasePythonRunner[IN, OUT](
   protected val timelyFlushTimeoutNanos: Long = 0
   protected val authSocketTimeout = conf.get(PYTHON_AUTH_SOCKET_TIMEOUT)
   private val reuseWorker = conf.get(PYTHON_WORKER_REUSE)
+  private val daemonPreloadModules = conf.get(PYTHON_DAEMON_PRELOAD_MODULES)
+  private val daemonPoolSize = conf.get(PYTHON_DAEMON_POOL_SIZE)
   protected val faultHandlerEnabled: Boolean = conf.get(PYTHON_WORKER_FAULTHANLDER_ENABLED)
   protected val simplifiedTraceback: Boolean = false
 
@@ -196,6 +198,12 @@ private[spark] abstract class BasePythonRunner[IN, OUT](
     if (reuseWorker) {
       envVars.put("SPARK_REUSE_WORKER", "1")
     }
+    if (daemonPreloadModules.nonEmpty) {
+      envVars.put("PYSPARK_DAEMON_PRELOAD_MODULES", daemonPreloadModules.mkString(","))
+    }
+    if (daemonPoolSize > 0) {
+      envVars.put("PYSPARK_DAEMON_POOL_SIZE", daemonPoolSize.toString)
+    }
     if (simplifiedTraceback) {
       envVars.put("SPARK_SIMPLIFIED_TRACEBACK", "1")
     }
@@ -514,6 +522,8 @@ private[spark] abstract class BasePythonRunner[IN, OUT](
       val bootTime = stream.readLong()
       val initTime = stream.readLong()
       val finishTime = stream.readLong()
+      // Whether the worker already ran a task or had the preloaded modules imported
+      val warmStart = stream.readInt() != 0
       val boot = bootTime - startTime
       val init = initTime - bootTime
       val finish = finishTime - initTime
@@ -521,7 +531,8 @@ private[spark] abstract class BasePythonRunner[IN, OUT](
       logInfo(log"Times: total = ${MDC(LogKeys.TOTAL_TIME, total)}, " +
         log"boot = ${MDC(LogKeys.BOOT_TIME, boot)}, " +
         log"init = ${MDC(LogKeys.INIT_TIME, init)}, " +
-        log"finish = ${MDC(LogKeys.FINISH_TIME, finish)}")
+        log"finish = ${MDC(LogKeys.FINISH_TIME, finish)}, " +
+        log"warm start = ${MDC(LogKeys.PYTHON_WORKER_WARM_START, warmStart)}")
       val memoryBytesSpilled = stream.readLong()
       val diskBytesSpilled = stream.readLong()
       context.taskMetrics().incMemoryBytesSpilled(memoryBytesSpilled)
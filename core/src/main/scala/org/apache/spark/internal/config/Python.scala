@@ -46,6 +46,25 @@ private[spark] object Python {
     .stringConf
     .createOptional
 
+  val PYTHON_DAEMON_PRELOAD_MODULES = ConfigBuilder("spark.python.daemon.preloadModules")
+    .doc("Comma-separated list of Python modules, e.g. 'numpy,pandas,pyarrow', which the " +
+      "Python daemon imports before forking workers. The workers start with these modules " +
+      "already imported instead of importing them in their first task. Only used when " +
+      s"${PYTHON_USE_DAEMON.key} is true.")
+    .version("4.0.0")
+    .stringConf
+    .toSequence
+    .createWithDefault(Nil)
+
+  val PYTHON_DAEMON_POOL_SIZE = ConfigBuilder("spark.python.daemon.poolSize")
+    .doc("The number of idle Python workers the Python daemon keeps forked in advance, so " +
+      "that a new Python worker is handed over without waiting for a fork. 0 means workers " +
+      s"are forked on demand. Only used when ${PYTHON_USE_DAEMON.key} is true.")
+    .version("4.0.0")
+    .intConf
+    .checkValue(_ >= 0, "The pool size must not be negative.")
+    .createWithDefault(0)
+
   val PYTHON_WORKER_MODULE = ConfigBuilder("spark.python.worker.module")
     .version("2.4.0")
     .stringConf
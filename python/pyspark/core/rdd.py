@@ -77,7 +77,9 @@ from pyspark.resource.profile import ResourceProfile
 from pyspark.resultiterable import ResultIterable
 from pyspark.shuffle import (
     Aggregator,
+    PrimitiveAggregator,
     ExternalMerger,
+    ExternalArrayMerger,
     get_used_memory,
     ExternalSorter,
     ExternalGroupBy,
@@ -96,6 +98,7 @@ from pyspark.util import PythonEvalType  # noqa: F401
 
 
 if TYPE_CHECKING:
+    import pyarrow as pa
     from py4j.java_gateway import JavaObject
 
     from pyspark._typing import S, NumberOrArray
@@ -799,6 +802,60 @@ class RDD(Generic[T_co]):
         )
         return self.mapPartitionsWithIndex(f, preservesPartitioning)
 
+    def mapPartitionsInArrow(
+        self: "RDD[T]",
+        f: Callable[[Iterable[T]], Iterable["pa.RecordBatch"]],
+        preservesPartitioning: bool = False,
+    ) -> "RDD[pa.RecordBatch]":
+        """
+        Return a new RDD by applying a function that produces Arrow record batches
+        to each partition of this RDD. The resulting partitions are exchanged with the JVM
+        (for example, when cached, collected or consumed by another Python stage) as Arrow
+        IPC streams instead of pickled objects.
+
+        .. versionadded:: 4.0.0
+
+        Parameters
+        ----------
+        f : function
+            a function to run on each partition of the RDD, returning an iterator of
+            :class:`pyarrow.RecordBatch`
+        preservesPartitioning : bool, optional, default False
+            indicates whether the input function preserves the partitioner,
+            which should be False unless this is a pair RDD and the input
+            function doesn't modify the keys
+
+        Returns
+        -------
+        :class:`RDD`
+            a new :class:`RDD` of :class:`pyarrow.RecordBatch`
+
+        See Also
+        --------
+        :meth:`RDD.mapPartitions`
+        :meth:`DataFrame.toArrowRDD`
+
+        Notes
+        -----
+        This API is experimental. PyArrow must be installed and available on the driver and
+        worker Python environments.
+
+        Examples
+        --------
+        >>> import pyarrow as pa  # doctest: +SKIP
+        >>> rdd = sc.parallelize([1, 2, 3, 4], 2)
+        >>> def f(iterator):
+        ...     yield pa.RecordBatch.from_pydict({"v": list(iterator)})
+        ...
+        >>> rdd.mapPartitionsInArrow(f).map(lambda b: b.num_rows).collect()  # doctest: +SKIP
+        [2, 2]
+        """
+        from pyspark.sql.pandas.serializers import ArrowRDDSerializer
+
+        rdd = self.mapPartitions(f, preservesPartitioning)
+        rdd._jrdd_deserializer = ArrowRDDSerializer()
+        return rdd
+
     def getNumPartitions(self) -> int:
         """
         Returns the number of partitions in RDD
@@ -1276,10 +1333,10 @@ class RDD(Generic[T_co]):
             numPartitions = self._defaultReducePartitions()
 
         memory = self._memory_limit()
-        serializer = self._jrdd_deserializer
+        fan_in = self._sort_merge_fan_in()
 
         def sortPartition(iterator: Iterable[Tuple[K, V]]) -> Iterable[Tuple[K, V]]:
-            sort = ExternalSorter(memory * 0.9, serializer).sorted
+            sort = ExternalSorter(memory * 0.9, fan_in).sorted
             return iter(sort(iterator, key=lambda k_v: keyfunc(k_v[0]), reverse=(not ascending)))
 
         return self.partitionBy(numPartitions, partitionFunc).mapPartitions(sortPartition, True)
@@ -1359,10 +1416,10 @@ class RDD(Generic[T_co]):
             numPartitions = self._defaultReducePartitions()
 
         memory = self._memory_limit()
-        serializer = self._jrdd_deserializer
+        fan_in = self._sort_merge_fan_in()
 
         def sortPartition(iterator: Iterable[Tuple[K, V]]) -> Iterable[Tuple[K, V]]:
-            sort = ExternalSorter(memory * 0.9, serializer).sorted
+            sort = ExternalSorter(memory * 0.9, fan_in).sorted
             return iter(sort(iterator, key=lambda kv: keyfunc(kv[0]), reverse=(not ascending)))
 
         if numPartitions == 1:
@@ -3416,6 +3473,9 @@ class RDD(Generic[T_co]):
         >>> sorted(rdd.reduceByKey(add).collect())
         [('a', 2), ('b', 1)]
         """
+        if self._use_primitive_aggregation(func):
+            agg = PrimitiveAggregator(func)
+            return self._combineByKeyWithAggregator(agg, numPartitions, partitionFunc)
         return self.combineByKey(lambda x: x, func, func, numPartitions, partitionFunc)
 
     def reduceByKeyLocally(self: "RDD[Tuple[K, V]]", func: Callable[[V, V], V]) -> Dict[K, V]:
@@ -3839,15 +3899,26 @@ class RDD(Generic[T_co]):
         >>> sorted(rdd.combineByKey(to_list, append, extend).collect())
         [('a', [1, 2]), ('b', [1])]
         """
+        agg = Aggregator(createCombiner, mergeValue, mergeCombiners)
+        return self._combineByKeyWithAggregator(agg, numPartitions, partitionFunc)
+
+    def _combineByKeyWithAggregator(
+        self: "RDD[Tuple[K, V]]",
+        agg: Aggregator,
+        numPartitions: Optional[int],
+        partitionFunc: Callable[[K], int],
+    ) -> "RDD[Tuple[K, U]]":
         if numPartitions is None:
             numPartitions = self._defaultReducePartitions()
 
         serializer = self.ctx.serializer
         memory = self._memory_limit()
-        agg = Aggregator(createCombiner, mergeValue, mergeCombiners)
+        merger_class = (
+            ExternalArrayMerger if isinstance(agg, PrimitiveAggregator) else ExternalMerger
+        )
 
         def combineLocally(iterator: Iterable[Tuple[K, V]]) -> Iterable[Tuple[K, U]]:
-            merger = ExternalMerger(agg, memory * 0.9, serializer)
+            merger = merger_class(agg, memory * 0.9, serializer)
             merger.mergeValues(iterator)
             return merger.items()
 
@@ -3855,7 +3926,7 @@ class RDD(Generic[T_co]):
         shuffled = locally_combined.partitionBy(numPartitions, partitionFunc)
 
         def _mergeCombiners(iterator: Iterable[Tuple[K, U]]) -> Iterable[Tuple[K, U]]:
-            merger = ExternalMerger(agg, memory, serializer)
+            merger = merger_class(agg, memory, serializer)
             merger.mergeCombiners(iterator)
             return merger.items()
 
@@ -3914,6 +3985,14 @@ class RDD(Generic[T_co]):
         [('a', (3, 2)), ('b', (1, 1))]
         """
 
+        if (
+            seqFunc is combFunc
+            and zeroValue is not None
+            and self._use_primitive_aggregation(seqFunc, zeroValue)
+        ):
+            agg = PrimitiveAggregator(seqFunc, zeroValue)
+            return self._combineByKeyWithAggregator(agg, numPartitions, partitionFunc)
+
         def createZero() -> U:
             return copy.deepcopy(zeroValue)
 
@@ -3967,6 +4046,10 @@ class RDD(Generic[T_co]):
         [('a', 2), ('b', 1)]
         """
 
+        if zeroValue is not None and self._use_primitive_aggregation(func, zeroValue):
+            agg = PrimitiveAggregator(func, zeroValue)
+            return self._combineByKeyWithAggregator(agg, numPartitions, partitionFunc)
+
         def createZero() -> V:
             return copy.deepcopy(zeroValue)
 
@@ -3977,6 +4060,13 @@ class RDD(Generic[T_co]):
     def _memory_limit(self) -> int:
         return _parse_memory(self.ctx._conf.get("spark.python.worker.memory", "512m"))
 
+    def _sort_merge_fan_in(self) -> int:
+        return int(self.ctx._conf.get("spark.python.shuffle.sort.mergeFanIn", "64"))
+
+    def _use_primitive_aggregation(self, func: Callable, zeroValue: Optional[Any] = None) -> bool:
+        enabled = self.ctx._conf.get("spark.python.shuffle.primitiveAggregation.enabled", "false")
+        return enabled.lower() == "true" and PrimitiveAggregator.supports(func, zeroValue)
+
     # TODO: support variant with custom partitioner
     def groupByKey(
         self: "RDD[Tuple[K, V]]",
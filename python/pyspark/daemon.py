@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import importlib
 import numbers
 import os
 import signal
@@ -31,8 +32,6 @@ from signal import SIGHUP, SIGTERM, SIGCHLD, SIG_DFL, SIG_IGN, SIGINT
 from pyspark.serializers import read_int, write_int, write_with_length, UTF8Deserializer
 
 if len(sys.argv) > 1 and sys.argv[1].startswith("pyspark"):
-    import importlib
-
     worker_module = importlib.import_module(sys.argv[1])
     worker_main = worker_module.main
 else:
@@ -89,6 +88,70 @@ def worker(sock, authenticated):
     return exit_code
 
 
+def preload_modules():
+    """
+    Import the modules listed in PYSPARK_DAEMON_PRELOAD_MODULES, so that the workers forked
+    afterwards start with these modules already imported.
+    """
+    modules = os.environ.get("PYSPARK_DAEMON_PRELOAD_MODULES", "")
+    for name in [m.strip() for m in modules.split(",") if m.strip()]:
+        try:
+            importlib.import_module(name)
+        except BaseException:
+            # the worker will fail with a proper error if the module is actually used
+            print("Failed to preload module %s in the Python daemon" % name, file=sys.stderr)
+            traceback.print_exc()
+
+
+def run_worker(sock, reuse):
+    """
+    Called by a worker process to serve the tasks sent through the socket, never returns.
+    """
+    try:
+        # Acknowledge that the fork was successful
+        outfile = sock.makefile(mode="wb")
+        write_int(os.getpid(), outfile)
+        outfile.flush()
+        outfile.close()
+        authenticated = False
+        while True:
+            code = worker(sock, authenticated)
+            if code == 0:
+                authenticated = True
+            if not reuse or code:
+                # wait for closing
+                try:
+                    while sock.recv(1024):
+                        pass
+                except Exception:
+                    pass
+                break
+            gc.collect()
+    except BaseException:
+        traceback.print_exc()
+        os._exit(1)
+    else:
+        os._exit(0)
+
+
+def wait_for_connection(channel, reuse):
+    """
+    Called by a pre-forked worker process, waits until the daemon hands over the socket
+    of a connection through the channel, then serves it. Exits if the daemon goes away.
+    """
+    # a pre-forked worker only waits, so it should die with the daemon
+    signal.signal(SIGHUP, SIG_DFL)
+    signal.signal(SIGTERM, SIG_DFL)
+    try:
+        _, fds, _, _ = socket.recv_fds(channel, 1, 1)
+    except OSError:
+        fds = []
+    channel.close()
+    if not fds:
+        os._exit(0)
+    run_worker(socket.socket(fileno=fds[0]), reuse)
+
+
 def manager():
     # Create a new process group to corral our children
     os.setpgid(0, 0)
@@ -125,6 +188,60 @@ def manager():
     signal.signal(SIGCHLD, SIG_IGN)
 
     reuse = os.environ.get("SPARK_REUSE_WORKER")
+    pool_size = int(os.environ.get("PYSPARK_DAEMON_POOL_SIZE", "0"))
+    # (pid, channel) of the pre-forked workers waiting for a connection
+    idle_workers = []
+
+    def setup_child():
+        listen_sock.close()
+        for _, channel in idle_workers:
+            channel.close()
+
+        # It should close the standard input in the child process so that
+        # Python native function executions stay intact.
+        #
+        # Note that if we just close the standard input (file descriptor 0),
+        # the lowest file descriptor (file descriptor 0) will be allocated,
+        # later when other file descriptors should happen to open.
+        #
+        # Therefore, here we redirects it to '/dev/null' by duplicating
+        # another file descriptor for '/dev/null' to the standard input (0).
+        # See SPARK-26175.
+        devnull = open(os.devnull, "r")
+        os.dup2(devnull.fileno(), 0)
+        devnull.close()
+
+    def fill_pool():
+        while len(idle_workers) < pool_size:
+            parent_channel, child_channel = socket.socketpair(socket.AF_UNIX, SOCK_STREAM)
+            try:
+                pid = os.fork()
+            except OSError:
+                parent_channel.close()
+                child_channel.close()
+                return  # fork on demand instead
+            if pid == 0:
+                parent_channel.close()
+                setup_child()
+                wait_for_connection(child_channel, reuse)
+            child_channel.close()
+            idle_workers.append((pid, parent_channel))
+
+    def hand_over(sock):
+        """Pass the connection to a pre-forked worker, return False if there is none"""
+        while idle_workers:
+            _, channel = idle_workers.pop(0)
+            try:
+                socket.send_fds(channel, [b"\0"], [sock.fileno()])
+                return True
+            except OSError:
+                pass  # the worker already died
+            finally:
+                channel.close()
+        return False
+
+    preload_modules()
+    fill_pool()
 
     # Initialization complete
     try:
@@ -156,6 +273,11 @@ def manager():
                         continue
                     raise
 
+                if hand_over(sock):
+                    sock.close()
+                    fill_pool()
+                    continue
+
                 # Launch a worker process
                 try:
                     pid = os.fork()
@@ -173,47 +295,8 @@ def manager():
 
                 if pid == 0:
                     # in child process
-                    listen_sock.close()
-
-                    # It should close the standard input in the child process so that
-                    # Python native function executions stay intact.
-                    #
-                    # Note that if we just close the standard input (file descriptor 0),
-                    # the lowest file descriptor (file descriptor 0) will be allocated,
-                    # later when other file descriptors should happen to open.
-                    #
-                    # Therefore, here we redirects it to '/dev/null' by duplicating
-                    # another file descriptor for '/dev/null' to the standard input (0).
-                    # See SPARK-26175.
-                    devnull = open(os.devnull, "r")
-                    os.dup2(devnull.fileno(), 0)
-                    devnull.close()
-
-                    try:
-                        # Acknowledge that the fork was successful
-                        outfile = sock.makefile(mode="wb")
-                        write_int(os.getpid(), outfile)
-                        outfile.flush()
-                        outfile.close()
-                        authenticated = False
-                        while True:
-                            code = worker(sock, authenticated)
-                            if code == 0:
-                                authenticated = True
-                            if not reuse or code:
-                                # wait for closing
-                                try:
-                                    while sock.recv(1024):
-                                        pass
-                                except Exception:
-                                    pass
-                                break
-                            gc.collect()
-                    except BaseException:
-                        traceback.print_exc()
-                        os._exit(1)
-                    else:
-                        os._exit(0)
+                    setup_child()
+                    run_worker(sock, reuse)
                 else:
                     sock.close()
 
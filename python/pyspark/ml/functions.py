@@ -383,6 +383,11 @@ def predict_batch_udf(
     Note: this assumes that the `make_predict_fn` encapsulates all of the necessary dependencies for
     running the model, or the Spark executor environment already satisfies all runtime requirements.
 
+    The `predict` functions are cached in each python worker by
+    :py:class:`pyspark.ml.model_cache.ModelCache`, which can be limited in bytes. To share one
+    copy of the model weights among all the python workers of an executor, the `make_predict_fn`
+    can load them with :py:meth:`pyspark.ml.model_cache.ModelCache.shared_arrays`.
+
     For the conversion of the Spark DataFrame to numpy arrays, there is a one-to-one mapping between
     the input arguments of the `predict` function (returned by the `make_predict_fn`) and the input
     columns sent to the Pandas UDF (returned by the `predict_batch_udf`) at runtime.  Each input
@@ -771,10 +776,7 @@ def predict_batch_udf(
         from pyspark.ml.model_cache import ModelCache
 
         # get predict function (from cache or from running user-provided make_predict_fn)
-        predict_fn = ModelCache.get(model_uuid)
-        if not predict_fn:
-            predict_fn = make_predict_fn()
-            ModelCache.add(model_uuid, predict_fn)
+        predict_fn = ModelCache.get_or_load(model_uuid, make_predict_fn)
 
         # get number of expected parameters for predict function
         signature = inspect.signature(predict_fn)
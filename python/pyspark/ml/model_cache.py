@@ -14,11 +14,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import hashlib
+import os
+import tempfile
+import time
+import warnings
 from collections import OrderedDict
 from threading import Lock
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
 from uuid import UUID
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _resident_memory() -> int:
+    """Return the resident memory of this process in bytes, or 0 if it is unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _shared_dir() -> str:
+    """Return the directory of the memory-mapped files shared by the python workers."""
+    path = os.environ.get("PYSPARK_ML_MODEL_CACHE_DIR")
+    if path is None:
+        local_dirs = os.environ.get("SPARK_LOCAL_DIRS")
+        if local_dirs:
+            path = os.path.join(local_dirs.split(",")[0], "python", "models")
+        else:
+            path = os.path.join(tempfile.gettempdir(), "pyspark-models")
+    return path
+
+
+# the units of the sizes taken by _parse_max_bytes, like the memory sizes of Java
+_SIZE_UNITS = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+
+def _parse_max_bytes(value: Optional[str]) -> int:
+    """Parse the maximum size of the cache, either a number of bytes or a size like 512k or 2g.
+
+    Return 0, i.e. no maximum size, with a warning if the value is invalid or not positive.
+    """
+    value = (value or "").strip()
+    if not value:
+        return 0
+    try:
+        if value.isdigit():
+            max_bytes = int(value)
+        elif value[-1].lower() in _SIZE_UNITS:
+            max_bytes = int(float(value[:-1]) * _SIZE_UNITS[value[-1].lower()])
+        else:
+            raise ValueError(value)
+    except (ValueError, OverflowError):
+        max_bytes = 0
+    if max_bytes > 0 or value == "0":
+        return max_bytes
+    warnings.warn(
+        f"Ignoring invalid PYSPARK_ML_MODEL_CACHE_MAX_BYTES '{value}', the cache holds at "
+        f"most {ModelCache._capacity} models instead."
+    )
+    return 0
+
 
 class ModelCache:
     """Cache for model prediction functions on executors.
@@ -32,19 +91,51 @@ class ModelCache:
 
     Caching large models can lead to out-of-memory conditions, which may require adjusting spark
     memory configurations, e.g. `spark.executor.memoryOverhead`.
+
+    By default, the cache holds at most 3 models. If the `PYSPARK_ML_MODEL_CACHE_MAX_BYTES`
+    environment variable is set, e.g. via `spark.executorEnv.PYSPARK_ML_MODEL_CACHE_MAX_BYTES`,
+    the least recently used models are evicted instead once the memory used by the cached models
+    exceeds that size, given in bytes or with a unit like 512k, 512m or 2g. The memory used by a
+    model is measured as the growth of the resident memory of the python worker while loading it,
+    see :meth:`get_or_load`.
+
+    Every python worker of an executor holds its own copy of a cached model. To share the model
+    weights among them, load the weights with :meth:`shared_arrays`.
     """
 
     _models: OrderedDict = OrderedDict()
+    _sizes: Dict[UUID, int] = {}
     _capacity: int = 3  # "reasonable" default size for now, make configurable later, if needed
+    _max_bytes: Optional[int] = None  # read from the environment on first use
     _lock: Lock = Lock()
 
+    # counters of this python worker, see stats()
+    _hits: int = 0
+    _misses: int = 0
+    _evictions: int = 0
+    _load_time: float = 0.0
+
     @staticmethod
-    def add(uuid: UUID, predict_fn: Callable) -> None:
+    def add(uuid: UUID, predict_fn: Callable, size: int = 0) -> None:
         with ModelCache._lock:
             ModelCache._models[uuid] = predict_fn
             ModelCache._models.move_to_end(uuid)
-            if len(ModelCache._models) > ModelCache._capacity:
-                ModelCache._models.popitem(last=False)
+            ModelCache._sizes[uuid] = size
+            # the model just added is kept even if it alone exceeds the maximum size
+            while len(ModelCache._models) > 1 and ModelCache._is_full():
+                evicted, _ = ModelCache._models.popitem(last=False)
+                del ModelCache._sizes[evicted]
+                ModelCache._evictions += 1
+
+    @staticmethod
+    def _is_full() -> bool:
+        if ModelCache._max_bytes is None:
+            ModelCache._max_bytes = _parse_max_bytes(
+                os.environ.get("PYSPARK_ML_MODEL_CACHE_MAX_BYTES")
+            )
+        if ModelCache._max_bytes > 0:
+            return sum(ModelCache._sizes.values()) > ModelCache._max_bytes
+        return len(ModelCache._models) > ModelCache._capacity
 
     @staticmethod
     def get(uuid: UUID) -> Optional[Callable]:
@@ -52,4 +143,97 @@ class ModelCache:
             predict_fn = ModelCache._models.get(uuid)
             if predict_fn:
                 ModelCache._models.move_to_end(uuid)
+                ModelCache._hits += 1
+            else:
+                ModelCache._misses += 1
             return predict_fn
+
+    @staticmethod
+    def get_or_load(uuid: UUID, make_predict_fn: Callable[[], Callable]) -> Callable:
+        """Get the cached prediction function, or make and cache it if it is not cached.
+
+        The time spent in `make_predict_fn` is added to the load time, and the growth of the
+        resident memory of the python worker during it is taken as the size of the model.
+        """
+        predict_fn = ModelCache.get(uuid)
+        if not predict_fn:
+            start_memory = _resident_memory()
+            start_time = time.perf_counter()
+            predict_fn = make_predict_fn()
+            load_time = time.perf_counter() - start_time
+            size = max(_resident_memory() - start_memory, 0)
+            with ModelCache._lock:
+                ModelCache._load_time += load_time
+            ModelCache.add(uuid, predict_fn, size)
+        return predict_fn
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        """Return the counters of the cache in this python worker.
+
+        The counters are the number of cache `hits`, `misses` and `evictions`, the total
+        `load_time` in seconds spent making the missing prediction functions, and the number of
+        cached `models` and their `size` in bytes.
+        """
+        with ModelCache._lock:
+            return {
+                "hits": ModelCache._hits,
+                "misses": ModelCache._misses,
+                "evictions": ModelCache._evictions,
+                "load_time": ModelCache._load_time,
+                "models": len(ModelCache._models),
+                "size": sum(ModelCache._sizes.values()),
+            }
+
+    @staticmethod
+    def shared_arrays(
+        key: str, load_arrays: Callable[[], Dict[str, "np.ndarray"]]
+    ) -> Dict[str, "np.ndarray"]:
+        """Return named arrays, e.g. model weights, backed by memory-mapped files which are
+        shared by all the python workers of an executor.
+
+        The first python worker asking for `key` calls `load_arrays` and saves the arrays into
+        the directory given by the `PYSPARK_ML_MODEL_CACHE_DIR` environment variable, a local
+        directory of the executor by default. All the python workers then memory-map the saved
+        arrays read-only, so the operating system holds only one copy of them in memory. Set the
+        environment variable to a memory-backed file system such as `/dev/shm` to avoid disk
+        reads. The names of the arrays are used as file names.
+
+        Parameters
+        ----------
+        key : str
+            Identifies the arrays, e.g. the path and version of the model.
+        load_arrays : callable
+            Function returning a dictionary of names to numpy arrays.
+
+        Returns
+        -------
+        dict
+            Dictionary of names to read-only `numpy.memmap` arrays.
+        """
+        import fcntl
+        import shutil
+
+        import numpy as np
+
+        shared_dir = _shared_dir()
+        os.makedirs(shared_dir, exist_ok=True)
+        path = os.path.join(shared_dir, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+        with open(path + ".lock", "w") as lock:
+            # only one python worker saves the arrays, the others wait for it
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if not os.path.isdir(path):
+                tmp = tempfile.mkdtemp(dir=shared_dir)
+                try:
+                    for name, array in load_arrays().items():
+                        np.save(os.path.join(tmp, name + ".npy"), array, allow_pickle=False)
+                    os.rename(tmp, path)
+                except BaseException:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise
+
+        return {
+            name[: -len(".npy")]: np.load(os.path.join(path, name), mmap_mode="r")
+            for name in sorted(os.listdir(path))
+        }
@@ -14,11 +14,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import os
+import tempfile
 import unittest
+from unittest import mock
 from uuid import uuid4
 
-from pyspark.ml.model_cache import ModelCache
+from pyspark.ml.model_cache import ModelCache, _parse_max_bytes
 from pyspark.testing.mlutils import SparkSessionTestCase
+from pyspark.testing.utils import have_numpy, numpy_requirement_message
 
 
 class ModelCacheTests(SparkSessionTestCase):
@@ -42,6 +46,83 @@ class ModelCacheTests(SparkSessionTestCase):
         expected_uuids = uuids[7:8] + uuids[9:10] + [uuids[8]]
         self.assertTrue(list(ModelCache._models.keys()) == expected_uuids)
 
+    def test_cache_max_bytes(self):
+        def predict_fn(inputs):
+            return inputs
+
+        uuids = [uuid4() for i in range(5)]
+        with mock.patch.object(ModelCache, "_max_bytes", 100):
+            for uuid in uuids[:4]:
+                ModelCache.add(uuid, predict_fn, size=30)
+            # 4 * 30 bytes exceed 100 bytes, expect the least recently used one evicted
+            self.assertEqual(list(ModelCache._models.keys())[-3:], uuids[1:4])
+            self.assertNotIn(uuids[0], ModelCache._models)
+
+            # a model larger than the cache evicts all the others, but is kept itself
+            ModelCache.add(uuids[4], predict_fn, size=200)
+            self.assertEqual(list(ModelCache._models.keys()), uuids[4:])
+
+    def test_parse_max_bytes(self):
+        self.assertEqual(_parse_max_bytes(None), 0)
+        self.assertEqual(_parse_max_bytes("0"), 0)
+        self.assertEqual(_parse_max_bytes("1000"), 1000)
+        self.assertEqual(_parse_max_bytes("512k"), 512 * 1024)
+        self.assertEqual(_parse_max_bytes("1.5K"), 1536)
+        self.assertEqual(_parse_max_bytes("512m"), 512 * 1024 * 1024)
+        self.assertEqual(_parse_max_bytes("2g"), 2 * 1024 * 1024 * 1024)
+        with self.assertWarnsRegex(UserWarning, "PYSPARK_ML_MODEL_CACHE_MAX_BYTES"):
+            self.assertEqual(_parse_max_bytes("lots"), 0)
+        for value in ["100b", "0k", "0.0001k", "-1m", "nank"]:
+            with self.assertWarnsRegex(UserWarning, "PYSPARK_ML_MODEL_CACHE_MAX_BYTES"):
+                self.assertEqual(_parse_max_bytes(value), 0)
+
+        # the environment variable is read when the cache is first used, not on import
+        with mock.patch.object(ModelCache, "_max_bytes", None), mock.patch.dict(
+            os.environ, {"PYSPARK_ML_MODEL_CACHE_MAX_BYTES": "2m"}
+        ):
+            ModelCache._is_full()
+            self.assertEqual(ModelCache._max_bytes, 2 * 1024 * 1024)
+
+    def test_get_or_load(self):
+        loads = []
+
+        def make_predict_fn():
+            loads.append(1)
+            return lambda inputs: inputs
+
+        uuid = uuid4()
+        before = ModelCache.stats()
+        predict_fn = ModelCache.get_or_load(uuid, make_predict_fn)
+        self.assertIs(ModelCache.get_or_load(uuid, make_predict_fn), predict_fn)
+        self.assertEqual(len(loads), 1)
+
+        after = ModelCache.stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertGreaterEqual(after["load_time"], before["load_time"])
+
+    @unittest.skipIf(not have_numpy, numpy_requirement_message)
+    def test_shared_arrays(self):
+        import numpy as np
+
+        loads = []
+
+        def load_arrays():
+            loads.append(1)
+            return {"weights": np.arange(10.0), "bias": np.ones(2)}
+
+        with tempfile.TemporaryDirectory() as d:
+            with mock.patch.dict(os.environ, {"PYSPARK_ML_MODEL_CACHE_DIR": d}):
+                arrays1 = ModelCache.shared_arrays("model", load_arrays)
+                arrays2 = ModelCache.shared_arrays("model", load_arrays)
+
+            self.assertEqual(len(loads), 1)
+            self.assertEqual(sorted(arrays2.keys()), ["bias", "weights"])
+            np.testing.assert_array_equal(arrays1["weights"], np.arange(10.0))
+            np.testing.assert_array_equal(arrays2["bias"], np.ones(2))
+            self.assertIsInstance(arrays2["weights"], np.memmap)
+            self.assertFalse(arrays2["weights"].flags.writeable)
+
 
 if __name__ == "__main__":
     from pyspark.ml.tests.test_model_cache import *  # noqa: F401
@@ -172,6 +172,17 @@ _options: List[Option] = [
         default=True,
         types=bool,
     ),
+    Option(
+        key="compute.share_default_index",
+        doc=(
+            "'compute.share_default_index' sets whether or not the DataFrames created from the "
+            "same Spark DataFrame without an index share the attached default index. If it is "
+            "set to True, such DataFrames have the same anchor, so the operations between them "
+            "do not need to join the DataFrames even if they are different DataFrames."
+        ),
+        default=False,
+        types=bool,
+    ),
     Option(
         key="compute.default_index_type",
         doc=("This sets the default index type: sequence, distributed and distributed-sequence."),
@@ -219,6 +230,30 @@ _options: List[Option] = [
             "'LOCAL_CHECKPOINT'.",
         ),
     ),
+    Option(
+        key="compute.default_index_reuse",
+        doc=(
+            "'compute.default_index_reuse' sets whether or not to locally checkpoint the data "
+            "with the attached distributed-sequence default index. If it is set to True, the "
+            "Spark job computing the index runs once, on the first action that needs the "
+            "index, and the DataFrames derived from it reuse the checkpointed index instead of "
+            "computing it again for every query. The checkpointed data is cached in the "
+            "executors until the DataFrame is garbage collected."
+        ),
+        default=False,
+        types=bool,
+    ),
+    Option(
+        key="compute.grouped_map_cumulative",
+        doc=(
+            "'compute.grouped_map_cumulative' sets whether or not to compute the cumulative "
+            "operations of GroupBy, i.e. `cumsum`, `cumprod`, `cummax` and `cummin`, with a "
+            "grouped map pandas UDF running NumPy cumulative kernels per group instead of Spark "
+            "window functions. Each group must fit in the memory of an executor."
+        ),
+        default=False,
+        types=bool,
+    ),
     Option(
         key="compute.ordered_head",
         doc=(
@@ -231,6 +266,19 @@ _options: List[Option] = [
         default=False,
         types=bool,
     ),
+    Option(
+        key="compute.statistics_cache",
+        doc=(
+            "'compute.statistics_cache' sets whether or not to cache the statistics of the "
+            "columns. If it is set to True, `DataFrame.describe`, `DataFrame.quantile`, "
+            "`DataFrame.median` and `DataFrame.nunique(approx=True)` compute the count, mean, "
+            "std, min, max and the requested statistics of their columns in a single pass, with "
+            "approximate percentiles at every 1%, and serve the later calls from them while the "
+            "columns are unchanged. The results are the same as without the cache."
+        ),
+        default=False,
+        types=bool,
+    ),
     Option(
         key="compute.eager_check",
         doc=(
@@ -107,6 +107,7 @@ from pyspark.pandas.correlation import (
     CORRELATION_COUNT_OUTPUT_COLUMN,
 )
 from pyspark.pandas.spark.accessors import SparkFrameMethods, CachedSparkFrameMethods
+from pyspark.pandas.statistics import column_statistics, is_countable, labels_to_index
 from pyspark.pandas.utils import (
     align_diff_frames,
     column_labels_level,
@@ -154,6 +155,7 @@ if TYPE_CHECKING:
     from pyspark.sql._typing import OptionalPrimitiveType
 
     from pyspark.pandas.groupby import DataFrameGroupBy
+    from pyspark.pandas.indexing import MaterializedIndex
     from pyspark.pandas.resample import DataFrameResampler
     from pyspark.pandas.indexes import Index
     from pyspark.pandas.series import Series
@@ -4927,6 +4929,24 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         axis = validate_axis(axis)
         if axis != 0:
             raise NotImplementedError('axis should be either 0 or "index" currently.')
+
+        if approx and get_option("compute.statistics_cache"):
+            pssers = list(map(self._psser_for, self._internal.column_labels))
+            if all(map(is_countable, pssers)):
+                all_stats = column_statistics(self, pssers, rsd=rsd)
+                return ps.from_pandas(
+                    pd.Series(
+                        [
+                            s.approx_distinct[rsd] + (0 if dropna or s.num_nulls == 0 else 1)
+                            for s in all_stats
+                        ],
+                        index=labels_to_index(
+                            self._internal.column_labels, self._internal.column_label_names
+                        ),
+                        dtype="int64",
+                    )
+                )
+
         sdf = self._internal.spark_frame.select(
             [F.lit(None).cast(StringType()).alias(SPARK_DEFAULT_INDEX_NAME)]
             + [
@@ -9850,6 +9870,23 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             formatted_perc = ["{:.0%}".format(p) for p in sorted(percentiles)]
             stats = ["count", "mean", "stddev", "min", *formatted_perc, "max"]
 
+            if get_option("compute.statistics_cache"):
+                all_stats = column_statistics(
+                    self, psser_numeric, percentiles=percentiles, skip_nan=True
+                )
+                pdf = pd.DataFrame(
+                    [
+                        [s.numeric_count, s.mean, s.std, s.min]
+                        + [s.percentiles[(10000, True)][p] for p in sorted(percentiles)]
+                        + [s.max]
+                        for s in all_stats
+                    ],
+                    index=labels_to_index(column_labels, self._internal.column_label_names),
+                    columns=["count", "mean", "std", "min", *formatted_perc, "max"],
+                    dtype="float64",
+                )
+                return DataFrame(pdf.transpose())
+
             # In this case, we can simply use `summary` to calculate the stats.
             sdf = self._internal.spark_frame.select(*exprs_numeric).summary(*stats)
             sdf = sdf.replace("stddev", "std", subset=["summary"])
@@ -12370,6 +12407,31 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             if v < 0.0 or v > 1.0:
                 raise ValueError("percentiles should all be in the interval [0, 1].")
 
+        if get_option("compute.statistics_cache"):
+            pssers = [
+                psser
+                for psser in map(self._psser_for, self._internal.column_labels)
+                if not numeric_only or isinstance(psser.spark.data_type, (NumericType, BooleanType))
+            ]
+            if len(pssers) > 0 and all(
+                isinstance(psser.spark.data_type, (NumericType, BooleanType)) for psser in pssers
+            ):
+                qs = qq if isinstance(qq, list) else [qq]
+                all_stats = column_statistics(self, pssers, percentiles=qs, accuracy=accuracy)
+                pdf = pd.DataFrame(
+                    [[s.percentiles[(accuracy, False)][v] for s in all_stats] for v in qs],
+                    index=qs,
+                    columns=labels_to_index(
+                        [psser._column_label for psser in pssers],
+                        self._internal.column_label_names,
+                    ),
+                    dtype="float64",
+                )
+                if isinstance(qq, list):
+                    return DataFrame(pdf)
+                else:
+                    return ps.from_pandas(pdf.iloc[0])
+
         def quantile(psser: "Series") -> PySparkColumn:
             spark_type = psser.spark.data_type
             spark_column = psser.spark.column
@@ -13744,6 +13806,9 @@ class CachedDataFrame(DataFrame):
     internally it caches the corresponding Spark DataFrame.
     """
 
+    # Set by `DataFrame.spark.materialize_index`.
+    _materialized_index: Optional["MaterializedIndex"] = None
+
     def __init__(self, internal: InternalFrame, storage_level: Optional[StorageLevel] = None):
         if storage_level is None:
             object.__setattr__(self, "_cached", internal.spark_frame.cache())
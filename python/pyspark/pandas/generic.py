@@ -57,8 +57,10 @@ from pyspark.pandas._typing import (
     Name,
     Scalar,
 )
+from pyspark.pandas.config import get_option
 from pyspark.pandas.indexing import AtIndexer, iAtIndexer, iLocIndexer, LocIndexer
 from pyspark.pandas.internal import InternalFrame
+from pyspark.pandas.statistics import column_statistics, labels_to_index
 from pyspark.pandas.typedef import spark_type_to_pandas_dtype
 from pyspark.pandas.utils import (
     is_name_like_tuple,
@@ -2168,6 +2170,32 @@ class Frame(object, metaclass=ABCMeta):
                 "accuracy must be an integer; however, got [%s]" % type(accuracy).__name__
             )
 
+        if (
+            get_option("compute.statistics_cache")
+            and isinstance(self, ps.DataFrame)
+            and axis == 0
+            and skipna
+        ):
+            pssers = [
+                psser
+                for psser in map(self._psser_for, self._internal.column_labels)
+                if not numeric_only or isinstance(psser.spark.data_type, (NumericType, BooleanType))
+            ]
+            if len(pssers) > 0 and all(
+                isinstance(psser.spark.data_type, (NumericType, BooleanType)) for psser in pssers
+            ):
+                all_stats = column_statistics(self, pssers, percentiles=[0.5], accuracy=accuracy)
+                return ps.from_pandas(
+                    pd.Series(
+                        [s.percentiles[(accuracy, False)][0.5] for s in all_stats],
+                        index=labels_to_index(
+                            [psser._column_label for psser in pssers],
+                            self._internal.column_label_names,
+                        ),
+                        dtype="float64",
+                    )
+                )
+
         def median(psser: "Series") -> Column:
             spark_type = psser.spark.data_type
             spark_column = psser.spark.column
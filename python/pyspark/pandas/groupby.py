@@ -1611,10 +1611,8 @@ class GroupBy(Generic[FrameLike], metaclass=ABCMeta):
         3    1
         Name: C, dtype: int64
         """
-        return self._apply_series_op(
-            lambda sg: sg._psser._cum(F.max, True, part_cols=sg._groupkeys_scols),
-            should_resolve=True,
-            numeric_only=True,
+        return self._apply_cumulative_op(
+            lambda sg: sg._psser._cum(F.max, True, part_cols=sg._groupkeys_scols), "cummax"
         )
 
     def cummin(self) -> FrameLike:
@@ -1660,10 +1658,8 @@ class GroupBy(Generic[FrameLike], metaclass=ABCMeta):
         3    10.0
         Name: B, dtype: float64
         """
-        return self._apply_series_op(
-            lambda sg: sg._psser._cum(F.min, True, part_cols=sg._groupkeys_scols),
-            should_resolve=True,
-            numeric_only=True,
+        return self._apply_cumulative_op(
+            lambda sg: sg._psser._cum(F.min, True, part_cols=sg._groupkeys_scols), "cummin"
         )
 
     def cumprod(self) -> FrameLike:
@@ -1709,10 +1705,8 @@ class GroupBy(Generic[FrameLike], metaclass=ABCMeta):
         3    10.0
         Name: B, dtype: float64
         """
-        return self._apply_series_op(
-            lambda sg: sg._psser._cumprod(True, part_cols=sg._groupkeys_scols),
-            should_resolve=True,
-            numeric_only=True,
+        return self._apply_cumulative_op(
+            lambda sg: sg._psser._cumprod(True, part_cols=sg._groupkeys_scols), "cumprod"
         )
 
     def cumsum(self) -> FrameLike:
@@ -1758,12 +1752,60 @@ class GroupBy(Generic[FrameLike], metaclass=ABCMeta):
         3    10.0
         Name: B, dtype: float64
         """
-        return self._apply_series_op(
-            lambda sg: sg._psser._cumsum(True, part_cols=sg._groupkeys_scols),
-            should_resolve=True,
-            numeric_only=True,
+        return self._apply_cumulative_op(
+            lambda sg: sg._psser._cumsum(True, part_cols=sg._groupkeys_scols), "cumsum"
+        )
+
+    def _apply_cumulative_op(
+        self, op: Callable[["SeriesGroupBy"], Series], method: str
+    ) -> FrameLike:
+        """
+        Apply the cumulative `op` to the numeric columns with Spark window functions. If
+        `compute.grouped_map_cumulative` is enabled, the pandas `method`, e.g. 'cumsum', is run
+        per group in a grouped map pandas UDF instead, which computes all the columns with NumPy
+        at once. The result has the same types in both cases.
+        """
+        result = self._apply_series_op(op, should_resolve=True, numeric_only=True)
+        if not get_option("compute.grouped_map_cumulative"):
+            return result
+
+        psdf = self._psdf
+        internal = result._internal.resolved_copy
+        agg_columns_by_label = {col._column_label: col for col in self._agg_columns}
+        agg_columns = [agg_columns_by_label[label] for label in internal.column_labels]
+
+        # The rows of each group are not guaranteed to be in order in the pandas UDF, so the
+        # natural order is passed to sort them.
+        order_label = verify_temp_column_name(psdf, "__natural_order__")
+        order_column = (
+            agg_columns[0]
+            ._with_new_scol(scol_for(psdf._internal.spark_frame, NATURAL_ORDER_COLUMN_NAME))
+            .rename(order_label)
         )
 
+        psdf, groupkey_labels, groupkey_names = GroupBy._prepare_group_map_apply(
+            psdf, self._groupkeys, [order_column] + agg_columns
+        )
+        order_name = order_label if len(order_label) > 1 else order_label[0]
+
+        def pandas_cumulative(pdf: pd.DataFrame) -> pd.DataFrame:
+            pdf = pdf.sort_values(order_name, kind="stable")
+            return getattr(pdf.drop(groupkey_names + [order_name], axis=1), method)()
+
+        sdf = GroupBy._spark_group_map_apply(
+            psdf,
+            pandas_cumulative,
+            [psdf._internal.spark_column_for(label) for label in groupkey_labels],
+            internal.spark_frame.drop(*HIDDEN_COLUMNS).schema,
+            retain_index=True,
+        )
+
+        psdf = DataFrame(internal.with_new_sdf(sdf))
+        if isinstance(self, SeriesGroupBy):
+            return cast(FrameLike, first_series(psdf))
+        else:
+            return cast(FrameLike, psdf)
+
     def apply(self, func: Callable, *args: Any, **kwargs: Any) -> Union[DataFrame, Series]:
         """
         Apply function `func` group-wise and combine the results together.
@@ -27,6 +27,7 @@ import pandas as pd
 from pandas.api.types import is_list_like  # type: ignore[attr-defined]
 import numpy as np
 
+from pyspark import StorageLevel
 from pyspark.sql import functions as F, Column as PySparkColumn
 from pyspark.sql.types import BooleanType, LongType, DataType
 from pyspark.errors import AnalysisException
@@ -52,11 +53,93 @@ from pyspark.pandas.utils import (
 )
 
 if TYPE_CHECKING:
-    from pyspark.pandas.frame import DataFrame
+    from pyspark.pandas.frame import CachedDataFrame, DataFrame
     from pyspark.pandas.generic import Frame
     from pyspark.pandas.series import Series
 
 
+class MaterializedIndex:
+    """
+    The metadata of a DataFrame persisted sorted and range-partitioned by its index, see
+    :meth:`DataFrame.spark.materialize_index`.
+
+    The natural order of the persisted rows is their position, and the minimum and maximum
+    label and the number of rows of each partition are kept. So `loc` and `iloc` do not have to
+    find the positions of labels, check whether the index is sorted, number the rows or count
+    them, and their filters skip the cached batches of the other partitions.
+    """
+
+    def __init__(self, internal: InternalFrame, bounds: List[Tuple[Any, Any]], counts: List[int]):
+        self.internal = internal
+        # The minimum and maximum non-null label of each partition, if the index has one level.
+        self.bounds = bounds
+        self.count = sum(counts)
+
+    @staticmethod
+    def materialize(
+        internal: InternalFrame, storage_level: StorageLevel, num_partitions: Optional[int]
+    ) -> "CachedDataFrame":
+        from pyspark.pandas.frame import CachedDataFrame
+
+        internal = internal.resolved_copy
+        sdf = internal.spark_frame
+
+        by = [scol.asc_nulls_last() for scol in internal.index_spark_columns]
+        by.append(scol_for(sdf, NATURAL_ORDER_COLUMN_NAME))
+        if num_partitions is None:
+            sdf = sdf.orderBy(*by)
+        else:
+            sdf = sdf.repartitionByRange(num_partitions, *by).sortWithinPartitions(*by)
+        # The positions of the rows, which `iloc` uses instead of a distributed sequence.
+        sdf = InternalFrame.attach_distributed_sequence_column(
+            sdf.drop(NATURAL_ORDER_COLUMN_NAME), column_name=NATURAL_ORDER_COLUMN_NAME
+        )
+        internal = internal.copy(
+            spark_frame=sdf,
+            index_spark_columns=[scol_for(sdf, col) for col in internal.index_spark_column_names],
+            data_spark_columns=[scol_for(sdf, col) for col in internal.data_spark_column_names],
+        )
+        psdf = CachedDataFrame(internal, storage_level=storage_level)
+
+        # This also materializes the cache.
+        aggs = [F.count(F.lit(1))]
+        if internal.index_level == 1:
+            index_scol = internal.index_spark_columns[0]
+            aggs += [F.min(index_scol), F.max(index_scol)]
+        rows = sorted(
+            internal.spark_frame.groupBy(F.spark_partition_id().alias("partition"))
+            .agg(*aggs)
+            .collect(),
+            key=lambda row: row[0],
+        )
+        counts = [row[1] for row in rows]
+        bounds = [(row[2], row[3]) for row in rows] if internal.index_level == 1 else []
+
+        object.__setattr__(psdf, "_materialized_index", MaterializedIndex(internal, bounds, counts))
+        return psdf
+
+    def may_contain(self, label: Any) -> bool:
+        """
+        Return whether the label may be in the index, i.e. ``False`` only if it is surely not.
+        """
+        if self.internal.index_level != 1 or label is None:
+            return True
+        try:
+            if label != label:
+                # NaN
+                return True
+            for lower, upper in self.bounds:
+                if lower is None:
+                    continue
+                # NaN is larger than any other value in Spark.
+                if lower <= label and (upper != upper or label <= upper):
+                    return True
+            return False
+        except (TypeError, ValueError):
+            # The labels are compared by Spark, e.g. strings with dates.
+            return True
+
+
 class IndexerLike:
     def __init__(self, psdf_or_psser: "Frame"):
         from pyspark.pandas.frame import DataFrame
@@ -91,6 +174,18 @@ class IndexerLike:
     def _internal(self) -> InternalFrame:
         return self._psdf._internal
 
+    @property
+    def _materialized_index(self) -> Optional[MaterializedIndex]:
+        """The materialized index of the DataFrame, if it was not updated since."""
+        from pyspark.pandas.frame import CachedDataFrame
+
+        psdf = self._psdf
+        if isinstance(psdf, CachedDataFrame):
+            materialized_index = psdf._materialized_index
+            if materialized_index is not None and materialized_index.internal is psdf._internal:
+                return materialized_index
+        return None
+
 
 class AtIndexer(IndexerLike):
     """
@@ -1016,6 +1111,15 @@ class LocIndexer(LocIndexerLike):
             start = rows_sel.start
             stop = rows_sel.stop
 
+            if self._materialized_index is not None:
+                # The index is sorted, so the rows from start to stop are the ones in between.
+                conds = []
+                if start is not None:
+                    conds.append(index_column.spark.column >= F.lit(start).cast(index_data_type))
+                if stop is not None:
+                    conds.append(index_column.spark.column <= F.lit(stop).cast(index_data_type))
+                return reduce(lambda x, y: x & y, conds), None, None
+
             # get natural order from '__natural_order__' from start to stop
             # to keep natural order.
             start_and_stop = (
@@ -1100,9 +1204,10 @@ class LocIndexer(LocIndexerLike):
             )
             if depth == 0:
                 return None, None, None
-            elif (
-                depth > self._internal.index_level
-                or not index.droplevel(
+            elif depth > self._internal.index_level or (
+                # The materialized index is sorted.
+                self._materialized_index is None
+                and not index.droplevel(
                     list(range(self._internal.index_level)[depth:])
                 ).is_monotonic_increasing
             ):
@@ -1176,6 +1281,10 @@ class LocIndexer(LocIndexerLike):
         if len(rows_sel) > self._internal.index_level:
             raise SparkPandasIndexingError("Too many indexers")
 
+        materialized_index = self._materialized_index
+        if materialized_index is not None and not materialized_index.may_contain(rows_sel[0]):
+            return F.lit(False), None, self._internal.index_level - len(rows_sel)
+
         rows = [scol == value for scol, value in zip(self._internal.index_spark_columns, rows_sel)]
         return (
             reduce(lambda x, y: x & y, rows),
@@ -1551,6 +1660,9 @@ class iLocIndexer(LocIndexerLike):
 
     @lazy_property
     def _internal(self) -> "InternalFrame":
+        if self._materialized_index is not None:
+            # The natural order is the position of the rows.
+            return self._materialized_index.internal
         # Use resolved_copy to fix the natural order.
         internal = super()._internal.resolved_copy
         sdf = InternalFrame.attach_distributed_sequence_column(
@@ -1560,10 +1672,17 @@ class iLocIndexer(LocIndexerLike):
 
     @lazy_property
     def _sequence_col(self) -> str:
+        if self._materialized_index is not None:
+            return NATURAL_ORDER_COLUMN_NAME
         # Use resolved_copy to fix the natural order.
         internal = super()._internal.resolved_copy
         return verify_temp_column_name(internal.spark_frame, "__distributed_sequence_column__")
 
+    def _count(self) -> int:
+        if self._materialized_index is not None:
+            return self._materialized_index.count
+        return self._internal.spark_frame.count()
+
     def _select_rows_by_series(
         self, rows_sel: "Series"
     ) -> Tuple[Optional[PySparkColumn], Optional[int], Optional[int]]:
@@ -1620,7 +1739,7 @@ class iLocIndexer(LocIndexerLike):
         sequence_scol = sdf[self._sequence_col]
 
         if has_negative or (step < 0 and start is None):
-            cnt = sdf.count()
+            cnt = self._count()
 
         cond = []
         if start is not None:
@@ -1652,7 +1771,7 @@ class iLocIndexer(LocIndexerLike):
         sdf = self._internal.spark_frame
 
         if any(isinstance(key, (int, np.int64, np.int32)) and key < 0 for key in rows_sel):
-            offset = sdf.count()
+            offset = self._count()
         else:
             offset = 0
 
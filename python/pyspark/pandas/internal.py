@@ -19,6 +19,7 @@
 An internal immutable DataFrame with some metadata to manage indexes.
 """
 import re
+import weakref
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING, cast
 
 import numpy as np
@@ -78,6 +79,10 @@ NATURAL_ORDER_COLUMN_NAME = "__natural_order__"
 
 HIDDEN_COLUMNS = {NATURAL_ORDER_COLUMN_NAME}
 
+# The Spark DataFrames with the default index attached, by the Spark DataFrames they were created
+# from, when `compute.share_default_index` is enabled.
+_shared_default_index_frames: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
 DEFAULT_SERIES_NAME = 0
 SPARK_DEFAULT_SERIES_NAME = str(DEFAULT_SERIES_NAME)
 
@@ -638,7 +643,10 @@ class InternalFrame:
             )
 
             # Create default index.
-            spark_frame = InternalFrame.attach_default_index(spark_frame)
+            if data_spark_columns is None and ps.get_option("compute.share_default_index"):
+                spark_frame = InternalFrame._attach_shared_default_index(spark_frame)
+            else:
+                spark_frame = InternalFrame.attach_default_index(spark_frame)
             index_spark_columns = [scol_for(spark_frame, SPARK_DEFAULT_INDEX_NAME)]
 
             index_fields = [
@@ -891,7 +899,13 @@ class InternalFrame:
         if default_index_type == "sequence":
             return InternalFrame.attach_sequence_column(sdf, column_name=index_column)
         elif default_index_type == "distributed-sequence":
-            return InternalFrame.attach_distributed_sequence_column(sdf, column_name=index_column)
+            sdf = InternalFrame.attach_distributed_sequence_column(sdf, column_name=index_column)
+            if ps.get_option("compute.default_index_reuse"):
+                # The checkpoint is not eager, so the index is computed once by the first action
+                # that needs it, and the derived DataFrames reuse the checkpointed data instead
+                # of computing it again.
+                sdf = sdf.localCheckpoint(eager=False)
+            return sdf
         elif default_index_type == "distributed":
             return InternalFrame.attach_distributed_column(sdf, column_name=index_column)
         else:
@@ -900,6 +914,29 @@ class InternalFrame:
                 " 'distributed-sequence' and 'distributed'"
             )
 
+    @staticmethod
+    def _attach_shared_default_index(sdf: PySparkDataFrame) -> PySparkDataFrame:
+        """
+        Attach the default index and the natural order column to the Spark DataFrame, reusing
+        the Spark DataFrame returned for the same `sdf` before, if any. The DataFrames created
+        from it have the same anchor, so no join is needed to operate between them.
+        """
+        key = (
+            ps.get_option("compute.default_index_type"),
+            ps.get_option("compute.default_index_reuse"),
+        )
+        shared = _shared_default_index_frames.get(sdf)
+        if shared is not None and shared[0] == key:
+            return shared[1]
+
+        attached = InternalFrame.attach_default_index(sdf)
+        if NATURAL_ORDER_COLUMN_NAME not in attached.columns:
+            attached = attached.withColumn(
+                NATURAL_ORDER_COLUMN_NAME, F.monotonically_increasing_id()
+            )
+        _shared_default_index_frames[sdf] = (key, attached)
+        return attached
+
     @staticmethod
     def attach_sequence_column(sdf: PySparkDataFrame, column_name: str) -> PySparkDataFrame:
         sequential_index = (
@@ -639,6 +639,57 @@ class SparkFrameMethods:
         )
         return CachedDataFrame(self._psdf._internal, storage_level=storage_level)
 
+    def materialize_index(
+        self,
+        storage_level: StorageLevel = StorageLevel.MEMORY_AND_DISK,
+        num_partitions: Optional[int] = None,
+    ) -> "CachedDataFrame":
+        """
+        Yields and caches the current DataFrame sorted and range-partitioned by its index, with
+        a specific StorageLevel.
+
+        The rows of the DataFrame are sorted by the index like :meth:`DataFrame.sort_index`, and
+        the minimum and maximum label and the number of rows of each partition are kept. Label
+        lookups and slices with `loc`, and positional lookups and slices with `iloc`, then only
+        read the cached partitions which can contain the rows selected. They also skip the jobs
+        finding the positions of labels, checking whether the index is sorted, and numbering or
+        counting the rows.
+
+        The index is not used anymore once the DataFrame is updated in place.
+
+        Parameters
+        ----------
+        storage_level : StorageLevel
+            The StorageLevel to cache the DataFrame with, `MEMORY_AND_DISK` by default.
+        num_partitions : int, optional
+            The number of partitions. If not given, the number of shuffle partitions is used.
+
+        See Also
+        --------
+        DataFrame.spark.persist
+        DataFrame.sort_index
+
+        Examples
+        --------
+        >>> df = ps.DataFrame({'dogs': [.2, .0, .6, .2]}, index=[30, 10, 40, 20])
+        >>> with df.spark.materialize_index(num_partitions=2) as indexed_df:
+        ...     print(indexed_df.loc[15:30])
+        ...     print(indexed_df.iloc[-1:])
+            dogs
+        20   0.2
+        30   0.2
+            dogs
+        40   0.6
+
+        To uncache the dataframe, use `unpersist` function
+
+        >>> indexed_df = df.spark.materialize_index()
+        >>> indexed_df.spark.unpersist()
+        """
+        from pyspark.pandas.indexing import MaterializedIndex
+
+        return MaterializedIndex.materialize(self._psdf._internal, storage_level, num_partitions)
+
     def hint(self, name: str, *parameters: "PrimitiveType") -> "ps.DataFrame":
         """
         Specifies some hint on the current DataFrame.
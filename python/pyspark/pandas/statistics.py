@@ -0,0 +1,205 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+A cache of the statistics of the columns of pandas-on-Spark DataFrames, computed in a single pass
+and shared by `describe`, `quantile`, `median` and `nunique(approx=True)` when
+`compute.statistics_cache` is enabled.
+"""
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import pandas as pd
+
+from pyspark.sql import Column as PySparkColumn, DataFrame as SparkDataFrame, functions as F
+from pyspark.sql.types import AtomicType, BooleanType, DoubleType, NumericType
+from pyspark.pandas._typing import Label
+
+if TYPE_CHECKING:
+    from pyspark.pandas.frame import DataFrame
+    from pyspark.pandas.series import Series
+
+
+# The percentiles computed besides the requested ones, so that most of the later requests are
+# served from the cache. Computing more percentiles with the same sketch is cheap.
+DEFAULT_PERCENTILES = [i / 100 for i in range(101)]
+
+# The statistics of the columns by the ids of their Spark columns, by the Spark DataFrames of the
+# pandas-on-Spark DataFrames. A column computing something else, e.g. another function applied
+# by `transform_batch` or an updated column, is a different Spark column object even if its
+# expression looks the same, whereas the DataFrames selecting some of the columns share them.
+_statistics_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class ColumnStatistics:
+    """
+    The statistics of a column. The numeric statistics are computed without NaN like
+    `DataFrame.describe`, and are None if the column is not numeric or boolean.
+    """
+
+    def __init__(self, column: PySparkColumn) -> None:
+        # The Spark column, which keeps its id unique while the statistics are cached.
+        self.column = column
+        self.num_rows = 0
+        # The number of non-null values, NaN included.
+        self.count = 0
+        # The numeric statistics.
+        self.numeric_count: Optional[int] = None
+        self.mean: Optional[float] = None
+        self.std: Optional[float] = None
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        # The approximate percentiles by the accuracy and whether NaN is skipped. NaN is kept
+        # like in the other `DataFrame.quantile` and `DataFrame.median` paths unless skipped.
+        self.percentiles: Dict[Tuple[int, bool], Dict[float, Optional[float]]] = {}
+        # The approximate numbers of distinct values by the relative standard deviation.
+        self.approx_distinct: Dict[float, int] = {}
+
+    @property
+    def num_nulls(self) -> int:
+        return self.num_rows - self.count
+
+    def has(
+        self, percentiles: Sequence[float], accuracy: int, skip_nan: bool, rsd: Optional[float]
+    ) -> bool:
+        cached = self.percentiles.get((accuracy, skip_nan), {})
+        return all(p in cached for p in percentiles) and (
+            rsd is None or rsd in self.approx_distinct
+        )
+
+
+def _is_numeric(psser: "Series") -> bool:
+    return isinstance(psser.spark.data_type, (NumericType, BooleanType))
+
+
+def is_countable(psser: "Series") -> bool:
+    """Return whether the approximate number of distinct values of the Series is cached."""
+    return isinstance(psser.spark.data_type, AtomicType)
+
+
+def column_statistics(
+    psdf: "DataFrame",
+    pssers: List["Series"],
+    *,
+    percentiles: Sequence[float] = (),
+    accuracy: int = 10000,
+    skip_nan: bool = False,
+    rsd: Optional[float] = None,
+) -> List[ColumnStatistics]:
+    """
+    Return the statistics of the given Series of `psdf`, with the approximate `percentiles`
+    at `accuracy`, skipping NaN if `skip_nan`, and, if `rsd` is given, the approximate numbers
+    of distinct values.
+
+    The statistics are served from the cache if possible. Otherwise the statistics of the given
+    Series are computed in a single pass, with the default percentiles if any percentile is
+    requested, so that the later requests for other percentiles are served from the cache too.
+    """
+    cache: Dict[int, ColumnStatistics] = _statistics_cache.setdefault(
+        psdf._internal.spark_frame, {}
+    )
+
+    keys = [id(psser.spark.column) for psser in pssers]
+    if any(
+        key not in cache
+        or not cache[key].has(
+            percentiles if _is_numeric(psser) else [],
+            accuracy,
+            skip_nan,
+            rsd if is_countable(psser) else None,
+        )
+        for key, psser in zip(keys, pssers)
+    ):
+        _compute(
+            psdf._internal.spark_frame,
+            cache,
+            pssers,
+            sorted(set(DEFAULT_PERCENTILES) | set(percentiles)) if len(percentiles) > 0 else [],
+            accuracy,
+            skip_nan,
+            rsd,
+        )
+    return [cache[key] for key in keys]
+
+
+def _compute(
+    sdf: SparkDataFrame,
+    cache: Dict[int, ColumnStatistics],
+    pssers: List["Series"],
+    percentiles: List[float],
+    accuracy: int,
+    skip_nan: bool,
+    rsd: Optional[float],
+) -> None:
+    columns = {}
+    for psser in pssers:
+        columns.setdefault(id(psser.spark.column), psser)
+
+    exprs = [F.count(F.lit(1))]
+    for psser in columns.values():
+        scol = psser.spark.column
+        exprs.append(F.count(scol))
+        if rsd is not None and is_countable(psser):
+            exprs.append(F.approx_count_distinct(scol, rsd))
+        if _is_numeric(psser):
+            numeric_scol = psser._dtype_op.nan_to_null(psser).spark.column.cast(DoubleType())
+            exprs.extend(
+                [
+                    F.count(numeric_scol),
+                    F.avg(numeric_scol),
+                    F.stddev_samp(numeric_scol),
+                    F.min(numeric_scol),
+                    F.max(numeric_scol),
+                ]
+            )
+            if len(percentiles) > 0:
+                percentile_scol = numeric_scol if skip_nan else scol.cast(DoubleType())
+                exprs.append(F.percentile_approx(percentile_scol, percentiles, accuracy))
+    row = sdf.select(*[expr.alias("__stat_{}__".format(i)) for i, expr in enumerate(exprs)]).head()
+    values = iter(row)
+
+    num_rows = next(values)
+    for key, psser in columns.items():
+        stats = cache.setdefault(key, ColumnStatistics(psser.spark.column))
+        stats.num_rows = num_rows
+        stats.count = next(values)
+        if rsd is not None and is_countable(psser):
+            stats.approx_distinct[rsd] = next(values)
+        if _is_numeric(psser):
+            stats.numeric_count = next(values)
+            stats.mean = next(values)
+            stats.std = next(values)
+            stats.min = next(values)
+            stats.max = next(values)
+            if len(percentiles) > 0:
+                result = next(values)
+                computed = dict(
+                    zip(percentiles, result if result is not None else [None] * len(percentiles))
+                )
+                stats.percentiles.setdefault((accuracy, skip_nan), {}).update(computed)
+                if stats.numeric_count == stats.count:
+                    # Without NaN, the percentiles are the same whether NaN is skipped or not.
+                    stats.percentiles.setdefault((accuracy, not skip_nan), {}).update(computed)
+
+
+def labels_to_index(labels: List[Label], label_names: List[Optional[Label]]) -> pd.Index:
+    """Return the pandas Index of the given column labels, like the columns of the DataFrame."""
+    names = [name if name is None or len(name) > 1 else name[0] for name in label_names]
+    if len(label_names) > 1:
+        return pd.MultiIndex.from_tuples(labels, names=names)
+    else:
+        return pd.Index([None if label is None else label[0] for label in labels], name=names[0])
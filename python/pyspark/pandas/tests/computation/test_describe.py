@@ -16,6 +16,7 @@
 #
 
 import unittest
+from unittest import mock
 
 import numpy as np
 import pandas as pd
@@ -228,6 +229,56 @@ class FrameDescribeMixin:
             pdf_result.where(pdf_result.notnull(), None).astype(str),
         )
 
+    def test_statistics_cache(self):
+        pdf, psdf = self.df_pair
+
+        with ps.option_context("compute.statistics_cache", True):
+            self.assert_eq(psdf.describe(), pdf.describe())
+            self.assert_eq(psdf.nunique(approx=True), pdf.nunique())
+
+            # The other statistics are served from the statistics computed above.
+            with mock.patch(
+                "pyspark.pandas.statistics._compute", side_effect=AssertionError("recomputed")
+            ):
+                self.assert_eq(psdf.describe(), pdf.describe())
+                self.assert_eq(psdf.quantile([0.25, 0.5, 0.75]), pdf.quantile([0.25, 0.5, 0.75]))
+                self.assert_eq(psdf.quantile(0.5), pdf.quantile(0.5))
+                self.assert_eq(psdf.median(), pdf.median())
+                self.assert_eq(psdf.nunique(approx=True), pdf.nunique())
+
+            # The statistics are computed again once the data changes.
+            psdf.a += psdf.a
+            pdf.a += pdf.a
+            self.assert_eq(psdf.describe(), pdf.describe())
+            self.assert_eq(psdf.median(), pdf.median())
+
+    def test_statistics_cache_transform_batch(self):
+        pdf, psdf = self.df_pair
+
+        with ps.option_context("compute.statistics_cache", True):
+            # Both columns are pandas UDFs over the same Spark DataFrame with the same name.
+            psdf1 = psdf.a.pandas_on_spark.transform_batch(lambda s: s + 1).to_frame()
+            psdf2 = psdf.a.pandas_on_spark.transform_batch(lambda s: s * 10).to_frame()
+            pdf1 = (pdf.a + 1).to_frame()
+            pdf2 = (pdf.a * 10).to_frame()
+            self.assert_eq(psdf1.describe(), pdf1.describe())
+            self.assert_eq(psdf2.describe(), pdf2.describe())
+            self.assert_eq(psdf1.median(), pdf1.median())
+            self.assert_eq(psdf2.median(), pdf2.median())
+
+    def test_statistics_cache_nan(self):
+        psdf = ps.DataFrame({"a": [1.0, 2.0, np.nan, 4.0, None], "b": [1.0, 2.0, 3.0, 4.0, 5.0]})
+
+        expected_describe = psdf.describe()
+        expected_quantile = psdf.quantile([0.25, 0.5, 0.75])
+        expected_median = psdf.median()
+        with ps.option_context("compute.statistics_cache", True):
+            # NaN is handled as without the cache, whichever statistics are computed first.
+            self.assert_eq(psdf.describe(), expected_describe)
+            self.assert_eq(psdf.quantile([0.25, 0.5, 0.75]), expected_quantile)
+            self.assert_eq(psdf.median(), expected_median)
+            self.assert_eq(psdf.describe(), expected_describe)
+
 
 class FrameDescribeTests(
     FrameDescribeMixin,
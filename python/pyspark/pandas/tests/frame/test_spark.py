@@ -234,6 +234,48 @@ class FrameSparkMixin:
 
         self.assertRaises(TypeError, lambda: psdf.spark.persist("DISK_ONLY"))
 
+    def test_materialize_index(self):
+        pdf = pd.DataFrame(
+            {"a": [1, 2, 3, 4, 5, 6], "b": [1.0, None, 3.0, 4.0, 5.0, 6.0]},
+            index=[40, 10, 60, 20, 50, 30],
+        )
+        psdf = ps.from_pandas(pdf)
+        pdf = pdf.sort_index()
+
+        with psdf.spark.materialize_index(num_partitions=3) as indexed_df:
+            self.assert_eq(isinstance(indexed_df, CachedDataFrame), True)
+            self.assert_eq(indexed_df, pdf, almost=True)
+
+            self.assert_eq(indexed_df.loc[20], pdf.loc[20])
+            self.assertRaises(KeyError, lambda: indexed_df.loc[25])
+            self.assertRaises(KeyError, lambda: indexed_df.loc[100])
+            self.assert_eq(indexed_df.loc[15:45], pdf.loc[15:45])
+            self.assert_eq(indexed_df.loc[:30, "b"], pdf.loc[:30, "b"])
+            self.assert_eq(indexed_df.a.loc[50:], pdf.a.loc[50:])
+
+            self.assert_eq(indexed_df.iloc[2], pdf.iloc[2])
+            self.assert_eq(indexed_df.iloc[1:4], pdf.iloc[1:4])
+            self.assert_eq(indexed_df.iloc[-2:], pdf.iloc[-2:])
+            self.assert_eq(indexed_df.iloc[[0, -1]], pdf.iloc[[0, -1]])
+            self.assert_eq(indexed_df.a.iloc[::2], pdf.a.iloc[::2])
+
+            # The index is not used once the DataFrame is updated.
+            indexed_df["c"] = indexed_df.a + 1
+            pdf["c"] = pdf.a + 1
+            self.assert_eq(indexed_df.loc[15:45], pdf.loc[15:45])
+            self.assert_eq(indexed_df.iloc[1:4], pdf.iloc[1:4])
+
+        pdf = pd.DataFrame(
+            {"a": [1, 2, 3, 4]},
+            index=pd.MultiIndex.from_tuples([("b", 2), ("a", 1), ("b", 1), ("a", 2)]),
+        )
+        psdf = ps.from_pandas(pdf)
+        pdf = pdf.sort_index()
+
+        with psdf.spark.materialize_index() as indexed_df:
+            self.assert_eq(indexed_df.loc["a"], pdf.loc["a"])
+            self.assert_eq(indexed_df.loc[("a", 2):"b"], pdf.loc[("a", 2):"b"])
+
     def test_udt(self):
         sparse_values = {0: 0.1, 1: 1.1}
         sparse_vector = SparseVector(len(sparse_values), sparse_values)
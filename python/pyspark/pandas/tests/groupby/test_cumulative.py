@@ -387,6 +387,35 @@ class GroupbyCumulativeMixin:
         psdf = ps.DataFrame([[1, "a"], [2, "b"], [3, "c"]], columns=["A", "B"])
         self.assertRaises(DataError, lambda: psdf.groupby(["A"])["B"].cumprod())
 
+    def test_grouped_map_cumulative(self):
+        pdf = pd.DataFrame(
+            {
+                "a": [1, 2, 3, 4, 5, 6] * 3,
+                "b": [1, 1, 2, 3, 5, 8] * 3,
+                "c": [1.0, np.nan, 9.0, -16.0, 25.0, 36.0] * 3,
+            },
+            index=np.random.rand(6 * 3),
+        )
+        psdf = ps.from_pandas(pdf)
+
+        with ps.option_context("compute.grouped_map_cumulative", True):
+            for method in ["cumsum", "cumprod", "cummax", "cummin"]:
+                with self.subTest(method=method):
+                    self.assert_eq(
+                        getattr(psdf.groupby("b")[["a", "c"]], method)().sort_index(),
+                        getattr(pdf.groupby("b")[["a", "c"]], method)().sort_index(),
+                        check_exact=False,
+                    )
+                    self.assert_eq(
+                        getattr(psdf.groupby(psdf.b // 5)["c"], method)().sort_index(),
+                        getattr(pdf.groupby(pdf.b // 5)["c"], method)().sort_index(),
+                        check_exact=False,
+                    )
+            self.assert_eq(
+                psdf.groupby("b").cumsum().sort_index(),
+                pdf.groupby("b").cumsum().sort_index(),
+            )
+
 
 class GroupbyCumulativeTests(
     GroupbyCumulativeMixin,
@@ -15,10 +15,14 @@
 # limitations under the License.
 #
 
+import io
+from contextlib import redirect_stdout
+
 import pandas as pd
 
 from pyspark.sql import functions as F
 from pyspark import pandas as ps
+from pyspark.pandas.utils import same_anchor
 from pyspark.testing.pandasutils import PandasOnSparkTestCase
 
 
@@ -33,6 +37,35 @@ class DefaultIndexTestsMixin:
             sdf = self.spark.range(1000)
             self.assert_eq(ps.DataFrame(sdf), pd.DataFrame({"id": list(range(1000))}))
 
+    def test_default_index_reuse(self):
+        def plan(psdf):
+            with io.StringIO() as buf, redirect_stdout(buf):
+                psdf.spark.explain()
+                return buf.getvalue()
+
+        pdf = pd.DataFrame({"id": list(range(100))})
+        with ps.option_context("compute.default_index_type", "distributed-sequence"):
+            for reuse in [False, True]:
+                with ps.option_context("compute.default_index_reuse", reuse):
+                    psdf = ps.DataFrame(self.spark.range(0, 100, 1, 10))
+                    psdf = psdf[psdf.id % 3 == 0] + 1
+
+                self.assert_eq(psdf, pdf[pdf.id % 3 == 0] + 1)
+                self.assertEqual("AttachDistributedSequence" in plan(psdf), not reuse)
+
+    def test_share_default_index(self):
+        sdf = self.spark.range(0, 100, 1, 10)
+        for share in [False, True]:
+            with ps.option_context("compute.share_default_index", share):
+                psdf1 = sdf.pandas_api()
+                psdf2 = ps.DataFrame(sdf)
+
+                self.assertEqual(same_anchor(psdf1, psdf2), share)
+                self.assert_eq(
+                    (psdf1.id + psdf2.id).sort_index(),
+                    pd.Series([i * 2 for i in range(100)], name="id"),
+                )
+
     def test_default_index_distributed(self):
         with ps.option_context("compute.default_index_type", "distributed"):
             sdf = self.spark.range(1000)
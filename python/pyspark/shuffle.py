@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import array
 import os
 import platform
 import shutil
@@ -23,6 +24,7 @@ import gc
 import itertools
 import operator
 import random
+import struct
 import sys
 import heapq
 
@@ -119,6 +121,34 @@ class SimpleAggregator(Aggregator):
         Aggregator.__init__(self, lambda x: x, combiner, combiner)
 
 
+class PrimitiveAggregator(Aggregator):
+
+    """
+    PrimitiveAggregator is an Aggregator whose combiner is one of the
+    builtin reductions `operator.add`, `min` or `max`, optionally starting
+    from a numeric zero value. `ExternalArrayMerger` applies it in place on
+    array-backed values instead of calling it for every item.
+    """
+
+    COMBINERS = (operator.add, min, max)
+
+    def __init__(self, combiner, zeroValue=None):
+        if zeroValue is None:
+            createCombiner = lambda x: x  # noqa: E731
+        else:
+            createCombiner = lambda x: combiner(zeroValue, x)  # noqa: E731
+        Aggregator.__init__(self, createCombiner, combiner, combiner)
+        self.combiner = combiner
+        self.zeroValue = zeroValue
+
+    @classmethod
+    def supports(cls, combiner, zeroValue=None):
+        """Whether the combiner (and the zero value) can be applied on arrays"""
+        return any(combiner is c for c in cls.COMBINERS) and (
+            zeroValue is None or type(zeroValue) in (int, float)
+        )
+
+
 class Merger:
 
     """
@@ -388,7 +418,7 @@ class ExternalMerger(Merger):
             p = os.path.join(path, str(index))
             # do not check memory during merging
             with open(p, "rb") as f:
-                self.mergeCombiners(self.serializer.load_stream(f), 0)
+                self.mergeCombiners(self._load_spill(f), 0)
 
             # limit the total partitions
             if (
@@ -426,7 +456,7 @@ class ExternalMerger(Merger):
             path = self._get_spill_dir(j)
             p = os.path.join(path, str(index))
             with open(p, "rb") as f:
-                m.mergeCombiners(self.serializer.load_stream(f), 0)
+                m.mergeCombiners(self._load_spill(f), 0)
 
             if get_used_memory() > limit:
                 m._spill()
@@ -434,12 +464,423 @@ class ExternalMerger(Merger):
 
         return m._external_items()
 
+    def _load_spill(self, f):
+        """Return the (key, combiner) pairs of a spilled file as iterator"""
+        return self.serializer.load_stream(f)
+
     def _cleanup(self):
         """Clean up all the files in disks"""
         for d in self.localdirs:
             shutil.rmtree(d, True)
 
 
+class ExternalArrayMerger(ExternalMerger):
+
+    """
+    ExternalArrayMerger is an ExternalMerger for `PrimitiveAggregator`
+    when keys are numbers, strings or bytes and values are ints or
+    floats, which is the common case of `reduceByKey(add)` like jobs.
+
+    - Each key is mapped to a slot of a compact `array.array` holding
+      the values, so no Python object is kept per combined value.
+
+    - The items are merged in batches and the combiner is applied in
+      place on the array, without calling into the combiner function.
+
+    - The memory used by the hash table is tracked in bytes, so it
+      spills exactly when the table goes above the memory limit instead
+      of polling the RSS of the process.
+
+    - Spilled partitions are written as columnar chunks of keys and
+      values, which are much cheaper to pickle than (key, value) pairs.
+
+    Once a key or value of another type shows up, or an int overflows
+    64 bits, the merged data is moved into dicts and the rest of the
+    items are merged the same way as `ExternalMerger` does.
+
+    Examples
+    --------
+    >>> agg = PrimitiveAggregator(operator.add)
+    >>> merger = ExternalArrayMerger(agg, 1)
+    >>> N = 100000
+    >>> merger.mergeValues(zip(range(N), range(N)))
+    >>> assert merger.spills > 0
+    >>> sum(v for k,v in merger.items())
+    4999950000
+
+    >>> merger = ExternalArrayMerger(agg, 10)
+    >>> merger.mergeValues([(1, 1), (2, 2), (1, "a")])
+    Traceback (most recent call last):
+        ...
+    TypeError: unsupported operand type(s) for +: 'int' and 'str'
+    """
+
+    KEY_TYPES = frozenset([int, float, str, bytes, bool])
+    VALUE_TYPECODES = {int: "q", float: "d"}
+
+    def __init__(
+        self,
+        aggregator,
+        memory_limit=512,
+        serializer=None,
+        localdirs=None,
+        scale=1,
+        partitions=59,
+        batch=1000,
+    ):
+        ExternalMerger.__init__(
+            self, aggregator, memory_limit, serializer, localdirs, scale, partitions, batch
+        )
+        self.primitive = isinstance(aggregator, PrimitiveAggregator)
+        self._value_type = None
+        self._reset_table()
+
+    def _reset_table(self):
+        # slot of each key in `_values`, in the order of insertion
+        self._slots = {}
+        self._values = array.array(self.VALUE_TYPECODES.get(self._value_type, "q"))
+        self._key_bytes = 0
+
+    def _table_bytes(self):
+        """Return the bytes used by the keys and values of the hash table"""
+        return (
+            sys.getsizeof(self._slots)
+            + self._key_bytes
+            + self._values.buffer_info()[1] * self._values.itemsize
+        )
+
+    def _table_items(self):
+        # the slots are allocated in the insertion order of the keys
+        return zip(self._slots, self._values)
+
+    def _merge_batch(self, batch, create):
+        """
+        Merge a batch of (key, value) pairs into the hash table, return the
+        number of merged items. Merging stops at the first item that can
+        not be stored in the table.
+        """
+        slots, values, sizeof = self._slots, self._values, sys.getsizeof
+        combiner, zero = self.agg.combiner, self.agg.zeroValue if create else None
+        key_types, value_type = self.KEY_TYPES, self._value_type
+        is_add, is_min = combiner is operator.add, combiner is min
+        key_bytes, merged = 0, 0
+        try:
+            for k, v in batch:
+                if type(k) not in key_types:
+                    break
+                s = slots.get(k)
+                if s is None:
+                    if zero is not None:
+                        v = combiner(zero, v)
+                    if type(v) is not value_type:
+                        if value_type is not None or type(v) not in self.VALUE_TYPECODES:
+                            break
+                        # the first value decides the type of the array
+                        value_type = self._value_type = type(v)
+                        values = self._values = array.array(self.VALUE_TYPECODES[value_type])
+                    values.append(v)
+                    slots[k] = len(values) - 1
+                    key_bytes += sizeof(k)
+                elif type(v) is not value_type:
+                    break
+                elif is_add:
+                    values[s] += v
+                elif is_min:
+                    if v < values[s]:
+                        values[s] = v
+                elif v > values[s]:
+                    values[s] = v
+                merged += 1
+        except OverflowError:
+            # out of the range of 64 bits integers
+            pass
+        self._key_bytes += key_bytes
+        return merged
+
+    def _fallback(self, partitioned):
+        """Move the hash table into dicts and merge the rest as ExternalMerger"""
+        self.primitive = False
+        if partitioned:
+            # `pdata` is cached by the callers, so extend it in place
+            self.pdata.extend([{} for _ in range(self.partitions)])
+            for k, v in self._table_items():
+                self.pdata[self._partition(k)][k] = v
+        else:
+            self.data.update(self._table_items())
+        self._reset_table()
+
+    def _merge_primitive(self, iterator, create, limit, partitioned):
+        """Merge items into the hash table, return the unmerged rest if it falls back"""
+        limit_bytes = limit * (1 << 20)
+        iterator = iter(iterator)
+        while True:
+            batch = list(itertools.islice(iterator, int(self.batch)))
+            if not batch:
+                return None
+            merged = self._merge_batch(batch, create)
+            if merged < len(batch):
+                self._fallback(partitioned)
+                return itertools.chain(batch[merged:], iterator)
+            if limit and self._table_bytes() >= limit_bytes:
+                self._spill()
+
+    def mergeValues(self, iterator):
+        """Combine the items by creator and combiner"""
+        if self.primitive:
+            iterator = self._merge_primitive(iterator, True, self.memory_limit, self.spills > 0)
+            if iterator is None:
+                return
+        ExternalMerger.mergeValues(self, iterator)
+
+    def mergeCombiners(self, iterator, limit=None):
+        """Merge (K,V) pair by mergeCombiner"""
+        if limit is None:
+            limit = self.memory_limit
+        if self.primitive:
+            # no spill happens in the middle of merging the spilled partitions
+            partitioned = bool(limit) and self.spills > 0
+            iterator = self._merge_primitive(iterator, False, limit, partitioned)
+            if iterator is None:
+                return
+        ExternalMerger.mergeCombiners(self, iterator, limit)
+
+    def _spill(self):
+        """
+        dump the merged data into disks, as one chunk of keys and one
+        chunk of values per partition.
+        """
+        global MemoryBytesSpilled, DiskBytesSpilled
+        path = self._get_spill_dir(self.spills)
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        if self.primitive:
+            used_bytes = self._table_bytes()
+            typecode = self._values.typecode
+            chunks = [([], array.array(typecode)) for _ in range(self.partitions)]
+            for k, v in self._table_items():
+                keys, values = chunks[self._partition(k)]
+                keys.append(k)
+                values.append(v)
+            self._reset_table()
+        else:
+            used_bytes = 0
+            if self.pdata:
+                chunks = [(list(d.keys()), list(d.values())) for d in self.pdata]
+            else:
+                chunks = [([], []) for _ in range(self.partitions)]
+                for k, v in self.data.items():
+                    keys, values = chunks[self._partition(k)]
+                    keys.append(k)
+                    values.append(v)
+
+        for i, chunk in enumerate(chunks):
+            p = os.path.join(path, str(i))
+            with open(p, "wb") as f:
+                self.serializer.dump_stream([chunk], f)
+            DiskBytesSpilled += os.path.getsize(p)
+
+        if not self.primitive:
+            used_memory = get_used_memory()
+            self.data.clear()
+            for d in self.pdata:
+                d.clear()
+            if not self.pdata:
+                # `pdata` is cached by the callers, so extend it in place
+                self.pdata.extend([{} for _ in range(self.partitions)])
+            gc.collect()  # release the memory as much as possible
+            used_bytes = max(used_memory - get_used_memory(), 0) << 20
+
+        self.spills += 1
+        MemoryBytesSpilled += used_bytes
+
+    def _load_spill(self, f):
+        for keys, values in self.serializer.load_stream(f):
+            yield from zip(keys, values)
+
+    def items(self):
+        """Return all merged items as iterator"""
+        if self.primitive and not self.spills:
+            return self._table_items()
+        return ExternalMerger.items(self)
+
+    def _external_items(self):
+        if self.primitive and self._slots:
+            self._spill()
+        return ExternalMerger._external_items(self)
+
+    def _merged_items(self, index):
+        if not self.primitive:
+            return ExternalMerger._merged_items(self, index)
+
+        self._reset_table()
+        limit_bytes = self.memory_limit * (1 << 20)
+        for j in range(self.spills):
+            path = self._get_spill_dir(j)
+            p = os.path.join(path, str(index))
+            with open(p, "rb") as f:
+                for keys, values in self.serializer.load_stream(f):
+                    if self.primitive:
+                        merged = self._merge_batch(zip(keys, values), False)
+                        if merged == len(keys):
+                            continue
+                        self._fallback(False)
+                        keys, values = keys[merged:], values[merged:]
+                    ExternalMerger.mergeCombiners(self, zip(keys, values), 0)
+
+            # limit the total partitions
+            if (
+                self.primitive
+                and self.scale * self.partitions < self.MAX_TOTAL_PARTITIONS
+                and j < self.spills - 1
+                and self._table_bytes() > limit_bytes
+            ):
+                self._reset_table()  # will read from disk again
+                return self._recursive_merged_items(index)
+
+        if self.primitive:
+            return self._table_items()
+        return self.data.items()
+
+
+def _key_typecode(keys):
+    """
+    Return the typecode of an array which can hold all the sort keys without
+    changing them, or None if they should be kept as Python objects.
+
+    >>> _key_typecode([1, -2, 3])
+    'q'
+    >>> _key_typecode([1.5, 2.0])
+    'd'
+    >>> _key_typecode([1, 2.0]) is None
+    True
+    >>> _key_typecode([1 << 64]) is None
+    True
+    """
+    if not keys:
+        return None
+    tpe = type(keys[0])
+    if tpe is int:
+        typecode = "q"
+    elif tpe is float:
+        typecode = "d"
+    else:
+        return None
+    for k in keys:
+        if type(k) is not tpe:
+            return None
+    if tpe is int and (min(keys) < -(1 << 63) or max(keys) >= 1 << 63):
+        return None
+    return typecode
+
+
+class _SortedRun:
+    """
+    A sorted run of elements with their sort keys, either kept in memory or
+    spilled into a run file. The keys are None if the elements are sorted by
+    themselves.
+
+    A run file is a sequence of compressed blocks, each one holding the keys
+    and the elements of up to BLOCK_SIZE records separately, followed by a
+    small index with the offsets of the blocks and the offset of the index
+    itself. The keys of a block are written as the raw bytes of an array if
+    they are all 64-bit ints or floats.
+    """
+
+    BLOCK_SIZE = 1024
+
+    def __init__(self, keys=None, values=None, path=None):
+        self.keys = keys
+        self.values = values
+        self.path = path
+
+    def blocks(self, size):
+        """Split the sorted keys and values in memory into blocks of (keys, values)"""
+        for i in range(0, len(self.values), size):
+            keys = self.keys[i : i + size] if self.keys is not None else None
+            yield keys, self.values[i : i + size]
+
+    @classmethod
+    def write(cls, path, blocks, serializer):
+        """Write the sorted blocks of (keys, values) into a run file, return the run"""
+        offsets = []
+        with open(path, "wb") as f:
+            for keys, values in blocks:
+                offsets.append(f.tell())
+                typecode = _key_typecode(keys) if keys is not None else None
+                if typecode is not None:
+                    keys = array.array(typecode, keys).tobytes()
+                serializer._write_with_length((typecode, keys, values), f)
+            index = f.tell()
+            serializer._write_with_length(offsets, f)
+            f.write(struct.pack("!q", index))
+        return cls(path=path)
+
+    def size(self):
+        return os.path.getsize(self.path) if self.path is not None else 0
+
+    def items(self, serializer, keyed):
+        """
+        Return an iterator of the elements in the run, or of (key, element)
+        pairs if `keyed` is True.
+        """
+        if self.path is None:
+            return zip(self.keys, self.values) if keyed else iter(self.values)
+        blocks = self._read_blocks(serializer)
+        if keyed:
+            return itertools.chain.from_iterable(itertools.starmap(zip, blocks))
+        return itertools.chain.from_iterable(values for _, values in blocks)
+
+    def _read_blocks(self, serializer):
+        try:
+            with open(self.path, "rb", 65536) as f:
+                f.seek(-8, os.SEEK_END)
+                f.seek(struct.unpack("!q", f.read(8))[0])
+                for offset in serializer._read_with_length(f):
+                    f.seek(offset)
+                    typecode, keys, values = serializer._read_with_length(f)
+                    if typecode is not None:
+                        keys = array.array(typecode, keys).tolist()
+                    yield keys, values
+        finally:
+            os.unlink(self.path)
+
+
+def _group_blocks(items, keyed, size):
+    """Group sorted elements or (key, element) pairs into blocks of (keys, values)"""
+    while True:
+        block = list(itertools.islice(items, size))
+        if not block:
+            return
+        if keyed:
+            keys, values = zip(*block)
+            yield keys, values
+        else:
+            yield None, block
+
+
+def _merge_keyed(iterators, reverse, with_keys=False):
+    """
+    Merge iterators of sorted (key, element) pairs, return an iterator of the
+    elements, or of (key, element) pairs if `with_keys` is True. The elements
+    with equal keys keep the order of the iterators.
+
+    The merge compares the keys computed when the runs were sorted, so the key
+    function is not called again.
+
+    >>> its = [iter([(1, "a"), (3, "c")]), iter([(2, "b"), (3, "d")])]
+    >>> list(_merge_keyed(its, False))
+    ['a', 'b', 'c', 'd']
+    >>> its = [iter([(3, "c"), (1, "a")]), iter([(3, "d"), (2, "b")])]
+    >>> list(_merge_keyed(its, True))
+    ['c', 'd', 'b', 'a']
+    """
+    merged = heapq.merge(*iterators, key=operator.itemgetter(0), reverse=reverse)
+    if with_keys:
+        return merged
+    return map(operator.itemgetter(1), merged)
+
+
 class ExternalSorter:
     """
     ExternalSorter will divide the elements into chunks, sort them in
@@ -448,6 +889,15 @@ class ExternalSorter:
     The spilling will only happen when the used memory goes above
     the limit.
 
+    The sort keys are computed when a chunk is sorted and kept together with
+    the elements, so the merge does not call the key function. The sorted
+    chunks are spilled as compact run files of compressed blocks, where int
+    and float keys are stored as raw binary arrays, and merged back by a k-way
+    merge which reads one block of each run at a time and opens at most
+    `fan_in` run files at the same time, merging them in multiple passes if
+    needed. The runs are always written with a compressed pickle serializer,
+    since the blocks hold the keys and the elements separately.
+
     Examples
     --------
     >>> sorter = ExternalSorter(1)  # 1M
@@ -460,10 +910,15 @@ class ExternalSorter:
     True
     """
 
-    def __init__(self, memory_limit, serializer=None):
+    def __init__(self, memory_limit, fan_in=64):
+        if fan_in < 2:
+            raise ValueError("fan_in should be at least 2, got %d" % fan_in)
         self.memory_limit = memory_limit
         self.local_dirs = _get_local_dirs("sort")
-        self.serializer = _compressed_serializer(serializer)
+        # runs are always written as blocks of pickled keys and values
+        self.serializer = CompressedSerializer(CPickleSerializer())
+        self.fan_in = fan_in
+        self._runs = 0
 
     def _get_path(self, n):
         """Choose one directory for spill by number n"""
@@ -480,6 +935,35 @@ class ExternalSorter:
         """
         return max(self.memory_limit, get_used_memory() * 1.05)
 
+    def _sort_chunk(self, chunk, key, reverse):
+        """
+        Sort the chunk in memory, return a run with the sorted elements and
+        their keys, which are kept so the merge does not call the key function.
+        """
+        if key is None:
+            chunk.sort(reverse=reverse)
+            return _SortedRun(None, chunk)
+        # compute every key once, and sort the positions of the elements by them
+        keys = list(map(key, chunk))
+        order = sorted(range(len(chunk)), key=keys.__getitem__, reverse=reverse)
+        return _SortedRun([keys[i] for i in order], [chunk[i] for i in order])
+
+    def _spill_run(self, blocks):
+        """Dump sorted blocks of (keys, values) into a new run file"""
+        path = self._get_path(self._runs)
+        self._runs += 1
+        return _SortedRun.write(path, blocks, self.serializer)
+
+    def _merge_runs(self, runs, keyed, reverse, with_keys=False):
+        """
+        Merge the sorted runs into an iterator of elements, or of (key, element)
+        pairs if `keyed` and `with_keys` are True.
+        """
+        items = [run.items(self.serializer, keyed) for run in runs]
+        if keyed:
+            return _merge_keyed(items, reverse, with_keys)
+        return heapq.merge(*items, reverse=reverse)
+
     def sorted(self, iterator, key=None, reverse=False):
         """
         Sort the elements in iterator, do external sort when the memory
@@ -487,7 +971,8 @@ class ExternalSorter:
         """
         global MemoryBytesSpilled, DiskBytesSpilled
         batch, limit = 100, self._next_limit()
-        chunks, current_chunk = [], []
+        keyed = key is not None
+        runs, current_chunk = [], []
         iterator = iter(iterator)
         while True:
             # pick elements in batch
@@ -498,36 +983,40 @@ class ExternalSorter:
 
             used_memory = get_used_memory()
             if used_memory > limit:
-                # sort them inplace will save memory
-                current_chunk.sort(key=key, reverse=reverse)
-                path = self._get_path(len(chunks))
-                with open(path, "wb") as f:
-                    self.serializer.dump_stream(current_chunk, f)
-
-                def load(f):
-                    for v in self.serializer.load_stream(f):
-                        yield v
-                    # close the file explicit once we consume all the items
-                    # to avoid ResourceWarning in Python3
-                    f.close()
-
-                chunks.append(load(open(path, "rb")))
+                run = self._sort_chunk(current_chunk, key, reverse)
                 current_chunk = []
+                run = self._spill_run(run.blocks(_SortedRun.BLOCK_SIZE))
+                runs.append(run)
                 MemoryBytesSpilled += max(used_memory - get_used_memory(), 0) << 20
-                DiskBytesSpilled += os.path.getsize(path)
-                os.unlink(path)  # data will be deleted after close
+                DiskBytesSpilled += run.size()
 
-            elif not chunks:
+            elif not runs:
                 batch = min(int(batch * 1.5), 10000)
 
-        current_chunk.sort(key=key, reverse=reverse)
-        if not chunks:
+        if not runs:
+            current_chunk.sort(key=key, reverse=reverse)
             return current_chunk
 
         if current_chunk:
-            chunks.append(iter(current_chunk))
-
-        return heapq.merge(*chunks, key=key, reverse=reverse)
+            runs.append(self._sort_chunk(current_chunk, key, reverse))
+            current_chunk = []
+
+        # merge every `fan_in` adjacent runs into a bigger one, until all the runs
+        # can be merged at once, keep the order of the runs to have a stable sort
+        while len(runs) > self.fan_in:
+            merged_runs = []
+            for i in range(0, len(runs), self.fan_in):
+                group = runs[i : i + self.fan_in]
+                if len(group) == 1:
+                    merged_runs.append(group[0])
+                    continue
+                merged = self._merge_runs(group, keyed, reverse, with_keys=True)
+                run = self._spill_run(_group_blocks(merged, keyed, _SortedRun.BLOCK_SIZE))
+                merged_runs.append(run)
+                DiskBytesSpilled += run.size()
+            runs = merged_runs
+
+        return self._merge_runs(runs, keyed, reverse)
 
 
 class ExternalList:
@@ -838,10 +1327,7 @@ class ExternalGroupBy(ExternalMerger):
             sorted_items = heapq.merge(*disk_items, key=operator.itemgetter(0))
 
         else:
-            # Flatten the combined values, so it will not consume huge
-            # memory during merging sort.
-            ser = self.flattened_serializer()
-            sorter = ExternalSorter(self.memory_limit, ser)
+            sorter = ExternalSorter(self.memory_limit)
             sorted_items = sorter.sorted(itertools.chain(*disk_items), key=operator.itemgetter(0))
         return ((k, vs) for k, vs in GroupByKey(sorted_items))
 
@@ -64,6 +64,7 @@ from pyspark.sql.streaming import DataStreamWriter
 from pyspark.sql.types import (
     StructType,
     Row,
+    _create_row,
     _parse_datatype_json_string,
 )
 from pyspark.sql.dataframe import (
@@ -170,6 +171,37 @@ class DataFrame(ParentDataFrame, PandasMapOpsMixin, PandasConversionMixin):
             )
         return self._lazy_rdd
 
+    def toArrowRDD(self, asRows: bool = False) -> "RDD[Any]":
+        from pyspark.core.rdd import RDD
+        from pyspark.sql.pandas.serializers import ArrowRDDSerializer
+        from pyspark.sql.pandas.utils import require_minimum_pyarrow_version
+
+        require_minimum_pyarrow_version()
+
+        jrdd = self._jdf.toArrowBatchRddToPython()
+        rdd = RDD(jrdd, self.sparkSession._sc, ArrowRDDSerializer())
+        if not asRows:
+            return rdd
+
+        schema = self.schema
+
+        def batches_to_rows(iterator: Iterable["pa.RecordBatch"]) -> Iterable[Row]:
+            from pyspark.sql.conversion import ArrowTableToRowsConversion
+
+            converters = [
+                ArrowTableToRowsConversion._create_converter(f.dataType) for f in schema.fields
+            ]
+            fields = schema.fieldNames()
+            for batch in iterator:
+                # Rows are only materialized while the partition is consumed, one batch
+                # at a time, so a partition is never held as Python objects as a whole.
+                columns = [column.to_pylist() for column in batch.columns]
+                for row in range(batch.num_rows):
+                    values = [converters[col](columns[col][row]) for col in range(len(columns))]
+                    yield _create_row(fields=fields, values=values)
+
+        return rdd.mapPartitions(batches_to_rows, preservesPartitioning=True)
+
     @property
     def na(self) -> ParentDataFrameNaFunctions:
         return DataFrameNaFunctions(self)
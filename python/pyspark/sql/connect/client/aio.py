@@ -0,0 +1,405 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from pyspark.sql.connect.utils import check_dependencies
+
+check_dependencies(__name__)
+
+import asyncio
+import logging
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    TYPE_CHECKING,
+)
+
+import grpc
+import pandas as pd
+import pyarrow as pa
+
+import pyspark.sql.connect.proto as pb2
+import pyspark.sql.connect.proto.base_pb2_grpc as grpc_lib
+from pyspark.errors.exceptions.connect import SparkConnectException
+from pyspark.sql.connect.client.artifact import Artifact
+from pyspark.sql.connect.client.core import AnalyzeResult, ConfigResult, PlanObservedMetrics
+from pyspark.sql.connect.client.reattach import AsyncExecutePlanResponseReattachableIterator
+from pyspark.sql.connect.client.retries import AsyncRetrying
+from pyspark.sql.connect.client.telemetry import timed_sleep
+from pyspark.sql.connect.logging import logger
+from pyspark.sql.connect.observation import Observation
+from pyspark.sql.metrics import ExecutionInfo, PlanMetrics
+from pyspark.sql.pandas.types import from_arrow_schema
+from pyspark.sql.types import StructType, TimestampType, _has_type
+
+if TYPE_CHECKING:
+    from pyspark.sql.connect.client.core import SparkConnectClient
+
+
+class AsyncSparkConnectClient:
+    """
+    Client of Spark Connect for asyncio, which sends the requests of the session of a
+    :class:`SparkConnectClient` over a `grpc.aio` channel.
+
+    Many plans can be executed concurrently on one event loop without a thread for each of them.
+    The client supports executing plans, analyzing their schemas, getting configurations,
+    interrupting operations and adding artifacts. Everything else is done with the
+    synchronous client, which also keeps the state of the session, e.g. the tags.
+
+    A `grpc.aio` channel is bound to the event loop it was created in, so a new channel is
+    created whenever the client is used in another event loop.
+
+    .. versionadded:: 4.0.0
+    """
+
+    def __init__(self, client: "SparkConnectClient"):
+        self._client = client
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._stub_instance: Optional[grpc_lib.SparkConnectServiceStub] = None
+
+    @property
+    def _stub(self) -> grpc_lib.SparkConnectServiceStub:
+        loop = asyncio.get_running_loop()
+        if self._stub_instance is None or self._loop is not loop:
+            self._close_channel()
+            self._loop = loop
+            self._channel = self._client._builder.toAsyncChannel()
+            self._stub_instance = grpc_lib.SparkConnectServiceStub(self._channel)
+        return self._stub_instance
+
+    def _retrying(self) -> AsyncRetrying:
+        return AsyncRetrying(
+            self._client._retry_policies, sleep=timed_sleep(self._client._telemetry, asyncio.sleep)
+        )
+
+    async def close(self) -> None:
+        """
+        Close the channel.
+        """
+        if self._channel is not None and self._loop is asyncio.get_running_loop():
+            await self._channel.close()
+        self._close_channel()
+
+    def _close_channel(self) -> None:
+        """
+        Close the channel in the event loop it was created in, without waiting for it.
+        """
+        channel, loop = self._channel, self._loop
+        self._loop = None
+        self._channel = None
+        self._stub_instance = None
+        # The channel of a closed event loop cannot be closed anymore, and is released once it
+        # is garbage collected.
+        if channel is not None and loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(channel.close(), loop)
+
+    async def _handle_error(self, error: Exception) -> NoReturn:
+        if isinstance(error, grpc.RpcError):
+            # Fetching the details of the error from the server blocks, so it is done in a thread.
+            await asyncio.to_thread(self._client._handle_error, error)
+        self._client._handle_error(error)
+
+    async def to_table_as_iterator(
+        self, plan: pb2.Plan, observations: Dict[str, Observation]
+    ) -> AsyncGenerator[Union[StructType, "pa.Table"], None]:
+        """
+        Return given plan as an asynchronous iterator of PyArrow Tables.
+        """
+        req = self._client._execute_plan_request_with_metadata()
+        req.plan.CopyFrom(plan)
+        responses = self._execute_and_fetch_as_iterator(req, observations)
+        try:
+            async for response in responses:
+                if isinstance(response, StructType):
+                    yield response
+                elif isinstance(response, pa.RecordBatch):
+                    yield pa.Table.from_batches([response])
+        finally:
+            # Release the execution right away if the caller stops iterating early.
+            await responses.aclose()
+
+    async def to_table(
+        self, plan: pb2.Plan, observations: Dict[str, Observation]
+    ) -> Tuple["pa.Table", Optional[StructType], ExecutionInfo]:
+        """
+        Return given plan as a PyArrow Table.
+        """
+        req = self._client._execute_plan_request_with_metadata()
+        req.plan.CopyFrom(plan)
+        table, schema, metrics, observed_metrics = await self._execute_and_fetch_table(
+            req, observations
+        )
+        return table, schema, ExecutionInfo(metrics, observed_metrics)
+
+    async def to_pandas(
+        self, plan: pb2.Plan, observations: Dict[str, Observation]
+    ) -> Tuple["pd.DataFrame", ExecutionInfo]:
+        """
+        Return given plan as a pandas DataFrame.
+        """
+        req = self._client._execute_plan_request_with_metadata()
+        req.plan.CopyFrom(plan)
+        (self_destruct_conf,) = await self.get_config_with_defaults(
+            ("spark.sql.execution.arrow.pyspark.selfDestruct.enabled", "false"),
+        )
+        self_destruct = cast(str, self_destruct_conf).lower() == "true"
+        table, schema, metrics, observed_metrics = await self._execute_and_fetch_table(
+            req, observations, self_destruct=self_destruct
+        )
+        ei = ExecutionInfo(metrics, observed_metrics)
+
+        schema = schema or from_arrow_schema(table.schema, prefer_timestamp_ntz=True)
+        assert schema is not None and isinstance(schema, StructType)
+
+        timezone: Optional[str] = None
+        if any(_has_type(f.dataType, TimestampType) for f in schema.fields):
+            (timezone,) = await self.get_configs("spark.sql.session.timeZone")
+
+        struct_in_pandas: Optional[str] = None
+        if any(_has_type(f.dataType, StructType) for f in schema.fields):
+            (struct_in_pandas,) = await self.get_config_with_defaults(
+                ("spark.sql.execution.pandas.structHandlingMode", "legacy"),
+            )
+
+        pdf = self._client._table_to_pandas(
+            table, schema, self_destruct, timezone, struct_in_pandas
+        )
+
+        if len(metrics) > 0:
+            pdf.attrs["metrics"] = metrics
+        if len(observed_metrics) > 0:
+            pdf.attrs["observed_metrics"] = observed_metrics
+        return pdf, ei
+
+    async def schema(self, plan: pb2.Plan) -> StructType:
+        """
+        Return schema for given plan.
+        """
+        key = self._client._plan_cache_key(plan)
+        plan_cache = self._client._plan_cache
+        if key is not None and plan_cache is not None:
+            cached = plan_cache.get_schema(key)
+            if cached is not None:
+                return cached
+        schema = (await self._analyze(method="schema", plan=plan)).schema
+        assert schema is not None
+        # Server side should populate the struct field which is the schema.
+        assert isinstance(schema, StructType)
+        if key is not None and plan_cache is not None:
+            plan_cache.put_schema(key, schema)
+        return schema
+
+    async def _analyze(self, method: str, **kwargs: Any) -> AnalyzeResult:
+        """
+        Call the analyze RPC of Spark Connect.
+        """
+        req = self._client._analyze_request(method, **kwargs)
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    resp = await self._stub.AnalyzePlan(
+                        req, metadata=self._client._builder.metadata()
+                    )
+                    self._client._verify_response_integrity(resp)
+                    return AnalyzeResult.fromProto(resp)
+            raise SparkConnectException("Invalid state during retry exception handling.")
+        except Exception as error:
+            await self._handle_error(error)
+
+    async def _execute_and_fetch_table(
+        self,
+        req: pb2.ExecutePlanRequest,
+        observations: Dict[str, Observation],
+        self_destruct: bool = False,
+    ) -> Tuple["pa.Table", Optional[StructType], List[PlanMetrics], List[PlanObservedMetrics]]:
+        """
+        Execute the plan of `req` and fetch its result as a table, or return the result from the
+        plan cache of the synchronous client if it is enabled.
+        """
+        plan_cache = self._client._plan_cache
+        key = None if self_destruct else self._client._plan_cache_key(req.plan, observations)
+        if key is not None and plan_cache is not None:
+            cached = plan_cache.get_result(key)
+            if cached is not None:
+                logger.debug("Returning the cached result of the plan.")
+                return cached[0], cached[1], [], []
+
+        table, schema, metrics, observed_metrics, _ = self._client._collect_fetched_results(
+            [response async for response in self._execute_and_fetch_as_iterator(req, observations)],
+            self_destruct=self_destruct,
+        )
+        assert table is not None
+        if key is not None and plan_cache is not None:
+            plan_cache.put_result(key, table, schema)
+        return table, schema, metrics, observed_metrics
+
+    async def _execute_and_fetch_as_iterator(
+        self,
+        req: pb2.ExecutePlanRequest,
+        observations: Dict[str, Observation],
+    ) -> AsyncGenerator[
+        Union[
+            "pa.RecordBatch",
+            StructType,
+            PlanMetrics,
+            PlanObservedMetrics,
+            Dict[str, Any],
+        ],
+        None,
+    ]:
+        self._client._optimize_plan(req)
+        if logger.isEnabledFor(logging.DEBUG):
+            # inside an if statement to not incur a performance cost converting proto to string
+            # when not at debug log level.
+            logger.debug(
+                "AsyncExecuteAndFetchAsIterator. "
+                + f"Request: {self._client._proto_to_string(req, True)}"
+            )
+
+        num_records = 0
+        metadata = self._client._builder.metadata()
+        generator: Optional[AsyncExecutePlanResponseReattachableIterator] = None
+        try:
+            if self._client._use_reattachable_execute:
+                # Don't use retryHandler - own retry handling is inside.
+                generator = AsyncExecutePlanResponseReattachableIterator(
+                    req, self._stub, self._retrying, metadata
+                )
+                async for b in generator:
+                    for result in self._client._handle_execute_plan_response(
+                        b, observations, None, num_records
+                    ):
+                        if isinstance(result, pa.RecordBatch):
+                            num_records += result.num_rows
+                        yield result
+            else:
+                async for attempt in self._retrying():
+                    with attempt:
+                        async for b in self._stub.ExecutePlan(req, metadata=metadata):
+                            for result in self._client._handle_execute_plan_response(
+                                b, observations, None, num_records
+                            ):
+                                if isinstance(result, pa.RecordBatch):
+                                    num_records += result.num_rows
+                                yield result
+        except asyncio.CancelledError:
+            logger.debug(f"Cancelled operation={req.operation_id}, interrupting it")
+            try:
+                await self.interrupt_operation(req.operation_id)
+            except Exception as e:
+                logger.warning(f"Failed to interrupt operation={req.operation_id}: {e}")
+            raise
+        except Exception as error:
+            await self._handle_error(error)
+        finally:
+            if generator is not None:
+                # Release the execution if not all of its results were fetched, e.g. the caller
+                # stopped iterating or was cancelled.
+                await generator.aclose()
+
+    async def get_configs(self, *keys: str) -> Tuple[Optional[str], ...]:
+        op = pb2.ConfigRequest.Operation(get=pb2.ConfigRequest.Get(keys=keys))
+        configs = dict((await self.config(op)).pairs)
+        return tuple(configs.get(key) for key in keys)
+
+    async def get_config_with_defaults(
+        self, *pairs: Tuple[str, Optional[str]]
+    ) -> Tuple[Optional[str], ...]:
+        op = pb2.ConfigRequest.Operation(
+            get_with_default=pb2.ConfigRequest.GetWithDefault(
+                pairs=[pb2.KeyValue(key=key, value=default) for key, default in pairs]
+            )
+        )
+        configs = dict((await self.config(op)).pairs)
+        return tuple(configs.get(key) for key, _ in pairs)
+
+    async def config(self, operation: pb2.ConfigRequest.Operation) -> ConfigResult:
+        """
+        Call the config RPC of Spark Connect.
+        """
+        req = self._client._config_request_with_metadata()
+        req.operation.CopyFrom(operation)
+        if operation.WhichOneof("op_type") in ("set", "unset"):
+            # The configurations may change the schemas and the results of the plans.
+            self._client._invalidate_plan_cache()
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    resp = await self._stub.Config(req, metadata=self._client._builder.metadata())
+                    self._client._verify_response_integrity(resp)
+                    return ConfigResult.fromProto(resp)
+            raise SparkConnectException("Invalid state during retry exception handling.")
+        except Exception as error:
+            await self._handle_error(error)
+
+    async def interrupt_operation(self, op_id: str) -> Optional[List[str]]:
+        req = self._client._interrupt_request("operation", op_id)
+        try:
+            async for attempt in self._retrying():
+                with attempt:
+                    resp = await self._stub.Interrupt(
+                        req, metadata=self._client._builder.metadata()
+                    )
+                    self._client._verify_response_integrity(resp)
+                    return list(resp.interrupted_ids)
+            raise SparkConnectException("Invalid state during retry exception handling.")
+        except Exception as error:
+            await self._handle_error(error)
+
+    async def add_artifacts(self, *paths: str, pyfile: bool, archive: bool, file: bool) -> None:
+        """
+        Add the artifacts to the session, see :meth:`SparkConnectClient.add_artifacts`.
+
+        The local files are read in a thread, one chunk at a time, while the chunks are sent.
+        The groups of artifacts are sent concurrently, up to `max_parallel_uploads` at a time.
+        """
+        manager = self._client._artifact_manager
+        artifacts = manager._parse_all_artifacts(*paths, pyfile=pyfile, archive=archive, file=file)
+        uploads = asyncio.Semaphore(max(manager.max_parallel_uploads, 1))
+
+        async def add_group(group: List[Artifact]) -> None:
+            requests = manager._add_artifacts(group)
+
+            async def read_requests() -> AsyncIterator[pb2.AddArtifactsRequest]:
+                while True:
+                    request = await asyncio.to_thread(next, requests, None)
+                    if request is None:
+                        return
+                    yield request
+
+            async with uploads:
+                await self._stub.AddArtifacts(
+                    read_requests(), metadata=self._client._builder.metadata()
+                )
+            manager._mark_added(group)
+
+        try:
+            # The artifacts which were added before a retried failure are not sent again.
+            async for attempt in self._retrying():
+                with attempt:
+                    # Checking whether the artifacts were added may hash local files.
+                    groups = await asyncio.to_thread(manager._pending_artifact_groups, artifacts)
+                    await asyncio.gather(*(add_group(group) for group in groups))
+        except Exception as error:
+            await self._handle_error(error)
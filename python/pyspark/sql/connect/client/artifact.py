@@ -25,9 +25,11 @@ import importlib
 import io
 import sys
 import os
+import threading
 import zlib
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
-from typing import List, Iterable, BinaryIO, Iterator, Optional, Tuple
+from typing import Dict, List, Iterable, BinaryIO, Iterator, Optional, Tuple
 import abc
 from pathlib import Path
 from urllib.parse import urlparse
@@ -47,6 +49,12 @@ FILE_PREFIX: str = "files"
 FORWARD_TO_FS_PREFIX: str = "forward_to_fs"
 CACHE_PREFIX: str = "cache"
 
+# SHA-256 hashes of the contents of local files, keyed by their path, size and modification time.
+# This is shared by all the sessions of this process, so that the unchanged files are not read
+# again to find out whether they have already been uploaded.
+_file_hashes: Dict[Tuple[str, int, int], str] = {}
+_file_hashes_lock = threading.Lock()
+
 
 class LocalData(metaclass=abc.ABCMeta):
     """
@@ -85,6 +93,10 @@ class LocalFile(LocalData):
     def stream(self) -> BinaryIO:
         return open(self.path, "rb")
 
+    def _manifest_key(self) -> Tuple[str, int, int]:
+        stat = os.stat(self.path)
+        return (self.path, stat.st_size, stat.st_mtime_ns)
+
 
 class InMemory(LocalData):
     """
@@ -118,6 +130,47 @@ class Artifact:
                 messageParameters={"operation": f"{self.storage} storage"},
             )
 
+    def content_hash(self) -> str:
+        """
+        Return the SHA-256 hash of the content of the artifact in hex.
+
+        The hashes of local files are remembered until the files are modified.
+        """
+        if isinstance(self.storage, InMemory):
+            return hashlib.sha256(self.storage.blob).hexdigest()
+        key = None
+        if isinstance(self.storage, LocalFile):
+            key = self.storage._manifest_key()
+            with _file_hashes_lock:
+                if key in _file_hashes:
+                    return _file_hashes[key]
+        digest = hashlib.sha256()
+        with self.storage.stream() as stream:
+            for chunk in iter(lambda: stream.read(ArtifactManager.CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return self._remember_hash(key, digest.hexdigest())
+
+    def _read_chunks(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Read the content of the artifact in chunks of `chunk_size` bytes, remembering the hash
+        of local files on the way so that :meth:`content_hash` does not need to read them again.
+        """
+        key = self.storage._manifest_key() if isinstance(self.storage, LocalFile) else None
+        digest = hashlib.sha256()
+        with self.storage.stream() as stream:
+            for chunk in iter(lambda: stream.read(chunk_size), b""):
+                digest.update(chunk)
+                yield chunk
+        self._remember_hash(key, digest.hexdigest())
+
+    def _remember_hash(self, key: Optional[Tuple[str, int, int]], hash: str) -> str:
+        # The hash is not remembered if the file was modified while it was read.
+        if key is not None and isinstance(self.storage, LocalFile):
+            if self.storage._manifest_key() == key:
+                with _file_hashes_lock:
+                    _file_hashes[key] = hash
+        return hash
+
 
 def new_jar_artifact(file_name: str, storage: LocalData) -> Artifact:
     return _new_artifact(JAR_PREFIX, ".jar", file_name, storage)
@@ -161,6 +214,12 @@ class ArtifactManager:
         An unique identifier of the session which the artifact manager belongs to.
     channel: grpc.Channel
         GRPC Channel instance.
+    chunk_size: int, optional
+        Size in bytes of the chunks the artifacts are sent in. Artifacts up to this size are
+        batched together into a single request.
+    max_parallel_uploads: int, optional
+        Number of requests adding artifacts to send in parallel. Every artifact larger than
+        `chunk_size` is sent in its own request.
     """
 
     # Using the midpoint recommendation of 32KiB for chunk size as specified in
@@ -173,6 +232,8 @@ class ArtifactManager:
         session_id: str,
         channel: grpc.Channel,
         metadata: Iterable[Tuple[str, str]],
+        chunk_size: int = CHUNK_SIZE,
+        max_parallel_uploads: int = 1,
     ):
         self._user_context = proto.UserContext()
         if user_id is not None:
@@ -180,6 +241,11 @@ class ArtifactManager:
         self._stub = grpc_lib.SparkConnectServiceStub(channel)
         self._session_id = session_id
         self._metadata = metadata
+        self.chunk_size = chunk_size
+        self.max_parallel_uploads = max_parallel_uploads
+        # Content hashes of the artifacts added to the session, keyed by their names.
+        self._added: Dict[str, str] = {}
+        self._added_lock = threading.Lock()
 
     def _parse_artifacts(
         self, path_or_uri: str, pyfile: bool, archive: bool, file: bool
@@ -294,14 +360,68 @@ class ArtifactManager:
 
     def add_artifacts(self, *path: str, pyfile: bool, archive: bool, file: bool) -> None:
         """
-        Add a single artifact to the session.
-        Currently only local files with .jar extension is supported.
+        Add the artifacts to the session.
+
+        Artifacts which have already been added to the session with the same content are
+        skipped, so that calling this again after a failure only sends the artifacts which
+        have not been added yet. The artifacts larger than `chunk_size` are sent in requests of
+        their own, up to `max_parallel_uploads` requests at a time.
         """
-        requests: Iterator[proto.AddArtifactsRequest] = self._create_requests(
-            *path, pyfile=pyfile, archive=archive, file=file
+        groups = self._pending_artifact_groups(
+            self._parse_all_artifacts(*path, pyfile=pyfile, archive=archive, file=file)
         )
 
-        self._request_add_artifacts(requests)
+        if self.max_parallel_uploads > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_parallel_uploads, len(groups)),
+                thread_name_prefix="spark-connect-artifacts",
+            ) as pool:
+                futures = [pool.submit(self._add_artifact_group, group) for group in groups]
+                for future in futures:
+                    future.result()
+        else:
+            for group in groups:
+                self._add_artifact_group(group)
+
+    def _parse_all_artifacts(
+        self, *path: str, pyfile: bool, archive: bool, file: bool
+    ) -> List[Artifact]:
+        return list(
+            chain(
+                *(self._parse_artifacts(p, pyfile=pyfile, archive=archive, file=file) for p in path)
+            )
+        )
+
+    def _pending_artifact_groups(self, artifacts: List[Artifact]) -> List[List[Artifact]]:
+        """
+        Return the artifacts which have not been added to the session yet, grouped into the
+        artifacts to send together in one request: all the small artifacts, and every artifact
+        larger than `chunk_size` on its own.
+        """
+        pending = [artifact for artifact in artifacts if not self._is_added(artifact)]
+
+        small = [artifact for artifact in pending if artifact.size <= self.chunk_size]
+        groups = [[artifact] for artifact in pending if artifact.size > self.chunk_size]
+        if len(small) > 0:
+            groups.insert(0, small)
+        return groups
+
+    def _is_added(self, artifact: Artifact) -> bool:
+        with self._added_lock:
+            added_hash = self._added.get(artifact.path)
+        # Only hash the artifacts which may have been added already.
+        return added_hash is not None and added_hash == artifact.content_hash()
+
+    def _add_artifact_group(self, artifacts: List[Artifact]) -> None:
+        self._request_add_artifacts(self._add_artifacts(artifacts))
+        self._mark_added(artifacts)
+
+    def _mark_added(self, artifacts: List[Artifact]) -> None:
+        # The hashes were remembered while the artifacts were read, so they are not read again.
+        hashes = [artifact.content_hash() for artifact in artifacts]
+        with self._added_lock:
+            for artifact, hash in zip(artifacts, hashes):
+                self._added[artifact.path] = hash
 
     def _add_forward_to_fs_artifacts(self, local_path: str, dest_path: str) -> None:
         requests: Iterator[proto.AddArtifactsRequest] = self._add_artifacts(
@@ -335,14 +455,14 @@ class ArtifactManager:
         for artifact in artifacts:
             data = artifact.storage
             size = data.size
-            if size > ArtifactManager.CHUNK_SIZE:
+            if size > self.chunk_size:
                 # Payload can either be a batch OR a single chunked artifact.
                 # Write batch if non-empty before chunking current artifact.
                 if len(current_batch) > 0:
                     yield from write_batch()
                 yield from self._add_chunked_artifact(artifact)
             else:
-                if current_batch_size + size > ArtifactManager.CHUNK_SIZE:
+                if current_batch_size + size > self.chunk_size:
                     yield from write_batch()
                 add_to_batch(artifact, size)
 
@@ -359,8 +479,7 @@ class ArtifactManager:
         artifact_chunks = []
 
         for artifact in artifacts:
-            with artifact.storage.stream() as stream:
-                binary = stream.read()
+            binary = b"".join(artifact._read_chunks(self.chunk_size))
             crc32 = zlib.crc32(binary)
             data = proto.AddArtifactsRequest.ArtifactChunk(data=binary, crc=crc32)
             artifact_chunks.append(
@@ -381,37 +500,34 @@ class ArtifactManager:
         """
         initial_batch = True
         # Integer division that rounds up to the nearest whole number.
-        get_num_chunks = int(
-            (artifact.size + (ArtifactManager.CHUNK_SIZE - 1)) / ArtifactManager.CHUNK_SIZE
-        )
+        get_num_chunks = int((artifact.size + (self.chunk_size - 1)) / self.chunk_size)
 
         # Consume stream in chunks until there is no data left to read.
-        with artifact.storage.stream() as stream:
-            for chunk in iter(lambda: stream.read(ArtifactManager.CHUNK_SIZE), b""):
-                if initial_batch:
-                    # First RPC contains the `BeginChunkedArtifact` payload (`begin_chunk`).
-                    yield proto.AddArtifactsRequest(
-                        session_id=self._session_id,
-                        user_context=self._user_context,
-                        begin_chunk=proto.AddArtifactsRequest.BeginChunkedArtifact(
-                            name=artifact.path,
-                            total_bytes=artifact.size,
-                            num_chunks=get_num_chunks,
-                            initial_chunk=proto.AddArtifactsRequest.ArtifactChunk(
-                                data=chunk, crc=zlib.crc32(chunk)
-                            ),
-                        ),
-                    )
-                    initial_batch = False
-                else:
-                    # Subsequent RPCs contains the `ArtifactChunk` payload (`chunk`).
-                    yield proto.AddArtifactsRequest(
-                        session_id=self._session_id,
-                        user_context=self._user_context,
-                        chunk=proto.AddArtifactsRequest.ArtifactChunk(
+        for chunk in artifact._read_chunks(self.chunk_size):
+            if initial_batch:
+                # First RPC contains the `BeginChunkedArtifact` payload (`begin_chunk`).
+                yield proto.AddArtifactsRequest(
+                    session_id=self._session_id,
+                    user_context=self._user_context,
+                    begin_chunk=proto.AddArtifactsRequest.BeginChunkedArtifact(
+                        name=artifact.path,
+                        total_bytes=artifact.size,
+                        num_chunks=get_num_chunks,
+                        initial_chunk=proto.AddArtifactsRequest.ArtifactChunk(
                             data=chunk, crc=zlib.crc32(chunk)
                         ),
-                    )
+                    ),
+                )
+                initial_batch = False
+            else:
+                # Subsequent RPCs contains the `ArtifactChunk` payload (`chunk`).
+                yield proto.AddArtifactsRequest(
+                    session_id=self._session_id,
+                    user_context=self._user_context,
+                    chunk=proto.AddArtifactsRequest.ArtifactChunk(
+                        data=chunk, crc=zlib.crc32(chunk)
+                    ),
+                )
 
     def is_cached_artifact(self, hash: str) -> bool:
         """
@@ -27,6 +27,7 @@ check_dependencies(__name__)
 import logging
 import threading
 import os
+import time
 import copy
 import platform
 import urllib.parse
@@ -68,6 +69,18 @@ from pyspark.sql.metrics import MetricValue, PlanMetrics, ExecutionInfo, Observe
 from pyspark.sql.connect.client.artifact import ArtifactManager
 from pyspark.sql.connect.logging import logger
 from pyspark.sql.connect.profiler import ConnectProfilerCollector
+from pyspark.sql.connect.client.plan_cache import PlanCache, plan_fingerprint
+from pyspark.sql.connect.client.plan_optimizer import optimize_plan, plan_string
+from pyspark.sql.connect.client.telemetry import (
+    ARROW_BATCH_BYTES,
+    ARROW_DECODE_SECONDS,
+    PANDAS_CONVERSION_SECONDS,
+    HistogramSink,
+    TelemetrySink,
+    TelemetryStub,
+    timed_sleep,
+)
+from pyspark.sql.connect.client.prefetch import prefetch
 from pyspark.sql.connect.client.reattach import ExecutePlanResponseReattachableIterator
 from pyspark.sql.connect.client.retries import RetryPolicy, Retrying, DefaultPolicy
 from pyspark.sql.connect.conversion import (
@@ -107,6 +120,7 @@ from pyspark.sql.connect.shell.progress import Progress, ProgressHandler, from_p
 if TYPE_CHECKING:
     from google.rpc.error_details_pb2 import ErrorInfo
     from pyspark.sql.connect._typing import DataTypeOrString
+    from pyspark.sql.connect.client.aio import AsyncSparkConnectClient
     from pyspark.sql.datasource import DataSource
 
 
@@ -183,6 +197,16 @@ class ChannelBuilder:
         """
         raise PySparkNotImplementedError
 
+    def toAsyncChannel(self) -> "grpc.aio.Channel":
+        """
+        The actual channel builder implementations can implement this function to return
+        a `grpc.aio` Channel, used by :class:`AsyncSparkConnectClient`.
+        This function should generally use self._async_insecure_channel or
+        self._async_secure_channel so that configuration options are applied
+        appropriately.
+        """
+        raise PySparkNotImplementedError
+
     @property
     def host(self) -> str:
         """
@@ -191,6 +215,32 @@ class ChannelBuilder:
         """
         raise PySparkNotImplementedError
 
+    def _async_interceptors(self) -> List["grpc.aio.ClientInterceptor"]:
+        # The interceptors of synchronous channels cannot be applied to asyncio channels.
+        interceptors = [i for i in self._interceptors if isinstance(i, grpc.aio.ClientInterceptor)]
+        if len(interceptors) < len(self._interceptors):
+            logger.warning("Interceptors which are not grpc.aio.ClientInterceptor are ignored.")
+        return interceptors
+
+    def _async_insecure_channel(self, target: Any, **kwargs: Any) -> "grpc.aio.Channel":
+        return grpc.aio.insecure_channel(
+            target,
+            options=self._channel_options,
+            interceptors=self._async_interceptors(),
+            **kwargs,
+        )
+
+    def _async_secure_channel(
+        self, target: Any, credentials: Any, **kwargs: Any
+    ) -> "grpc.aio.Channel":
+        return grpc.aio.secure_channel(
+            target,
+            credentials,
+            options=self._channel_options,
+            interceptors=self._async_interceptors(),
+            **kwargs,
+        )
+
     def _insecure_channel(self, target: Any, **kwargs: Any) -> grpc.Channel:
         channel = grpc.insecure_channel(target, options=self._channel_options, **kwargs)
 
@@ -439,16 +489,26 @@ class DefaultChannelBuilder(ChannelBuilder):
         if not self.secure:
             return self._insecure_channel(self.endpoint)
         else:
-            ssl_creds = grpc.ssl_channel_credentials()
+            return self._secure_channel(self.endpoint, self._credentials())
 
-            if self.token is None:
-                creds = ssl_creds
-            else:
-                creds = grpc.composite_channel_credentials(
-                    ssl_creds, grpc.access_token_call_credentials(self.token)
-                )
+    def toAsyncChannel(self) -> "grpc.aio.Channel":
+        """
+        Same as :meth:`toChannel`, but creates a `grpc.aio` Channel.
+        """
+        if not self.secure:
+            return self._async_insecure_channel(self.endpoint)
+        else:
+            return self._async_secure_channel(self.endpoint, self._credentials())
+
+    def _credentials(self) -> grpc.ChannelCredentials:
+        ssl_creds = grpc.ssl_channel_credentials()
 
-            return self._secure_channel(self.endpoint, creds)
+        if self.token is None:
+            return ssl_creds
+        else:
+            return grpc.composite_channel_credentials(
+                ssl_creds, grpc.access_token_call_credentials(self.token)
+            )
 
 
 class PlanObservedMetrics(ObservedMetrics):
@@ -669,6 +729,29 @@ class SparkConnectClient(object):
 
         self._progress_handlers: List[ProgressHandler] = []
 
+        self._plan_cache: Optional[PlanCache] = None
+
+        self._optimize_plans = False
+
+        self._telemetry: Optional[TelemetrySink] = None
+
+        # The number of responses received ahead in the background, 0 if disabled.
+        self._max_prefetched_responses = 0
+
+        self._async_client: Optional["AsyncSparkConnectClient"] = None
+
+    @property
+    def async_client(self) -> "AsyncSparkConnectClient":
+        """
+        The asyncio client sending the requests of this session, see
+        :class:`AsyncSparkConnectClient`.
+        """
+        if self._async_client is None:
+            from pyspark.sql.connect.client.aio import AsyncSparkConnectClient
+
+            self._async_client = AsyncSparkConnectClient(self)
+        return self._async_client
+
     def register_progress_handler(self, handler: ProgressHandler) -> None:
         """
         Register a progress handler to be called when a progress message is received.
@@ -699,7 +782,7 @@ class SparkConnectClient(object):
         self._progress_handlers.remove(handler)
 
     def _retrying(self) -> "Retrying":
-        return Retrying(self._retry_policies)
+        return Retrying(self._retry_policies, sleep=timed_sleep(self._telemetry, time.sleep))
 
     def disable_reattachable_execute(self) -> "SparkConnectClient":
         self._use_reattachable_execute = False
@@ -709,6 +792,178 @@ class SparkConnectClient(object):
         self._use_reattachable_execute = True
         return self
 
+    def enable_plan_cache(
+        self, max_bytes: int = 64 * 1024 * 1024, max_result_bytes: int = 4 * 1024 * 1024
+    ) -> "SparkConnectClient":
+        """
+        Enable the client-side cache of plan schemas and results.
+
+        The schemas and the results of up to `max_result_bytes` of the executed plans are kept
+        in memory, up to `max_bytes` in total, and are reused for equal plans instead of calling
+        the server again. The cache is cleared on commands, catalog calls and configuration
+        changes issued through this client. Plans calling non-deterministic functions, e.g.
+        ``current_timestamp()`` or ``rand()``, are not cached. Results are served from the
+        cache even if the underlying data was changed otherwise, so this should only be
+        enabled for interactive use on data which does not change.
+        """
+        self._plan_cache = PlanCache(max_bytes, max_result_bytes)
+        return self
+
+    def disable_plan_cache(self) -> "SparkConnectClient":
+        self._plan_cache = None
+        return self
+
+    def enable_plan_optimizer(self) -> "SparkConnectClient":
+        """
+        Collapse adjacent `withColumns`, `withColumnsRenamed`, `drop` and `filter` relations of
+        the plans before sending them, see :meth:`explain_plan_optimization`.
+
+        Long chains of these relations, e.g. built by calling `withColumn` in a loop, are then
+        analyzed by the server as a single relation instead of one relation per call. Relations
+        are only collapsed when this does not change the result.
+        Persisted DataFrames are found by their plans as they were built, so the relations of
+        a plan are not matched with a persisted DataFrame once collapsed.
+        """
+        self._optimize_plans = True
+        return self
+
+    def disable_plan_optimizer(self) -> "SparkConnectClient":
+        self._optimize_plans = False
+        return self
+
+    def explain_plan_optimization(self, plan: pb2.Plan) -> str:
+        """
+        Return the relations of the plan before and after they are collapsed by the plan
+        optimizer, see :meth:`enable_plan_optimizer`.
+        """
+        optimized = pb2.Plan()
+        optimized.CopyFrom(plan)
+        optimize_plan(optimized)
+        return self._plan_optimization_string(plan, optimized)
+
+    @staticmethod
+    def _plan_optimization_string(plan: pb2.Plan, optimized: pb2.Plan) -> str:
+        def relation(p: pb2.Plan) -> pb2.Relation:
+            return p.command.relation if p.HasField("command") else p.root
+
+        return (
+            f"== Client Plan ==\n{plan_string(relation(plan))}\n"
+            f"== Optimized Client Plan ==\n{plan_string(relation(optimized))}"
+        )
+
+    def _optimize_plan(self, req: google.protobuf.message.Message) -> None:
+        """Collapse the relations of the plans in the request if the optimizer is enabled."""
+        if not self._optimize_plans:
+            return
+        if logger.isEnabledFor(logging.DEBUG) and isinstance(req, pb2.ExecutePlanRequest):
+            plan = pb2.Plan()
+            plan.CopyFrom(req.plan)
+            collapsed = optimize_plan(req)
+            logger.debug(
+                f"Collapsed {collapsed} relations of the plan.\n"
+                + self._plan_optimization_string(plan, req.plan)
+            )
+        else:
+            optimize_plan(req)
+
+    def enable_telemetry(self, sink: Optional[TelemetrySink] = None) -> "SparkConnectClient":
+        """
+        Record the duration of the RPCs to the server, the time waited before retries, the size
+        and decoding time of the Arrow batches received and the time converting results to
+        pandas with the given sink, or with a new :class:`HistogramSink` if None.
+
+        The time until the first response of `ExecutePlan` and `ReattachExecute` is mostly spent
+        by the server, while the decoding and conversion time is spent by the client. The RPCs
+        of the asyncio client are not timed.
+        """
+        self.disable_telemetry()
+        self._telemetry = sink if sink is not None else HistogramSink()
+        self._stub = TelemetryStub(self._stub, self._telemetry)
+        return self
+
+    def disable_telemetry(self) -> "SparkConnectClient":
+        if isinstance(self._stub, TelemetryStub):
+            self._stub = self._stub.stub
+        self._telemetry = None
+        return self
+
+    @property
+    def telemetry_sink(self) -> Optional[TelemetrySink]:
+        """The sink of the measurements if telemetry is enabled, see :meth:`enable_telemetry`."""
+        return self._telemetry
+
+    def _record(self, name: str, value: float) -> None:
+        if self._telemetry is not None:
+            self._telemetry.record(name, value, {})
+
+    def enable_background_fetch(self, max_pending_responses: int = 16) -> "SparkConnectClient":
+        """
+        Receive the responses of executed plans in a background thread.
+
+        The background thread receives and parses up to `max_pending_responses` responses ahead,
+        while the calling thread decodes the Arrow batches of the responses already received.
+        This overlaps the network transfer with the decoding of large results, e.g. of
+        `toPandas()` and `toArrow()`, at the cost of buffering up to `max_pending_responses`
+        Arrow batches in memory.
+        """
+        if max_pending_responses <= 0:
+            raise PySparkValueError(
+                errorClass="VALUE_NOT_POSITIVE",
+                messageParameters={
+                    "arg_name": "max_pending_responses",
+                    "arg_value": str(max_pending_responses),
+                },
+            )
+        self._max_prefetched_responses = max_pending_responses
+        return self
+
+    def disable_background_fetch(self) -> "SparkConnectClient":
+        self._max_prefetched_responses = 0
+        return self
+
+    def configure_artifact_upload(
+        self, chunk_size: Optional[int] = None, max_parallel_uploads: Optional[int] = None
+    ) -> "SparkConnectClient":
+        """
+        Set the size in bytes of the chunks artifacts are sent in, and the number of requests
+        adding artifacts which are sent in parallel, see :class:`ArtifactManager`.
+
+        Larger chunks take fewer requests to send large artifacts such as environment archives,
+        but every chunk has to fit into a gRPC message.
+        """
+        for arg_name, value in (
+            ("chunk_size", chunk_size),
+            ("max_parallel_uploads", max_parallel_uploads),
+        ):
+            if value is not None and value <= 0:
+                raise PySparkValueError(
+                    errorClass="VALUE_NOT_POSITIVE",
+                    messageParameters={"arg_name": arg_name, "arg_value": str(value)},
+                )
+        if chunk_size is not None:
+            self._artifact_manager.chunk_size = chunk_size
+        if max_parallel_uploads is not None:
+            self._artifact_manager.max_parallel_uploads = max_parallel_uploads
+        return self
+
+    def _invalidate_plan_cache(self) -> None:
+        if self._plan_cache is not None:
+            self._plan_cache.clear()
+
+    def _plan_cache_key(
+        self, plan: pb2.Plan, observations: Optional[Dict[str, Observation]] = None
+    ) -> Optional[bytes]:
+        """
+        Return the key of the plan in the plan cache, or None if the plan must not be cached.
+        """
+        if self._plan_cache is None or plan.HasField("command") or observations:
+            return None
+        if plan.root.HasField("catalog"):
+            # Catalog calls may change the session state, e.g. the current database.
+            self._plan_cache.clear()
+            return None
+        return plan_fingerprint(plan)
+
     def set_retry_policies(self, policies: Iterable[RetryPolicy]) -> None:
         """
         Sets list of policies to be used for retries.
@@ -869,6 +1124,8 @@ class SparkConnectClient(object):
             # inside an if statement to not incur a performance cost converting proto to string
             # when not at debug log level.
             logger.debug(f"Executing plan {self._proto_to_string(plan, True)}")
+        # The results are not cached, but catalog calls still clear the plan cache.
+        self._plan_cache_key(plan, observations)
         req = self._execute_plan_request_with_metadata()
         req.plan.CopyFrom(plan)
         with Progress(handlers=self._progress_handlers, operation_id=req.operation_id) as progress:
@@ -890,7 +1147,7 @@ class SparkConnectClient(object):
             logger.debug(f"Executing plan {self._proto_to_string(plan, True)}")
         req = self._execute_plan_request_with_metadata()
         req.plan.CopyFrom(plan)
-        table, schema, metrics, observed_metrics, _ = self._execute_and_fetch(req, observations)
+        table, schema, metrics, observed_metrics = self._execute_and_fetch_table(req, observations)
 
         # Create a query execution object.
         ei = ExecutionInfo(metrics, observed_metrics)
@@ -913,7 +1170,7 @@ class SparkConnectClient(object):
             ("spark.sql.execution.arrow.pyspark.selfDestruct.enabled", "false"),
         )
         self_destruct = cast(str, self_destruct_conf).lower() == "true"
-        table, schema, metrics, observed_metrics, _ = self._execute_and_fetch(
+        table, schema, metrics, observed_metrics = self._execute_and_fetch_table(
             req, observations, self_destruct=self_destruct
         )
         assert table is not None
@@ -922,6 +1179,37 @@ class SparkConnectClient(object):
         schema = schema or from_arrow_schema(table.schema, prefer_timestamp_ntz=True)
         assert schema is not None and isinstance(schema, StructType)
 
+        timezone: Optional[str] = None
+        if any(_has_type(f.dataType, TimestampType) for f in schema.fields):
+            (timezone,) = self.get_configs("spark.sql.session.timeZone")
+
+        struct_in_pandas: Optional[str] = None
+        if any(_has_type(f.dataType, StructType) for f in schema.fields):
+            (struct_in_pandas,) = self.get_config_with_defaults(
+                ("spark.sql.execution.pandas.structHandlingMode", "legacy"),
+            )
+
+        pdf = self._table_to_pandas(table, schema, self_destruct, timezone, struct_in_pandas)
+
+        if len(metrics) > 0:
+            pdf.attrs["metrics"] = metrics
+        if len(observed_metrics) > 0:
+            pdf.attrs["observed_metrics"] = observed_metrics
+        return pdf, ei
+
+    def _table_to_pandas(
+        self,
+        table: "pa.Table",
+        schema: StructType,
+        self_destruct: bool,
+        timezone: Optional[str],
+        struct_in_pandas: Optional[str],
+    ) -> "pd.DataFrame":
+        """
+        Convert the fetched `table` to a pandas DataFrame, given the session time zone if the
+        schema has timestamps, and the struct handling mode if it has structs.
+        """
+        start = time.perf_counter()
         # Rename columns to avoid duplicated column names.
         renamed_table = table.rename_columns([f"col_{i}" for i in range(table.num_columns)])
 
@@ -951,40 +1239,29 @@ class SparkConnectClient(object):
         pdf.columns = schema.names
 
         if len(pdf.columns) > 0:
-            timezone: Optional[str] = None
-            if any(_has_type(f.dataType, TimestampType) for f in schema.fields):
-                (timezone,) = self.get_configs("spark.sql.session.timeZone")
-
-            struct_in_pandas: Optional[str] = None
             error_on_duplicated_field_names: bool = False
-            if any(_has_type(f.dataType, StructType) for f in schema.fields):
-                (struct_in_pandas,) = self.get_config_with_defaults(
-                    ("spark.sql.execution.pandas.structHandlingMode", "legacy"),
-                )
-
-                if struct_in_pandas == "legacy":
-                    error_on_duplicated_field_names = True
-                    struct_in_pandas = "dict"
+            if struct_in_pandas == "legacy":
+                error_on_duplicated_field_names = True
+                struct_in_pandas = "dict"
 
-            pdf = pd.concat(
-                [
-                    _create_converter_to_pandas(
+            # Unlike pd.concat, which copies the columns into consolidated blocks with pandas
+            # before 3.0, this keeps the columns converted from the Arrow table as they are.
+            pdf = pd.DataFrame(
+                {
+                    i: _create_converter_to_pandas(
                         field.dataType,
                         field.nullable,
                         timezone=timezone,
                         struct_in_pandas=struct_in_pandas,
                         error_on_duplicated_field_names=error_on_duplicated_field_names,
                     )(pser)
-                    for (_, pser), field, pa_field in zip(pdf.items(), schema.fields, table.schema)
-                ],
-                axis="columns",
+                    for i, ((_, pser), field) in enumerate(zip(pdf.items(), schema.fields))
+                },
+                copy=False,
             )
-
-        if len(metrics) > 0:
-            pdf.attrs["metrics"] = metrics
-        if len(observed_metrics) > 0:
-            pdf.attrs["observed_metrics"] = observed_metrics
-        return pdf, ei
+            pdf.columns = schema.names
+        self._record(PANDAS_CONVERSION_SECONDS, time.perf_counter() - start)
+        return pdf
 
     def _proto_to_string(self, p: google.protobuf.message.Message, truncate: bool = False) -> str:
         """
@@ -1071,10 +1348,18 @@ class SparkConnectClient(object):
             # inside an if statement to not incur a performance cost converting proto to string
             # when not at debug log level.
             logger.debug(f"Schema for plan: {self._proto_to_string(plan, True)}")
+        key = self._plan_cache_key(plan)
+        if key is not None:
+            assert self._plan_cache is not None
+            cached = self._plan_cache.get_schema(key)
+            if cached is not None:
+                return cached
         schema = self._analyze(method="schema", plan=plan).schema
         assert schema is not None
         # Server side should populate the struct field which is the schema.
         assert isinstance(schema, StructType)
+        if key is not None and self._plan_cache is not None:
+            self._plan_cache.put_schema(key, schema)
         return schema
 
     def explain_string(self, plan: pb2.Plan, explain_mode: str = "extended") -> str:
@@ -1110,6 +1395,14 @@ class SparkConnectClient(object):
         data, _, metrics, observed_metrics, properties = self._execute_and_fetch(
             req, observations or {}
         )
+        if not (
+            command.HasField("sql_command")
+            and "sql_command_result" in properties
+            and not properties["sql_command_result"].HasField("local_relation")
+        ):
+            # Commands may change the session state, except SQL queries which are not executed
+            # but returned as relations, unlike the results of SQL commands.
+            self._invalidate_plan_cache()
         # Create a query execution object.
         ei = ExecutionInfo(metrics, observed_metrics)
         if data is not None:
@@ -1133,6 +1426,7 @@ class SparkConnectClient(object):
         if self._user_id:
             req.user_context.user_id = self._user_id
         req.plan.command.CopyFrom(command)
+        self._invalidate_plan_cache()
         for response in self._execute_and_fetch_as_iterator(req, observations or {}):
             if isinstance(response, dict):
                 yield response
@@ -1166,7 +1460,11 @@ class SparkConnectClient(object):
         """
         ExecutePlanResponseReattachableIterator.shutdown()
         self._channel.close()
+        if self._async_client is not None:
+            self._async_client._close_channel()
         self._closed = True
+        if self._telemetry is not None:
+            self._telemetry.flush()
 
     @property
     def is_closed(self) -> bool:
@@ -1220,6 +1518,18 @@ class SparkConnectClient(object):
         -------
         The result of the analyze call.
         """
+        req = self._analyze_request(method, **kwargs)
+        try:
+            for attempt in self._retrying():
+                with attempt:
+                    resp = self._stub.AnalyzePlan(req, metadata=self._builder.metadata())
+                    self._verify_response_integrity(resp)
+                    return AnalyzeResult.fromProto(resp)
+            raise SparkConnectException("Invalid state during retry exception handling.")
+        except Exception as error:
+            self._handle_error(error)
+
+    def _analyze_request(self, method: str, **kwargs: Any) -> pb2.AnalyzePlanRequest:
         req = self._analyze_plan_request_with_metadata()
         if method == "schema":
             req.schema.plan.CopyFrom(cast(pb2.Plan, kwargs.get("plan")))
@@ -1291,16 +1601,11 @@ class SparkConnectClient(object):
                     "operation": method,
                 },
             )
-
-        try:
-            for attempt in self._retrying():
-                with attempt:
-                    resp = self._stub.AnalyzePlan(req, metadata=self._builder.metadata())
-                    self._verify_response_integrity(resp)
-                    return AnalyzeResult.fromProto(resp)
-            raise SparkConnectException("Invalid state during retry exception handling.")
-        except Exception as error:
-            self._handle_error(error)
+        if method in ["schema", "explain", "tree_string", "is_local", "is_streaming"]:
+            # The other methods depend on the plans as they were built, e.g. to find the plans
+            # of persisted DataFrames.
+            self._optimize_plan(req)
+        return req
 
     def _execute(self, req: pb2.ExecutePlanRequest) -> None:
         """
@@ -1313,6 +1618,8 @@ class SparkConnectClient(object):
 
         """
         logger.debug("Execute")
+        self._invalidate_plan_cache()
+        self._optimize_plan(req)
 
         def handle_response(b: pb2.ExecutePlanResponse) -> None:
             self._verify_response_integrity(b)
@@ -1347,6 +1654,7 @@ class SparkConnectClient(object):
             Dict[str, Any],
         ]
     ]:
+        self._optimize_plan(req)
         if logger.isEnabledFor(logging.DEBUG):
             # inside an if statement to not incur a performance cost converting proto to string
             # when not at debug log level.
@@ -1367,110 +1675,12 @@ class SparkConnectClient(object):
             ]
         ]:
             nonlocal num_records
-            # The session ID is the local session ID and should match what we expect.
-            self._verify_response_integrity(b)
-            if logger.isEnabledFor(logging.DEBUG):
-                # inside an if statement to not incur a performance cost converting proto to string
-                # when not at debug log level.
-                logger.debug(
-                    f"ExecuteAndFetchAsIterator. Response received: {self._proto_to_string(b)}"
-                )
-
-            if b.HasField("metrics"):
-                logger.debug("Received metric batch.")
-                yield from self._build_metrics(b.metrics)
-            if b.observed_metrics:
-                logger.debug("Received observed metric batch.")
-                for observed_metrics in self._build_observed_metrics(b.observed_metrics):
-                    if observed_metrics.name == "__python_accumulator__":
-                        from pyspark.worker_util import pickleSer
-
-                        for metric in observed_metrics.metrics:
-                            (aid, update) = pickleSer.loads(LiteralExpression._to_value(metric))
-                            if aid == SpecialAccumulatorIds.SQL_UDF_PROFIER:
-                                self._profiler_collector._update(update)
-                    elif observed_metrics.name in observations:
-                        observation_result = observations[observed_metrics.name]._result
-                        assert observation_result is not None
-                        observation_result.update(
-                            {
-                                key: LiteralExpression._to_value(metric)
-                                for key, metric in zip(
-                                    observed_metrics.keys, observed_metrics.metrics
-                                )
-                            }
-                        )
-                    yield observed_metrics
-            if b.HasField("schema"):
-                logger.debug("Received the schema.")
-                dt = types.proto_schema_to_pyspark_data_type(b.schema)
-                assert isinstance(dt, StructType)
-                yield dt
-            if b.HasField("sql_command_result"):
-                logger.debug("Received the SQL command result.")
-                yield {"sql_command_result": b.sql_command_result.relation}
-            if b.HasField("write_stream_operation_start_result"):
-                field = "write_stream_operation_start_result"
-                yield {field: b.write_stream_operation_start_result}
-            if b.HasField("streaming_query_command_result"):
-                yield {"streaming_query_command_result": b.streaming_query_command_result}
-            if b.HasField("streaming_query_manager_command_result"):
-                cmd_result = b.streaming_query_manager_command_result
-                yield {"streaming_query_manager_command_result": cmd_result}
-            if b.HasField("streaming_query_listener_events_result"):
-                event_result = b.streaming_query_listener_events_result
-                yield {"streaming_query_listener_events_result": event_result}
-            if b.HasField("get_resources_command_result"):
-                resources = {}
-                for key, resource in b.get_resources_command_result.resources.items():
-                    name = resource.name
-                    addresses = [address for address in resource.addresses]
-                    resources[key] = ResourceInformation(name, addresses)
-                yield {"get_resources_command_result": resources}
-            if b.HasField("extension"):
-                yield b.extension
-            if b.HasField("execution_progress"):
-                if progress:
-                    p = from_proto(b.execution_progress)
-                    progress.update_ticks(*p, operation_id=b.operation_id)
-            if b.HasField("arrow_batch"):
-                logger.debug(
-                    f"Received arrow batch rows={b.arrow_batch.row_count} "
-                    f"size={len(b.arrow_batch.data)}"
-                )
-
-                if (
-                    b.arrow_batch.HasField("start_offset")
-                    and num_records != b.arrow_batch.start_offset
-                ):
-                    raise SparkConnectException(
-                        f"Expected arrow batch to start at row offset {num_records} in results, "
-                        + "but received arrow batch starting at offset "
-                        + f"{b.arrow_batch.start_offset}."
-                    )
-
-                num_records_in_batch = 0
-                with pa.ipc.open_stream(b.arrow_batch.data) as reader:
-                    for batch in reader:
-                        assert isinstance(batch, pa.RecordBatch)
-                        num_records_in_batch += batch.num_rows
-                        yield batch
-
-                if num_records_in_batch != b.arrow_batch.row_count:
-                    raise SparkConnectException(
-                        f"Expected {b.arrow_batch.row_count} rows in arrow batch but got "
-                        + f"{num_records_in_batch}."
-                    )
-                num_records += num_records_in_batch
-            if b.HasField("create_resource_profile_command_result"):
-                profile_id = b.create_resource_profile_command_result.profile_id
-                yield {"create_resource_profile_command_result": profile_id}
-            if b.HasField("checkpoint_command_result"):
-                yield {
-                    "checkpoint_command_result": proto_to_remote_cached_dataframe(
-                        b.checkpoint_command_result.relation
-                    )
-                }
+            for result in self._handle_execute_plan_response(
+                b, observations, progress, num_records
+            ):
+                if isinstance(result, pa.RecordBatch):
+                    num_records += result.num_rows
+                yield result
 
         try:
             if self._use_reattachable_execute:
@@ -1478,12 +1688,14 @@ class SparkConnectClient(object):
                 generator = ExecutePlanResponseReattachableIterator(
                     req, self._stub, self._retrying, self._builder.metadata()
                 )
-                for b in generator:
+                for b in self._prefetch_responses(generator):
                     yield from handle_response(b)
             else:
                 for attempt in self._retrying():
                     with attempt:
-                        for b in self._stub.ExecutePlan(req, metadata=self._builder.metadata()):
+                        for b in self._prefetch_responses(
+                            self._stub.ExecutePlan(req, metadata=self._builder.metadata())
+                        ):
                             yield from handle_response(b)
         except KeyboardInterrupt as kb:
             logger.debug(f"Interrupt request received for operation={req.operation_id}")
@@ -1494,6 +1706,165 @@ class SparkConnectClient(object):
         except Exception as error:
             self._handle_error(error)
 
+    def _handle_execute_plan_response(
+        self,
+        b: pb2.ExecutePlanResponse,
+        observations: Dict[str, Observation],
+        progress: Optional["Progress"],
+        num_records: int,
+    ) -> Iterator[
+        Union[
+            "pa.RecordBatch",
+            StructType,
+            PlanMetrics,
+            PlanObservedMetrics,
+            Dict[str, Any],
+            any_pb2.Any,
+        ]
+    ]:
+        """
+        Return the results in the response `b` of an ExecutePlan call, given the number of records
+        received before it.
+        """
+        # The session ID is the local session ID and should match what we expect.
+        self._verify_response_integrity(b)
+        if logger.isEnabledFor(logging.DEBUG):
+            # inside an if statement to not incur a performance cost converting proto to string
+            # when not at debug log level.
+            logger.debug(
+                f"ExecuteAndFetchAsIterator. Response received: {self._proto_to_string(b)}"
+            )
+
+        if b.HasField("metrics"):
+            logger.debug("Received metric batch.")
+            yield from self._build_metrics(b.metrics)
+        if b.observed_metrics:
+            logger.debug("Received observed metric batch.")
+            for observed_metrics in self._build_observed_metrics(b.observed_metrics):
+                if observed_metrics.name == "__python_accumulator__":
+                    from pyspark.worker_util import pickleSer
+
+                    for metric in observed_metrics.metrics:
+                        (aid, update) = pickleSer.loads(LiteralExpression._to_value(metric))
+                        if aid == SpecialAccumulatorIds.SQL_UDF_PROFIER:
+                            self._profiler_collector._update(update)
+                elif observed_metrics.name in observations:
+                    observation_result = observations[observed_metrics.name]._result
+                    assert observation_result is not None
+                    observation_result.update(
+                        {
+                            key: LiteralExpression._to_value(metric)
+                            for key, metric in zip(observed_metrics.keys, observed_metrics.metrics)
+                        }
+                    )
+                yield observed_metrics
+        if b.HasField("schema"):
+            logger.debug("Received the schema.")
+            dt = types.proto_schema_to_pyspark_data_type(b.schema)
+            assert isinstance(dt, StructType)
+            yield dt
+        if b.HasField("sql_command_result"):
+            logger.debug("Received the SQL command result.")
+            yield {"sql_command_result": b.sql_command_result.relation}
+        if b.HasField("write_stream_operation_start_result"):
+            field = "write_stream_operation_start_result"
+            yield {field: b.write_stream_operation_start_result}
+        if b.HasField("streaming_query_command_result"):
+            yield {"streaming_query_command_result": b.streaming_query_command_result}
+        if b.HasField("streaming_query_manager_command_result"):
+            cmd_result = b.streaming_query_manager_command_result
+            yield {"streaming_query_manager_command_result": cmd_result}
+        if b.HasField("streaming_query_listener_events_result"):
+            event_result = b.streaming_query_listener_events_result
+            yield {"streaming_query_listener_events_result": event_result}
+        if b.HasField("get_resources_command_result"):
+            resources = {}
+            for key, resource in b.get_resources_command_result.resources.items():
+                name = resource.name
+                addresses = [address for address in resource.addresses]
+                resources[key] = ResourceInformation(name, addresses)
+            yield {"get_resources_command_result": resources}
+        if b.HasField("extension"):
+            yield b.extension
+        if b.HasField("execution_progress"):
+            if progress:
+                p = from_proto(b.execution_progress)
+                progress.update_ticks(*p, operation_id=b.operation_id)
+        if b.HasField("arrow_batch"):
+            logger.debug(
+                f"Received arrow batch rows={b.arrow_batch.row_count} "
+                f"size={len(b.arrow_batch.data)}"
+            )
+
+            if b.arrow_batch.HasField("start_offset") and num_records != b.arrow_batch.start_offset:
+                raise SparkConnectException(
+                    f"Expected arrow batch to start at row offset {num_records} in results, "
+                    + "but received arrow batch starting at offset "
+                    + f"{b.arrow_batch.start_offset}."
+                )
+
+            num_records_in_batch = 0
+            start = time.perf_counter()
+            with pa.ipc.open_stream(b.arrow_batch.data) as reader:
+                batches = list(reader)
+            self._record(ARROW_DECODE_SECONDS, time.perf_counter() - start)
+            self._record(ARROW_BATCH_BYTES, len(b.arrow_batch.data))
+            for batch in batches:
+                assert isinstance(batch, pa.RecordBatch)
+                num_records_in_batch += batch.num_rows
+                yield batch
+
+            if num_records_in_batch != b.arrow_batch.row_count:
+                raise SparkConnectException(
+                    f"Expected {b.arrow_batch.row_count} rows in arrow batch but got "
+                    + f"{num_records_in_batch}."
+                )
+        if b.HasField("create_resource_profile_command_result"):
+            profile_id = b.create_resource_profile_command_result.profile_id
+            yield {"create_resource_profile_command_result": profile_id}
+        if b.HasField("checkpoint_command_result"):
+            yield {
+                "checkpoint_command_result": proto_to_remote_cached_dataframe(
+                    b.checkpoint_command_result.relation
+                )
+            }
+
+    def _prefetch_responses(
+        self, responses: Iterator[pb2.ExecutePlanResponse]
+    ) -> Iterator[pb2.ExecutePlanResponse]:
+        if self._max_prefetched_responses > 0:
+            return prefetch(
+                responses, self._max_prefetched_responses, "spark-connect-background-fetch"
+            )
+        return responses
+
+    def _execute_and_fetch_table(
+        self,
+        req: pb2.ExecutePlanRequest,
+        observations: Dict[str, Observation],
+        self_destruct: bool = False,
+    ) -> Tuple["pa.Table", Optional[StructType], List[PlanMetrics], List[PlanObservedMetrics]]:
+        """
+        Execute the plan of `req` and fetch its result as a table, or return the result from the
+        plan cache if it is enabled. There are no metrics for a cached result.
+        """
+        # A self-destructing table is released while it is converted, so it cannot be cached.
+        key = None if self_destruct else self._plan_cache_key(req.plan, observations)
+        if key is not None:
+            assert self._plan_cache is not None
+            cached = self._plan_cache.get_result(key)
+            if cached is not None:
+                logger.debug("Returning the cached result of the plan.")
+                return cached[0], cached[1], [], []
+
+        table, schema, metrics, observed_metrics, _ = self._execute_and_fetch(
+            req, observations, self_destruct=self_destruct
+        )
+        assert table is not None
+        if key is not None and self._plan_cache is not None:
+            self._plan_cache.put_result(key, table, schema)
+        return table, schema, metrics, observed_metrics
+
     def _execute_and_fetch(
         self,
         req: pb2.ExecutePlanRequest,
@@ -1508,33 +1879,52 @@ class SparkConnectClient(object):
     ]:
         logger.debug("ExecuteAndFetch")
 
+        with Progress(handlers=self._progress_handlers, operation_id=req.operation_id) as progress:
+            return self._collect_fetched_results(
+                self._execute_and_fetch_as_iterator(req, observations, progress=progress),
+                self_destruct=self_destruct,
+            )
+
+    def _collect_fetched_results(
+        self,
+        responses: Iterable[
+            Union["pa.RecordBatch", StructType, PlanMetrics, PlanObservedMetrics, Dict[str, Any]]
+        ],
+        self_destruct: bool = False,
+    ) -> Tuple[
+        Optional["pa.Table"],
+        Optional[StructType],
+        List[PlanMetrics],
+        List[PlanObservedMetrics],
+        Dict[str, Any],
+    ]:
+        """
+        Collect the results returned by `_execute_and_fetch_as_iterator` into a table.
+        """
         observed_metrics: List[PlanObservedMetrics] = []
         metrics: List[PlanMetrics] = []
         batches: List[pa.RecordBatch] = []
         schema: Optional[StructType] = None
         properties: Dict[str, Any] = {}
 
-        with Progress(handlers=self._progress_handlers, operation_id=req.operation_id) as progress:
-            for response in self._execute_and_fetch_as_iterator(
-                req, observations, progress=progress
-            ):
-                if isinstance(response, StructType):
-                    schema = response
-                elif isinstance(response, pa.RecordBatch):
-                    batches.append(response)
-                elif isinstance(response, PlanMetrics):
-                    metrics.append(response)
-                elif isinstance(response, PlanObservedMetrics):
-                    observed_metrics.append(response)
-                elif isinstance(response, dict):
-                    properties.update(**response)
-                else:
-                    raise PySparkValueError(
-                        errorClass="UNKNOWN_RESPONSE",
-                        messageParameters={
-                            "response": response,
-                        },
-                    )
+        for response in responses:
+            if isinstance(response, StructType):
+                schema = response
+            elif isinstance(response, pa.RecordBatch):
+                batches.append(response)
+            elif isinstance(response, PlanMetrics):
+                metrics.append(response)
+            elif isinstance(response, PlanObservedMetrics):
+                observed_metrics.append(response)
+            elif isinstance(response, dict):
+                properties.update(**response)
+            else:
+                raise PySparkValueError(
+                    errorClass="UNKNOWN_RESPONSE",
+                    messageParameters={
+                        "response": response,
+                    },
+                )
 
         if len(batches) > 0:
             if self_destruct:
@@ -1609,6 +1999,9 @@ class SparkConnectClient(object):
         if self._server_session_id is not None:
             req.client_observed_server_side_session_id = self._server_session_id
         req.operation.CopyFrom(operation)
+        if operation.WhichOneof("op_type") in ("set", "unset"):
+            # The configurations may change the schemas and the results of the plans.
+            self._invalidate_plan_cache()
         try:
             for attempt in self._retrying():
                 with attempt:
@@ -1855,12 +2248,12 @@ class SparkConnectClient(object):
 
     def add_artifacts(self, *paths: str, pyfile: bool, archive: bool, file: bool) -> None:
         try:
-            for path in paths:
-                for attempt in self._retrying():
-                    with attempt:
-                        self._artifact_manager.add_artifacts(
-                            path, pyfile=pyfile, archive=archive, file=file
-                        )
+            # The artifacts which were added before a retried failure are not sent again.
+            for attempt in self._retrying():
+                with attempt:
+                    self._artifact_manager.add_artifacts(
+                        *paths, pyfile=pyfile, archive=archive, file=file
+                    )
         except Exception as error:
             self._handle_error(error)
 
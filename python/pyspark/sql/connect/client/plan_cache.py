@@ -0,0 +1,207 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from pyspark.sql.connect.utils import check_dependencies
+
+check_dependencies(__name__)
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pyarrow as pa
+import google.protobuf.message
+from google.protobuf.descriptor import FieldDescriptor
+
+import pyspark.sql.connect.proto as pb2
+from pyspark.sql.types import StructType
+
+
+# Functions whose results differ between executions of the same plan.
+_NON_DETERMINISTIC_FUNCTIONS = frozenset(
+    [
+        "curdate",
+        "current_date",
+        "current_time",
+        "current_timestamp",
+        "input_file_block_length",
+        "input_file_block_start",
+        "input_file_name",
+        "localtimestamp",
+        "monotonically_increasing_id",
+        "now",
+        "rand",
+        "randn",
+        "random",
+        "randstr",
+        "shuffle",
+        "spark_partition_id",
+        "uniform",
+        "uuid",
+    ]
+)
+
+# Matches the non-deterministic functions in SQL text. The datetime functions can be called
+# without parentheses, and unix_timestamp() is non-deterministic only without arguments.
+_NON_DETERMINISTIC_SQL = re.compile(
+    r"\b(?:%s)\b|\bunix_timestamp\s*\(\s*\)" % "|".join(sorted(_NON_DETERMINISTIC_FUNCTIONS)),
+    re.IGNORECASE,
+)
+
+
+def is_repeated(field: FieldDescriptor) -> bool:
+    """
+    Return whether the given protobuf field is a repeated field.
+    """
+    # FieldDescriptor.label is deprecated in newer protobuf versions in favor of is_repeated.
+    if hasattr(field, "is_repeated"):
+        return field.is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+def _is_non_deterministic(message: google.protobuf.message.Message) -> bool:
+    if isinstance(message, pb2.Expression.UnresolvedFunction):
+        name = message.function_name.lower()
+        if name == "unix_timestamp":
+            return len(message.arguments) == 0
+        return name in _NON_DETERMINISTIC_FUNCTIONS
+    elif isinstance(message, pb2.CommonInlineUserDefinedFunction):
+        return not message.deterministic
+    elif isinstance(message, pb2.Expression.ExpressionString):
+        return _NON_DETERMINISTIC_SQL.search(message.expression) is not None
+    elif isinstance(message, pb2.SQL):
+        return _NON_DETERMINISTIC_SQL.search(message.query) is not None
+    return False
+
+
+def plan_fingerprint(plan: pb2.Plan) -> Optional[bytes]:
+    """
+    Return a fingerprint of the given plan which is the same for equal plans built by different
+    DataFrames, or None if the plan is non-deterministic and its results must not be cached.
+
+    Every DataFrame assigns new plan ids to its relations, so the plan ids are renumbered in the
+    order they appear in the plan before the plan is hashed. A plan is non-deterministic if it
+    calls a non-deterministic function such as ``current_timestamp()``, ``rand()`` or
+    ``uuid()``, or a non-deterministic user-defined function.
+    """
+    canonical = pb2.Plan()
+    canonical.CopyFrom(plan)
+    plan_ids: Dict[int, int] = {}
+
+    def visit(message: google.protobuf.message.Message) -> bool:
+        if _is_non_deterministic(message):
+            return False
+        for field, value in message.ListFields():
+            if field.type == FieldDescriptor.TYPE_MESSAGE:
+                if field.message_type.GetOptions().map_entry:
+                    value_field = field.message_type.fields_by_name["value"]
+                    if value_field.type == FieldDescriptor.TYPE_MESSAGE:
+                        if not all(visit(v) for v in value.values()):
+                            return False
+                elif is_repeated(field):
+                    if not all(visit(v) for v in value):
+                        return False
+                elif not visit(value):
+                    return False
+            elif field.name == "plan_id" and field.type == FieldDescriptor.TYPE_INT64:
+                # Start from 1 so that a renumbered plan id is never the default value.
+                setattr(message, field.name, plan_ids.setdefault(value, len(plan_ids) + 1))
+        return True
+
+    if not visit(canonical):
+        return None
+    return hashlib.sha256(canonical.SerializeToString(deterministic=True)).digest()
+
+
+class PlanCache:
+    """
+    Client-side cache of the analyzed schemas and the results of plans, keyed by
+    :func:`plan_fingerprint`. Non-deterministic plans are not cached.
+
+    The least recently used entries are evicted once the cached schemas and result tables take
+    more than `max_bytes`. Results larger than `max_result_bytes` are not cached. The cache
+    does not know which tables a plan reads, so it has to be cleared whenever the session
+    state may have changed, e.g. on commands, catalog calls and configuration changes.
+    """
+
+    def __init__(self, max_bytes: int, max_result_bytes: int):
+        self._max_bytes = max_bytes
+        self._max_result_bytes = max_result_bytes
+        self._entries: "OrderedDict[Tuple[str, bytes], Tuple[Any, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # Counters, see stats().
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _get(self, kind: str, fingerprint: bytes) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((kind, fingerprint))
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end((kind, fingerprint))
+            self._hits += 1
+            return entry[0]
+
+    def _put(self, kind: str, fingerprint: bytes, value: Any, size: int) -> None:
+        with self._lock:
+            old = self._entries.pop((kind, fingerprint), None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[(kind, fingerprint)] = (value, size)
+            self._size += size
+            while self._size > self._max_bytes and len(self._entries) > 0:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def get_schema(self, fingerprint: bytes) -> Optional[StructType]:
+        return self._get("schema", fingerprint)
+
+    def put_schema(self, fingerprint: bytes, schema: StructType) -> None:
+        self._put("schema", fingerprint, schema, len(fingerprint) + len(schema.json()))
+
+    def get_result(self, fingerprint: bytes) -> Optional[Tuple["pa.Table", Optional[StructType]]]:
+        return self._get("result", fingerprint)
+
+    def put_result(
+        self, fingerprint: bytes, table: "pa.Table", schema: Optional[StructType]
+    ) -> None:
+        if table.nbytes <= self._max_result_bytes:
+            self._put("result", fingerprint, (table, schema), len(fingerprint) + table.nbytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of cache `hits`, `misses` and `evictions`, and the number of cached
+        `entries` and their `size` in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "size": self._size,
+            }
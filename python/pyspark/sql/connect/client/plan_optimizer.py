@@ -0,0 +1,333 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from pyspark.sql.connect.utils import check_dependencies
+
+check_dependencies(__name__)
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import google.protobuf.message
+from google.protobuf.descriptor import FieldDescriptor
+
+import pyspark.sql.connect.proto as pb2
+from pyspark.sql.connect.client.plan_cache import is_repeated
+
+# Expressions referencing columns which are only known once the expression is parsed or
+# analyzed by the server.
+_OPAQUE_EXPRESSIONS = frozenset(
+    [
+        "expression_string",
+        "unresolved_star",
+        "unresolved_regex",
+        "typed_aggregate_expression",
+        "extension",
+    ]
+)
+
+# Functions which may return different results for the same input.
+_NONDETERMINISTIC_FUNCTIONS = frozenset(
+    [
+        "current_batch_id",
+        "input_file_block_length",
+        "input_file_block_start",
+        "input_file_name",
+        "monotonically_increasing_id",
+        "rand",
+        "randn",
+        "random",
+        "randstr",
+        "shuffle",
+        "spark_partition_id",
+        "uniform",
+        "uuid",
+    ]
+)
+
+
+def _messages(
+    message: google.protobuf.message.Message,
+) -> Iterator[google.protobuf.message.Message]:
+    """
+    Iterate over the message and all the messages nested in it, without recursion since plans
+    may be deeply nested. A message is only looked into after it was returned, so it can be
+    changed in between.
+    """
+    stack = [message]
+    while len(stack) > 0:
+        current = stack.pop()
+        yield current
+        for field, value in current.ListFields():
+            if field.type != FieldDescriptor.TYPE_MESSAGE:
+                continue
+            if field.message_type.GetOptions().map_entry:
+                if field.message_type.fields_by_name["value"].type == FieldDescriptor.TYPE_MESSAGE:
+                    stack.extend(value.values())
+            elif is_repeated(field):
+                stack.extend(reversed(value))
+            else:
+                stack.append(value)
+
+
+def _referenced_plan_ids(message: google.protobuf.message.Message) -> Set[int]:
+    """
+    Return the plan ids referenced by the message, e.g. by columns of a specific DataFrame. The
+    relations with these plan ids must be kept.
+    """
+    plan_ids = set()
+    for m in _messages(message):
+        if not isinstance(m, pb2.RelationCommon):
+            for field, value in m.ListFields():
+                if field.name == "plan_id":
+                    plan_ids.add(value)
+    return plan_ids
+
+
+def _name_parts(identifier: str) -> List[str]:
+    # Conservatively matches `a.b` with the columns a, b and a.b.
+    return [p.lower() for p in re.split(r"[.`]", identifier) if p] + [
+        identifier.replace("`", "").lower()
+    ]
+
+
+class _Expressions:
+    """The columns referenced by expressions, and whether the expressions are deterministic."""
+
+    def __init__(self, expressions: Iterable[pb2.Expression]):
+        self.names: Set[str] = set()
+        self.opaque = False
+        self.deterministic = True
+        for expression in expressions:
+            for m in _messages(expression):
+                if not isinstance(m, pb2.Expression):
+                    continue
+                kind = m.WhichOneof("expr_type")
+                if kind in _OPAQUE_EXPRESSIONS:
+                    self.opaque = True
+                elif kind == "unresolved_attribute":
+                    self.names.update(_name_parts(m.unresolved_attribute.unparsed_identifier))
+                elif kind == "unresolved_function":
+                    if m.unresolved_function.function_name.lower() in _NONDETERMINISTIC_FUNCTIONS:
+                        self.deterministic = False
+                elif kind == "call_function":
+                    if m.call_function.function_name.lower() in _NONDETERMINISTIC_FUNCTIONS:
+                        self.deterministic = False
+                elif kind == "common_inline_user_defined_function":
+                    if not m.common_inline_user_defined_function.deterministic:
+                        self.deterministic = False
+
+
+class _WithColumns:
+    """
+    Collapses `withColumns` relations. The expressions of a relation are resolved against the
+    input of the relations below it once collapsed, so they must not reference the columns
+    added or replaced by these relations.
+    """
+
+    def __init__(self, outer: pb2.WithColumns):
+        self.aliases = [list(outer.aliases)]
+        self.names = {name.lower() for alias in outer.aliases for name in alias.name}
+        self.expressions = _Expressions(alias.expr for alias in outer.aliases)
+
+    def add(self, inner: pb2.WithColumns) -> bool:
+        names = {name.lower() for alias in inner.aliases for name in alias.name}
+        if self.expressions.opaque or names & (self.names | self.expressions.names):
+            return False
+        self.aliases.append(list(inner.aliases))
+        self.names.update(names)
+        expressions = _Expressions(alias.expr for alias in inner.aliases)
+        self.expressions.names.update(expressions.names)
+        self.expressions.opaque |= expressions.opaque
+        return True
+
+    def apply(self, target: pb2.WithColumns) -> None:
+        # The aliases are copied out first, since some of them are in the target.
+        merged = pb2.WithColumns()
+        merged.aliases.extend(alias for aliases in reversed(self.aliases) for alias in aliases)
+        del target.aliases[:]
+        target.aliases.extend(merged.aliases)
+
+
+class _WithColumnsRenamed:
+    """Collapses `withColumnsRenamed` relations, when they rename distinct columns."""
+
+    def __init__(self, outer: pb2.WithColumnsRenamed):
+        self.renames = [list(outer.renames)]
+        self.names = self._names(outer)
+
+    @staticmethod
+    def _names(relation: pb2.WithColumnsRenamed) -> Optional[Set[str]]:
+        if len(relation.rename_columns_map) > 0:
+            return None
+        return {n.lower() for r in relation.renames for n in (r.col_name, r.new_col_name)}
+
+    def add(self, inner: pb2.WithColumnsRenamed) -> bool:
+        names = self._names(inner)
+        if self.names is None or names is None or names & self.names:
+            return False
+        self.renames.append(list(inner.renames))
+        self.names.update(names)
+        return True
+
+    def apply(self, target: pb2.WithColumnsRenamed) -> None:
+        merged = pb2.WithColumnsRenamed()
+        merged.renames.extend(rename for renames in reversed(self.renames) for rename in renames)
+        del target.renames[:]
+        target.renames.extend(merged.renames)
+
+
+class _Drop:
+    """Collapses `drop` relations by column names, as dropping missing columns is a no-op."""
+
+    def __init__(self, outer: pb2.Drop):
+        self.column_names = [list(outer.column_names)]
+        self.by_name = len(outer.columns) == 0
+
+    def add(self, inner: pb2.Drop) -> bool:
+        if not self.by_name or len(inner.columns) > 0:
+            return False
+        self.column_names.append(list(inner.column_names))
+        return True
+
+    def apply(self, target: pb2.Drop) -> None:
+        column_names = [name for names in reversed(self.column_names) for name in names]
+        del target.column_names[:]
+        target.column_names.extend(column_names)
+
+
+class _Filter:
+    """Collapses `filter` relations into a conjunction, when the conditions are deterministic."""
+
+    def __init__(self, outer: pb2.Filter):
+        self.conditions = [outer.condition]
+        self.collapsible = self._collapsible(outer)
+
+    @staticmethod
+    def _collapsible(relation: pb2.Filter) -> bool:
+        expressions = _Expressions([relation.condition])
+        return not expressions.opaque and expressions.deterministic
+
+    def add(self, inner: pb2.Filter) -> bool:
+        if not self.collapsible or not self._collapsible(inner):
+            return False
+        self.conditions.append(inner.condition)
+        return True
+
+    def apply(self, target: pb2.Filter) -> None:
+        conditions = list(reversed(self.conditions))
+        condition = conditions[0]
+        for right in conditions[1:]:
+            left = condition
+            condition = pb2.Expression()
+            condition.unresolved_function.function_name = "and"
+            condition.unresolved_function.arguments.extend([left, right])
+        target.condition.CopyFrom(condition)
+
+
+_COLLAPSE: Dict[str, type] = {
+    "with_columns": _WithColumns,
+    "with_columns_renamed": _WithColumnsRenamed,
+    "drop": _Drop,
+    "filter": _Filter,
+}
+
+
+def _collapse(relation: pb2.Relation, referenced: Set[int]) -> int:
+    """
+    Collapse the chain of relations of the same kind starting at `relation` into `relation`, and
+    return the number of relations removed.
+    """
+    kind = relation.WhichOneof("rel_type")
+    if kind not in _COLLAPSE:
+        return 0
+    op = getattr(relation, kind)
+    collapse = _COLLAPSE[kind](op)
+    collapsed = 0
+    bottom = op
+    while (
+        bottom.input.WhichOneof("rel_type") == kind
+        and bottom.input.common.plan_id not in referenced
+        and collapse.add(getattr(bottom.input, kind))
+    ):
+        bottom = getattr(bottom.input, kind)
+        collapsed += 1
+    if collapsed > 0:
+        # The input is copied out first, since it is nested in the relations it replaces.
+        input = pb2.Relation()
+        input.CopyFrom(bottom.input)
+        collapse.apply(op)
+        op.input.CopyFrom(input)
+    return collapsed
+
+
+def optimize_plan(message: google.protobuf.message.Message) -> int:
+    """
+    Collapse the chains of `withColumns`, `withColumnsRenamed`, `drop` and `filter` relations
+    in the message, e.g. a plan or a request, into single relations, and return the number of
+    relations removed.
+
+    Relations are only collapsed when the result is the same: the relations removed must not be
+    referenced by their plan ids, and the expressions must not depend on the order the
+    relations are applied in. Otherwise the relations are kept as they are.
+    """
+    referenced = _referenced_plan_ids(message)
+    collapsed = 0
+    for m in _messages(message):
+        if isinstance(m, pb2.Relation):
+            collapsed += _collapse(m, referenced)
+    return collapsed
+
+
+def _relation_lines(relation: pb2.Relation) -> Iterator[Tuple[int, str]]:
+    stack: List[Tuple[int, pb2.Relation]] = [(0, relation)]
+    while len(stack) > 0:
+        depth, current = stack.pop()
+        kind = current.WhichOneof("rel_type")
+        if kind is None:
+            yield depth, "Unknown"
+            continue
+        op = getattr(current, kind)
+        name = "".join(part.capitalize() for part in kind.split("_"))
+        details = ""
+        if kind == "with_columns":
+            details = " [" + ", ".join(n for a in op.aliases for n in a.name) + "]"
+        elif kind == "with_columns_renamed":
+            details = (
+                " [" + ", ".join(f"{r.col_name} AS {r.new_col_name}" for r in op.renames) + "]"
+            )
+        elif kind == "drop":
+            details = " [" + ", ".join(op.column_names) + "]"
+        elif kind == "read" and op.HasField("named_table"):
+            details = " " + op.named_table.unparsed_identifier
+        yield depth, f"{name}{details} #{current.common.plan_id}"
+
+        children = []
+        for field, value in op.ListFields():
+            if field.message_type is not None and field.message_type.name == "Relation":
+                if is_repeated(field):
+                    children.extend(value)
+                else:
+                    children.append(value)
+        stack.extend((depth + 1, child) for child in reversed(children))
+
+
+def plan_string(relation: pb2.Relation) -> str:
+    """Return the relations of a plan as a tree, one relation per line."""
+    lines = []
+    for depth, line in _relation_lines(relation):
+        lines.append(("   " * (depth - 1) + "+- " if depth > 0 else "") + line)
+    return "\n".join(lines)
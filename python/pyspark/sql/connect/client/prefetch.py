@@ -0,0 +1,77 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import queue
+import threading
+from typing import Any, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Kinds of the items passed from the background thread to the consumer.
+_ITEM = 0
+_END = 1
+_ERROR = 2
+
+
+def prefetch(iterator: Iterator[T], max_pending: int, name: str) -> Iterator[T]:
+    """
+    Iterate over `iterator` in a background thread, which runs ahead of the consumer by at most
+    `max_pending` items.
+
+    Errors raised by `iterator` are re-raised to the consumer in order. When the consumer stops
+    iterating early, the background thread stops after the item it is currently waiting for.
+    The background thread closes `iterator` when it stops, so that for example a reattachable
+    execution is released.
+    """
+    pending: "queue.Queue[Tuple[int, Any]]" = queue.Queue(max_pending)
+    stopped = threading.Event()
+
+    def put(kind: int, value: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                pending.put((kind, value), timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def run() -> None:
+        try:
+            for item in iterator:
+                if not put(_ITEM, item):
+                    return
+            put(_END, None)
+        except BaseException as e:
+            put(_ERROR, e)
+        finally:
+            # Only this thread may call into `iterator`, a generator cannot be closed while
+            # another thread is running it.
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            kind, value = pending.get()
+            if kind == _END:
+                return
+            elif kind == _ERROR:
+                raise value
+            yield value
+    finally:
+        stopped.set()
@@ -14,15 +14,29 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from pyspark.sql.connect.client.retries import Retrying, RetryException
+from pyspark.sql.connect.client.retries import AsyncRetrying, Retrying, RetryException
 from pyspark.sql.connect.utils import check_dependencies
 
 check_dependencies(__name__)
 
+import asyncio
 from threading import RLock
 import uuid
 from collections.abc import Generator
-from typing import Optional, Any, Iterator, Iterable, Tuple, Callable, cast, Type, ClassVar
+from typing import (
+    Optional,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Iterator,
+    Iterable,
+    Tuple,
+    Callable,
+    cast,
+    Type,
+    ClassVar,
+    Set,
+)
 from concurrent.futures import ThreadPoolExecutor
 import os
 
@@ -285,44 +299,14 @@ class ExecutePlanResponseReattachableIterator(Generator):
             raise e
 
     def _create_reattach_execute_request(self) -> pb2.ReattachExecuteRequest:
-        server_side_session_id = (
-            None
-            if not self._initial_request.client_observed_server_side_session_id
-            else self._initial_request.client_observed_server_side_session_id
+        return _create_reattach_execute_request(
+            self._initial_request, self._last_returned_response_id
         )
-        reattach = pb2.ReattachExecuteRequest(
-            session_id=self._initial_request.session_id,
-            client_observed_server_side_session_id=server_side_session_id,
-            user_context=self._initial_request.user_context,
-            operation_id=self._initial_request.operation_id,
-        )
-
-        if self._initial_request.client_type:
-            reattach.client_type = self._initial_request.client_type
-
-        if self._last_returned_response_id:
-            reattach.last_response_id = self._last_returned_response_id
-
-        return reattach
 
     def _create_release_execute_request(
         self, until_response_id: Optional[str]
     ) -> pb2.ReleaseExecuteRequest:
-        release = pb2.ReleaseExecuteRequest(
-            session_id=self._initial_request.session_id,
-            user_context=self._initial_request.user_context,
-            operation_id=self._initial_request.operation_id,
-        )
-
-        if self._initial_request.client_type:
-            release.client_type = self._initial_request.client_type
-
-        if not until_response_id:
-            release.release_all.CopyFrom(pb2.ReleaseExecuteRequest.ReleaseAll())
-        else:
-            release.release_until.response_id = until_response_id
-
-        return release
+        return _create_release_execute_request(self._initial_request, until_response_id)
 
     def throw(self, type: Any = None, value: Any = None, traceback: Any = None) -> Any:
         super().throw(type, value, traceback)
@@ -333,3 +317,242 @@ class ExecutePlanResponseReattachableIterator(Generator):
 
     def __del__(self) -> None:
         return self.close()
+
+
+class AsyncExecutePlanResponseReattachableIterator:
+    """
+    Version of :class:`ExecutePlanResponseReattachableIterator` for asyncio, which iterates over
+    the ExecutePlanResponses of an ExecutePlan call made with a `grpc.aio` stub.
+
+    It reattaches and retries in the same way. The ReleaseExecute RPCs are sent by tasks of the
+    running event loop instead of a thread pool.
+    """
+
+    # The pending ReleaseExecute tasks, so that they are not garbage collected before they finish.
+    _release_tasks: ClassVar[Set["asyncio.Task[None]"]] = set()
+
+    def __init__(
+        self,
+        request: pb2.ExecutePlanRequest,
+        stub: grpc_lib.SparkConnectServiceStub,
+        retrying: Callable[[], AsyncRetrying],
+        metadata: Iterable[Tuple[str, str]],
+    ):
+        # The event loop the ReleaseExecute RPCs are sent in.
+        self._loop = asyncio.get_running_loop()
+        self._request = request
+        self._retrying = retrying
+        if request.operation_id:
+            self._operation_id = request.operation_id
+        else:
+            # Add operation id, if not present, see ExecutePlanResponseReattachableIterator.
+            self._operation_id = str(uuid.uuid4())
+
+        self._stub = stub
+        request.request_options.append(
+            pb2.ExecutePlanRequest.RequestOption(
+                reattach_options=pb2.ReattachOptions(reattachable=True)
+            )
+        )
+        request.operation_id = self._operation_id
+        self._initial_request = request
+
+        # ResponseId of the last response returned by __anext__()
+        self._last_returned_response_id: Optional[str] = None
+
+        # True after ResponseComplete message was seen in the stream.
+        self._result_complete = False
+
+        self._metadata = metadata
+        self._iterator: Optional[AsyncIterator[pb2.ExecutePlanResponse]] = self._stub.ExecutePlan(
+            self._initial_request, metadata=metadata
+        ).__aiter__()
+
+        # Current item from this iterator.
+        self._current: Optional[pb2.ExecutePlanResponse] = None
+
+    def __aiter__(self) -> "AsyncExecutePlanResponseReattachableIterator":
+        return self
+
+    async def __anext__(self) -> pb2.ExecutePlanResponse:
+        # will trigger reattach in case the stream completed without result_complete
+        if not await self._has_next():
+            raise StopAsyncIteration()
+
+        ret = self._current
+        assert ret is not None
+
+        self._last_returned_response_id = ret.response_id
+        if ret.HasField("result_complete"):
+            self._release_all()
+        else:
+            self._release_until(self._last_returned_response_id)
+        self._current = None
+        return ret
+
+    async def _has_next(self) -> bool:
+        if self._result_complete:
+            # After response complete response
+            return False
+        else:
+            try:
+                async for attempt in self._retrying():
+                    with attempt:
+                        if self._current is None:
+                            self._current = await self._call_next()
+
+                        has_next = self._current is not None
+
+                        # Graceful reattach, see ExecutePlanResponseReattachableIterator.
+                        if not self._result_complete and not has_next:
+                            while not has_next:
+                                # unset iterator for new ReattachExecute to be called in _call_next
+                                self._iterator = None
+                                # shouldn't change
+                                assert not self._result_complete
+                                self._current = await self._call_next()
+                                has_next = self._current is not None
+                        return has_next
+            except Exception as e:
+                self._release_all()
+                raise e
+            return False
+
+    def _release_until(self, until_response_id: str) -> None:
+        """
+        Inform the server to release the buffered execution results until and including given
+        result, without waiting for the RPC.
+        """
+        if self._result_complete:
+            return
+
+        self._release(_create_release_execute_request(self._initial_request, until_response_id))
+
+    def _release_all(self) -> None:
+        """
+        Inform the server to release the execution, without waiting for the RPC.
+        """
+        if self._result_complete:
+            return
+
+        self._release(_create_release_execute_request(self._initial_request, None))
+        self._result_complete = True
+
+    def _release(self, request: pb2.ReleaseExecuteRequest) -> None:
+        async def target() -> None:
+            try:
+                async for attempt in self._retrying():
+                    with attempt:
+                        await self._stub.ReleaseExecute(request, metadata=self._metadata)
+            except Exception as e:
+                logger.warn(f"ReleaseExecute failed with exception: {e}.")
+
+        task = asyncio.get_running_loop().create_task(target())
+        self._release_tasks.add(task)
+        task.add_done_callback(self._release_tasks.discard)
+
+    async def _call_next(self) -> Optional[pb2.ExecutePlanResponse]:
+        """
+        Return the next response of the iterator, or None if it ended. If this fails with this
+        operationId not existing on the server, this means that the initial ExecutePlan request
+        didn't even reach the server. In that case, attempt to start again with ExecutePlan.
+
+        Called inside retry block, so retryable failure will get handled upstream.
+        """
+        if self._iterator is None:
+            # we get a new iterator with ReattachExecute if it was unset.
+            self._iterator = self._stub.ReattachExecute(
+                _create_reattach_execute_request(
+                    self._initial_request, self._last_returned_response_id
+                ),
+                metadata=self._metadata,
+            ).__aiter__()
+
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            return None
+        except grpc.RpcError as e:
+            status = rpc_status.from_call(cast(grpc.Call, e))
+            if status is not None and (
+                "INVALID_HANDLE.OPERATION_NOT_FOUND" in status.message
+                or "INVALID_HANDLE.SESSION_NOT_FOUND" in status.message
+            ):
+                if self._last_returned_response_id is not None:
+                    raise PySparkRuntimeError(
+                        errorClass="RESPONSE_ALREADY_RECEIVED",
+                        messageParameters={},
+                    )
+                # Try a new ExecutePlan, and throw upstream for retry.
+                self._iterator = self._stub.ExecutePlan(
+                    self._initial_request, metadata=self._metadata
+                ).__aiter__()
+                raise RetryException()
+            else:
+                # Remove the iterator, so that a new one will be created after retry.
+                self._iterator = None
+                raise e
+        except Exception as e:
+            # Remove the iterator, so that a new one will be created after retry.
+            self._iterator = None
+            raise e
+
+    async def aclose(self) -> None:
+        """
+        Release the execution if not all of its responses were returned, e.g. the caller stopped
+        iterating or was cancelled, and close the response stream.
+        """
+        self._release_all()
+        if self._iterator is not None:
+            iterator, self._iterator = self._iterator, None
+            await cast(AsyncGenerator[pb2.ExecutePlanResponse, None], iterator).aclose()
+
+    def __del__(self) -> None:
+        # Like the synchronous iterator, release the execution if the iterator is dropped without
+        # being closed before all of its responses were returned.
+        if not self._result_complete and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._release_all)
+
+
+def _create_reattach_execute_request(
+    initial_request: pb2.ExecutePlanRequest, last_returned_response_id: Optional[str]
+) -> pb2.ReattachExecuteRequest:
+    server_side_session_id = (
+        None
+        if not initial_request.client_observed_server_side_session_id
+        else initial_request.client_observed_server_side_session_id
+    )
+    reattach = pb2.ReattachExecuteRequest(
+        session_id=initial_request.session_id,
+        client_observed_server_side_session_id=server_side_session_id,
+        user_context=initial_request.user_context,
+        operation_id=initial_request.operation_id,
+    )
+
+    if initial_request.client_type:
+        reattach.client_type = initial_request.client_type
+
+    if last_returned_response_id:
+        reattach.last_response_id = last_returned_response_id
+
+    return reattach
+
+
+def _create_release_execute_request(
+    initial_request: pb2.ExecutePlanRequest, until_response_id: Optional[str]
+) -> pb2.ReleaseExecuteRequest:
+    release = pb2.ReleaseExecuteRequest(
+        session_id=initial_request.session_id,
+        user_context=initial_request.user_context,
+        operation_id=initial_request.operation_id,
+    )
+
+    if initial_request.client_type:
+        release.client_type = initial_request.client_type
+
+    if not until_response_id:
+        release.release_all.CopyFrom(pb2.ReleaseExecuteRequest.ReleaseAll())
+    else:
+        release.release_until.response_id = until_response_id
+
+    return release
@@ -15,11 +15,12 @@
 # limitations under the License.
 #
 
+import asyncio
 import grpc
 import random
 import time
 import typing
-from typing import Optional, Callable, Generator, List, Type
+from typing import AsyncGenerator, Awaitable, Optional, Callable, Generator, List, Type
 from types import TracebackType
 from pyspark.sql.connect.logging import logger
 from pyspark.errors import PySparkRuntimeError, RetriesExceeded
@@ -208,13 +209,19 @@ class Retrying:
             )
         return self._exception
 
-    def _wait(self) -> None:
+    def _next_wait_time(self) -> Optional[int]:
+        """
+        Returns
+        -------
+            Time (in milliseconds) to wait until the next attempt, or None if it can be made
+            immediately. Raises RetriesExceeded if no policy allows more retries.
+        """
         exception = self._last_exception()
 
         if isinstance(exception, RetryException):
             # Considered immediately retriable
             logger.debug(f"Got error: {repr(exception)}. Retrying.")
-            return
+            return None
 
         # Attempt to find a policy to wait with
         for policy in self._policies:
@@ -227,14 +234,17 @@ class Retrying:
                     f"Got error: {repr(exception)}. "
                     + f"Will retry after {wait_time} ms (policy: {policy.name})"
                 )
-
-                self._sleep(wait_time / 1000)
-                return
+                return wait_time
 
         # Exceeded retries
         logger.debug(f"Given up on retrying. error: {repr(exception)}")
         raise RetriesExceeded(errorClass="RETRIES_EXCEEDED", messageParameters={}) from exception
 
+    def _wait(self) -> None:
+        wait_time = self._next_wait_time()
+        if wait_time is not None:
+            self._sleep(wait_time / 1000)
+
     def __iter__(self) -> Generator[AttemptManager, None, None]:
         """
         Generator function to wrap the exception producing code block.
@@ -252,6 +262,36 @@ class Retrying:
             yield AttemptManager(self)
 
 
+class AsyncRetrying(Retrying):
+    """
+    Version of :class:`Retrying` for asyncio, which waits between the attempts without blocking
+    the event loop.
+
+    The usage of the class should be as follows:
+    async for attempt in AsyncRetrying(...):
+        with attempt:
+            Do something that can throw exception
+    """
+
+    def __init__(
+        self,
+        policies: typing.Union[RetryPolicy, typing.Iterable[RetryPolicy]],
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        super().__init__(policies)
+        self._async_sleep = sleep
+
+    async def __aiter__(self) -> AsyncGenerator[AttemptManager, None]:
+        # First attempt is free, no need to do waiting.
+        yield AttemptManager(self)
+
+        while not self._done:
+            wait_time = self._next_wait_time()
+            if wait_time is not None:
+                await self._async_sleep(wait_time / 1000)
+            yield AttemptManager(self)
+
+
 class RetryException(Exception):
     """
     An exception that can be thrown upstream when inside retry and which is always retryable
@@ -0,0 +1,247 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from pyspark.sql.connect.utils import check_dependencies
+
+check_dependencies(__name__)
+
+import abc
+import bisect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = [
+    "TelemetrySink",
+    "Histogram",
+    "HistogramSink",
+    "PrometheusTextFileSink",
+]
+
+# The duration of RPCs to the server, until the last response of streaming RPCs was received.
+RPC_SECONDS = "spark_connect_client_rpc_seconds"
+# The time until the first response of streaming RPCs was received, i.e. mostly server time.
+RPC_FIRST_RESPONSE_SECONDS = "spark_connect_client_rpc_first_response_seconds"
+# The time waited before retrying a failed RPC.
+RETRY_WAIT_SECONDS = "spark_connect_client_retry_wait_seconds"
+# The size of the Arrow batches received.
+ARROW_BATCH_BYTES = "spark_connect_client_arrow_batch_bytes"
+# The time spent decoding the Arrow batches received.
+ARROW_DECODE_SECONDS = "spark_connect_client_arrow_decode_seconds"
+# The time spent converting the results to pandas DataFrames.
+PANDAS_CONVERSION_SECONDS = "spark_connect_client_pandas_conversion_seconds"
+
+# The RPCs returning a stream of responses.
+_STREAMING_RPCS = frozenset(["ExecutePlan", "ReattachExecute"])
+
+
+class TelemetrySink(abc.ABC):
+    """
+    Receives the measurements of a :class:`SparkConnectClient`, see
+    :meth:`SparkConnectClient.enable_telemetry`.
+
+    Subclasses export the measurements, e.g. by recording them with the histograms of an
+    OpenTelemetry meter, or by aggregating them like :class:`HistogramSink`. Measurements are
+    recorded by the threads executing queries, so sinks must be thread-safe and fast.
+    """
+
+    @abc.abstractmethod
+    def record(self, name: str, value: float, attributes: Mapping[str, str]) -> None:
+        """
+        Record a measurement of the metric `name`, such as the duration of an RPC in seconds,
+        with the attributes distinguishing it from other measurements of the same metric.
+        """
+        pass
+
+    def flush(self) -> None:
+        """Export the measurements recorded so far, called when the client is closed."""
+        pass
+
+
+class Histogram:
+    """A histogram counting the values observed in buckets with the given upper bounds."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        # The last bucket counts the values larger than all bounds.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self) -> List[int]:
+        """Return the number of values lower than or equal to each bound, and in total."""
+        counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+
+# From 1 ms to about 1 minute, and from 1 KiB to 1 GiB.
+_SECONDS_BOUNDS = [0.001 * 2**i for i in range(17)]
+_BYTES_BOUNDS = [1024.0 * 4**i for i in range(11)]
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if len(labels) == 0:
+        return ""
+    escaped = [
+        (k, v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for k, v in labels
+    ]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class HistogramSink(TelemetrySink):
+    """
+    Aggregates the measurements into a histogram per metric and attributes, in memory. Durations
+    are counted in buckets from 1 ms to about a minute, sizes in buckets from 1 KiB to 1 GiB.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+
+    def record(self, name: str, value: float, attributes: Mapping[str, str]) -> None:
+        key = (name, tuple(sorted(attributes.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = _BYTES_BOUNDS if name.endswith("_bytes") else _SECONDS_BOUNDS
+                histogram = self._histograms[key] = Histogram(bounds)
+            histogram.observe(value)
+
+    def histograms(self, name: str) -> Dict[Tuple[Tuple[str, str], ...], Histogram]:
+        """Return the histograms of the metric `name` by their sorted attributes."""
+        with self._lock:
+            return {labels: h for (n, labels), h in self._histograms.items() if n == name}
+
+    def to_prometheus(self) -> str:
+        """Return the histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            last_name = None
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name != last_name:
+                    lines.append(f"# TYPE {name} histogram")
+                    last_name = name
+                counts = histogram.cumulative_counts()
+                bounds = [_format_value(b) for b in histogram.bounds] + ["+Inf"]
+                for bound, count in zip(bounds, counts):
+                    bucket_labels = _format_labels(list(labels) + [("le", bound)])
+                    lines.append(f"{name}_bucket{bucket_labels} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return "".join(line + "\n" for line in lines)
+
+
+class PrometheusTextFileSink(HistogramSink):
+    """
+    Aggregates the measurements like :class:`HistogramSink`, and writes them to the file `path`
+    in the Prometheus text exposition format, e.g. for the textfile collector of the node
+    exporter. The file is replaced at most every `interval` seconds while measurements are
+    recorded, and when the sink is flushed.
+    """
+
+    def __init__(self, path: str, interval: float = 10.0):
+        super().__init__()
+        self._path = path
+        self._interval = interval
+        self._last_write = time.monotonic()
+
+    def record(self, name: str, value: float, attributes: Mapping[str, str]) -> None:
+        super().record(name, value, attributes)
+        now = time.monotonic()
+        if now - self._last_write >= self._interval:
+            self._last_write = now
+            self.flush()
+
+    def flush(self) -> None:
+        # Replace the file at once so that it is never read partially written.
+        tmp_path = f"{self._path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, self._path)
+
+
+class TelemetryStub:
+    """Wraps a Spark Connect service stub to record the duration of its RPCs."""
+
+    def __init__(self, stub: Any, sink: TelemetrySink):
+        self.stub = stub
+        self._sink = sink
+
+    def __getattr__(self, rpc: str) -> Any:
+        method = getattr(self.stub, rpc)
+        if not callable(method):
+            return method
+        attributes = {"rpc": rpc}
+        sink = self._sink
+
+        if rpc in _STREAMING_RPCS:
+
+            def call_streaming(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                start = time.perf_counter()
+                return _timed_responses(method(*args, **kwargs), start, sink, attributes)
+
+            return call_streaming
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                sink.record(RPC_SECONDS, time.perf_counter() - start, attributes)
+
+        return call
+
+
+def _timed_responses(
+    responses: Any, start: float, sink: TelemetrySink, attributes: Mapping[str, str]
+) -> Iterator[Any]:
+    first = True
+    try:
+        for response in responses:
+            if first:
+                sink.record(RPC_FIRST_RESPONSE_SECONDS, time.perf_counter() - start, attributes)
+                first = False
+            yield response
+    finally:
+        sink.record(RPC_SECONDS, time.perf_counter() - start, attributes)
+
+
+def timed_sleep(
+    sink: Optional[TelemetrySink], sleep: Callable[[float], Any]
+) -> Callable[[float], Any]:
+    """Return `sleep` recording the time waited before retries with the sink, if any."""
+    if sink is None:
+        return sleep
+
+    def record_and_sleep(seconds: float) -> Any:
+        sink.record(RETRY_WAIT_SECONDS, seconds, {})
+        return sleep(seconds)
+
+    return record_and_sleep
@@ -26,7 +26,6 @@ import decimal
 import pyarrow as pa
 
 from pyspark.sql.types import (
-    _create_row,
     Row,
     DataType,
     TimestampType,
@@ -46,9 +45,18 @@ from pyspark.sql.types import (
 
 from pyspark.storagelevel import StorageLevel
 import pyspark.sql.connect.proto as pb2
+from pyspark.sql.conversion import ArrowRowSequence, ArrowTableToRowsConversion  # noqa: F401
 from pyspark.sql.pandas.types import to_arrow_schema, _dedup_names, _deduplicate_field_names
 
-from typing import Any, Callable, Sequence, List, TYPE_CHECKING
+from typing import (
+    Any,
+    Callable,
+    Optional,
+    Sequence,
+    List,
+    Union,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
     from pyspark.sql.connect.dataframe import DataFrame
@@ -322,230 +330,197 @@ class LocalDataToArrowConversion:
             return lambda value: value
 
     @staticmethod
-    def convert(data: Sequence[Any], schema: StructType) -> "pa.Table":
-        assert isinstance(data, list) and len(data) > 0
-
-        assert schema is not None and isinstance(schema, StructType)
-
-        column_names = schema.fieldNames()
-
-        column_convs = [
-            LocalDataToArrowConversion._create_converter(
-                field.dataType,
-                field.nullable,
-            )
-            for field in schema.fields
-        ]
-
-        pylist: List[List] = [[] for _ in range(len(column_names))]
-
-        for item in data:
-            if (
-                not isinstance(item, Row)
-                and not isinstance(item, tuple)  # inherited namedtuple
-                and hasattr(item, "__dict__")
-            ):
-                item = item.__dict__
-            if isinstance(item, dict):
-                for i, col in enumerate(column_names):
-                    pylist[i].append(column_convs[i](item.get(col)))
-            else:
-                if len(item) != len(column_names):
-                    raise PySparkValueError(
-                        errorClass="AXIS_LENGTH_MISMATCH",
-                        messageParameters={
-                            "expected_length": str(len(column_names)),
-                            "actual_length": str(len(item)),
-                        },
-                    )
-
-                for i in range(len(column_names)):
-                    pylist[i].append(column_convs[i](item[i]))
-
-        pa_schema = to_arrow_schema(
-            StructType(
-                [
-                    StructField(
-                        field.name, _deduplicate_field_names(field.dataType), field.nullable
-                    )
-                    for field in schema.fields
-                ]
-            )
-        )
-
-        return pa.Table.from_arrays(pylist, schema=pa_schema)
-
-
-class ArrowTableToRowsConversion:
-    """
-    Conversion from Arrow Table to Rows.
-    Currently, only :class:`DataFrame` in Spark Connect can use this class.
-    """
-
-    @staticmethod
-    def _need_converter(dataType: DataType) -> bool:
-        if isinstance(dataType, NullType):
-            return True
-        elif isinstance(dataType, StructType):
-            return True
-        elif isinstance(dataType, ArrayType):
-            return ArrowTableToRowsConversion._need_converter(dataType.elementType)
-        elif isinstance(dataType, MapType):
-            # Different from PySpark, here always needs conversion,
-            # since the input from Arrow is a list of tuples.
-            return True
-        elif isinstance(dataType, BinaryType):
-            return True
-        elif isinstance(dataType, (TimestampType, TimestampNTZType)):
-            # Always remove the time zone info for now
-            return True
-        elif isinstance(dataType, UserDefinedType):
-            return True
-        elif isinstance(dataType, VariantType):
-            return True
-        else:
-            return False
-
-    @staticmethod
-    def _create_converter(dataType: DataType) -> Callable:
+    def _create_column_converter(
+        dataType: DataType,
+        nullable: bool,
+        arrowType: "pa.DataType",
+    ) -> Callable[[Sequence[Any]], "pa.Array"]:
+        """
+        Create a converter of a whole column to an Arrow array. The values of the common types
+        are converted in bulk by PyArrow, the others by the converter of
+        :meth:`_create_converter` value by value.
+        """
         assert dataType is not None and isinstance(dataType, DataType)
+        assert isinstance(nullable, bool)
 
-        if not ArrowTableToRowsConversion._need_converter(dataType):
-            return lambda value: value
-
-        if isinstance(dataType, NullType):
-            return lambda value: None
-
-        elif isinstance(dataType, StructType):
-            field_names = dataType.names
-            dedup_field_names = _dedup_names(field_names)
-
-            field_convs = [
-                ArrowTableToRowsConversion._create_converter(f.dataType) for f in dataType.fields
-            ]
-
-            def convert_struct(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, dict)
+        def to_array(values: Union[Sequence[Any], "pa.Array"]) -> "pa.Array":
+            arr = values if isinstance(values, pa.Array) else pa.array(values, type=arrowType)
+            if not nullable and arr.null_count > 0:
+                raise PySparkValueError(f"input for {dataType} must not be None")
+            return arr
 
-                    _values = [
-                        field_convs[i](value.get(name, None))
-                        for i, name in enumerate(dedup_field_names)
-                    ]
-                    return _create_row(field_names, _values)
+        if not LocalDataToArrowConversion._need_converter(dataType):
+            return to_array
 
-            return convert_struct
-
-        elif isinstance(dataType, ArrayType):
-            element_conv = ArrowTableToRowsConversion._create_converter(dataType.elementType)
+        elif isinstance(dataType, TimestampType):
 
-            def convert_array(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, list)
-                    return [element_conv(v) for v in value]
+            def convert_timestamp(values: Sequence[Any]) -> "pa.Array":
+                # Naive datetimes are in local time, unlike in PyArrow.
+                arr = LocalDataToArrowConversion._local_timestamps_to_utc(values)
+                if arr is not None:
+                    return to_array(arr)
+                return to_array(
+                    [None if v is None else v.astimezone(datetime.timezone.utc) for v in values]
+                )
 
-            return convert_array
+            return convert_timestamp
 
-        elif isinstance(dataType, MapType):
-            key_conv = ArrowTableToRowsConversion._create_converter(dataType.keyType)
-            value_conv = ArrowTableToRowsConversion._create_converter(dataType.valueType)
+        elif isinstance(dataType, TimestampNTZType):
+            conv = LocalDataToArrowConversion._create_converter(dataType, nullable)
 
-            def convert_map(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, list)
-                    assert all(isinstance(t, tuple) and len(t) == 2 for t in value)
-                    return dict((key_conv(t[0]), value_conv(t[1])) for t in value)
+            def convert_timestamp_ntz(values: Sequence[Any]) -> "pa.Array":
+                # PyArrow would convert aware datetimes to UTC, let the converter reject them.
+                if any(getattr(v, "tzinfo", None) is not None for v in values):
+                    return to_array([conv(v) for v in values])
+                return to_array(values)
 
-            return convert_map
+            return convert_timestamp_ntz
 
         elif isinstance(dataType, BinaryType):
+            return to_array
 
-            def convert_binary(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, bytes)
-                    return bytearray(value)
+        elif isinstance(dataType, DecimalType):
 
-            return convert_binary
+            def convert_decimal(values: Sequence[Any]) -> "pa.Array":
+                try:
+                    return to_array(values)
+                except pa.ArrowException:
+                    # Convert Decimal('NaN') to None
+                    return to_array([None if v is not None and v.is_nan() else v for v in values])
 
-        elif isinstance(dataType, TimestampType):
+            return convert_decimal
 
-            def convert_timestample(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, datetime.datetime)
-                    return value.astimezone().replace(tzinfo=None)
+        conv = LocalDataToArrowConversion._create_converter(dataType, nullable)
 
-            return convert_timestample
+        if isinstance(dataType, StringType):
 
-        elif isinstance(dataType, TimestampNTZType):
+            def convert_string(values: Sequence[Any]) -> "pa.Array":
+                if all(v is None or type(v) is str for v in values):
+                    return to_array(values)
+                return to_array([conv(v) for v in values])
 
-            def convert_timestample_ntz(value: Any) -> Any:
-                if value is None:
-                    return None
-                else:
-                    assert isinstance(value, datetime.datetime)
-                    return value
+            return convert_string
 
-            return convert_timestample_ntz
+        else:
+            # e.g. structs, maps, user defined types and variants
+            return lambda values: pa.array([conv(v) for v in values], type=arrowType)
 
-        elif isinstance(dataType, UserDefinedType):
-            udt: UserDefinedType = dataType
+    @staticmethod
+    def _local_timestamps_to_utc(values: Sequence[Any]) -> Optional["pa.Array"]:
+        """
+        Convert naive datetimes in local time to a UTC timestamp array, looking up the UTC offset
+        once per distinct hour instead of once per value. Return None if there are aware
+        datetimes, or if the offset changes within one of the hours, to convert value by value.
+        """
+        import pyarrow.compute as pc
+
+        if not all(v is None or v.tzinfo is None for v in values):
+            return None
+
+        try:
+            naive = pa.array(values, type=pa.timestamp("us"))
+            hours = pc.floor_temporal(naive, unit="hour")
+            unique_hours = pc.unique(hours).drop_null()
+            if len(unique_hours) > len(values) // 4:
+                return None
 
-            conv = ArrowTableToRowsConversion._create_converter(udt.sqlType())
+            def offset(local: datetime.datetime) -> datetime.timedelta:
+                return local - local.astimezone(datetime.timezone.utc).replace(tzinfo=None)
 
-            def convert_udt(value: Any) -> Any:
-                if value is None:
+            offsets = []
+            for hour in unique_hours.to_pylist():
+                last = hour + datetime.timedelta(hours=1, microseconds=-1)
+                if offset(hour) != offset(last):
                     return None
-                else:
-                    return udt.deserialize(conv(value))
-
-            return convert_udt
+                offsets.append(offset(hour) // datetime.timedelta(microseconds=1))
+        except (OverflowError, ValueError, OSError):
+            return None
 
-        elif isinstance(dataType, VariantType):
+        hour_offsets = pc.take(pa.array(offsets, pa.int64()), pc.index_in(hours, unique_hours))
+        utc = pc.subtract(naive.cast(pa.int64()), hour_offsets)
+        return utc.cast(pa.timestamp("us", tz="UTC"))
 
-            def convert_variant(value: Any) -> Any:
-                if value is None:
-                    return None
-                elif (
-                    isinstance(value, dict)
-                    and all(key in value for key in ["value", "metadata"])
-                    and all(isinstance(value[key], bytes) for key in ["value", "metadata"])
+    @staticmethod
+    def _to_columns(rows: Sequence[Any], column_names: List[str]) -> List[List[Any]]:
+        """
+        Transpose the rows, i.e. tuples, Rows, dicts or objects, to columns.
+        """
+        if not all(issubclass(t, (tuple, list)) for t in set(map(type, rows))):
+            normalized = []
+            for row in rows:
+                if (
+                    not isinstance(row, Row)
+                    and not isinstance(row, tuple)  # inherited namedtuple
+                    and hasattr(row, "__dict__")
                 ):
-                    return VariantVal(value["value"], value["metadata"])
-                else:
-                    raise PySparkValueError(errorClass="MALFORMED_VARIANT")
-
-            return convert_variant
+                    row = row.__dict__
+                if isinstance(row, dict):
+                    row = tuple(row.get(col) for col in column_names)
+                normalized.append(row)
+            rows = normalized
+
+        lengths = set(map(len, rows))
+        if lengths != {len(column_names)}:
+            raise PySparkValueError(
+                errorClass="AXIS_LENGTH_MISMATCH",
+                messageParameters={
+                    "expected_length": str(len(column_names)),
+                    "actual_length": str(min(lengths - {len(column_names)})),
+                },
+            )
 
-        else:
-            return lambda value: value
+        # PyArrow converts lists much faster than tuples.
+        return list(map(list, zip(*rows)))
 
     @staticmethod
-    def convert(table: "pa.Table", schema: StructType) -> List[Row]:
-        assert isinstance(table, pa.Table)
+    def convert(data: Sequence[Any], schema: StructType, max_rows_per_batch: int = 0) -> "pa.Table":
+        """
+        Convert the rows to an Arrow table, column by column, and batch by batch of up to
+        `max_rows_per_batch` rows, or in a single batch if it is not positive, so that only the
+        Python objects of one batch are converted at a time.
+        """
+        assert isinstance(data, list) and len(data) > 0
 
         assert schema is not None and isinstance(schema, StructType)
 
-        field_converters = [
-            ArrowTableToRowsConversion._create_converter(f.dataType) for f in schema.fields
+        column_names = schema.fieldNames()
+
+        pa_schema = to_arrow_schema(
+            StructType(
+                [
+                    StructField(
+                        field.name, _deduplicate_field_names(field.dataType), field.nullable
+                    )
+                    for field in schema.fields
+                ]
+            )
+        )
+
+        column_convs = [
+            LocalDataToArrowConversion._create_column_converter(
+                field.dataType,
+                field.nullable,
+                pa_field.type,
+            )
+            for field, pa_field in zip(schema.fields, pa_schema)
         ]
 
-        columnar_data = [column.to_pylist() for column in table.columns]
+        if max_rows_per_batch <= 0:
+            max_rows_per_batch = len(data)
+
+        batches = []
+        for start in range(0, len(data), max_rows_per_batch):
+            columns = LocalDataToArrowConversion._to_columns(
+                data[start : start + max_rows_per_batch], column_names
+            )
+            batches.append(
+                pa.RecordBatch.from_arrays(
+                    [conv(column) for conv, column in zip(column_convs, columns)],
+                    schema=pa_schema,
+                )
+            )
 
-        rows: List[Row] = []
-        for i in range(0, table.num_rows):
-            values = [field_converters[j](columnar_data[j][i]) for j in range(table.num_columns)]
-            rows.append(_create_row(fields=schema.fieldNames(), values=values))
-        return rows
+        return pa.Table.from_batches(batches, schema=pa_schema)
 
 
 def storage_level_to_proto(storage_level: StorageLevel) -> pb2.StorageLevel:
@@ -28,6 +28,7 @@ check_dependencies(__name__)
 
 from typing import (
     Any,
+    AsyncIterator,
     Dict,
     Iterator,
     List,
@@ -71,7 +72,7 @@ from pyspark.errors import (
 from pyspark.util import PythonEvalType
 from pyspark.storagelevel import StorageLevel
 import pyspark.sql.connect.plan as plan
-from pyspark.sql.connect.conversion import ArrowTableToRowsConversion
+from pyspark.sql.connect.conversion import ArrowRowSequence, ArrowTableToRowsConversion
 from pyspark.sql.connect.group import GroupedData
 from pyspark.sql.connect.merge import MergeIntoWriter
 from pyspark.sql.connect.readwriter import DataFrameWriter, DataFrameWriterV2
@@ -670,7 +671,7 @@ class DataFrame(ParentDataFrame):
         return self.take(n)
 
     def take(self, num: int) -> List[Row]:
-        return self.limit(num).collect()
+        return self.limit(num)._collect()
 
     def join(
         self,
@@ -733,7 +734,7 @@ class DataFrame(ParentDataFrame):
         return res
 
     def tail(self, num: int) -> List[Row]:
-        return DataFrame(plan.Tail(child=self._plan, limit=num), session=self._session).collect()
+        return DataFrame(plan.Tail(child=self._plan, limit=num), session=self._session)._collect()
 
     def sort(
         self,
@@ -1748,16 +1749,39 @@ class DataFrame(ParentDataFrame):
         return sorted(attrs)
 
     def collect(self) -> List[Row]:
+        return self._collect()
+
+    def _collect(self) -> List[Row]:
+        table, schema = self._to_table()
+        return ArrowTableToRowsConversion.convert(table, self._verify_schema(table, schema))
+
+    def collectLazy(self) -> ArrowRowSequence:
+        """
+        Same as :meth:`collect`, but returns a read-only sequence of :class:`Row` backed by
+        the Arrow batches of the result instead of a list.
+
+        The :class:`Row` objects are created only when they are accessed, one batch at a
+        time, which reduces the memory usage of large results. This is only available with
+        Spark Connect.
+
+        .. versionadded:: 4.0.0
+
+        Returns
+        -------
+        :class:`ArrowRowSequence`
+            A sequence of rows. The underlying Arrow table is available as ``.table``.
+        """
         table, schema = self._to_table()
+        return ArrowRowSequence(table, self._verify_schema(table, schema))
 
+    def _verify_schema(self, table: "pa.Table", schema: Optional[StructType]) -> StructType:
         # not all datatypes are supported in arrow based collect
         # here always verify the schema by from_arrow_schema
         schema2 = from_arrow_schema(table.schema, prefer_timestamp_ntz=True)
         schema = schema or schema2
 
         assert schema is not None and isinstance(schema, StructType)
-
-        return ArrowTableToRowsConversion.convert(table, schema)
+        return schema
 
     def _to_table(self) -> Tuple["pa.Table", Optional[StructType]]:
         query = self._plan.to_proto(self._session.client)
@@ -1778,6 +1802,90 @@ class DataFrame(ParentDataFrame):
         self._execution_info = ei
         return pdf
 
+    async def collectAsync(self) -> List[Row]:
+        """
+        Same as :meth:`collect`, but awaits the result with asyncio instead of blocking.
+
+        Many actions can be awaited concurrently on one event loop, see
+        :class:`AsyncSparkConnectClient`. This is only available with Spark Connect.
+
+        .. versionadded:: 4.0.0
+        """
+        table, schema = await self._to_table_async()
+        return ArrowTableToRowsConversion.convert(table, self._verify_schema(table, schema))
+
+    async def countAsync(self) -> int:
+        """
+        Same as :meth:`count`, but awaits the result with asyncio instead of blocking.
+
+        .. versionadded:: 4.0.0
+        """
+        df = self.agg(F._invoke_function("count", F.lit(1)))  # type: ignore[operator]
+        table, _ = await df._to_table_async()
+        return table[0][0].as_py()
+
+    async def toArrowAsync(self) -> "pa.Table":
+        """
+        Same as :meth:`toArrow`, but awaits the result with asyncio instead of blocking.
+
+        .. versionadded:: 4.0.0
+        """
+        if self._cached_schema is None:
+            query = self._plan.to_proto(self._session.client)
+            self._cached_schema = await self._session.client.async_client.schema(query)
+        schema = to_arrow_schema(
+            self._cached_schema, error_on_duplicated_field_names_in_struct=True
+        )
+        table, _ = await self._to_table_async()
+        return table.cast(schema)
+
+    async def toPandasAsync(self) -> "PandasDataFrameLike":
+        """
+        Same as :meth:`toPandas`, but awaits the result with asyncio instead of blocking.
+
+        .. versionadded:: 4.0.0
+        """
+        query = self._plan.to_proto(self._session.client)
+        pdf, ei = await self._session.client.async_client.to_pandas(query, self._plan.observations)
+        self._execution_info = ei
+        return pdf
+
+    async def toLocalIteratorAsync(self) -> AsyncIterator[Row]:
+        """
+        Same as :meth:`toLocalIterator`, but returns an asynchronous iterator, which receives
+        the rows with asyncio as they are iterated over.
+
+        .. versionadded:: 4.0.0
+        """
+        query = self._plan.to_proto(self._session.client)
+
+        schema: Optional[StructType] = None
+        tables = self._session.client.async_client.to_table_as_iterator(
+            query, self._plan.observations
+        )
+        try:
+            async for schema_or_table in tables:
+                if isinstance(schema_or_table, StructType):
+                    assert schema is None
+                    schema = schema_or_table
+                else:
+                    assert isinstance(schema_or_table, pa.Table)
+                    table = schema_or_table
+                    if schema is None:
+                        schema = from_arrow_schema(table.schema, prefer_timestamp_ntz=True)
+                    for row in ArrowRowSequence(table, schema):
+                        yield row
+        finally:
+            # Release the execution right away once this iterator is closed early.
+            await tables.aclose()
+
+    async def _to_table_async(self) -> Tuple["pa.Table", Optional[StructType]]:
+        query = self._plan.to_proto(self._session.client)
+        table, schema, self._execution_info = await self._session.client.async_client.to_table(
+            query, self._plan.observations
+        )
+        return (table, schema)
+
     def transpose(self, indexColumn: Optional["ColumnOrName"] = None) -> ParentDataFrame:
         return DataFrame(
             plan.Transpose(self._plan, [F._to_col(indexColumn)] if indexColumn is not None else []),
@@ -1991,7 +2099,7 @@ class DataFrame(ParentDataFrame):
                 table = schema_or_table
                 if schema is None:
                     schema = from_arrow_schema(table.schema, prefer_timestamp_ntz=True)
-                yield from ArrowTableToRowsConversion.convert(table, schema)
+                yield from ArrowRowSequence(table, schema)
 
     def pandas_api(
         self, index_col: Optional[Union[str, List[str]]] = None
@@ -2171,6 +2279,12 @@ class DataFrame(ParentDataFrame):
                 messageParameters={"feature": "rdd"},
             )
 
+        def toArrowRDD(self, asRows: bool = False) -> "RDD[Any]":
+            raise PySparkNotImplementedError(
+                errorClass="NOT_IMPLEMENTED",
+                messageParameters={"feature": "toArrowRDD()"},
+            )
+
     @property
     def executionInfo(self) -> Optional["ExecutionInfo"]:
         return self._execution_info
@@ -38,7 +38,7 @@ from typing import (
 import functools
 import json
 import pickle
-from threading import Lock
+from threading import Lock, local
 from inspect import signature, isclass
 
 import pyarrow as pa
@@ -70,6 +70,8 @@ if TYPE_CHECKING:
 class LogicalPlan:
     _lock: Lock = Lock()
     _nextPlanId: int = 0
+    # The plans being generated in this thread, see _plan_into().
+    _generating = local()
 
     INDENT = 2
 
@@ -88,13 +90,59 @@ class LogicalPlan:
         return plan_id
 
     def _create_proto_relation(self) -> proto.Relation:
-        plan = proto.Relation()
+        targets = getattr(LogicalPlan._generating, "targets", None)
+        if targets is None:
+            plan = proto.Relation()
+        else:
+            # A plan generated directly by `child.plan(session)` inside the plan of its parent
+            # would be missing the subtrees that are still pending, see _plan_into().
+            assert id(self) in targets, "Use _plan_into() to generate the plan of a child."
+            plan = targets.pop(id(self))
         plan.common.plan_id = self._plan_id
         return plan
 
     def plan(self, session: "SparkConnectClient") -> proto.Relation:  # type: ignore[empty-body]
+        """
+        Generate the plan, starting from :meth:`_create_proto_relation`.
+
+        The plans of the children must be generated with :meth:`_plan_into`, never by calling
+        `child.plan(session)` directly: while a plan is being generated, the subtrees of the
+        children are only filled in after :meth:`plan` returns.
+        """
         ...
 
+    def _plan_into(self, relation: proto.Relation, session: "SparkConnectClient") -> None:
+        """
+        Generate the plan into `relation`, e.g. the input field of the relation of the parent plan.
+
+        Copying the relation returned by :meth:`plan` into the parent would copy the whole
+        subtree again at every level of the plan, which is quadratic in the depth of the plan.
+        Instead, :meth:`_create_proto_relation` hands out `relation` itself, so that the plan is
+        generated in place, and :meth:`plan` must return it.
+
+        When called from :meth:`plan`, the plan is only generated after the plan of the parent,
+        so that deep plans do not recurse. `relation` is complete once the outermost call returns.
+        """
+        generating = LogicalPlan._generating
+        pending = getattr(generating, "pending", None)
+        if pending is not None:
+            pending.append((self, relation))
+            return
+
+        generating.pending = pending = [(self, relation)]
+        generating.targets = targets = {}
+        try:
+            while len(pending) > 0:
+                node, target = pending.pop()
+                targets[id(node)] = target
+                plan = node.plan(session)
+                targets.pop(id(node), None)
+                if plan is not target:
+                    target.CopyFrom(plan)
+        finally:
+            generating.pending = None
+            generating.targets = None
+
     def command(self, session: "SparkConnectClient") -> proto.Command:  # type: ignore[empty-body]
         ...
 
@@ -102,7 +150,7 @@ class LogicalPlan:
         """This method is used to verify that the current logical plan
         can be serialized to Proto and back and afterwards is identical."""
         plan = proto.Plan()
-        plan.root.CopyFrom(self.plan(session))
+        self._plan_into(plan.root, session)
 
         serialized_plan = plan.SerializeToString()
         test_plan = proto.Plan()
@@ -122,7 +170,7 @@ class LogicalPlan:
             if enabled, the proto plan will be printed.
         """
         plan = proto.Plan()
-        plan.root.CopyFrom(self.plan(session))
+        self._plan_into(plan.root, session)
 
         if debug:
             print(plan)
@@ -368,14 +416,20 @@ class LocalRelation(LogicalPlan):
 
         self._schema = schema
 
+        # The Arrow IPC stream of the table, which is written once however often the plan is
+        # generated.
+        self._data: Optional[bytes] = None
+
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
         if self._table is not None:
-            sink = pa.BufferOutputStream()
-            with pa.ipc.new_stream(sink, self._table.schema) as writer:
-                for b in self._table.to_batches():
-                    writer.write_batch(b)
-            plan.local_relation.data = sink.getvalue().to_pybytes()
+            if self._data is None:
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, self._table.schema) as writer:
+                    for b in self._table.to_batches():
+                        writer.write_batch(b)
+                self._data = sink.getvalue().to_pybytes()
+            plan.local_relation.data = self._data
 
         if self._schema is not None:
             plan.local_relation.schema = self._schema
@@ -435,7 +489,7 @@ class ShowString(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.show_string.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.show_string.input, session)
         plan.show_string.num_rows = self.num_rows
         plan.show_string.truncate = self.truncate
         plan.show_string.vertical = self.vertical
@@ -451,7 +505,7 @@ class HtmlString(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.html_string.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.html_string.input, session)
         plan.html_string.num_rows = self.num_rows
         plan.html_string.truncate = self.truncate
         return plan
@@ -480,7 +534,7 @@ class Project(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.project.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.project.input, session)
         plan.project.expressions.extend([c.to_plan(session) for c in self._columns])
         return plan
 
@@ -520,7 +574,7 @@ class WithColumns(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.with_columns.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.with_columns.input, session)
 
         for i in range(0, len(self._columnNames)):
             alias = proto.Expression.Alias()
@@ -544,7 +598,7 @@ class WithWatermark(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.with_watermark.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.with_watermark.input, session)
         plan.with_watermark.event_time = self._event_time
         plan.with_watermark.delay_threshold = self._delay_threshold
         return plan
@@ -623,7 +677,7 @@ class Hint(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.hint.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.hint.input, session)
         plan.hint.name = self._name
         plan.hint.parameters.extend([param.to_plan(session) for param in self._parameters])
         return plan
@@ -637,7 +691,7 @@ class Filter(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.filter.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.filter.input, session)
         plan.filter.condition.CopyFrom(self.filter.to_plan(session))
         return plan
 
@@ -650,7 +704,7 @@ class Limit(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.limit.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.limit.input, session)
         plan.limit.limit = self.limit
         return plan
 
@@ -663,7 +717,7 @@ class Tail(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.tail.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.tail.input, session)
         plan.tail.limit = self.limit
         return plan
 
@@ -676,7 +730,7 @@ class Offset(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.offset.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.offset.input, session)
         plan.offset.offset = self.offset
         return plan
 
@@ -697,7 +751,7 @@ class Deduplicate(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.deduplicate.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.deduplicate.input, session)
         plan.deduplicate.all_columns_as_keys = self.all_columns_as_keys
         plan.deduplicate.within_watermark = self.within_watermark
         if self.column_names is not None:
@@ -723,7 +777,7 @@ class Sort(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.sort.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.sort.input, session)
         plan.sort.order.extend([c.to_plan(session).sort_order for c in self.columns])
         plan.sort.is_global = self.is_global
         return plan
@@ -743,7 +797,7 @@ class Drop(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.drop.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.drop.input, session)
         for c in self._columns:
             if isinstance(c, Column):
                 plan.drop.columns.append(c.to_plan(session))
@@ -772,7 +826,7 @@ class Sample(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.sample.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.sample.input, session)
         plan.sample.lower_bound = self.lower_bound
         plan.sample.upper_bound = self.upper_bound
         plan.sample.with_replacement = self.with_replacement
@@ -828,7 +882,7 @@ class Aggregate(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.aggregate.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.aggregate.input, session)
         plan.aggregate.grouping_expressions.extend(
             [c.to_plan(session) for c in self._grouping_cols]
         )
@@ -899,8 +953,8 @@ class Join(LogicalPlan):
 
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
-        plan.join.left.CopyFrom(self.left.plan(session))
-        plan.join.right.CopyFrom(self.right.plan(session))
+        self.left._plan_into(plan.join.left, session)
+        self.right._plan_into(plan.join.right, session)
         if self.on is not None:
             if not isinstance(self.on, list):
                 if isinstance(self.on, str):
@@ -967,8 +1021,8 @@ class AsOfJoin(LogicalPlan):
 
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
-        plan.as_of_join.left.CopyFrom(self.left.plan(session))
-        plan.as_of_join.right.CopyFrom(self.right.plan(session))
+        self.left._plan_into(plan.as_of_join.left, session)
+        self.right._plan_into(plan.as_of_join.right, session)
 
         plan.as_of_join.left_as_of.CopyFrom(self.left_as_of.to_plan(session))
         plan.as_of_join.right_as_of.CopyFrom(self.right_as_of.to_plan(session))
@@ -1049,9 +1103,9 @@ class SetOperation(LogicalPlan):
         assert self._child is not None
         plan = self._create_proto_relation()
         if self._child is not None:
-            plan.set_op.left_input.CopyFrom(self._child.plan(session))
+            self._child._plan_into(plan.set_op.left_input, session)
         if self.other is not None:
-            plan.set_op.right_input.CopyFrom(self.other.plan(session))
+            self.other._plan_into(plan.set_op.right_input, session)
         if self.set_op == "union":
             plan.set_op.set_op_type = proto.SetOperation.SET_OP_TYPE_UNION
         elif self.set_op == "intersect":
@@ -1114,7 +1168,7 @@ class Repartition(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
         if self._child is not None:
-            plan.repartition.input.CopyFrom(self._child.plan(session))
+            self._child._plan_into(plan.repartition.input, session)
         plan.repartition.shuffle = self._shuffle
         plan.repartition.num_partitions = self._num_partitions
         return plan
@@ -1141,7 +1195,7 @@ class RepartitionByExpression(LogicalPlan):
         )
 
         if self._child is not None:
-            plan.repartition_by_expression.input.CopyFrom(self._child.plan(session))
+            self._child._plan_into(plan.repartition_by_expression.input, session)
         if self.num_partitions is not None:
             plan.repartition_by_expression.num_partitions = self.num_partitions
         return plan
@@ -1157,7 +1211,7 @@ class SubqueryAlias(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
         if self._child is not None:
-            plan.subquery_alias.input.CopyFrom(self._child.plan(session))
+            self._child._plan_into(plan.subquery_alias.input, session)
         plan.subquery_alias.alias = self._alias
         return plan
 
@@ -1176,9 +1230,9 @@ class WithRelations(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
         if self._child is not None:
-            plan.with_relations.root.CopyFrom(self._child.plan(session))
+            self._child._plan_into(plan.with_relations.root, session)
         for ref in self._references:
-            plan.with_relations.references.append(ref.plan(session))
+            ref._plan_into(plan.with_relations.references.add(), session)
         return plan
 
 
@@ -1216,13 +1270,7 @@ class SQL(LogicalPlan):
 
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         plan = self._create_proto_relation()
-        plan.sql.query = self._query
-
-        if self._args is not None and len(self._args) > 0:
-            plan.sql.pos_arguments.extend([arg.to_plan(session) for arg in self._args])
-        if self._named_args is not None and len(self._named_args) > 0:
-            for k, arg in self._named_args.items():
-                plan.sql.named_arguments[k].CopyFrom(arg.to_plan(session))
+        sql_plan = plan
 
         if self._views is not None and len(self._views) > 0:
             # build new plan like
@@ -1231,17 +1279,24 @@ class SQL(LogicalPlan):
             #     reference:
             #          view#1: [id 8]
             #          view#2: [id 5]
-            sql_plan = plan
-            plan = proto.Relation()
             plan.common.plan_id = self._plan_id_with_rel
-            plan.with_relations.root.CopyFrom(sql_plan)
-            plan.with_relations.references.extend([v.plan(session) for v in self._views])
+            sql_plan = plan.with_relations.root
+            sql_plan.common.plan_id = self._plan_id
+            for v in self._views:
+                v._plan_into(plan.with_relations.references.add(), session)
+
+        sql_plan.sql.query = self._query
+        if self._args is not None and len(self._args) > 0:
+            sql_plan.sql.pos_arguments.extend([arg.to_plan(session) for arg in self._args])
+        if self._named_args is not None and len(self._named_args) > 0:
+            for k, arg in self._named_args.items():
+                sql_plan.sql.named_arguments[k].CopyFrom(arg.to_plan(session))
 
         return plan
 
     def command(self, session: "SparkConnectClient") -> proto.Command:
         cmd = proto.Command()
-        cmd.sql_command.input.CopyFrom(self.plan(session))
+        self._plan_into(cmd.sql_command.input, session)
         return cmd
 
 
@@ -1277,7 +1332,7 @@ class ToSchema(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.to_schema.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.to_schema.input, session)
         plan.to_schema.schema.CopyFrom(pyspark_types_to_proto_types(self._schema))
         return plan
 
@@ -1290,7 +1345,7 @@ class WithColumnsRenamed(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.with_columns_renamed.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.with_columns_renamed.input, session)
         if len(self._colsMap) > 0:
             for k, v in self._colsMap.items():
                 rename = proto.WithColumnsRenamed.Rename()
@@ -1320,7 +1375,7 @@ class Unpivot(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.unpivot.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.unpivot.input, session)
         plan.unpivot.ids.extend([id.to_plan(session) for id in self.ids])
         if self.values is not None:
             plan.unpivot.values.values.extend([v.to_plan(session) for v in self.values])
@@ -1343,7 +1398,7 @@ class Transpose(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.transpose.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.transpose.input, session)
         if self.index_columns is not None and len(self.index_columns) > 0:
             for index_column in self.index_columns:
                 plan.transpose.index_columns.append(index_column.to_plan(session))
@@ -1381,7 +1436,7 @@ class CollectMetrics(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.collect_metrics.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.collect_metrics.input, session)
         plan.collect_metrics.name = (
             self._observation
             if isinstance(self._observation, str)
@@ -1436,7 +1491,7 @@ class NAFill(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.fill_na.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.fill_na.input, session)
         if self.cols is not None and len(self.cols) > 0:
             plan.fill_na.cols.extend(self.cols)
         plan.fill_na.values.extend([self._convert_value(v) for v in self.values])
@@ -1458,7 +1513,7 @@ class NADrop(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.drop_na.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.drop_na.input, session)
         if self.cols is not None and len(self.cols) > 0:
             plan.drop_na.cols.extend(self.cols)
         if self.min_non_nulls is not None:
@@ -1485,7 +1540,7 @@ class NAReplace(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.replace.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.replace.input, session)
         if self.cols is not None and len(self.cols) > 0:
             plan.replace.cols.extend(self.cols)
         if len(self.replacements) > 0:
@@ -1505,7 +1560,7 @@ class StatSummary(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.summary.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.summary.input, session)
         plan.summary.statistics.extend(self.statistics)
         return plan
 
@@ -1518,7 +1573,7 @@ class StatDescribe(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.describe.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.describe.input, session)
         plan.describe.cols.extend(self.cols)
         return plan
 
@@ -1532,7 +1587,7 @@ class StatCov(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.cov.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.cov.input, session)
         plan.cov.col1 = self._col1
         plan.cov.col2 = self._col2
         return plan
@@ -1554,7 +1609,7 @@ class StatApproxQuantile(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.approx_quantile.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.approx_quantile.input, session)
         plan.approx_quantile.cols.extend(self._cols)
         plan.approx_quantile.probabilities.extend(self._probabilities)
         plan.approx_quantile.relative_error = self._relativeError
@@ -1570,7 +1625,7 @@ class StatCrosstab(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.crosstab.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.crosstab.input, session)
         plan.crosstab.col1 = self.col1
         plan.crosstab.col2 = self.col2
         return plan
@@ -1590,7 +1645,7 @@ class StatFreqItems(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.freq_items.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.freq_items.input, session)
         plan.freq_items.cols.extend(self._cols)
         plan.freq_items.support = self._support
         return plan
@@ -1622,7 +1677,7 @@ class StatSampleBy(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.sample_by.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.sample_by.input, session)
         plan.sample_by.col.CopyFrom(self._col._expr.to_plan(session))
         if len(self._fractions) > 0:
             for k, v in self._fractions:
@@ -1644,7 +1699,7 @@ class StatCorr(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.corr.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.corr.input, session)
         plan.corr.col1 = self._col1
         plan.corr.col2 = self._col2
         plan.corr.method = self._method
@@ -1659,7 +1714,7 @@ class ToDF(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.to_df.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.to_df.input, session)
         plan.to_df.column_names.extend(self._cols)
         return plan
 
@@ -1680,7 +1735,7 @@ class CreateView(LogicalPlan):
         plan.create_dataframe_view.replace = self._replace
         plan.create_dataframe_view.is_global = self._is_global
         plan.create_dataframe_view.name = self._name
-        plan.create_dataframe_view.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.create_dataframe_view.input, session)
         return plan
 
 
@@ -1703,7 +1758,7 @@ class WriteOperation(LogicalPlan):
         assert self._child is not None
         plan = proto.Command()
 
-        plan.write_operation.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.write_operation.input, session)
         if self.source is not None:
             plan.write_operation.source = self.source
         plan.write_operation.sort_column_names.extend(self.sort_cols)
@@ -1806,7 +1861,7 @@ class WriteOperationV2(LogicalPlan):
     def command(self, session: "SparkConnectClient") -> proto.Command:
         assert self._child is not None
         plan = proto.Command()
-        plan.write_operation_v2.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.write_operation_v2.input, session)
         if self.table_name is not None:
             plan.write_operation_v2.table_name = self.table_name
         if self.provider is not None:
@@ -1862,7 +1917,7 @@ class WriteStreamOperation(LogicalPlan):
 
     def command(self, session: "SparkConnectClient") -> proto.Command:
         assert self._child is not None
-        self.write_op.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(self.write_op.input, session)
         cmd = proto.Command()
         cmd.write_stream_operation_start.CopyFrom(self.write_op)
         return cmd
@@ -1897,11 +1952,8 @@ class Checkpoint(LogicalPlan):
     def command(self, session: "SparkConnectClient") -> proto.Command:
         cmd = proto.Command()
         assert self._child is not None
-        checkpoint_command = proto.CheckpointCommand(
-            relation=self._child.plan(session),
-            local=self._local,
-            eager=self._eager,
-        )
+        checkpoint_command = proto.CheckpointCommand(local=self._local, eager=self._eager)
+        self._child._plan_into(checkpoint_command.relation, session)
         if self._storage_level is not None:
             checkpoint_command.storage_level.CopyFrom(storage_level_to_proto(self._storage_level))
         cmd.checkpoint_command.CopyFrom(checkpoint_command)
@@ -2259,7 +2311,7 @@ class MapPartitions(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.map_partitions.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.map_partitions.input, session)
         plan.map_partitions.func.CopyFrom(self._function.to_plan_udf(session))
         plan.map_partitions.is_barrier = self._is_barrier
         if self._profile is not None:
@@ -2286,7 +2338,7 @@ class GroupMap(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.group_map.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.group_map.input, session)
         plan.group_map.grouping_expressions.extend(
             [c.to_plan(session) for c in self._grouping_cols]
         )
@@ -2323,11 +2375,11 @@ class CoGroupMap(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.co_group_map.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.co_group_map.input, session)
         plan.co_group_map.input_grouping_expressions.extend(
             [c.to_plan(session) for c in self._input_grouping_cols]
         )
-        plan.co_group_map.other.CopyFrom(self._other.plan(session))
+        self._other._plan_into(plan.co_group_map.other, session)
         plan.co_group_map.other_grouping_expressions.extend(
             [c.to_plan(session) for c in self._other_grouping_cols]
         )
@@ -2362,7 +2414,7 @@ class ApplyInPandasWithState(LogicalPlan):
     def plan(self, session: "SparkConnectClient") -> proto.Relation:
         assert self._child is not None
         plan = self._create_proto_relation()
-        plan.apply_in_pandas_with_state.input.CopyFrom(self._child.plan(session))
+        self._child._plan_into(plan.apply_in_pandas_with_state.input, session)
         plan.apply_in_pandas_with_state.grouping_expressions.extend(
             [c.to_plan(session) for c in self._grouping_cols]
         )
@@ -0,0 +1,310 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Conversions between Arrow data and Python objects that do not depend on Spark Connect, so
+that they can also be used by Spark Classic, e.g. on executors.
+"""
+import bisect
+import datetime
+import itertools
+from collections.abc import Sequence as SequenceABC
+
+import pyarrow as pa
+
+from pyspark.errors import PySparkValueError
+from pyspark.sql.pandas.types import _dedup_names
+from pyspark.sql.types import (
+    _create_row,
+    Row,
+    DataType,
+    TimestampType,
+    TimestampNTZType,
+    MapType,
+    StructType,
+    ArrayType,
+    BinaryType,
+    NullType,
+    UserDefinedType,
+    VariantType,
+    VariantVal,
+)
+
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    List,
+    Tuple,
+    Union,
+    overload,
+)
+
+__all__ = ["ArrowTableToRowsConversion", "ArrowRowSequence"]
+
+
+class ArrowTableToRowsConversion:
+    """
+    Conversion from Arrow Table to Rows.
+    This is used by :class:`DataFrame` in Spark Connect and by :meth:`DataFrame.toArrowRDD`.
+    """
+
+    @staticmethod
+    def _need_converter(dataType: DataType) -> bool:
+        if isinstance(dataType, NullType):
+            return True
+        elif isinstance(dataType, StructType):
+            return True
+        elif isinstance(dataType, ArrayType):
+            return ArrowTableToRowsConversion._need_converter(dataType.elementType)
+        elif isinstance(dataType, MapType):
+            # Different from PySpark, here always needs conversion,
+            # since the input from Arrow is a list of tuples.
+            return True
+        elif isinstance(dataType, BinaryType):
+            return True
+        elif isinstance(dataType, (TimestampType, TimestampNTZType)):
+            # Always remove the time zone info for now
+            return True
+        elif isinstance(dataType, UserDefinedType):
+            return True
+        elif isinstance(dataType, VariantType):
+            return True
+        else:
+            return False
+
+    @staticmethod
+    def _create_converter(dataType: DataType) -> Callable:
+        assert dataType is not None and isinstance(dataType, DataType)
+
+        if not ArrowTableToRowsConversion._need_converter(dataType):
+            return lambda value: value
+
+        if isinstance(dataType, NullType):
+            return lambda value: None
+
+        elif isinstance(dataType, StructType):
+            field_names = dataType.names
+            dedup_field_names = _dedup_names(field_names)
+
+            field_convs = [
+                ArrowTableToRowsConversion._create_converter(f.dataType) for f in dataType.fields
+            ]
+
+            def convert_struct(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, dict)
+
+                    _values = [
+                        field_convs[i](value.get(name, None))
+                        for i, name in enumerate(dedup_field_names)
+                    ]
+                    return _create_row(field_names, _values)
+
+            return convert_struct
+
+        elif isinstance(dataType, ArrayType):
+            element_conv = ArrowTableToRowsConversion._create_converter(dataType.elementType)
+
+            def convert_array(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, list)
+                    return [element_conv(v) for v in value]
+
+            return convert_array
+
+        elif isinstance(dataType, MapType):
+            key_conv = ArrowTableToRowsConversion._create_converter(dataType.keyType)
+            value_conv = ArrowTableToRowsConversion._create_converter(dataType.valueType)
+
+            def convert_map(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, list)
+                    assert all(isinstance(t, tuple) and len(t) == 2 for t in value)
+                    return dict((key_conv(t[0]), value_conv(t[1])) for t in value)
+
+            return convert_map
+
+        elif isinstance(dataType, BinaryType):
+
+            def convert_binary(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, bytes)
+                    return bytearray(value)
+
+            return convert_binary
+
+        elif isinstance(dataType, TimestampType):
+
+            def convert_timestample(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, datetime.datetime)
+                    return value.astimezone().replace(tzinfo=None)
+
+            return convert_timestample
+
+        elif isinstance(dataType, TimestampNTZType):
+
+            def convert_timestample_ntz(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    assert isinstance(value, datetime.datetime)
+                    return value
+
+            return convert_timestample_ntz
+
+        elif isinstance(dataType, UserDefinedType):
+            udt: UserDefinedType = dataType
+
+            conv = ArrowTableToRowsConversion._create_converter(udt.sqlType())
+
+            def convert_udt(value: Any) -> Any:
+                if value is None:
+                    return None
+                else:
+                    return udt.deserialize(conv(value))
+
+            return convert_udt
+
+        elif isinstance(dataType, VariantType):
+
+            def convert_variant(value: Any) -> Any:
+                if value is None:
+                    return None
+                elif (
+                    isinstance(value, dict)
+                    and all(key in value for key in ["value", "metadata"])
+                    and all(isinstance(value[key], bytes) for key in ["value", "metadata"])
+                ):
+                    return VariantVal(value["value"], value["metadata"])
+                else:
+                    raise PySparkValueError(errorClass="MALFORMED_VARIANT")
+
+            return convert_variant
+
+        else:
+            return lambda value: value
+
+    @staticmethod
+    def convert(table: "pa.Table", schema: StructType) -> List[Row]:
+        assert isinstance(table, pa.Table)
+
+        assert schema is not None and isinstance(schema, StructType)
+
+        return list(ArrowRowSequence(table, schema))
+
+
+class ArrowRowSequence(SequenceABC):
+    """
+    Read-only sequence of the rows of an Arrow table, which creates the :class:`Row` objects
+    only when they are accessed, one record batch at a time. The length is known and slices
+    with step 1 are taken without copying the table.
+    """
+
+    def __init__(self, table: "pa.Table", schema: StructType) -> None:
+        assert isinstance(table, pa.Table)
+
+        assert schema is not None and isinstance(schema, StructType)
+
+        self._table = table
+        self._schema = schema
+        self._field_names = schema.fieldNames()
+        self._field_converters = [
+            ArrowTableToRowsConversion._create_converter(f.dataType)
+            if ArrowTableToRowsConversion._need_converter(f.dataType)
+            else None
+            for f in schema.fields
+        ]
+        self._batches = table.to_batches()
+        self._batch_offsets = list(itertools.accumulate(b.num_rows for b in self._batches))
+        # The rows of the most recently accessed record batch, see _rows_of_batch.
+        self._current_batch: Optional[Tuple[int, List[Row]]] = None
+
+    @property
+    def table(self) -> "pa.Table":
+        """The Arrow table holding the rows."""
+        return self._table
+
+    def _rows_of_batch(self, index: int) -> List[Row]:
+        if self._current_batch is None or self._current_batch[0] != index:
+            batch = self._batches[index]
+            columnar_data = [
+                column.to_pylist() if conv is None else [conv(v) for v in column.to_pylist()]
+                for conv, column in zip(self._field_converters, batch.columns)
+            ]
+            if len(columnar_data) > 0:
+                rows = [_create_row(self._field_names, values) for values in zip(*columnar_data)]
+            else:
+                rows = [_create_row(self._field_names, []) for _ in range(batch.num_rows)]
+            self._current_batch = (index, rows)
+        return self._current_batch[1]
+
+    def __len__(self) -> int:
+        return self._table.num_rows
+
+    @overload
+    def __getitem__(self, index: int) -> Row:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ArrowRowSequence":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Row, "ArrowRowSequence"]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                table = self._table.slice(start, max(stop - start, 0))
+            else:
+                table = self._table.take(pa.array(range(start, stop, step), type=pa.int64()))
+            return ArrowRowSequence(table, self._schema)
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        batch_index = bisect.bisect_right(self._batch_offsets, index)
+        batch_start = self._batch_offsets[batch_index - 1] if batch_index > 0 else 0
+        return self._rows_of_batch(batch_index)[index - batch_start]
+
+    def __iter__(self) -> Iterator[Row]:
+        for i in range(len(self._batches)):
+            yield from self._rows_of_batch(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, ArrowRowSequence)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce__(self) -> Tuple:
+        return list, (list(self),)
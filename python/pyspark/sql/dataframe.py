@@ -190,6 +190,47 @@ class DataFrame:
             """
             ...
 
+        def toArrowRDD(self, asRows: bool = False) -> "RDD[Any]":
+            """Returns the content as an :class:`pyspark.RDD` whose partitions are transferred
+            from the JVM as Arrow record batches instead of pickled rows.
+
+            .. versionadded:: 4.0.0
+
+            Parameters
+            ----------
+            asRows : bool, optional, default False
+                If False, each element of the returned RDD is a :class:`pyarrow.RecordBatch`.
+                If True, the elements are :class:`Row`\\s that are lazily materialized from
+                the record batches while a partition is iterated.
+
+            Returns
+            -------
+            :class:`RDD`
+
+            Notes
+            -----
+            This API is experimental. PyArrow must be installed and available on the driver
+            and worker Python environments. The batch size is controlled by
+            `spark.sql.execution.arrow.maxRecordsPerBatch`. When ``asRows`` is True, values
+            are converted with :meth:`pyarrow.Array.to_pylist`; timestamps are converted to
+            naive local datetimes and binary values to ``bytearray`` as in :attr:`rdd`.
+
+            See Also
+            --------
+            DataFrame.rdd
+            DataFrame.mapInArrow
+            RDD.mapPartitionsInArrow
+
+            Examples
+            --------
+            >>> df = spark.range(10)
+            >>> df.toArrowRDD().map(lambda batch: batch.num_rows).sum()  # doctest: +SKIP
+            10
+            >>> df.toArrowRDD(asRows=True).map(lambda row: row.id).sum()  # doctest: +SKIP
+            45
+            """
+            ...
+
     @property
     def na(self) -> "DataFrameNaFunctions":
         """Returns a :class:`DataFrameNaFunctions` for handling missing values.
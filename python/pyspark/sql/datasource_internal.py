@@ -18,8 +18,9 @@
 
 import json
 import copy
+import threading
 from itertools import chain
-from typing import Iterator, List, Optional, Sequence, Tuple
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from pyspark.sql.datasource import (
     DataSource,
@@ -30,17 +31,32 @@ from pyspark.sql.datasource import (
 from pyspark.sql.types import StructType
 from pyspark.errors import PySparkNotImplementedError
 
+if TYPE_CHECKING:
+    import pyarrow as pa
 
-def _streamReader(datasource: DataSource, schema: StructType) -> "DataSourceStreamReader":
+
+def _streamReader(
+    datasource: DataSource,
+    schema: StructType,
+    to_arrow_batches: Optional[Callable[[Iterator[Tuple]], List["pa.RecordBatch"]]] = None,
+    prefetch_batches: int = 0,
+    prefetch_bytes: int = 0,
+) -> "DataSourceStreamReader":
     """
     Fallback to simpleStreamReader() method when streamReader() is not implemented.
     This should be invoked whenever a DataSourceStreamReader needs to be created instead of
-    invoking datasource.streamReader() directly.
+    invoking datasource.streamReader() directly. The other arguments are passed to
+    :class:`_SimpleStreamReaderWrapper`.
     """
     try:
         return datasource.streamReader(schema=schema)
     except PySparkNotImplementedError:
-        return _SimpleStreamReaderWrapper(datasource.simpleStreamReader(schema=schema))
+        return _SimpleStreamReaderWrapper(
+            datasource.simpleStreamReader(schema=schema),
+            to_arrow_batches,
+            prefetch_batches,
+            prefetch_bytes,
+        )
 
 
 class SimpleInputPartition(InputPartition):
@@ -56,6 +72,20 @@ class PrefetchedCacheEntry:
         self.iterator = iterator
 
 
+class PrefetchedArrowCacheEntry:
+    def __init__(self, start: dict, end: dict, batches: List["pa.RecordBatch"]):
+        self.start = start
+        self.end = end
+        self.batches = batches
+        self.nbytes = sum(batch.nbytes for batch in batches)
+
+
+def _same_offset(offset1: dict, offset2: dict) -> bool:
+    # There is no convenient way to compare 2 offsets.
+    # Serialize into json string before comparison.
+    return json.dumps(offset1) == json.dumps(offset2)
+
+
 class _SimpleStreamReaderWrapper(DataSourceStreamReader):
     """
     A private class that wrap :class:`SimpleDataSourceStreamReader` in prefetch and cache pattern,
@@ -75,13 +105,43 @@ class _SimpleStreamReaderWrapper(DataSourceStreamReader):
 
     When query restart, batches in write ahead offset log that has not been committed will be
     replayed by reading data between start and end offset through readBetweenOffsets(start, end).
+
+    If `to_arrow_batches` is given, the prefetched data is converted into Arrow record batches
+    before it is cached, see getCachedBatches(start, end). If `prefetch_batches` is positive as
+    well, read() is called by a background thread instead of latestOffset(), which runs ahead of
+    the streaming engine by at most `prefetch_batches` reads, as long as the cached data is
+    smaller than `prefetch_bytes`. latestOffset() then returns the end offset of all the data
+    prefetched so far, and only waits for the read in progress if there is none. After a read
+    without new data, the thread waits for the next latestOffset() call before reading again.
     """
 
-    def __init__(self, simple_reader: SimpleDataSourceStreamReader):
+    def __init__(
+        self,
+        simple_reader: SimpleDataSourceStreamReader,
+        to_arrow_batches: Optional[Callable[[Iterator[Tuple]], List["pa.RecordBatch"]]] = None,
+        prefetch_batches: int = 0,
+        prefetch_bytes: int = 0,
+    ):
         self.simple_reader = simple_reader
         self.initial_offset: Optional[dict] = None
         self.current_offset: Optional[dict] = None
         self.cache: List[PrefetchedCacheEntry] = []
+        self.to_arrow_batches = to_arrow_batches
+        self.prefetch_batches = prefetch_batches if to_arrow_batches is not None else 0
+        self.prefetch_bytes = prefetch_bytes
+        self.arrow_cache: List[PrefetchedArrowCacheEntry] = []
+
+        # State of the background prefetching, guarded by `_cond`.
+        self._cond = threading.Condition()
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_error: Optional[BaseException] = None
+        self._num_unreported = 0
+        self._reading = False
+        self._read_requested = False
+        self._source_idle = False
+        self._stopped = False
+        # Serializes the calls to the simple reader from the background thread and the engine.
+        self._reader_lock = threading.Lock()
 
     def initialOffset(self) -> dict:
         if self.initial_offset is None:
@@ -92,24 +152,116 @@ class _SimpleStreamReaderWrapper(DataSourceStreamReader):
         # when query start for the first time, use initial offset as the start offset.
         if self.current_offset is None:
             self.current_offset = self.initialOffset()
+        if self.prefetch_batches > 0:
+            return self._latest_prefetched_offset()
+        if self.to_arrow_batches is not None:
+            entry = self._read_arrow_entry(self.current_offset)
+            self.arrow_cache.append(entry)
+            self.current_offset = entry.end
+            return entry.end
         (iter, end) = self.simple_reader.read(self.current_offset)
         self.cache.append(PrefetchedCacheEntry(self.current_offset, end, iter))
         self.current_offset = end
         return end
 
+    def _read_arrow_entry(self, start: dict) -> PrefetchedArrowCacheEntry:
+        assert self.to_arrow_batches is not None
+        with self._reader_lock:
+            (it, end) = self.simple_reader.read(start)
+            return PrefetchedArrowCacheEntry(start, end, self.to_arrow_batches(it))
+
+    def _latest_prefetched_offset(self) -> dict:
+        with self._cond:
+            if self._prefetch_thread is None:
+                self._prefetch_thread = threading.Thread(
+                    target=self._prefetch, name="python-stream-reader-prefetch", daemon=True
+                )
+                self._prefetch_thread.start()
+            self._read_requested = True
+            self._cond.notify_all()
+            # Nothing new is prefetched yet, wait for the read in progress.
+            while (
+                self._num_unreported == 0
+                and self._prefetch_error is None
+                and (self._reading or self._should_prefetch())
+            ):
+                self._cond.wait()
+            if self._prefetch_error is not None:
+                raise self._prefetch_error
+            # Let the background thread prefetch the next batches.
+            self._num_unreported = 0
+            self._cond.notify_all()
+            assert self.current_offset is not None
+            return self.current_offset
+
+    def _should_prefetch(self) -> bool:
+        return (
+            not self._stopped
+            and (self._read_requested or not self._source_idle)
+            and self._num_unreported < self.prefetch_batches
+            and sum(entry.nbytes for entry in self.arrow_cache) < self.prefetch_bytes
+        )
+
+    def _prefetch(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    while not self._stopped and not self._should_prefetch():
+                        self._cond.wait()
+                    if self._stopped:
+                        return
+                    start = self.current_offset
+                    assert start is not None
+                    self._reading = True
+                    self._read_requested = False
+
+                entry = self._read_arrow_entry(start)
+
+                with self._cond:
+                    self._reading = False
+                    self._source_idle = _same_offset(entry.start, entry.end)
+                    if not self._source_idle:
+                        self.arrow_cache.append(entry)
+                        self.current_offset = entry.end
+                        self._num_unreported += 1
+                    self._cond.notify_all()
+        except BaseException as e:
+            with self._cond:
+                self._reading = False
+                self._prefetch_error = e
+                self._cond.notify_all()
+
     def commit(self, end: dict) -> None:
         if self.current_offset is None:
             self.current_offset = end
 
         end_idx = -1
         for idx, entry in enumerate(self.cache):
-            if json.dumps(entry.end) == json.dumps(end):
+            if _same_offset(entry.end, end):
                 end_idx = idx
                 break
         if end_idx > 0:
             # Drop prefetched data for batch that has been committed.
             self.cache = self.cache[end_idx:]
-        self.simple_reader.commit(end)
+
+        with self._cond:
+            for idx, arrow_entry in enumerate(self.arrow_cache):
+                if _same_offset(arrow_entry.end, end):
+                    # Drop the data of the committed batch eagerly and let the background
+                    # thread prefetch more data within the freed budget.
+                    self.arrow_cache = self.arrow_cache[idx + 1 :]
+                    self._cond.notify_all()
+                    break
+
+        with self._reader_lock:
+            self.simple_reader.commit(end)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
 
     def partitions(self, start: dict, end: dict) -> Sequence["InputPartition"]:
         # when query restart from checkpoint, use the last committed offset as the start offset.
@@ -121,15 +273,31 @@ class _SimpleStreamReaderWrapper(DataSourceStreamReader):
             assert self.cache[-1].end == end
         return [SimpleInputPartition(start, end)]
 
+    def getCachedBatches(self, start: dict, end: dict) -> Optional[List["pa.RecordBatch"]]:
+        """
+        Return the prefetched Arrow record batches between start and end offset, or None if
+        they are not cached, e.g. when the query restarts. Only used with `to_arrow_batches`.
+        """
+        with self._cond:
+            start_idx = -1
+            for idx, entry in enumerate(self.arrow_cache):
+                if _same_offset(entry.start, start):
+                    start_idx = idx
+                if start_idx != -1 and _same_offset(entry.end, end):
+                    return [
+                        batch
+                        for entry in self.arrow_cache[start_idx : idx + 1]
+                        for batch in entry.batches
+                    ]
+            return None
+
     def getCache(self, start: dict, end: dict) -> Iterator[Tuple]:
         start_idx = -1
         end_idx = -1
         for idx, entry in enumerate(self.cache):
-            # There is no convenient way to compare 2 offsets.
-            # Serialize into json string before comparison.
-            if json.dumps(entry.start) == json.dumps(start):
+            if _same_offset(entry.start, start):
                 start_idx = idx
-            if json.dumps(entry.end) == json.dumps(end):
+            if _same_offset(entry.end, end):
                 end_idx = idx
                 break
         if start_idx == -1 or end_idx == -1:
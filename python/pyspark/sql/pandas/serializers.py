@@ -19,13 +19,16 @@
 Serializers for PyArrow and pandas conversions. See `pyspark.serializers` for more details.
 """
 
+import os
 from itertools import groupby
 from pyspark.errors import PySparkRuntimeError, PySparkTypeError, PySparkValueError
 from pyspark.loose_version import LooseVersion
 from pyspark.serializers import (
     Serializer,
+    FramedSerializer,
     read_int,
     write_int,
+    write_with_length,
     UTF8Deserializer,
     CPickleSerializer,
 )
@@ -34,7 +37,9 @@ from pyspark.sql.pandas.types import (
     is_variant,
     to_arrow_type,
     _create_converter_from_pandas,
+    _create_converter_from_python,
     _create_converter_to_pandas,
+    _create_converter_to_python,
 )
 from pyspark.sql.streaming.stateful_processor_util import TransformWithStateInPandasFuncMode
 from pyspark.sql.types import (
@@ -103,11 +108,57 @@ class ArrowCollectSerializer(Serializer):
 class ArrowStreamSerializer(Serializer):
     """
     Serializes Arrow record batches as a stream.
+
+    If a shared memory directory is set by :meth:`use_shared_memory`, each record batch is
+    written as a self-contained Arrow stream into its own file in the directory instead, and
+    only the path of the file is written to the stream, followed by an empty path after the
+    last batch. The files are memory-mapped when they are loaded, so the record batches are
+    not copied.
+
+    If a maximum number of bytes per batch is set by :meth:`set_max_bytes_per_batch`, the
+    record batches larger than that are split into slices of about that many bytes before
+    they are dumped, based on their number of bytes per row.
     """
 
+    _shared_memory_dir = None
+
+    _max_bytes_per_batch = 0
+
+    def use_shared_memory(self, directory):
+        """
+        Exchange the record batches as files in the given directory, which is usually on a
+        memory-backed file system, instead of in the stream.
+        """
+        self._shared_memory_dir = directory
+
+    def set_max_bytes_per_batch(self, max_bytes):
+        """
+        Split the record batches to dump into batches of about the given number of bytes.
+        Zero or a negative number means no limit.
+        """
+        self._max_bytes_per_batch = max_bytes
+
+    def _split_batches(self, iterator):
+        max_bytes = self._max_bytes_per_batch
+        for batch in iterator:
+            num_slices = -(-batch.nbytes // max_bytes)
+            if num_slices <= 1:
+                yield batch
+            else:
+                # Slicing does not copy the data of the batch.
+                num_rows = -(-batch.num_rows // num_slices)
+                for offset in range(0, batch.num_rows, num_rows):
+                    yield batch.slice(offset, num_rows)
+
     def dump_stream(self, iterator, stream):
         import pyarrow as pa
 
+        if self._max_bytes_per_batch > 0:
+            iterator = self._split_batches(iterator)
+
+        if self._shared_memory_dir is not None:
+            return self._dump_to_shared_memory(iterator, stream)
+
         writer = None
         try:
             for batch in iterator:
@@ -121,14 +172,73 @@ class ArrowStreamSerializer(Serializer):
     def load_stream(self, stream):
         import pyarrow as pa
 
+        if self._shared_memory_dir is not None:
+            yield from self._load_from_shared_memory(stream)
+            return
+
         reader = pa.ipc.open_stream(stream)
         for batch in reader:
             yield batch
 
+    def _dump_to_shared_memory(self, iterator, stream):
+        import pyarrow as pa
+
+        num_batches = 0
+        for batch in iterator:
+            path = os.path.join(self._shared_memory_dir, "output-%d.arrow" % num_batches)
+            with pa.OSFile(path, "wb") as sink:
+                with pa.ipc.new_stream(sink, batch.schema) as writer:
+                    writer.write_batch(batch)
+            write_with_length(path.encode("utf-8"), stream)
+            num_batches += 1
+        if num_batches > 0:
+            write_int(0, stream)
+
+    def _load_from_shared_memory(self, stream):
+        import pyarrow as pa
+
+        while True:
+            length = read_int(stream)
+            if length == 0:
+                break
+            path = stream.read(length).decode("utf-8")
+            source = pa.memory_map(path)
+            # the mapped memory stays valid until the batches are released
+            os.remove(path)
+            for batch in pa.ipc.open_stream(source):
+                yield batch
+
     def __repr__(self):
         return "ArrowStreamSerializer"
 
 
+class ArrowRDDSerializer(FramedSerializer):
+    """
+    Serializes each ``pyarrow.RecordBatch`` of an RDD as a self-contained Arrow IPC stream,
+    so that columnar RDDs are exchanged with the JVM as record batches instead of pickled rows.
+    See also `DataFrame.toArrowRDD` and `RDD.mapPartitionsInArrow`.
+    """
+
+    def __init__(self):
+        self.serializer = ArrowStreamSerializer()
+
+    def dumps(self, batch):
+        import pyarrow as pa
+
+        sink = pa.BufferOutputStream()
+        self.serializer.dump_stream([batch], sink)
+        return sink.getvalue().to_pybytes()
+
+    def loads(self, obj):
+        import pyarrow as pa
+
+        # Each frame holds exactly one batch preceded by its schema.
+        return next(iter(self.serializer.load_stream(pa.py_buffer(obj))))
+
+    def __repr__(self):
+        return "ArrowRDDSerializer"
+
+
 class ArrowStreamUDFSerializer(ArrowStreamSerializer):
     """
     Same as :class:`ArrowStreamSerializer` but it flattens the struct to Arrow record batch
@@ -558,6 +668,123 @@ class ArrowStreamPandasUDFSerializer(ArrowStreamPandasSerializer):
         return "ArrowStreamPandasUDFSerializer"
 
 
+class ArrowBatchUDFSerializer(ArrowStreamSerializer):
+    """
+    Serializer used by Python worker to evaluate Arrow-optimized Python UDFs without pandas.
+
+    Loads Arrow record batches as a list of columns, each a list of Python objects, and
+    serializes a list of ``(list, arrow_type, spark_type)`` as Arrow record batches, with the
+    values coerced to the given types.
+
+    Parameters
+    ----------
+    timezone : str
+        The session timezone.
+    safecheck : bool
+        Whether to check for overflows and other unsafe conversions when coercing the values.
+    """
+
+    def __init__(self, timezone, safecheck):
+        super(ArrowBatchUDFSerializer, self).__init__()
+        self._timezone = timezone
+        self._safecheck = safecheck
+        self._converters = {}
+
+    def _get_converter(self, create_converter, dt):
+        key = (create_converter, dt)
+        if key not in self._converters:
+            self._converters[key] = create_converter(dt, timezone=self._timezone)
+        return self._converters[key]
+
+    def arrow_to_python(self, arrow_column):
+        """
+        Convert an Arrow array to a list of the Python objects Python UDFs take.
+        """
+        conv = self._get_converter(
+            _create_converter_to_python,
+            from_arrow_type(arrow_column.type, prefer_timestamp_ntz=True),
+        )
+        values = arrow_column.to_pylist()
+        if conv is not None:
+            values = [conv(v) if v is not None else None for v in values]
+        return values
+
+    def _create_array(self, values, arrow_type, spark_type=None):
+        """
+        Create an Arrow array of the given type from a list of the Python objects returned by
+        Python UDFs. The values are cast with Arrow when they are not of the given type.
+        """
+        import pyarrow as pa
+
+        dt = spark_type or from_arrow_type(arrow_type, prefer_timestamp_ntz=True)
+        conv = self._get_converter(_create_converter_from_python, dt)
+        if conv is not None:
+            values = [conv(v) if v is not None else None for v in values]
+
+        try:
+            try:
+                return pa.array(values, type=arrow_type)
+            except pa.lib.ArrowInvalid:
+                return pa.array(values).cast(target_type=arrow_type, safe=self._safecheck)
+        except TypeError as e:
+            error_msg = "Exception thrown when converting the results to Arrow Array (%s)."
+            raise PySparkTypeError(error_msg % arrow_type) from e
+        except ValueError as e:
+            error_msg = "Exception thrown when converting the results to Arrow Array (%s)."
+            if self._safecheck:
+                error_msg = error_msg + (
+                    " It can be caused by overflows or other "
+                    "unsafe conversions warned by Arrow. Arrow safe type check "
+                    "can be disabled by using SQL config "
+                    "`spark.sql.execution.pandas.convertToArrowArraySafely`."
+                )
+            raise PySparkValueError(error_msg % arrow_type) from e
+
+    def _create_batch(self, results):
+        import pyarrow as pa
+
+        # Make input conform to [(values1, arrow_type1, spark_type1), ...]
+        if len(results) in (2, 3) and isinstance(results[1], pa.DataType):
+            results = [results]
+        results = [r if len(r) == 3 else (r[0], r[1], None) for r in results]
+
+        arrs = [
+            self._create_array(values, arrow_type, spark_type)
+            for values, arrow_type, spark_type in results
+        ]
+        return pa.RecordBatch.from_arrays(arrs, ["_%d" % i for i in range(len(arrs))])
+
+    def dump_stream(self, iterator, stream):
+        """
+        Override because Python UDFs require a START_ARROW_STREAM before the Arrow stream is sent.
+        This should be sent after creating the first record batch so in case of an error, it can
+        be sent back to the JVM before the Arrow stream starts.
+        """
+
+        def init_stream_yield_batches():
+            should_write_start_length = True
+            for results in iterator:
+                batch = self._create_batch(results)
+                if should_write_start_length:
+                    write_int(SpecialLengths.START_ARROW_STREAM, stream)
+                    should_write_start_length = False
+                yield batch
+
+        return super(ArrowBatchUDFSerializer, self).dump_stream(init_stream_yield_batches(), stream)
+
+    def load_stream(self, stream):
+        """
+        Deserialize Arrow record batches and return them as a list of columns, each a list of
+        Python objects.
+        """
+        batches = super(ArrowBatchUDFSerializer, self).load_stream(stream)
+        for batch in batches:
+            yield [self.arrow_to_python(column) for column in batch.columns]
+
+    def __repr__(self):
+        return "ArrowBatchUDFSerializer"
+
+
 class ArrowStreamPandasUDTFSerializer(ArrowStreamPandasUDFSerializer):
     """
     Serializer used by Python worker to evaluate Arrow-optimized Python UDTFs.
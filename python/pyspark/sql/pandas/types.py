@@ -1331,6 +1331,290 @@ def _create_converter_from_pandas(
         return lambda pser: pser
 
 
+def _create_converter_to_python(
+    data_type: DataType,
+    *,
+    timezone: Optional[str] = None,
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Create a converter of the Python objects created by `pyarrow.Array.to_pylist` to the ones
+    Python UDFs take, without pandas.
+
+    Parameters
+    ----------
+    data_type : :class:`DataType`
+        The data type corresponding to the values to be converted.
+    timezone : str, optional
+        The timezone to convert to. If there is a timestamp type, it's required.
+
+    Returns
+    -------
+    The converter of non-null values, or ``None`` if the values need no conversion.
+    """
+
+    def _converter(dt: DataType) -> Optional[Callable[[Any], Any]]:
+        if isinstance(dt, ArrayType):
+            _element_conv = _converter(dt.elementType)
+
+            if _element_conv is None:
+                return None
+
+            def convert_array(value: Any) -> Any:
+                return [_element_conv(v) if v is not None else None for v in value]
+
+            return convert_array
+
+        elif isinstance(dt, MapType):
+            _key_conv = _converter(dt.keyType)
+            _value_conv = _converter(dt.valueType)
+
+            if _key_conv is None and _value_conv is None:
+
+                def convert_map(value: Any) -> Any:
+                    # `pyarrow.Array.to_pylist` uses `list` of key-value tuple.
+                    return dict(value)
+
+            else:
+
+                def convert_map(value: Any) -> Any:
+                    return {
+                        (_key_conv(k) if _key_conv is not None and k is not None else k): (
+                            _value_conv(v) if _value_conv is not None and v is not None else v
+                        )
+                        for k, v in value
+                    }
+
+            return convert_map
+
+        elif isinstance(dt, StructType):
+            field_names = dt.names
+
+            # `pyarrow.Array.to_pylist` cannot convert structs with duplicated field names.
+            if len(set(field_names)) != len(field_names):
+                raise UnsupportedOperationException(
+                    errorClass="DUPLICATED_FIELD_NAME_IN_ARROW_STRUCT",
+                    messageParameters={"field_names": str(field_names)},
+                )
+
+            field_convs = [_converter(f.dataType) for f in dt.fields]
+
+            if all(conv is None for conv in field_convs):
+
+                def convert_struct(value: Any) -> Any:
+                    # `pyarrow.Array.to_pylist` uses `dict`.
+                    return _create_row(field_names, [value[name] for name in field_names])
+
+            else:
+
+                def convert_struct(value: Any) -> Any:
+                    _values = [
+                        conv(v) if conv is not None and v is not None else v
+                        for conv, v in zip(field_convs, (value[name] for name in field_names))
+                    ]
+                    return _create_row(field_names, _values)
+
+            return convert_struct
+
+        elif isinstance(dt, TimestampType):
+            assert timezone is not None
+
+            tz = _get_tzinfo(timezone)
+
+            def convert_timestamp(value: Any) -> Any:
+                return value.astimezone(tz).replace(tzinfo=None)
+
+            return convert_timestamp
+
+        elif isinstance(dt, UserDefinedType):
+            udt: UserDefinedType = dt
+
+            conv = _converter(udt.sqlType())
+
+            if conv is None:
+
+                def convert_udt(value: Any) -> Any:
+                    return udt.deserialize(value)
+
+            else:
+
+                def convert_udt(value: Any) -> Any:
+                    return udt.deserialize(conv(value))
+
+            return convert_udt
+
+        elif isinstance(dt, VariantType):
+
+            def convert_variant(value: Any) -> Any:
+                if (
+                    isinstance(value, dict)
+                    and all(key in value for key in ["value", "metadata"])
+                    and all(isinstance(value[key], bytes) for key in ["value", "metadata"])
+                ):
+                    return VariantVal(value["value"], value["metadata"])
+                else:
+                    raise PySparkValueError(errorClass="MALFORMED_VARIANT")
+
+            return convert_variant
+
+        else:
+            return None
+
+    return _converter(data_type)
+
+
+def _create_converter_from_python(
+    data_type: DataType,
+    *,
+    timezone: Optional[str] = None,
+) -> Optional[Callable[[Any], Any]]:
+    """
+    Create a converter of the Python objects returned by Python UDFs to the ones
+    `pyarrow.array` takes, without pandas.
+
+    Parameters
+    ----------
+    data_type : :class:`DataType`
+        The data type corresponding to the values to be converted.
+    timezone : str, optional
+        The timezone to convert from. If there is a timestamp type, it's required.
+
+    Returns
+    -------
+    The converter of non-null values, or ``None`` if the values need no conversion.
+    """
+
+    def _converter(dt: DataType) -> Optional[Callable[[Any], Any]]:
+        if isinstance(dt, ArrayType):
+            _element_conv = _converter(dt.elementType)
+
+            if _element_conv is None:
+                return None
+
+            def convert_array(value: Any) -> Any:
+                # Iterable
+                return [_element_conv(v) if v is not None else None for v in value]
+
+            return convert_array
+
+        elif isinstance(dt, MapType):
+            _key_conv = _converter(dt.keyType)
+            _value_conv = _converter(dt.valueType)
+
+            def check_map(value: Any) -> None:
+                if not isinstance(value, dict):
+                    raise PySparkTypeError(
+                        errorClass="CANNOT_ACCEPT_OBJECT_IN_TYPE",
+                        messageParameters={
+                            "data_type": str(dt),
+                            "obj_name": str(value),
+                            "obj_type": type(value).__name__,
+                        },
+                    )
+
+            if _key_conv is None and _value_conv is None:
+
+                def convert_map(value: Any) -> Any:
+                    check_map(value)
+                    return list(value.items())
+
+            else:
+
+                def convert_map(value: Any) -> Any:
+                    check_map(value)
+                    return [
+                        (
+                            _key_conv(k) if _key_conv is not None and k is not None else k,
+                            _value_conv(v) if _value_conv is not None and v is not None else v,
+                        )
+                        for k, v in value.items()
+                    ]
+
+            return convert_map
+
+        elif isinstance(dt, StructType):
+            field_names = dt.names
+            field_convs = [_converter(f.dataType) for f in dt.fields]
+
+            # Structs are created from tuples, since their field names can be duplicated.
+            def convert_struct(value: Any) -> Any:
+                if isinstance(value, dict):
+                    _values: Iterable[Any] = (value.get(name, None) for name in field_names)
+                elif isinstance(value, (tuple, list)):
+                    # tuple, list or Row
+                    _values = value
+                else:
+                    raise PySparkTypeError(
+                        errorClass="CANNOT_ACCEPT_OBJECT_IN_TYPE",
+                        messageParameters={
+                            "data_type": str(dt),
+                            "obj_name": str(value),
+                            "obj_type": type(value).__name__,
+                        },
+                    )
+                return tuple(
+                    conv(v) if conv is not None and v is not None else v
+                    for conv, v in zip(field_convs, _values)
+                )
+
+            return convert_struct
+
+        elif isinstance(dt, TimestampType):
+            assert timezone is not None
+
+            tz = _get_tzinfo(timezone)
+
+            def convert_timestamp(value: Any) -> Any:
+                if isinstance(value, datetime.datetime) and value.tzinfo is None:
+                    # Choose the standard time for ambiguous timestamps, like
+                    # `_check_series_convert_timestamps_internal`.
+                    return value.replace(tzinfo=tz, fold=1)
+                else:
+                    return value
+
+            return convert_timestamp
+
+        elif isinstance(dt, UserDefinedType):
+            udt: UserDefinedType = dt
+
+            conv = _converter(udt.sqlType())
+
+            if conv is None:
+
+                def convert_udt(value: Any) -> Any:
+                    return udt.serialize(value)
+
+            else:
+
+                def convert_udt(value: Any) -> Any:
+                    return conv(udt.serialize(value))
+
+            return convert_udt
+
+        elif isinstance(dt, VariantType):
+
+            def convert_variant(variant: Any) -> Any:
+                assert isinstance(variant, VariantVal)
+                return {"value": variant.value, "metadata": variant.metadata}
+
+            return convert_variant
+
+        return None
+
+    return _converter(data_type)
+
+
+def _get_tzinfo(timezone: str) -> datetime.tzinfo:
+    import zoneinfo
+
+    try:
+        return zoneinfo.ZoneInfo(timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        import pyarrow as pa
+
+        # Fixed offsets, like "+08:00", which PyArrow also supports.
+        return pa.scalar(0, pa.timestamp("us", tz=timezone)).as_py().tzinfo
+
+
 def _dedup_names(names: List[str]) -> List[str]:
     if len(set(names)) == len(names):
         return names
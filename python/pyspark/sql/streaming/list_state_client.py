@@ -118,12 +118,12 @@ class ListStateClient:
         state_variable_request = stateMessage.StateVariableRequest(listStateCall=list_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error updating value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"ListState.append_value('{state_name}')", "Error updating value state"
+        )
 
     def append_list(
         self, state_name: str, schema: Union[StructType, str], values: List[Tuple]
@@ -139,14 +139,13 @@ class ListStateClient:
         state_variable_request = stateMessage.StateVariableRequest(listStateCall=list_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-
-        self._stateful_processor_api_client._send_arrow_state(schema, values)
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error updating value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._send_arrow_state(schema, values, flush=False)
+        self._stateful_processor_api_client._defer_response_check(
+            f"ListState.append_list('{state_name}')", "Error updating value state"
+        )
 
     def put(self, state_name: str, schema: Union[StructType, str], values: List[Tuple]) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -158,14 +157,13 @@ class ListStateClient:
         state_variable_request = stateMessage.StateVariableRequest(listStateCall=list_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-
-        self._stateful_processor_api_client._send_arrow_state(schema, values)
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error updating value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._send_arrow_state(schema, values, flush=False)
+        self._stateful_processor_api_client._defer_response_check(
+            f"ListState.put('{state_name}')", "Error updating value state"
+        )
 
     def clear(self, state_name: str) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -175,12 +173,12 @@ class ListStateClient:
         state_variable_request = stateMessage.StateVariableRequest(listStateCall=list_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error clearing value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"ListState.clear('{state_name}')", "Error clearing value state"
+        )
 
 
 class ListStateIterator:
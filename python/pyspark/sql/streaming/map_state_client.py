@@ -139,12 +139,12 @@ class MapStateClient:
         state_variable_request = stateMessage.StateVariableRequest(mapStateCall=map_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error updating map state value: {response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"MapState.update_value('{state_name}')", "Error updating map state value"
+        )
 
     def get_key_value_pair(self, state_name: str, iterator_id: str) -> Tuple[Tuple, Tuple]:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -255,12 +255,12 @@ class MapStateClient:
         state_variable_request = stateMessage.StateVariableRequest(mapStateCall=map_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error removing key from map state: {response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"MapState.remove_key('{state_name}')", "Error removing key from map state"
+        )
 
     def clear(self, state_name: str) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -270,12 +270,12 @@ class MapStateClient:
         state_variable_request = stateMessage.StateVariableRequest(mapStateCall=map_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error clearing map state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"MapState.clear('{state_name}')", "Error clearing map state"
+        )
 
 
 class MapStateIterator:
@@ -18,12 +18,13 @@
 import os
 import sys
 import json
-from typing import IO, Iterator, Tuple
+from typing import IO, Iterator, List, Tuple, TYPE_CHECKING
 
 from pyspark.accumulators import _accumulatorRegistry
 from pyspark.errors import IllegalArgumentException, PySparkAssertionError, PySparkRuntimeError
 from pyspark.serializers import (
     read_int,
+    read_long,
     write_int,
     write_with_length,
     SpecialLengths,
@@ -47,6 +48,9 @@ from pyspark.worker_util import (
     utf8_deserializer,
 )
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 INITIAL_OFFSET_FUNC_ID = 884
 LATEST_OFFSET_FUNC_ID = 885
 PARTITIONS_FUNC_ID = 886
@@ -67,14 +71,7 @@ def latest_offset_func(reader: DataSourceStreamReader, outfile: IO) -> None:
     write_with_length(json.dumps(offset).encode("utf-8"), outfile)
 
 
-def partitions_func(
-    reader: DataSourceStreamReader,
-    data_source: DataSource,
-    schema: StructType,
-    max_arrow_batch_size: int,
-    infile: IO,
-    outfile: IO,
-) -> None:
+def partitions_func(reader: DataSourceStreamReader, infile: IO, outfile: IO) -> None:
     start_offset = json.loads(utf8_deserializer.loads(infile))
     end_offset = json.loads(utf8_deserializer.loads(infile))
     partitions = reader.partitions(start_offset, end_offset)
@@ -83,11 +80,11 @@ def partitions_func(
     for partition in partitions:
         pickleSer._write_with_length(partition, outfile)
     if isinstance(reader, _SimpleStreamReaderWrapper):
-        it = reader.getCache(start_offset, end_offset)
-        if it is None:
+        batches = reader.getCachedBatches(start_offset, end_offset)
+        if batches is None:
             write_int(PREFETCHED_RECORDS_NOT_FOUND, outfile)
         else:
-            send_batch_func(it, outfile, schema, max_arrow_batch_size, data_source)
+            send_arrow_batches(batches, outfile)
     else:
         write_int(PREFETCHED_RECORDS_NOT_FOUND, outfile)
 
@@ -98,14 +95,7 @@ def commit_func(reader: DataSourceStreamReader, infile: IO, outfile: IO) -> None
     write_int(0, outfile)
 
 
-def send_batch_func(
-    rows: Iterator[Tuple],
-    outfile: IO,
-    schema: StructType,
-    max_arrow_batch_size: int,
-    data_source: DataSource,
-) -> None:
-    batches = list(records_to_arrow_batches(rows, max_arrow_batch_size, schema, data_source))
+def send_arrow_batches(batches: List["pa.RecordBatch"], outfile: IO) -> None:
     if len(batches) != 0:
         write_int(NON_EMPTY_PYARROW_RECORD_BATCHES, outfile)
         write_int(SpecialLengths.START_ARROW_STREAM, outfile)
@@ -154,10 +144,19 @@ def main(infile: IO, outfile: IO) -> None:
             "The maximum arrow batch size should be greater than 0, but got "
             f"'{max_arrow_batch_size}'"
         )
+        prefetch_batches = read_int(infile)
+        prefetch_bytes = read_long(infile)
+
+        def to_arrow_batches(rows: Iterator[Tuple]) -> List["pa.RecordBatch"]:
+            return list(
+                records_to_arrow_batches(iter(rows), max_arrow_batch_size, schema, data_source)
+            )
 
         # Instantiate data source reader.
         try:
-            reader = _streamReader(data_source, schema)
+            reader = _streamReader(
+                data_source, schema, to_arrow_batches, prefetch_batches, prefetch_bytes
+            )
             # Initialization succeed.
             write_int(0, outfile)
             outfile.flush()
@@ -170,9 +169,7 @@ def main(infile: IO, outfile: IO) -> None:
                 elif func_id == LATEST_OFFSET_FUNC_ID:
                     latest_offset_func(reader, outfile)
                 elif func_id == PARTITIONS_FUNC_ID:
-                    partitions_func(
-                        reader, data_source, schema, max_arrow_batch_size, infile, outfile
-                    )
+                    partitions_func(reader, infile, outfile)
                 elif func_id == COMMIT_FUNC_ID:
                     commit_func(reader, infile, outfile)
                 else:
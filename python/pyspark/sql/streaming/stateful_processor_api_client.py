@@ -48,6 +48,15 @@ class StatefulProcessorHandleState(Enum):
 
 
 class StatefulProcessorApiClient:
+    # The maximum number of bytes of the requests whose responses are not checked yet and of
+    # those responses, see _defer_response_check. It keeps the pipelined requests and the unread
+    # responses well within the socket buffers, so that the JVM never blocks on writing a response
+    # while this client blocks on writing a request.
+    _MAX_PENDING_BYTES = 64 * 1024
+    # The number of bytes accounted for each unread response. A successful response is an empty
+    # message after its length, a failed one also carries the error message.
+    _PENDING_RESPONSE_BYTES = 64
+
     def __init__(self, state_server_port: int, key_schema: StructType) -> None:
         self.key_schema = key_schema
         self._client_socket = socket.socket()
@@ -66,6 +75,13 @@ class StatefulProcessorApiClient:
         # so we will have new timestamps for a new batch
         self._batch_timestamp = -1
         self._watermark_timestamp = -1
+        # The calls and error messages of the requests whose responses are not checked yet, and
+        # the number of bytes accounted for them.
+        self._pending_responses: List[Tuple[str, str]] = []
+        self._pending_bytes = 0
+        # The values of the value states read for the current grouping key, or None if no
+        # grouping key is set. A value of None means that the value state does not exist.
+        self._value_state_cache: Optional[Dict[str, Optional[Tuple]]] = None
 
     def set_handle_state(self, state: StatefulProcessorHandleState) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -108,6 +124,7 @@ class StatefulProcessorApiClient:
         if status != 0:
             # TODO(SPARK-49233): Classify errors thrown by internal methods.
             raise PySparkRuntimeError(f"Error setting implicit key: " f"{response_message[1]}")
+        self._value_state_cache = {}
 
     def remove_implicit_key(self) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -122,6 +139,7 @@ class StatefulProcessorApiClient:
         if status != 0:
             # TODO(SPARK-49233): Classify errors thrown by internal methods.
             raise PySparkRuntimeError(f"Error removing implicit key: " f"{response_message[1]}")
+        self._value_state_cache = None
 
     def get_value_state(
         self, state_name: str, schema: Union[StructType, str], ttl_duration_ms: Optional[int]
@@ -177,12 +195,8 @@ class StatefulProcessorApiClient:
         call = stateMessage.StatefulProcessorCall(timerStateCall=state_call_command)
         message = stateMessage.StateRequest(statefulProcessorCall=call)
 
-        self._send_proto_message(message.SerializeToString())
-        response_message = self._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error register timer: " f"{response_message[1]}")
+        self._send_proto_message(message.SerializeToString(), flush=False)
+        self._defer_response_check(f"registerTimer({expiry_time_stamp_ms})", "Error register timer")
 
     def delete_timer(self, expiry_time_stamp_ms: int) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -192,12 +206,8 @@ class StatefulProcessorApiClient:
         call = stateMessage.StatefulProcessorCall(timerStateCall=state_call_command)
         message = stateMessage.StateRequest(statefulProcessorCall=call)
 
-        self._send_proto_message(message.SerializeToString())
-        response_message = self._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error deleting timer: " f"{response_message[1]}")
+        self._send_proto_message(message.SerializeToString(), flush=False)
+        self._defer_response_check(f"deleteTimer({expiry_time_stamp_ms})", "Error deleting timer")
 
     def get_list_timer_row(self, iterator_id: str) -> int:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -324,6 +334,8 @@ class StatefulProcessorApiClient:
         if status != 0:
             # TODO(SPARK-49233): Classify user facing errors.
             raise PySparkRuntimeError(f"Error deleting state: " f"{response_message[1]}")
+        if self._value_state_cache is not None:
+            self._value_state_cache.pop(state_name, None)
 
     def _get_batch_timestamp(self) -> int:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -367,13 +379,60 @@ class StatefulProcessorApiClient:
             timestamp = response_message[2]
             return timestamp
 
-    def _send_proto_message(self, message: bytes) -> None:
+    def _send_proto_message(self, message: bytes, flush: bool = True) -> None:
+        if flush:
+            # The request waits for its response, so check the deferred responses first. This
+            # raises the error of a failed deferred call before anything else is sent.
+            self._check_pending_responses()
         # Writing zero here to indicate message version. This allows us to evolve the message
         # format or even changing the message protocol in the future.
         write_int(0, self.sockfile)
         write_int(len(message), self.sockfile)
         self.sockfile.write(message)
+        if flush:
+            self.sockfile.flush()
+        else:
+            self._pending_bytes += 8 + len(message)
+
+    def _defer_response_check(self, call: str, error_message: str) -> None:
+        """
+        Defer reading the response of the request just sent, which only tells whether the request
+        succeeded. This pipelines the requests which do not return a value, e.g. state updates,
+        instead of waiting for a round-trip to the JVM per request.
+
+        The deferred responses are checked before the next request that waits for its response
+        is sent, e.g. a state read or the removal of the grouping key at the end of
+        `handleInputRows`, or once the pending requests and responses reach
+        `_MAX_PENDING_BYTES`. A failed request then raises an error with the given message,
+        naming the deferred call that failed.
+        """
+        self._pending_responses.append((call, error_message))
+        self._pending_bytes += self._PENDING_RESPONSE_BYTES
+        if self._pending_bytes >= self._MAX_PENDING_BYTES:
+            self._check_pending_responses()
+
+    def _check_pending_responses(self) -> None:
+        if not self._pending_responses:
+            return
+        import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
+
         self.sockfile.flush()
+        pending_responses, self._pending_responses = self._pending_responses, []
+        self._pending_bytes = 0
+        error = None
+        for call, error_message in pending_responses:
+            # Read all the pending responses so that the stream is left in a consistent state.
+            length = read_int(self.sockfile)
+            message = stateMessage.StateResponse()
+            message.ParseFromString(self.sockfile.read(length))
+            if message.statusCode != 0 and error is None:
+                error = f"{error_message} in the deferred call {call}: {message.errorMessage}"
+        if error is not None:
+            # The cached values may assume that the failed call succeeded.
+            if self._value_state_cache is not None:
+                self._value_state_cache = {}
+            # TODO(SPARK-49233): Classify user facing errors.
+            raise PySparkRuntimeError(error)
 
     def _receive_proto_message(self) -> Tuple[int, str, bytes]:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -421,7 +480,7 @@ class StatefulProcessorApiClient:
     def _deserialize_from_bytes(self, value: bytes) -> Any:
         return self.pickleSer.loads(value)
 
-    def _send_arrow_state(self, schema: StructType, state: List[Tuple]) -> None:
+    def _send_arrow_state(self, schema: StructType, state: List[Tuple], flush: bool = True) -> None:
         import pyarrow as pa
         import pandas as pd
 
@@ -431,7 +490,10 @@ class StatefulProcessorApiClient:
         )
         batch = pa.RecordBatch.from_pandas(pandas_df)
         self.serializer.dump_stream(iter([batch]), self.sockfile)
-        self.sockfile.flush()
+        if flush:
+            self.sockfile.flush()
+        else:
+            self._pending_bytes += batch.nbytes
 
     def _read_arrow_state(self) -> Any:
         return self.serializer.load_stream(self.sockfile)
@@ -30,6 +30,10 @@ class ValueStateClient:
     def exists(self, state_name: str) -> bool:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
 
+        cache = self._stateful_processor_api_client._value_state_cache
+        if cache is not None and state_name in cache:
+            return cache[state_name] is not None
+
         exists_call = stateMessage.Exists()
         value_state_call = stateMessage.ValueStateCall(stateName=state_name, exists=exists_call)
         state_variable_request = stateMessage.StateVariableRequest(valueStateCall=value_state_call)
@@ -52,6 +56,12 @@ class ValueStateClient:
     def get(self, state_name: str) -> Optional[Tuple]:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
 
+        # The value read for the current grouping key is cached until the value state is
+        # updated, so reading the value state repeatedly does not call the JVM every time.
+        cache = self._stateful_processor_api_client._value_state_cache
+        if cache is not None and state_name in cache:
+            return cache[state_name]
+
         get_call = stateMessage.Get()
         value_state_call = stateMessage.ValueStateCall(stateName=state_name, get=get_call)
         state_variable_request = stateMessage.StateVariableRequest(valueStateCall=value_state_call)
@@ -62,9 +72,15 @@ class ValueStateClient:
         status = response_message[0]
         if status == 0:
             if len(response_message[2]) == 0:
-                return None
-            data = self._stateful_processor_api_client._deserialize_from_bytes(response_message[2])
-            return tuple(data)
+                value = None
+            else:
+                data = self._stateful_processor_api_client._deserialize_from_bytes(
+                    response_message[2]
+                )
+                value = tuple(data)
+            if cache is not None:
+                cache[state_name] = value
+            return value
         else:
             # TODO(SPARK-49233): Classify user facing errors.
             raise PySparkRuntimeError(f"Error getting value state: " f"{response_message[1]}")
@@ -82,12 +98,17 @@ class ValueStateClient:
         state_variable_request = stateMessage.StateVariableRequest(valueStateCall=value_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error updating value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"ValueState.update('{state_name}')", "Error updating value state"
+        )
+        # The next read goes to the JVM rather than caching the given value, whose types may
+        # differ from the ones of the value read back, e.g. NumPy types.
+        cache = self._stateful_processor_api_client._value_state_cache
+        if cache is not None:
+            cache.pop(state_name, None)
 
     def clear(self, state_name: str) -> None:
         import pyspark.sql.streaming.proto.StateMessage_pb2 as stateMessage
@@ -97,9 +118,12 @@ class ValueStateClient:
         state_variable_request = stateMessage.StateVariableRequest(valueStateCall=value_state_call)
         message = stateMessage.StateRequest(stateVariableRequest=state_variable_request)
 
-        self._stateful_processor_api_client._send_proto_message(message.SerializeToString())
-        response_message = self._stateful_processor_api_client._receive_proto_message()
-        status = response_message[0]
-        if status != 0:
-            # TODO(SPARK-49233): Classify user facing errors.
-            raise PySparkRuntimeError(f"Error clearing value state: " f"{response_message[1]}")
+        self._stateful_processor_api_client._send_proto_message(
+            message.SerializeToString(), flush=False
+        )
+        self._stateful_processor_api_client._defer_response_check(
+            f"ValueState.clear('{state_name}')", "Error clearing value state"
+        )
+        cache = self._stateful_processor_api_client._value_state_cache
+        if cache is not None:
+            cache[state_name] = None
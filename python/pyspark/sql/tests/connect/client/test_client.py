@@ -15,10 +15,14 @@
 # limitations under the License.
 #
 
+import asyncio
+import os
+import tempfile
 import unittest
 import uuid
 from collections.abc import Generator
 from typing import Optional, Any, Union
+from unittest import mock
 
 from pyspark.testing.connectutils import should_test_connect, connect_requirement_message
 from pyspark.testing.utils import eventually
@@ -30,11 +34,27 @@ if should_test_connect:
     import pyarrow as pa
     from pyspark.sql.connect.client import SparkConnectClient, DefaultChannelBuilder
     from pyspark.sql.connect.client.retries import (
+        AsyncRetrying,
         Retrying,
         DefaultPolicy,
     )
-    from pyspark.sql.connect.client.reattach import ExecutePlanResponseReattachableIterator
-    from pyspark.errors import PySparkRuntimeError, RetriesExceeded
+    from pyspark.sql.connect.client.plan_cache import plan_fingerprint
+    from pyspark.sql.connect.client.prefetch import prefetch
+    from pyspark.sql.connect.client.telemetry import (
+        ARROW_DECODE_SECONDS,
+        PANDAS_CONVERSION_SECONDS,
+        RETRY_WAIT_SECONDS,
+        RPC_FIRST_RESPONSE_SECONDS,
+        RPC_SECONDS,
+        PrometheusTextFileSink,
+    )
+    from pyspark.sql.connect.client.reattach import (
+        AsyncExecutePlanResponseReattachableIterator,
+        ExecutePlanResponseReattachableIterator,
+    )
+    from pyspark.sql.connect.types import pyspark_types_to_proto_types
+    from pyspark.sql.types import LongType, StructField, StructType
+    from pyspark.errors import PySparkRuntimeError, PySparkValueError, RetriesExceeded
     import pyspark.sql.connect.proto as proto
 
     class TestPolicy(DefaultPolicy):
@@ -132,9 +152,16 @@ if should_test_connect:
         def __init__(self, session_id: str):
             self._session_id = session_id
             self.req = None
+            # Call counters
+            self.execute_calls = 0
+            self.analyze_calls = 0
+            # Requests of every AddArtifacts call, and the artifacts to fail adding once
+            self.artifact_requests = []
+            self.failing_artifacts = set()
 
         def ExecutePlan(self, req: proto.ExecutePlanRequest, metadata):
             self.req = req
+            self.execute_calls += 1
             resp = proto.ExecutePlanResponse()
             resp.session_id = self._session_id
 
@@ -158,6 +185,71 @@ if should_test_connect:
             resp.session_id = self._session_id
             return resp
 
+        def AnalyzePlan(self, req: proto.AnalyzePlanRequest, metadata):
+            self.req = req
+            self.analyze_calls += 1
+            resp = proto.AnalyzePlanResponse()
+            resp.session_id = self._session_id
+            resp.schema.schema.CopyFrom(
+                pyspark_types_to_proto_types(StructType([StructField("col1", LongType())]))
+            )
+            return resp
+
+        def Config(self, req: proto.ConfigRequest, metadata):
+            self.req = req
+            resp = proto.ConfigResponse()
+            resp.session_id = self._session_id
+            return resp
+
+        def AddArtifacts(self, requests, metadata):
+            requests = list(requests)
+            names = [a.name for r in requests if r.HasField("batch") for a in r.batch.artifacts]
+            names += [r.begin_chunk.name for r in requests if r.HasField("begin_chunk")]
+            if any(name in self.failing_artifacts for name in names):
+                self.failing_artifacts.difference_update(names)
+                raise TestException("Non Fatal", grpc.StatusCode.UNAVAILABLE)
+            self.artifact_requests.append(requests)
+            return proto.AddArtifactsResponse()
+
+    def async_responses(ops):
+        """Returns the values, or the results of calling them, as an async response stream."""
+
+        async def generate():
+            for op in ops:
+                yield op() if callable(op) else op
+
+        return generate()
+
+    class AsyncMockService(MockService):
+        """Mock of the SparkConnectService for the asyncio client."""
+
+        def ExecutePlan(self, req: proto.ExecutePlanRequest, metadata):
+            return async_responses(super().ExecutePlan(req, metadata))
+
+        async def Interrupt(self, req: proto.InterruptRequest, metadata):
+            return super().Interrupt(req, metadata)
+
+        async def AnalyzePlan(self, req: proto.AnalyzePlanRequest, metadata):
+            return super().AnalyzePlan(req, metadata)
+
+        async def Config(self, req: proto.ConfigRequest, metadata):
+            return super().Config(req, metadata)
+
+        async def AddArtifacts(self, requests, metadata):
+            return super().AddArtifacts([req async for req in requests], metadata)
+
+    class AsyncMockSparkConnectStub(MockSparkConnectStub):
+        """Mock of the asyncio GRPC stub used by the asynchronous re-attachable execution."""
+
+        def ExecutePlan(self, *args, **kwargs):
+            return async_responses(super().ExecutePlan(*args, **kwargs))
+
+        def ReattachExecute(self, *args, **kwargs):
+            return async_responses(super().ReattachExecute(*args, **kwargs))
+
+        async def ReleaseExecute(self, req: proto.ReleaseExecuteRequest, *args, **kwargs):
+            super().ReleaseExecute(req, *args, **kwargs)
+
 
 @unittest.skipIf(not should_test_connect, connect_requirement_message)
 class SparkConnectClientTestCase(unittest.TestCase):
@@ -255,6 +347,238 @@ class SparkConnectClientTestCase(unittest.TestCase):
         client = SparkConnectClient(chan)
         self.assertEqual(client._session_id, chan.session_id)
 
+    def test_plan_optimizer(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        mock = MockService(client._session_id)
+        client._stub = mock
+
+        plan = proto.Plan()
+        relation = plan.root
+        for i in reversed(range(3)):
+            relation.common.plan_id = i + 1
+            relation.with_columns.aliases.add(name=[f"col{i}"]).expr.literal.integer = i
+            relation = relation.with_columns.input
+        relation.sql.query = "SELECT 1"
+
+        client.to_table(plan, {})
+        self.assertEqual(mock.req.plan, plan)
+        client.enable_plan_optimizer()
+        client.to_table(plan, {})
+        self.assertEqual(
+            [a.name[0] for a in mock.req.plan.root.with_columns.aliases], ["col0", "col1", "col2"]
+        )
+        self.assertTrue(mock.req.plan.root.with_columns.input.HasField("sql"))
+        client.schema(plan)
+        self.assertTrue(mock.req.schema.plan.root.with_columns.input.HasField("sql"))
+
+        self.assertEqual(
+            client.explain_plan_optimization(plan),
+            "== Client Plan ==\n"
+            "WithColumns [col2] #3\n"
+            "+- WithColumns [col1] #2\n"
+            "   +- WithColumns [col0] #1\n"
+            "      +- Sql #0\n"
+            "== Optimized Client Plan ==\n"
+            "WithColumns [col0, col1, col2] #3\n"
+            "+- Sql #0",
+        )
+
+    def test_telemetry(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        client._stub = MockService(client._session_id)
+        client.set_retry_policies([TestPolicy()])
+        with tempfile.TemporaryDirectory(prefix="test_telemetry") as d:
+            path = os.path.join(d, "spark_connect.prom")
+            client.enable_telemetry(PrometheusTextFileSink(path))
+            sink = client.telemetry_sink
+
+            plan = proto.Plan()
+            plan.root.sql.query = "SELECT 1"
+            table, schema, _ = client.to_table(plan, {})
+            schema = StructType([StructField("col1", LongType())])
+            client._table_to_pandas(table, schema, False, None, None)
+            client.get_configs("spark.sql.session.timeZone")
+            self.assertEqual(sink.histograms(RPC_SECONDS)[(("rpc", "Config"),)].count, 1)
+            for name in [RPC_SECONDS, RPC_FIRST_RESPONSE_SECONDS]:
+                self.assertEqual(sink.histograms(name)[(("rpc", "ExecutePlan"),)].count, 1)
+            for name in [ARROW_DECODE_SECONDS, PANDAS_CONVERSION_SECONDS]:
+                self.assertEqual(sink.histograms(name)[()].count, 1)
+
+            attempts = 0
+            for attempt in client._retrying():
+                with attempt:
+                    attempts += 1
+                    if attempts == 1:
+                        raise TestException("Retryable error", grpc.StatusCode.UNAVAILABLE)
+            self.assertEqual(sink.histograms(RETRY_WAIT_SECONDS)[()].count, 1)
+
+            histogram = sink.histograms(RPC_SECONDS)[(("rpc", "ExecutePlan"),)]
+            self.assertEqual(histogram.cumulative_counts()[-1], 1)
+            client.close()
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertIn(f"# TYPE {RPC_SECONDS} histogram", lines)
+            self.assertIn(f'{RPC_SECONDS}_bucket{{rpc="ExecutePlan",le="+Inf"}} 1', lines)
+            self.assertIn(f'{RPC_SECONDS}_count{{rpc="ExecutePlan"}} 1', lines)
+            self.assertIn(f"{RETRY_WAIT_SECONDS}_count 1", lines)
+
+        client.disable_telemetry()
+        self.assertIsInstance(client._stub, MockService)
+
+    def test_plan_cache(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        mock = MockService(client._session_id)
+        client._stub = mock
+        client.enable_plan_cache()
+
+        def plan(plan_id, query="SELECT 1"):
+            p = proto.Plan()
+            p.root.common.plan_id = plan_id
+            p.root.sql.query = query
+            return p
+
+        # Equal plans of different DataFrames differ only in their plan ids.
+        self.assertEqual(client.schema(plan(1)), client.schema(plan(7)))
+        self.assertEqual(mock.analyze_calls, 1)
+        client.schema(plan(1, "SELECT 2"))
+        self.assertEqual(mock.analyze_calls, 2)
+
+        table, _, _ = client.to_table(plan(1), {})
+        cached_table, _, ei = client.to_table(plan(2), {})
+        self.assertEqual(mock.execute_calls, 1)
+        self.assertEqual(table, cached_table)
+        self.assertIsNone(ei.metrics)
+
+        # Commands and configuration changes clear the cache.
+        client.execute_command(proto.Command())
+        client.to_table(plan(3), {})
+        self.assertEqual(mock.execute_calls, 3)
+        client.config(proto.ConfigRequest.Operation(set=proto.ConfigRequest.Set()))
+        client.schema(plan(4))
+        self.assertEqual(mock.analyze_calls, 3)
+
+        stats = client._plan_cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["entries"], 1)
+
+        client.disable_plan_cache()
+        client.schema(plan(4))
+        self.assertEqual(mock.analyze_calls, 4)
+
+    def test_plan_cache_non_deterministic(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        mock = MockService(client._session_id)
+        client._stub = mock
+        client.enable_plan_cache()
+
+        def sql(query):
+            p = proto.Plan()
+            p.root.sql.query = query
+            return p
+
+        def project(function_name):
+            p = proto.Plan()
+            p.root.project.input.sql.query = "SELECT 1"
+            p.root.project.expressions.add().unresolved_function.function_name = function_name
+            return p
+
+        for plan in [
+            sql("SELECT current_timestamp()"),
+            sql("SELECT CURRENT_DATE"),
+            sql("SELECT unix_timestamp()"),
+            project("rand"),
+            project("uuid"),
+        ]:
+            self.assertIsNone(plan_fingerprint(plan))
+            execute_calls = mock.execute_calls
+            client.to_table(plan, {})
+            client.to_table(plan, {})
+            self.assertEqual(mock.execute_calls, execute_calls + 2)
+
+        for plan in [sql("SELECT unix_timestamp(ts) FROM t"), project("abs")]:
+            self.assertIsNotNone(plan_fingerprint(plan))
+            execute_calls = mock.execute_calls
+            client.to_table(plan, {})
+            client.to_table(plan, {})
+            self.assertEqual(mock.execute_calls, execute_calls + 1)
+
+    def test_background_fetch(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        mock = MockService(client._session_id)
+        client._stub = mock
+        client.enable_background_fetch(max_pending_responses=1)
+
+        plan = proto.Plan()
+        plan.root.sql.query = "SELECT 1"
+        table, _, _ = client.to_table(plan, {})
+        self.assertEqual(table.column(0).to_pylist(), [1, 2])
+
+        # Errors of the stream are raised to the caller after the responses received before.
+        def failing(iterator):
+            yield from iterator
+            raise ValueError("broken stream")
+
+        received = []
+        with self.assertRaisesRegex(ValueError, "broken stream"):
+            for item in prefetch(failing(iter(range(5))), 2, "test-prefetch"):
+                received.append(item)
+        self.assertEqual(received, list(range(5)))
+
+        with self.assertRaises(PySparkValueError):
+            client.enable_background_fetch(max_pending_responses=0)
+        client.disable_background_fetch()
+        table, _, _ = client.to_table(plan, {})
+        self.assertEqual(table.num_rows, 2)
+
+    def test_add_artifacts(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        mock = MockService(client._session_id)
+        client._artifact_manager._stub = mock
+        client.configure_artifact_upload(chunk_size=4, max_parallel_uploads=2)
+        with self.assertRaises(PySparkValueError):
+            client.configure_artifact_upload(chunk_size=0)
+
+        with tempfile.TemporaryDirectory(prefix="test_add_artifacts") as d:
+            paths = []
+            for name, content in [("a.py", "x=1"), ("b.py", "y = 2"), ("c.py", "z = 333")]:
+                paths.append(os.path.join(d, name))
+                with open(paths[-1], "w") as f:
+                    f.write(content)
+
+            client.add_artifacts(*paths, pyfile=True, archive=False, file=False)
+            # The small artifact is batched, the large ones are sent in chunks on their own.
+            self.assertEqual(len(mock.artifact_requests), 3)
+            streams = sorted(mock.artifact_requests, key=len)
+            self.assertEqual(streams[0][0].batch.artifacts[0].name, "pyfiles/a.py")
+            self.assertEqual(streams[1][0].begin_chunk.name, "pyfiles/b.py")
+            self.assertEqual(streams[1][0].begin_chunk.num_chunks, 2)
+            self.assertEqual(streams[2][0].begin_chunk.num_chunks, 2)
+            self.assertEqual(b"".join(r.chunk.data for r in streams[2][1:]), b"333")
+
+            # The artifacts already added with the same content are not sent again.
+            mock.artifact_requests.clear()
+            client.add_artifacts(*paths, pyfile=True, archive=False, file=False)
+            self.assertEqual(mock.artifact_requests, [])
+
+            # Only the artifacts which failed to be added are sent again.
+            for path in paths[1:]:
+                with open(path, "a") as f:
+                    f.write("0")
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            mock.failing_artifacts.add("pyfiles/c.py")
+            with self.assertRaises(TestException):
+                client._artifact_manager.add_artifacts(
+                    *paths, pyfile=True, archive=False, file=False
+                )
+            self.assertEqual(
+                [r[0].begin_chunk.name for r in mock.artifact_requests], ["pyfiles/b.py"]
+            )
+            mock.artifact_requests.clear()
+            client._artifact_manager.add_artifacts(*paths, pyfile=True, archive=False, file=False)
+            self.assertEqual(
+                [r[0].begin_chunk.name for r in mock.artifact_requests], ["pyfiles/c.py"]
+            )
+
 
 @unittest.skipIf(not should_test_connect, connect_requirement_message)
 class SparkConnectClientReattachTestCase(unittest.TestCase):
@@ -289,6 +613,20 @@ class SparkConnectClientReattachTestCase(unittest.TestCase):
 
         eventually(timeout=1, catch_assertions=True)(check_all)()
 
+    def test_release_on_early_stop_with_prefetch(self):
+        stub = self._stub_with([self.response] * 10 + [self.finished])
+        ite = ExecutePlanResponseReattachableIterator(self.request, stub, self.retrying, [])
+        responses = prefetch(ite, 1, "test-prefetch")
+        for b in responses:
+            break
+        responses.close()
+
+        def check():
+            self.assertEqual(1, stub.release_calls)
+            self.assertEqual(1, stub.execute_calls)
+
+        eventually(timeout=1, catch_assertions=True)(check)()
+
     def test_fail_during_execute(self):
         def fatal():
             raise TestException("Fatal")
@@ -430,6 +768,234 @@ class SparkConnectClientReattachTestCase(unittest.TestCase):
         self.assertEqual(reattach.client_observed_server_side_session_id, session_id)
 
 
+@unittest.skipIf(not should_test_connect, connect_requirement_message)
+class AsyncSparkConnectClientTestCase(unittest.TestCase):
+    def _async_client(self, client, stub):
+        async_client = client.async_client
+        # Use the stub instead of a channel in the running event loop.
+        async_client._loop = asyncio.get_running_loop()
+        async_client._stub_instance = stub
+        return async_client
+
+    def test_execute_concurrently(self):
+        async def run():
+            client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+            mock = AsyncMockService(client._session_id)
+            async_client = self._async_client(client, mock)
+
+            plan = proto.Plan()
+            plan.root.sql.query = "SELECT 1"
+            results = await asyncio.gather(*(async_client.to_table(plan, {}) for _ in range(10)))
+            self.assertEqual(mock.execute_calls, 10)
+            for table, _, _ in results:
+                self.assertEqual(table.column(0).to_pylist(), [1, 2])
+
+            rows = [
+                table.num_rows
+                async for table in async_client.to_table_as_iterator(plan, {})
+                if isinstance(table, pa.Table)
+            ]
+            self.assertEqual(rows, [2])
+
+            schema = await async_client.schema(plan)
+            self.assertEqual(schema, StructType([StructField("col1", LongType())]))
+            self.assertEqual(await async_client.get_configs("foo"), (None,))
+
+        asyncio.run(run())
+
+    def test_add_artifacts(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        client.set_retry_policies([TestPolicy()])
+        client.configure_artifact_upload(chunk_size=4, max_parallel_uploads=2)
+        mock = AsyncMockService(client._session_id)
+
+        async def add(*paths):
+            await self._async_client(client, mock).add_artifacts(
+                *paths, pyfile=True, archive=False, file=False
+            )
+
+        with tempfile.TemporaryDirectory(prefix="test_add_artifacts") as d:
+            paths = []
+            for name, content in [("a.py", "x=1"), ("b.py", "y = 2"), ("c.py", "z = 333")]:
+                paths.append(os.path.join(d, name))
+                with open(paths[-1], "w") as f:
+                    f.write(content)
+
+            asyncio.run(add(*paths))
+            # The small artifact is batched, the large ones are sent in chunks on their own.
+            streams = sorted(mock.artifact_requests, key=len)
+            self.assertEqual(len(streams), 3)
+            self.assertEqual(streams[0][0].batch.artifacts[0].name, "pyfiles/a.py")
+            self.assertEqual(streams[0][0].batch.artifacts[0].data.data, b"x=1")
+            self.assertEqual(streams[1][0].begin_chunk.name, "pyfiles/b.py")
+            self.assertEqual(b"".join(r.chunk.data for r in streams[2][1:]), b"333")
+
+            # The artifacts already added with the same content are not sent again.
+            mock.artifact_requests.clear()
+            asyncio.run(add(*paths))
+            self.assertEqual(mock.artifact_requests, [])
+
+            # A failed upload is retried, without sending the artifacts added meanwhile again.
+            for path in paths[1:]:
+                with open(path, "a") as f:
+                    f.write("0")
+                os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            mock.failing_artifacts.add("pyfiles/c.py")
+            asyncio.run(add(*paths))
+            self.assertEqual(
+                sorted(r[0].begin_chunk.name for r in mock.artifact_requests),
+                ["pyfiles/b.py", "pyfiles/c.py"],
+            )
+
+    def test_reattach(self):
+        def non_fatal():
+            raise TestException("Non Fatal", grpc.StatusCode.UNAVAILABLE)
+
+        response = proto.ExecutePlanResponse(response_id="1")
+        finished = proto.ExecutePlanResponse(
+            result_complete=proto.ExecutePlanResponse.ResultComplete(),
+            response_id="2",
+        )
+        stub = AsyncMockSparkConnectStub([response, non_fatal], [response, finished])
+
+        async def run():
+            ite = AsyncExecutePlanResponseReattachableIterator(
+                proto.ExecutePlanRequest(), stub, lambda: AsyncRetrying(TestPolicy()), []
+            )
+            responses = [b async for b in ite]
+            self.assertEqual(len(responses), 3)
+            await asyncio.gather(*AsyncExecutePlanResponseReattachableIterator._release_tasks)
+
+        asyncio.run(run())
+        self.assertEqual(1, stub.execute_calls)
+        self.assertEqual(1, stub.attach_calls)
+        self.assertEqual(2, stub.release_until_calls)
+        self.assertEqual(1, stub.release_calls)
+
+    def _arrow_response(self, client, response_id):
+        response = MockService(client._session_id).ExecutePlan(proto.ExecutePlanRequest(), [])[0]
+        response.response_id = response_id
+        return response
+
+    def test_release_on_early_stop(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=True)
+        finished = proto.ExecutePlanResponse(
+            result_complete=proto.ExecutePlanResponse.ResultComplete(),
+            response_id="3",
+        )
+        stub = AsyncMockSparkConnectStub(
+            [self._arrow_response(client, "1"), self._arrow_response(client, "2"), finished]
+        )
+        plan = proto.Plan()
+        plan.root.sql.query = "SELECT 1"
+
+        async def run():
+            tables = self._async_client(client, stub).to_table_as_iterator(plan, {})
+            async for _ in tables:
+                break
+            await tables.aclose()
+            await asyncio.gather(*AsyncExecutePlanResponseReattachableIterator._release_tasks)
+
+        asyncio.run(run())
+        self.assertEqual(1, stub.execute_calls)
+        self.assertEqual(1, stub.release_calls)
+
+    def test_release_on_cancel(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=True)
+        response = self._arrow_response(client, "1")
+
+        class BlockingStub(AsyncMockSparkConnectStub):
+            def ExecutePlan(self, *args, **kwargs):
+                self.execute_calls += 1
+
+                async def generate():
+                    yield response
+                    # The rest of the results never arrive.
+                    await asyncio.Event().wait()
+
+                return generate()
+
+        stub = BlockingStub()
+        plan = proto.Plan()
+        plan.root.sql.query = "SELECT 1"
+
+        async def run():
+            received = asyncio.Event()
+
+            async def consume():
+                async for _ in self._async_client(client, stub).to_table_as_iterator(plan, {}):
+                    received.set()
+
+            task = asyncio.create_task(consume())
+            await received.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            await asyncio.gather(*AsyncExecutePlanResponseReattachableIterator._release_tasks)
+
+        asyncio.run(run())
+        self.assertEqual(1, stub.execute_calls)
+        self.assertEqual(1, stub.release_calls)
+
+    def test_channel_per_event_loop(self):
+        client = SparkConnectClient("sc://foo/", use_reattachable_execute=False)
+        channels = []
+
+        def to_async_channel():
+            channel = mock.MagicMock()
+            channel.close = mock.AsyncMock()
+            channels.append(channel)
+            return channel
+
+        client._builder.toAsyncChannel = to_async_channel
+
+        async def get_stub():
+            return client.async_client._stub
+
+        loop1 = asyncio.new_event_loop()
+        loop2 = asyncio.new_event_loop()
+        try:
+            loop1.run_until_complete(get_stub())
+            loop1.run_until_complete(get_stub())
+            self.assertEqual(len(channels), 1)
+
+            # The channel of the first event loop is closed in it once another loop is used.
+            loop2.run_until_complete(get_stub())
+            self.assertEqual(len(channels), 2)
+            loop1.run_until_complete(asyncio.sleep(0))
+            channels[0].close.assert_awaited_once()
+
+            # Closing the client closes the channel of the last event loop.
+            client.close()
+            loop2.run_until_complete(asyncio.sleep(0))
+            channels[1].close.assert_awaited_once()
+        finally:
+            loop1.close()
+            loop2.close()
+
+    def test_retry(self):
+        attempts = 0
+
+        async def run():
+            nonlocal attempts
+            async for attempt in AsyncRetrying(TestPolicy()):
+                with attempt:
+                    attempts += 1
+                    if attempts < 3:
+                        raise TestException("Non Fatal", grpc.StatusCode.UNAVAILABLE)
+
+        asyncio.run(run())
+        self.assertEqual(attempts, 3)
+
+        async def fail():
+            async for attempt in AsyncRetrying(TestPolicy()):
+                with attempt:
+                    raise TestException("Non Fatal", grpc.StatusCode.UNAVAILABLE)
+
+        with self.assertRaises(RetriesExceeded):
+            asyncio.run(fail())
+
+
 if __name__ == "__main__":
     from pyspark.sql.tests.connect.client.test_client import *  # noqa: F401
 
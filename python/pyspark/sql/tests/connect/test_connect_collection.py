@@ -47,6 +47,27 @@ class SparkConnectCollectionTests(SparkConnectSQLTestCase):
             sdf.collect(),
         )
 
+    def test_collect_lazy(self):
+        from pyspark.sql.conversion import ArrowRowSequence
+
+        cdf = self.connect.read.table(self.tbl_name).select(
+            "id", "name", CF.struct("id", "name").alias("s")
+        )
+        sdf = self.spark.read.table(self.tbl_name).select(
+            "id", "name", SF.struct("id", "name").alias("s")
+        )
+        expected = sdf.collect()
+
+        data = cdf.collectLazy()
+
+        self.assertIsInstance(data, ArrowRowSequence)
+        self.assertIsInstance(cdf.collect(), list)
+        self.assertEqual(len(data), len(expected))
+        self.assertEqual(data, expected)
+        self.assertEqual(data[-1], expected[-1])
+        self.assertEqual(list(data[2:5]), expected[2:5])
+        self.assertEqual(data.table.num_rows, len(expected))
+
     def test_collect_timestamp(self):
         query = """
             SELECT * FROM VALUES
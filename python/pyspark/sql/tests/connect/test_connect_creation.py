@@ -17,6 +17,7 @@
 
 import array
 import datetime
+import decimal
 import unittest
 import random
 import string
@@ -513,6 +514,43 @@ class SparkConnectCreationTests(SparkConnectSQLTestCase):
         self.assertEqual(cdf.schema, sdf.schema)
         self.assertEqual(cdf.collect(), sdf.collect())
 
+    def test_create_df_in_batches(self):
+        schema = "id long, name string, amount decimal(10, 0), ts timestamp, tags array<string>"
+        data = [
+            (
+                i,
+                str(i) if i % 3 else i,
+                decimal.Decimal("NaN") if i % 5 == 0 else decimal.Decimal(i),
+                datetime.datetime(2024, 1, 1, i % 24),
+                ["a", None] if i % 2 else None,
+            )
+            for i in range(100)
+        ]
+        data[10] = {"id": 10, "name": True, "amount": None, "ts": None, "tags": []}
+
+        expected = self.connect.createDataFrame(data, schema).collect()
+        self.connect.conf.set("spark.sql.execution.arrow.maxRecordsPerBatch", "7")
+        try:
+            self.assertEqual(self.connect.createDataFrame(data, schema).collect(), expected)
+        finally:
+            self.connect.conf.unset("spark.sql.execution.arrow.maxRecordsPerBatch")
+
+        self.assertEqual(expected[3].name, "3")
+        self.assertIsNone(expected[5].amount)
+        self.assertEqual(expected[10], Row(id=10, name="true", amount=None, ts=None, tags=[]))
+
+    def test_create_df_timestamp_ntz_rejects_aware_datetime(self):
+        schema = "ts timestamp_ntz"
+        naive = datetime.datetime(2024, 1, 1, 12)
+        self.assertEqual(
+            self.connect.createDataFrame([(naive,), (None,)], schema).collect(),
+            [Row(ts=naive), Row(ts=None)],
+        )
+
+        aware = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+        with self.assertRaises(AssertionError):
+            self.connect.createDataFrame([(naive,), (aware,)], schema)
+
     def test_create_df_nullability(self):
         data = [("asd", None)]
         schema = StructType(
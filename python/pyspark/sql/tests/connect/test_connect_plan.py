@@ -32,6 +32,7 @@ if should_test_connect:
     from pyspark.sql.connect.column import Column
     from pyspark.sql.connect.dataframe import DataFrame
     from pyspark.sql.connect.plan import WriteOperation, Read
+    from pyspark.sql.connect.client.plan_optimizer import optimize_plan, plan_string
     from pyspark.sql.connect.readwriter import DataFrameReader
     from pyspark.sql.connect.expressions import LiteralExpression
     from pyspark.sql.connect.functions import col, lit, max, min, sum
@@ -602,6 +603,90 @@ class SparkConnectPlanTests(PlanOnlyTestFixture):
         self.assertIsNotNone(plan.root, "Root relation must be set")
         self.assertIsNotNone(plan.root.read)
 
+    def test_deep_plan(self):
+        df = self.connect.readTable(table_name=self.tbl_name)
+        for i in range(3000):
+            df = df.withColumn(f"col{i}", lit(i))
+        # The same subtree may appear more than once in a plan.
+        df = df.union(df)
+        plan = df._plan.to_proto(self.connect)
+
+        for relation in [plan.root.set_op.left_input, plan.root.set_op.right_input]:
+            for i in reversed(range(3000)):
+                self.assertEqual(relation.with_columns.aliases[0].name, [f"col{i}"])
+                relation = relation.with_columns.input
+            self.assertEqual(relation.read.named_table.unparsed_identifier, self.tbl_name)
+
+    def test_nested_plan_call(self):
+        from pyspark.sql.connect.plan import LogicalPlan
+
+        class DirectChildPlan(LogicalPlan):
+            def plan(self, session):
+                plan = self._create_proto_relation()
+                plan.project.input.CopyFrom(self._child.plan(session))
+                return plan
+
+        df = self.connect.readTable(table_name=self.tbl_name).select("col1")
+        with self.assertRaises(AssertionError):
+            DirectChildPlan(df._plan).to_proto(self.connect)
+
+    def test_optimize_plan(self):
+        df = self.connect.readTable(table_name=self.tbl_name)
+        for i in range(3):
+            df = df.withColumn(f"col{i}", lit(i))
+        df = df.withColumn("col3", col("id") + 1).withColumn("col4", col("col3"))
+        plan = df._plan.to_proto(self.connect)
+        self.assertEqual(optimize_plan(plan), 3)
+        # col4 references col3, so it is not collapsed with it.
+        self.assertEqual([a.name[0] for a in plan.root.with_columns.aliases], ["col4"])
+        relation = plan.root.with_columns.input
+        self.assertEqual(
+            [a.name[0] for a in relation.with_columns.aliases], ["col0", "col1", "col2", "col3"]
+        )
+        self.assertTrue(relation.with_columns.input.HasField("read"))
+        self.assertEqual(
+            plan_string(plan.root),
+            f"WithColumns [col4] #{plan.root.common.plan_id}\n"
+            f"+- WithColumns [col0, col1, col2, col3] #{relation.common.plan_id}\n"
+            f"   +- Read {self.tbl_name} #{relation.with_columns.input.common.plan_id}",
+        )
+
+        # Replacing a column depends on the order.
+        df = self.connect.readTable(table_name=self.tbl_name)
+        plan = df.withColumn("a", lit(1)).withColumn("a", lit(2))._plan.to_proto(self.connect)
+        self.assertEqual(optimize_plan(plan), 0)
+
+        # Relations referenced by their plan ids are kept.
+        df1 = df.withColumn("a", lit(1))
+        df2 = df1.withColumn("b", df1["a"])
+        plan = df2.withColumn("c", lit(2))._plan.to_proto(self.connect)
+        self.assertEqual(optimize_plan(plan), 1)
+        self.assertEqual([a.name[0] for a in plan.root.with_columns.aliases], ["b", "c"])
+        self.assertEqual(plan.root.with_columns.input.common.plan_id, df1._plan._plan_id)
+
+        df = self.connect.readTable(table_name=self.tbl_name)
+        df = df.filter(col("id") > 1).filter(col("id") < 10).filter(col("name").isNotNull())
+        df = df.withColumnRenamed("a", "b").withColumnRenamed("c", "d").drop("e").drop("f")
+        plan = df._plan.to_proto(self.connect)
+        self.assertEqual(optimize_plan(plan), 4)
+        self.assertEqual(list(plan.root.drop.column_names), ["e", "f"])
+        relation = plan.root.drop.input
+        self.assertEqual(
+            [(r.col_name, r.new_col_name) for r in relation.with_columns_renamed.renames],
+            [("a", "b"), ("c", "d")],
+        )
+        condition = relation.with_columns_renamed.input.filter.condition.unresolved_function
+        self.assertEqual(condition.function_name, "and")
+        self.assertEqual(condition.arguments[0].unresolved_function.function_name, "and")
+        self.assertEqual(condition.arguments[1].unresolved_function.function_name, "isNotNull")
+
+        # Renaming a renamed column depends on the order.
+        df = self.connect.readTable(table_name=self.tbl_name)
+        plan = (
+            df.withColumnRenamed("a", "b").withColumnRenamed("b", "c")._plan.to_proto(self.connect)
+        )
+        self.assertEqual(optimize_plan(plan), 0)
+
     def test_union(self):
         df1 = self.connect.readTable(table_name=self.tbl_name)
         df2 = self.connect.readTable(table_name=self.tbl_name)
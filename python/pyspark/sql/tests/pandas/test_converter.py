@@ -18,6 +18,7 @@
 import unittest
 from typing import cast
 
+from pyspark.errors import PySparkTypeError
 from pyspark.sql.types import (
     ArrayType,
     IntegerType,
@@ -43,6 +44,8 @@ if have_pandas:
 if have_pyarrow:
     import pyarrow as pa  # noqa: F401
 
+    from pyspark.sql.pandas.types import _create_converter_from_python
+
 
 @unittest.skipIf(
     not have_pandas or not have_pyarrow,
@@ -582,6 +585,30 @@ class ConverterTests(unittest.TestCase):
             ),
         )
 
+    def test_converter_from_python_struct(self):
+        conv = _create_converter_from_python(
+            StructType().add("a", IntegerType()).add("b", MapType(StringType(), IntegerType()))
+        )
+        self.assertEqual(conv(Row(a=1, b={"x": 2})), (1, [("x", 2)]))
+        self.assertEqual(conv((1, None)), (1, None))
+        self.assertEqual(conv([1, {}]), (1, []))
+        self.assertEqual(conv({"b": {"x": 2}}), (None, [("x", 2)]))
+
+        with self.assertRaises(PySparkTypeError) as pe:
+            conv(1)
+        self.assertEqual(pe.exception.getErrorClass(), "CANNOT_ACCEPT_OBJECT_IN_TYPE")
+
+        with self.assertRaises(PySparkTypeError) as pe:
+            conv((1, [("x", 2)]))
+        self.assertEqual(pe.exception.getErrorClass(), "CANNOT_ACCEPT_OBJECT_IN_TYPE")
+
+    def test_converter_from_python_map(self):
+        conv = _create_converter_from_python(MapType(StringType(), IntegerType()))
+        self.assertEqual(conv({"x": 1}), [("x", 1)])
+        with self.assertRaises(PySparkTypeError) as pe:
+            conv([("x", 1)])
+        self.assertEqual(pe.exception.getErrorClass(), "CANNOT_ACCEPT_OBJECT_IN_TYPE")
+
 
 if __name__ == "__main__":
     from pyspark.sql.tests.pandas.test_converter import *  # noqa: F401
@@ -852,6 +852,49 @@ class TransformWithStateInPandasTestsMixin:
             StatefulProcessorWithInitialStateTimers(), check_results, "processingTime"
         )
 
+    def test_transform_with_state_in_pandas_interleaved_state_calls(self):
+        def check_results(batch_df, batch_id):
+            if batch_id == 0:
+                assert set(batch_df.sort("id").collect()) == {
+                    Row(id="0", countAsString="2"),
+                    Row(id="1", countAsString="2"),
+                }
+            else:
+                assert set(batch_df.sort("id").collect()) == {
+                    Row(id="0", countAsString="5"),
+                    Row(id="1", countAsString="4"),
+                }
+
+        self._test_transform_with_state_in_pandas_basic(
+            InterleavedStateCallsProcessor(), check_results
+        )
+
+    def test_transform_with_state_in_pandas_deferred_state_call_error(self):
+        def check_results(batch_df, _):
+            assert set(batch_df.sort("id").collect()) == {
+                Row(id="0", countAsString="2"),
+                Row(id="1", countAsString="2"),
+            }
+
+        self._test_transform_with_state_in_pandas_basic(
+            DeferredStateCallErrorProcessor(), check_results, True
+        )
+
+    def test_transform_with_state_in_pandas_value_state_cache(self):
+        def check_results(batch_df, batch_id):
+            if batch_id == 0:
+                assert set(batch_df.sort("id").collect()) == {
+                    Row(id="0", countAsString="2"),
+                    Row(id="1", countAsString="2"),
+                }
+            else:
+                assert set(batch_df.sort("id").collect()) == {
+                    Row(id="0", countAsString="5"),
+                    Row(id="1", countAsString="4"),
+                }
+
+        self._test_transform_with_state_in_pandas_basic(ValueStateCacheProcessor(), check_results)
+
     # run the same test suites again but with single shuffle partition
     def test_transform_with_state_with_timers_single_partition(self):
         with self.sql_conf({"spark.sql.shuffle.partitions": "1"}):
@@ -1251,6 +1294,99 @@ class MapStateLargeTTLProcessor(MapStateProcessor):
         self.map_state = handle.getMapState("mapState", key_schema, value_schema, 30000)
 
 
+# A stateful processor that interleaves the reads of value, list and map states with the writes,
+# whose responses are not waited for.
+class InterleavedStateCallsProcessor(StatefulProcessor):
+    def init(self, handle: StatefulProcessorHandle) -> None:
+        state_schema = StructType([StructField("value", IntegerType(), True)])
+        key_schema = StructType([StructField("name", StringType(), True)])
+        self.count_state = handle.getValueState("count", state_schema)
+        self.list_state = handle.getListState("list", state_schema)
+        self.map_state = handle.getMapState("map", key_schema, state_schema)
+
+    def handleInputRows(self, key, rows, timer_values) -> Iterator[pd.DataFrame]:
+        count = 0
+        for pdf in rows:
+            count += len(pdf)
+        existing = self.count_state.get()
+        total = count + (existing[0] if existing is not None else 0)
+        self.count_state.update((total,))
+        self.list_state.put([(total,)])
+        assert self.count_state.get() == (total,)
+        self.map_state.update_value(("total",), (total,))
+        self.list_state.append_value((count,))
+        assert [row[0] for row in self.list_state.get()] == [total, count]
+        self.count_state.clear()
+        assert self.map_state.get_value(("total",)) == (total,)
+        assert self.count_state.get() is None
+        self.map_state.remove_key(("total",))
+        assert not self.map_state.contains_key(("total",))
+        self.count_state.update((total,))
+        yield pd.DataFrame({"id": key, "countAsString": str(total)})
+
+    def close(self) -> None:
+        pass
+
+
+# A stateful processor whose update of a deleted value state fails. The error is raised by the
+# next call that waits for a response, and the later calls still succeed.
+class DeferredStateCallErrorProcessor(StatefulProcessor, unittest.TestCase):
+    def init(self, handle: StatefulProcessorHandle) -> None:
+        state_schema = StructType([StructField("value", IntegerType(), True)])
+        self.count_state = handle.getValueState("count", state_schema)
+        self.temp_state = handle.getValueState("tempState", state_schema)
+        handle.deleteIfExists("tempState")
+
+    def handleInputRows(self, key, rows, timer_values) -> Iterator[pd.DataFrame]:
+        self.temp_state.update((1,))
+        with self.assertRaisesRegex(
+            PySparkRuntimeError,
+            "Error updating value state in the deferred call ValueState.update\\('tempState'\\)",
+        ):
+            self.count_state.exists()
+        count = 0
+        for pdf in rows:
+            count += len(pdf)
+        self.count_state.update((count,))
+        assert self.count_state.get() == (count,)
+        yield pd.DataFrame({"id": key, "countAsString": str(count)})
+
+    def close(self) -> None:
+        pass
+
+
+# A stateful processor that checks that the cached value state is invalidated by updates and
+# clears.
+class ValueStateCacheProcessor(StatefulProcessor):
+    def init(self, handle: StatefulProcessorHandle) -> None:
+        state_schema = StructType([StructField("value", IntegerType(), True)])
+        self.count_state = handle.getValueState("count", state_schema)
+
+    def handleInputRows(self, key, rows, timer_values) -> Iterator[pd.DataFrame]:
+        count = 0
+        for pdf in rows:
+            count += len(pdf)
+        existing = self.count_state.get()
+        # Read the value again, now from the cache.
+        assert self.count_state.get() == existing
+        assert self.count_state.exists() == (existing is not None)
+        total = count + (existing[0] if existing is not None else 0)
+        self.count_state.update((total + 1,))
+        assert self.count_state.get() == (total + 1,)
+        self.count_state.update((total,))
+        assert self.count_state.get() == (total,)
+        self.count_state.clear()
+        assert not self.count_state.exists()
+        assert self.count_state.get() is None
+        self.count_state.update((total,))
+        assert self.count_state.exists()
+        assert self.count_state.get() == (total,)
+        yield pd.DataFrame({"id": key, "countAsString": str(total)})
+
+    def close(self) -> None:
+        pass
+
+
 class TransformWithStateInPandasTests(TransformWithStateInPandasTestsMixin, ReusedSQLTestCase):
     pass
 
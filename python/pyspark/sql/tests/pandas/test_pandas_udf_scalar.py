@@ -710,6 +710,23 @@ class ScalarPandasUDFTestsMixin:
             res = df.select(g(f(col("id"))))
             self.assertEqual(df.collect(), res.collect())
 
+    def test_vectorized_udf_chained_shared(self):
+        import numpy as np
+
+        df = self.spark.range(10)
+        f = pandas_udf(lambda x: x + 1, DoubleType())
+        h = pandas_udf(lambda x: x - 1, DoubleType())
+        # Only claims to be deterministic, to tell whether it is evaluated once.
+        g = pandas_udf(lambda x: x + np.random.rand(len(x)), DoubleType())
+
+        res = df.select(f(g(col("id"))).alias("f"), h(g(col("id"))).alias("h"))
+        for row in res.collect():
+            self.assertAlmostEqual(row.f - 2, row.h)
+
+        g = g.asNondeterministic()
+        res = df.select(f(g(col("id"))).alias("f"), h(g(col("id"))).alias("h"))
+        self.assertTrue(any(abs(row.f - 2 - row.h) > 1e-9 for row in res.collect()))
+
     def test_vectorized_udf_chained_struct_type(self):
         df = self.spark.range(10)
         return_type = StructType([StructField("id", LongType()), StructField("str", StringType())])
@@ -0,0 +1,94 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import unittest
+
+# Import the modules instead of the test classes, so that the loader does not run the tests of
+# the base classes again in this module.
+from pyspark.sql.tests.pandas import (
+    test_pandas_grouped_map,
+    test_pandas_map,
+    test_pandas_udf_grouped_agg,
+    test_pandas_udf_scalar,
+    test_pandas_udf_window,
+)
+
+
+# The same tests as without shared memory, but the Arrow batches are exchanged with the Python
+# workers through files in spark.sql.execution.pandas.udf.sharedMemory.dir.
+
+
+class SharedMemoryScalarPandasUDFTests(test_pandas_udf_scalar.ScalarPandasUDFTests):
+    @classmethod
+    def conf(cls):
+        return (
+            super(SharedMemoryScalarPandasUDFTests, cls)
+            .conf()
+            .set("spark.sql.execution.pandas.udf.sharedMemory.enabled", "true")
+        )
+
+
+class SharedMemoryMapInPandasTests(test_pandas_map.MapInPandasTests):
+    @classmethod
+    def conf(cls):
+        return (
+            super(SharedMemoryMapInPandasTests, cls)
+            .conf()
+            .set("spark.sql.execution.pandas.udf.sharedMemory.enabled", "true")
+        )
+
+
+class SharedMemoryGroupedApplyInPandasTests(test_pandas_grouped_map.GroupedApplyInPandasTests):
+    @classmethod
+    def conf(cls):
+        return (
+            super(SharedMemoryGroupedApplyInPandasTests, cls)
+            .conf()
+            .set("spark.sql.execution.pandas.udf.sharedMemory.enabled", "true")
+        )
+
+
+class SharedMemoryGroupedAggPandasUDFTests(test_pandas_udf_grouped_agg.GroupedAggPandasUDFTests):
+    @classmethod
+    def conf(cls):
+        return (
+            super(SharedMemoryGroupedAggPandasUDFTests, cls)
+            .conf()
+            .set("spark.sql.execution.pandas.udf.sharedMemory.enabled", "true")
+        )
+
+
+class SharedMemoryWindowPandasUDFTests(test_pandas_udf_window.WindowPandasUDFTests):
+    @classmethod
+    def conf(cls):
+        return (
+            super(SharedMemoryWindowPandasUDFTests, cls)
+            .conf()
+            .set("spark.sql.execution.pandas.udf.sharedMemory.enabled", "true")
+        )
+
+
+if __name__ == "__main__":
+    from pyspark.sql.tests.pandas.test_pandas_udf_shared_memory import *  # noqa: F401
+
+    try:
+        import xmlrunner
+
+        testRunner = xmlrunner.XMLTestRunner(output="target/test-reports", verbosity=2)
+    except ImportError:
+        testRunner = None
+    unittest.main(testRunner=testRunner, verbosity=2)
@@ -1724,7 +1724,45 @@ class ArrowTestsMixin:
     cast(str, pandas_requirement_message or pyarrow_requirement_message),
 )
 class ArrowTests(ArrowTestsMixin, ReusedSQLTestCase):
-    pass
+    def test_toArrowRDD(self):
+        df = self.spark.range(0, 10, 1, 2).selectExpr("id", "cast(id as string) as s")
+        batches = df.toArrowRDD().collect()
+        self.assertTrue(all(isinstance(b, pa.RecordBatch) for b in batches))
+        table = pa.Table.from_batches(batches)
+        self.assertEqual(table.column_names, ["id", "s"])
+        self.assertEqual(table.column("id").to_pylist(), list(range(10)))
+        self.assertEqual(table.column("s").to_pylist(), [str(i) for i in range(10)])
+
+    def test_toArrowRDD_as_rows(self):
+        df = self.spark.createDataFrame(self.data, schema=self.schema)
+        self.assertEqual(df.toArrowRDD(asRows=True).collect(), df.rdd.collect())
+
+        def total(iterator):
+            yield sum(row.id for row in iterator)
+
+        rows = self.spark.range(0, 100, 1, 4).toArrowRDD(asRows=True)
+        self.assertEqual(sum(rows.mapPartitions(total).collect()), sum(range(100)))
+
+    def test_mapPartitionsInArrow(self):
+        def to_batches(iterator):
+            values = list(iterator)
+            yield pa.RecordBatch.from_pydict({"v": values, "sq": [v * v for v in values]})
+
+        rdd = self.sc.parallelize(range(8), 2).mapPartitionsInArrow(to_batches).cache()
+        self.assertEqual(rdd.map(lambda b: b.num_rows).collect(), [4, 4])
+        table = pa.Table.from_batches(rdd.collect())
+        self.assertEqual(table.column("sq").to_pylist(), [v * v for v in range(8)])
+
+        def double(iterator):
+            import pyarrow.compute as pc
+
+            for batch in iterator:
+                yield pa.RecordBatch.from_arrays(
+                    [pc.multiply(batch.column(0), 2), batch.column(1)], names=["v", "sq"]
+                )
+
+        doubled = pa.Table.from_batches(rdd.mapPartitionsInArrow(double).collect())
+        self.assertEqual(doubled.column("v").to_pylist(), [v * 2 for v in range(8)])
 
 
 @unittest.skipIf(
@@ -1759,6 +1797,53 @@ class MaxResultArrowTests(unittest.TestCase):
             self.spark.range(0, 10000, 1, 100).toPandas()
 
 
+@unittest.skipIf(not have_pyarrow, pyarrow_requirement_message)
+class ArrowStreamSerializerTests(unittest.TestCase):
+    def test_shared_memory_round_trip(self):
+        import io
+        import tempfile
+
+        from pyspark.sql.pandas.serializers import ArrowStreamSerializer
+
+        batches = [
+            pa.record_batch([pa.array(range(i, i + 3)), pa.array(["a", "b", None])], ["i", "s"])
+            for i in range(0, 9, 3)
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            ser = ArrowStreamSerializer()
+            ser.use_shared_memory(d)
+            stream = io.BytesIO()
+            ser.dump_stream(iter(batches), stream)
+            self.assertEqual(len(os.listdir(d)), 3)
+
+            stream.seek(0)
+            loaded = list(ser.load_stream(stream))
+            self.assertEqual(loaded, batches)
+            self.assertEqual(os.listdir(d), [])
+
+            stream = io.BytesIO()
+            ser.dump_stream(iter([]), stream)
+            self.assertEqual(stream.getvalue(), b"")
+
+    def test_max_bytes_per_batch(self):
+        import io
+
+        from pyspark.sql.pandas.serializers import ArrowStreamSerializer
+
+        batch = pa.record_batch([pa.array(range(1000), pa.int64())], ["i"])
+        ser = ArrowStreamSerializer()
+        ser.set_max_bytes_per_batch(batch.nbytes // 4)
+        stream = io.BytesIO()
+        ser.dump_stream(iter([batch, batch.slice(0, 10)]), stream)
+
+        stream.seek(0)
+        loaded = list(ser.load_stream(stream))
+        self.assertEqual([b.num_rows for b in loaded], [250, 250, 250, 250, 10])
+        self.assertEqual(
+            pa.concat_arrays([b.column(0) for b in loaded[:4]]).to_pylist(), list(range(1000))
+        )
+
+
 class EncryptionArrowTests(ArrowTests):
     @classmethod
     def conf(cls):
@@ -15,6 +15,7 @@
 # limitations under the License.
 #
 
+import datetime
 import unittest
 
 from pyspark.errors import AnalysisException, PythonException, PySparkNotImplementedError
@@ -252,6 +253,43 @@ class AsyncPythonUDFArrowTests(PythonUDFArrowTests):
             super(AsyncPythonUDFArrowTests, cls).tearDownClass()
 
 
+class PythonUDFArrowWithoutPandasTests(PythonUDFArrowTests):
+    @classmethod
+    def setUpClass(cls):
+        super(PythonUDFArrowWithoutPandasTests, cls).setUpClass()
+        cls.spark.conf.set("spark.sql.execution.pythonUDF.arrow.pandasConversion.enabled", "false")
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            cls.spark.conf.unset("spark.sql.execution.pythonUDF.arrow.pandasConversion.enabled")
+        finally:
+            super(PythonUDFArrowWithoutPandasTests, cls).tearDownClass()
+
+    def test_input_and_result_types(self):
+        df = self.spark.range(1).selectExpr(
+            "array(1, null) as array",
+            "map('a', struct(1 as x)) as map",
+            "timestamp'2020-01-01 12:00:00' as ts",
+            "cast(null as bigint) as n",
+        )
+
+        row = df.select(
+            udf(lambda x: x, "array<int>")("array"),
+            udf(lambda x: str(x))("map"),
+            udf(lambda x: {"b": x["a"]}, "map<string,struct<x:int>>")("map"),
+            udf(lambda x: x, "timestamp")("ts"),
+            udf(lambda x: x is None, "boolean")("n"),
+        ).first()
+
+        self.assertEqual(row[0], [1, None])
+        self.assertEqual(row[1], "{'a': Row(x=1)}")
+        self.assertEqual(row[2], {"b": Row(x=1)})
+        self.assertEqual(row[3], datetime.datetime(2020, 1, 1, 12, 0))
+        # The nulls of integral types are None, not NaN as with pandas.
+        self.assertTrue(row[4])
+
+
 if __name__ == "__main__":
     from pyspark.sql.tests.test_arrow_python_udf import *  # noqa: F401
 
@@ -27,6 +27,7 @@ from pyspark.sql.datasource import (
     SimpleDataSourceStreamReader,
     WriterCommitMessage,
 )
+from pyspark.sql.datasource_internal import _SimpleStreamReaderWrapper
 from pyspark.sql.streaming import StreamingQueryException
 from pyspark.sql.types import Row
 from pyspark.testing.sqlutils import (
@@ -296,6 +297,80 @@ class BasePythonStreamingDataSourceTestsMixin:
             checkpoint_dir.cleanup()
 
 
+@unittest.skipIf(not have_pyarrow, pyarrow_requirement_message)
+class SimpleStreamReaderWrapperTests(unittest.TestCase):
+    class CountingStreamReader(SimpleDataSourceStreamReader):
+        def initialOffset(self):
+            return {"offset": 0}
+
+        def read(self, start: dict):
+            start_idx = start["offset"]
+            it = iter([(i,) for i in range(start_idx, start_idx + 2)])
+            return (it, {"offset": start_idx + 2})
+
+        def commit(self, end):
+            pass
+
+    @staticmethod
+    def to_arrow_batches(rows):
+        import pyarrow as pa
+
+        return [pa.RecordBatch.from_pylist([{"id": row[0]} for row in rows])]
+
+    def wait_for_prefetch(self, wrapper, num_entries):
+        deadline = time.time() + 30
+        while wrapper._num_unreported < num_entries and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_prefetch(self):
+        wrapper = _SimpleStreamReaderWrapper(
+            self.CountingStreamReader(), self.to_arrow_batches, 2, 1 << 20
+        )
+        try:
+            end1 = wrapper.latestOffset()
+            self.assertGreaterEqual(end1["offset"], 2)
+
+            # The background thread runs ahead by at most 2 reads.
+            self.wait_for_prefetch(wrapper, 2)
+            end2 = wrapper.latestOffset()
+            self.assertEqual(end2["offset"], end1["offset"] + 4)
+            batches = wrapper.getCachedBatches(end1, end2)
+            self.assertEqual(
+                [row["id"] for batch in batches for row in batch.to_pylist()],
+                list(range(end1["offset"], end2["offset"])),
+            )
+
+            # The data of committed batches is evicted.
+            wrapper.commit(end1)
+            self.assertIsNone(wrapper.getCachedBatches({"offset": 0}, end1))
+            self.assertIsNotNone(wrapper.getCachedBatches(end1, end2))
+        finally:
+            wrapper.stop()
+
+    def test_prefetch_max_bytes(self):
+        wrapper = _SimpleStreamReaderWrapper(
+            self.CountingStreamReader(), self.to_arrow_batches, 2, 1
+        )
+        try:
+            end1 = wrapper.latestOffset()
+            self.assertEqual(end1, {"offset": 2})
+            # The prefetched data exceeds the budget, so there is nothing new to report.
+            self.assertEqual(wrapper.latestOffset(), end1)
+
+            wrapper.commit(end1)
+            self.assertEqual(wrapper.latestOffset(), {"offset": 4})
+        finally:
+            wrapper.stop()
+
+    def test_no_prefetch(self):
+        wrapper = _SimpleStreamReaderWrapper(self.CountingStreamReader(), self.to_arrow_batches)
+        end1 = wrapper.latestOffset()
+        end2 = wrapper.latestOffset()
+        self.assertEqual((end1, end2), ({"offset": 2}, {"offset": 4}))
+        self.assertEqual(len(wrapper.getCachedBatches({"offset": 0}, end2)), 2)
+        self.assertIsNone(wrapper._prefetch_thread)
+
+
 class PythonStreamingDataSourceTests(BasePythonStreamingDataSourceTestsMixin, ReusedSQLTestCase):
     pass
 
@@ -66,6 +66,35 @@ class DaemonTests(unittest.TestCase):
         else:
             self.fail("Expected EnvironmentError to be raised")
 
+    def test_pre_forked_workers(self):
+        from socket import socket, AF_INET, SOCK_STREAM
+        from subprocess import Popen, PIPE
+
+        daemon_path = os.path.join(os.path.dirname(__file__), "..", "daemon.py")
+        python_exec = sys.executable or os.environ.get("PYSPARK_PYTHON")
+        env = dict(
+            os.environ,
+            SPARK_PREFER_IPV6="false",
+            PYSPARK_DAEMON_POOL_SIZE="2",
+            PYSPARK_DAEMON_PRELOAD_MODULES="json, decimal",
+        )
+        daemon = Popen([python_exec, daemon_path], stdin=PIPE, stdout=PIPE, env=env)
+        try:
+            port = read_int(daemon.stdout)
+            pids = []
+            for _ in range(3):
+                sock = socket(AF_INET, SOCK_STREAM)
+                sock.connect(("127.0.0.1", port))
+                # the worker acknowledges the connection with its pid
+                pids.append(read_int(sock.makefile("rb")))
+                sock.send(b"\xFF\xFF\xFF\xFF")
+                sock.close()
+            self.assertEqual(len(set(pids)), 3)
+            self.assertNotIn(daemon.pid, pids)
+        finally:
+            daemon.stdin.close()
+            daemon.wait(10)
+
     def test_termination_stdin(self):
         """Ensure that daemon and workers terminate when stdin is closed."""
         self.do_termination_test(lambda daemon: daemon.stdin.close())
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import operator
 import random
 import unittest
 from tempfile import TemporaryDirectory
@@ -24,8 +25,10 @@ from py4j.protocol import Py4JJavaError
 from pyspark import shuffle, CPickleSerializer, SparkConf, SparkContext
 from pyspark.shuffle import (
     Aggregator,
+    ExternalArrayMerger,
     ExternalMerger,
     ExternalSorter,
+    PrimitiveAggregator,
     SimpleAggregator,
     Merger,
     ExternalGroupBy,
@@ -177,6 +180,106 @@ class MergerTests(unittest.TestCase):
             m.mergeCombiners(map(lambda x_y1: (x_y1[0], [x_y1[1]]), data))
 
 
+class ExternalArrayMergerTests(unittest.TestCase):
+    def setUp(self):
+        self.N = 1 << 16
+        self.data = [(i % 1000, i) for i in range(self.N)]
+
+    def expected(self, op, data, zero=None):
+        result = {}
+        for k, v in data:
+            if k in result:
+                result[k] = op(result[k], v)
+            else:
+                result[k] = v if zero is None else op(zero, v)
+        return result
+
+    def test_supported_combiners(self):
+        self.assertTrue(PrimitiveAggregator.supports(operator.add))
+        self.assertTrue(PrimitiveAggregator.supports(min, 0))
+        self.assertTrue(PrimitiveAggregator.supports(max, 1.5))
+        self.assertFalse(PrimitiveAggregator.supports(lambda x, y: x + y))
+        self.assertFalse(PrimitiveAggregator.supports(operator.add, [0]))
+
+    def test_small_dataset(self):
+        for op in PrimitiveAggregator.COMBINERS:
+            m = ExternalArrayMerger(PrimitiveAggregator(op), 1000)
+            m.mergeValues(self.data)
+            self.assertTrue(m.primitive)
+            self.assertEqual(m.spills, 0)
+            self.assertEqual(dict(m.items()), self.expected(op, self.data))
+
+    def test_zero_value(self):
+        m = ExternalArrayMerger(PrimitiveAggregator(operator.add, 10), 1000)
+        m.mergeValues(self.data)
+        self.assertEqual(dict(m.items()), self.expected(operator.add, self.data, 10))
+
+    def test_float_values_and_string_keys(self):
+        data = [(str(i % 7), i / 3.0) for i in range(1000)]
+        m = ExternalArrayMerger(PrimitiveAggregator(operator.add), 1000)
+        m.mergeValues(data)
+        self.assertTrue(m.primitive)
+        self.assertEqual(dict(m.items()), self.expected(operator.add, data))
+
+    def test_spill_by_table_size(self):
+        data = [(i, i) for i in range(self.N)] * 2
+        m = ExternalArrayMerger(PrimitiveAggregator(operator.add), 1)
+        m.mergeValues(data)
+        self.assertTrue(m.primitive)
+        self.assertGreaterEqual(m.spills, 1)
+        self.assertEqual(dict(m.items()), self.expected(operator.add, data))
+
+        m = ExternalArrayMerger(PrimitiveAggregator(max), 1)
+        m.mergeCombiners(data)
+        self.assertGreaterEqual(m.spills, 1)
+        self.assertEqual(dict(m.items()), self.expected(max, data))
+
+    def test_fallback(self):
+        agg = PrimitiveAggregator(operator.add)
+        data = self.data + [(1, 0.5), ((1, 2), 3)]
+        m = ExternalArrayMerger(agg, 1000)
+        m.mergeValues(data)
+        self.assertFalse(m.primitive)
+        self.assertEqual(dict(m.items()), self.expected(operator.add, data))
+
+        # falls back after the hash table was spilled
+        data = [(i, i) for i in range(self.N)] + [(i, 2**63) for i in range(10)]
+        m = ExternalArrayMerger(agg, 1)
+        m.mergeValues(data)
+        self.assertFalse(m.primitive)
+        self.assertGreaterEqual(m.spills, 1)
+        self.assertEqual(dict(m.items()), self.expected(operator.add, data))
+
+    def test_generic_aggregator(self):
+        agg = Aggregator(
+            lambda x: [x], lambda x, y: x.append(y) or x, lambda x, y: x.extend(y) or x
+        )
+        m = ExternalArrayMerger(agg, 20)
+        m.mergeValues(self.data)
+        self.assertFalse(m.primitive)
+        self.assertEqual(sum(sum(v) for k, v in m.items()), sum(range(self.N)))
+
+    def test_primitive_aggregation_in_rdd(self):
+        conf = SparkConf().set("spark.python.shuffle.primitiveAggregation.enabled", "true")
+        sc = SparkContext(conf=conf)
+        try:
+            rdd = sc.parallelize(self.data, 4)
+            expected = sorted(self.expected(operator.add, self.data).items())
+            self.assertEqual(sorted(rdd.reduceByKey(operator.add).collect()), expected)
+            self.assertEqual(sorted(rdd.foldByKey(0, operator.add).collect()), expected)
+            self.assertEqual(
+                sorted(rdd.aggregateByKey(0, operator.add, operator.add).collect()), expected
+            )
+            # string values fall back to the dict based aggregation
+            strings = rdd.mapValues(str)
+            self.assertEqual(
+                sorted(strings.reduceByKey(min).collect()),
+                sorted(self.expected(min, strings.collect()).items()),
+            )
+        finally:
+            sc.stop()
+
+
 class ExternalGroupByTests(unittest.TestCase):
     def setUp(self):
         self.N = 1 << 20
@@ -245,6 +348,44 @@ class SorterTests(unittest.TestCase):
         )
         self.assertGreater(shuffle.DiskBytesSpilled, last)
 
+    def test_external_sort_multi_pass_merge(self):
+        class CustomizedSorter(ExternalSorter):
+            def _next_limit(self):
+                return self.memory_limit
+
+        lst = [(random.randint(0, 50), i) for i in range(2048)]
+        # at most 2 runs are merged at once, so the runs are merged in multiple passes
+        sorter = CustomizedSorter(1, fan_in=2)
+        self.assertEqual(
+            sorted(lst, key=lambda x: x[0]), list(sorter.sorted(lst, key=lambda x: x[0]))
+        )
+        self.assertEqual(
+            sorted(lst, key=lambda x: x[0], reverse=True),
+            list(sorter.sorted(lst, key=lambda x: x[0], reverse=True)),
+        )
+        self.assertRaises(ValueError, lambda: ExternalSorter(1, fan_in=1))
+
+    def test_external_sort_key_types(self):
+        class CustomizedSorter(ExternalSorter):
+            def _next_limit(self):
+                return self.memory_limit
+
+        sorter = CustomizedSorter(1, fan_in=3)
+        ints = [random.randint(-(1 << 63), (1 << 63) - 1) for _ in range(1024)] + [1 << 70]
+        floats = [random.uniform(-1e10, 1e10) for _ in range(1024)] + [-0.0, 0.0, float("inf")]
+        strs = ["%s\u00e9\U0001f600" % random.random() for _ in range(1024)] + [""]
+        data = [str(i).encode("utf-8") for i in range(1024)]
+        for lst in [ints, floats, strs, data]:
+            random.shuffle(lst)
+            self.assertEqual(sorted(lst), list(sorter.sorted(lst)))
+            self.assertEqual(sorted(lst, reverse=True), list(sorter.sorted(lst, reverse=True)))
+
+        # the keys of some runs can not be written as arrays
+        mixed = list(range(1024)) + [float(i) + 0.5 for i in range(1024)] + [True, 1 << 70]
+        random.shuffle(mixed)
+        self.assertEqual(sorted(mixed), list(sorter.sorted(mixed)))
+        self.assertEqual(sorted(mixed, reverse=True), list(sorter.sorted(mixed, reverse=True)))
+
     def test_external_sort_in_rdd(self):
         conf = SparkConf().set("spark.python.worker.memory", "1m")
         sc = SparkContext(conf=conf)
@@ -51,6 +51,7 @@ from pyspark.serializers import (
 )
 from pyspark.sql.functions import SkipRestOfInputTableException
 from pyspark.sql.pandas.serializers import (
+    ArrowBatchUDFSerializer,
     ArrowStreamPandasUDFSerializer,
     ArrowStreamPandasUDTFSerializer,
     CogroupArrowUDFSerializer,
@@ -79,6 +80,7 @@ from pyspark.errors import PySparkRuntimeError, PySparkTypeError
 from pyspark.worker_util import (
     check_python_version,
     read_command,
+    read_command_and_bytes,
     pickleSer,
     send_accumulator_updates,
     setup_broadcasts,
@@ -95,11 +97,29 @@ except Exception:
     has_memory_profiler = False
 
 
-def report_times(outfile, boot, init, finish):
+# Whether this worker process already ran a task, so the next one starts warm.
+has_run_task = False
+
+
+def is_warm_start():
+    """
+    Whether the current task starts in a warm worker process: the process already ran a task,
+    or it was forked by the daemon after importing all the modules listed in
+    `spark.python.daemon.preloadModules`.
+    """
+    if has_run_task:
+        return True
+    modules = os.environ.get("PYSPARK_DAEMON_PRELOAD_MODULES", "")
+    modules = [m.strip() for m in modules.split(",") if m.strip()]
+    return len(modules) > 0 and all(m in sys.modules for m in modules)
+
+
+def report_times(outfile, boot, init, finish, warm_start=False):
     write_int(SpecialLengths.TIMING_DATA, outfile)
     write_long(int(1000 * boot), outfile)
     write_long(int(1000 * init), outfile)
     write_long(int(1000 * finish), outfile)
+    write_int(1 if warm_start else 0, outfile)
 
 
 def chain(f, g):
@@ -107,6 +127,21 @@ def chain(f, g):
     return lambda *a: g(f(*a))
 
 
+def share_results(f, key, results):
+    """
+    Return `f` returning the result stored in `results` under `key` if there is one, so that a
+    deterministic function shared by several UDFs is evaluated once until `results` is cleared.
+    """
+
+    def shared(*args, **kwargs):
+        if key in results:
+            return results[key]
+        result = results[key] = f(*args, **kwargs)
+        return result
+
+    return shared
+
+
 def wrap_udf(f, args_offsets, kwargs_offsets, return_type):
     func, args_kwargs_offsets = wrap_kwargs_support(f, args_offsets, kwargs_offsets)
 
@@ -205,6 +240,61 @@ def wrap_arrow_batch_udf(f, args_offsets, kwargs_offsets, return_type, runner_co
     )
 
 
+def wrap_arrow_batch_udf_arrow(f, args_offsets, kwargs_offsets, return_type, runner_conf):
+    # Same as `wrap_arrow_batch_udf` but evaluates the function on the lists of Python objects
+    # loaded by `ArrowBatchUDFSerializer` instead of pandas Series.
+    func, args_kwargs_offsets = wrap_kwargs_support(f, args_offsets, kwargs_offsets)
+
+    arrow_return_type = to_arrow_type(return_type)
+
+    result_func = None
+    if type(return_type) == StringType:
+        result_func = lambda r: str(r) if r is not None else r  # noqa: E731
+    elif type(return_type) == BinaryType:
+        result_func = lambda r: bytes(r) if r is not None else r  # noqa: E731
+
+    if result_func is None:
+        evaluate_row = lambda row: func(*row)  # noqa: E731
+    else:
+        evaluate_row = lambda row: result_func(func(*row))  # noqa: E731
+
+    if "spark.sql.execution.pythonUDF.arrow.concurrency.level" in runner_conf:
+        from concurrent.futures import ThreadPoolExecutor
+
+        c = int(runner_conf["spark.sql.execution.pythonUDF.arrow.concurrency.level"])
+
+        @fail_on_stopiteration
+        def evaluate(*args: list) -> list:
+            with ThreadPoolExecutor(max_workers=c) as pool:
+                return list(pool.map(evaluate_row, zip(*args)))
+
+    else:
+
+        @fail_on_stopiteration
+        def evaluate(*args: list) -> list:
+            return list(map(evaluate_row, zip(*args)))
+
+    def verify_result_length(result, length):
+        if len(result) != length:
+            raise PySparkRuntimeError(
+                errorClass="SCHEMA_MISMATCH_FOR_PANDAS_UDF",
+                messageParameters={
+                    "expected": str(length),
+                    "actual": str(len(result)),
+                },
+            )
+        return result
+
+    return (
+        args_kwargs_offsets,
+        lambda *a: (
+            verify_result_length(evaluate(*a), len(a[0])),
+            arrow_return_type,
+            return_type,
+        ),
+    )
+
+
 def wrap_pandas_batch_iter_udf(f, return_type):
     arrow_return_type = to_arrow_type(return_type)
     iter_type_label = "pandas.DataFrame" if type(return_type) == StructType else "pandas.Series"
@@ -803,7 +893,9 @@ def wrap_memory_profiler(f, result_id):
     return profiling_func
 
 
-def read_single_udf(pickleSer, infile, eval_type, runner_conf, udf_index, profiler):
+def read_single_udf(
+    pickleSer, infile, eval_type, runner_conf, udf_index, profiler, shared_results=None
+):
     num_arg = read_int(infile)
 
     if eval_type in (
@@ -829,8 +921,15 @@ def read_single_udf(pickleSer, infile, eval_type, runner_conf, udf_index, profil
         kwargs_offsets = {}
 
     chained_func = None
+    # The functions chained so far are identified by the arguments and the commands.
+    key = (tuple(args_offsets), tuple(kwargs_offsets.items()))
     for i in range(read_int(infile)):
-        f, return_type = read_command(pickleSer, infile)
+        if shared_results is None:
+            f, return_type = read_command(pickleSer, infile)
+        else:
+            (f, return_type), command = read_command_and_bytes(pickleSer, infile)
+            key = (key, command)
+            f = share_results(f, key, shared_results)
         if chained_func is None:
             chained_func = f
         else:
@@ -867,7 +966,14 @@ def read_single_udf(pickleSer, infile, eval_type, runner_conf, udf_index, profil
     if eval_type == PythonEvalType.SQL_SCALAR_PANDAS_UDF:
         return wrap_scalar_pandas_udf(func, args_offsets, kwargs_offsets, return_type)
     elif eval_type == PythonEvalType.SQL_ARROW_BATCHED_UDF:
-        return wrap_arrow_batch_udf(func, args_offsets, kwargs_offsets, return_type, runner_conf)
+        if use_pandas_conversion(runner_conf):
+            return wrap_arrow_batch_udf(
+                func, args_offsets, kwargs_offsets, return_type, runner_conf
+            )
+        else:
+            return wrap_arrow_batch_udf_arrow(
+                func, args_offsets, kwargs_offsets, return_type, runner_conf
+            )
     elif eval_type == PythonEvalType.SQL_SCALAR_PANDAS_ITER_UDF:
         return args_offsets, wrap_pandas_batch_iter_udf(func, return_type)
     elif eval_type == PythonEvalType.SQL_MAP_PANDAS_ITER_UDF:
@@ -922,6 +1028,17 @@ def assign_cols_by_name(runner_conf):
     )
 
 
+# Whether SQL_ARROW_BATCHED_UDF converts its inputs and results with pandas, see
+# ArrowBatchUDFSerializer
+def use_pandas_conversion(runner_conf):
+    return (
+        runner_conf.get(
+            "spark.sql.execution.pythonUDF.arrow.pandasConversion.enabled", "true"
+        ).lower()
+        == "true"
+    )
+
+
 # Read and process a serialized user-defined table function (UDTF) from a socket.
 # It expects the UDTF to be in a specific format and performs various checks to
 # ensure the UDTF is valid. This function also prepares a mapper function for applying
@@ -1544,6 +1661,10 @@ def read_udfs(pickleSer, infile, eval_type):
             ser = ArrowStreamUDFSerializer()
         elif eval_type == PythonEvalType.SQL_GROUPED_MAP_ARROW_UDF:
             ser = ArrowStreamGroupUDFSerializer(_assign_cols_by_name)
+        elif eval_type == PythonEvalType.SQL_ARROW_BATCHED_UDF and not use_pandas_conversion(
+            runner_conf
+        ):
+            ser = ArrowBatchUDFSerializer(timezone, safecheck)
         else:
             # Scalar Pandas UDF handles struct type arguments as pandas DataFrames instead of
             # pandas Series. See SPARK-27240.
@@ -1568,6 +1689,23 @@ def read_udfs(pickleSer, infile, eval_type):
                 ndarray_as_list,
                 arrow_cast,
             )
+
+        shared_memory_dir = runner_conf.get(
+            "spark.sql.execution.pandas.udf.sharedMemory.taskDir", None
+        )
+        if shared_memory_dir is not None:
+            ser.use_shared_memory(shared_memory_dir)
+
+        arrow_max_bytes_per_batch = int(
+            runner_conf.get("spark.sql.execution.arrow.maxBytesPerBatch", 0)
+        )
+        # The serializers of the stateful UDFs size their output batches themselves.
+        if arrow_max_bytes_per_batch > 0 and eval_type not in (
+            PythonEvalType.SQL_GROUPED_MAP_PANDAS_UDF_WITH_STATE,
+            PythonEvalType.SQL_TRANSFORM_WITH_STATE_PANDAS_UDF,
+            PythonEvalType.SQL_TRANSFORM_WITH_STATE_PANDAS_INIT_STATE_UDF,
+        ):
+            ser.set_max_bytes_per_batch(arrow_max_bytes_per_batch)
     else:
         ser = BatchedSerializer(CPickleSerializer(), 100)
 
@@ -1878,11 +2016,30 @@ def read_udfs(pickleSer, infile, eval_type):
             return f(df1_keys, df1_vals, df2_keys, df2_vals)
 
     else:
+        # The results of the functions chained by several deterministic scalar pandas UDFs on
+        # the same arguments, e.g. `g` of `f(g(x))` and `h(g(x))`, are shared within a batch.
+        deterministic_udfs = set()
+        if eval_type == PythonEvalType.SQL_SCALAR_PANDAS_UDF:
+            deterministic_udfs = {
+                int(i)
+                for i in runner_conf.get(
+                    "spark.sql.execution.pandas.udf.deterministicUDFs", ""
+                ).split(",")
+                if i
+            }
+        shared_results = {} if len(deterministic_udfs) > 1 else None
+
         udfs = []
         for i in range(num_udfs):
             udfs.append(
                 read_single_udf(
-                    pickleSer, infile, eval_type, runner_conf, udf_index=i, profiler=profiler
+                    pickleSer,
+                    infile,
+                    eval_type,
+                    runner_conf,
+                    udf_index=i,
+                    profiler=profiler,
+                    shared_results=shared_results if i in deterministic_udfs else None,
                 )
             )
 
@@ -1895,6 +2052,15 @@ def read_udfs(pickleSer, infile, eval_type):
             else:
                 return result
 
+        if shared_results is not None:
+            evaluate = mapper
+
+            def mapper(a):
+                try:
+                    return evaluate(a)
+                finally:
+                    shared_results.clear()
+
     def func(_, it):
         return map(mapper, it)
 
@@ -1903,7 +2069,9 @@ def read_udfs(pickleSer, infile, eval_type):
 
 
 def main(infile, outfile):
+    global has_run_task
     faulthandler_log_path = os.environ.get("PYTHON_FAULTHANDLER_DIR", None)
+    warm_start = is_warm_start()
     try:
         if faulthandler_log_path:
             faulthandler_log_path = os.path.join(faulthandler_log_path, str(os.getpid()))
@@ -2002,7 +2170,8 @@ def main(infile, outfile):
             faulthandler_log_file.close()
             os.remove(faulthandler_log_path)
     finish_time = time.time()
-    report_times(outfile, boot_time, init_time, finish_time)
+    report_times(outfile, boot_time, init_time, finish_time, warm_start)
+    has_run_task = True
     write_long(shuffle.MemoryBytesSpilled, outfile)
     write_long(shuffle.DiskBytesSpilled, outfile)
 
@@ -22,7 +22,7 @@ import importlib
 from inspect import currentframe, getframeinfo
 import os
 import sys
-from typing import Any, IO
+from typing import Any, IO, Tuple
 import warnings
 
 # 'resource' is a Unix specific module.
@@ -44,6 +44,7 @@ from pyspark.serializers import (
     FramedSerializer,
     UTF8Deserializer,
     CPickleSerializer,
+    SpecialLengths,
 )
 
 pickleSer = CPickleSerializer()
@@ -58,13 +59,29 @@ def add_path(path: str) -> None:
 
 
 def read_command(serializer: FramedSerializer, file: IO) -> Any:
+    return read_command_and_bytes(serializer, file)[0]
+
+
+def read_command_and_bytes(serializer: FramedSerializer, file: IO) -> Tuple[Any, bytes]:
+    """
+    Read a command like `read_command`, and also return its serialized bytes, which are the same
+    for the same commands.
+    """
     if not is_remote_only():
         from pyspark.core.broadcast import Broadcast
 
-    command = serializer._read_with_length(file)
+    length = read_int(file)
+    if length == SpecialLengths.END_OF_DATA_SECTION:
+        raise EOFError
+    elif length == SpecialLengths.NULL:
+        return None, b""
+    data = file.read(length)
+    if len(data) < length:
+        raise EOFError
+    command = serializer.loads(data)
     if not is_remote_only() and isinstance(command, Broadcast):
         command = serializer.loads(command.value)
-    return command
+    return command, data
 
 
 def check_python_version(infile: IO) -> None:
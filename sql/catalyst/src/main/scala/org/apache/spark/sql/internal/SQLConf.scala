@@ -3256,6 +3256,19 @@ object SQLConf {
       .intConf
       .createWithDefault(10000)
 
+  val ARROW_EXECUTION_MAX_BYTES_PER_BATCH =
+    buildConf("spark.sql.execution.arrow.maxBytesPerBatch")
+      .doc("When positive, the ArrowRecordBatches exchanged with the Python workers of Pandas " +
+        "UDFs, Arrow-optimized Python UDFs and mapInPandas/mapInArrow are sized adaptively " +
+        "from the observed number of bytes per row, so that each batch holds about this many " +
+        "bytes, within the limit of " +
+        s"'${ARROW_EXECUTION_MAX_RECORDS_PER_BATCH.key}'. The output batches of the grouping " +
+        "API are split as well, but their input batches are not because each group becomes " +
+        "each ArrowRecordBatch. If set to zero or negative there is no limit.")
+      .version("4.0.0")
+      .bytesConf(ByteUnit.BYTE)
+      .createWithDefault(0)
+
   val ARROW_TRANSFORM_WITH_STATE_IN_PANDAS_MAX_RECORDS_PER_BATCH =
     buildConf("spark.sql.execution.arrow.transformWithStateInPandas.maxRecordsPerBatch")
       .doc("When using TransformWithStateInPandas, limit the maximum number of state records " +
@@ -3285,6 +3298,26 @@ object SQLConf {
       .version("3.0.0")
       .fallbackConf(BUFFER_SIZE)
 
+  val PANDAS_UDF_SHARED_MEMORY_DIR =
+    buildConf("spark.sql.execution.pandas.udf.sharedMemory.dir")
+      .doc("The directory on the executors where Arrow batches are exchanged with the Python " +
+        "workers when `spark.sql.execution.pandas.udf.sharedMemory.enabled` is true. It " +
+        "should be on a memory-backed file system such as tmpfs.")
+      .version("4.0.0")
+      .stringConf
+      .createWithDefault("/dev/shm")
+
+  val PANDAS_UDF_SHARED_MEMORY_ENABLED =
+    buildConf("spark.sql.execution.pandas.udf.sharedMemory.enabled")
+      .doc("When true, the Arrow batches of Pandas UDFs, Arrow-optimized Python UDFs, " +
+        "mapInPandas, mapInArrow and applyInPandas are exchanged between the JVM and the " +
+        "Python worker as files under " +
+        s"`${PANDAS_UDF_SHARED_MEMORY_DIR.key}` instead of through the socket. The Python " +
+        "worker memory-maps the input batches instead of copying them from the socket.")
+      .version("4.0.0")
+      .booleanConf
+      .createWithDefault(false)
+
   val PANDAS_STRUCT_HANDLING_MODE =
     buildConf("spark.sql.execution.pandas.structHandlingMode")
       .doc(
@@ -3332,6 +3365,15 @@ object SQLConf {
           " must be more than one.")
       .createOptional
 
+  val PYTHON_UDF_ARROW_PANDAS_CONVERSION_ENABLED =
+    buildConf("spark.sql.execution.pythonUDF.arrow.pandasConversion.enabled")
+      .doc("When true, Arrow-optimized Python UDFs convert their arguments and results " +
+        "with pandas. When false, they are converted between Arrow and Python objects " +
+        "directly, without pandas, which is usually faster, e.g. for strings.")
+      .version("4.0.0")
+      .booleanConf
+      .createWithDefault(true)
+
   val PYTHON_TABLE_UDF_ARROW_ENABLED =
     buildConf("spark.sql.execution.pythonUDTF.arrow.enabled")
       .doc("Enable Arrow optimization for Python UDTFs.")
@@ -3351,6 +3393,28 @@ object SQLConf {
       .bytesConf(ByteUnit.MiB)
       .createOptional
 
+  val PYTHON_STREAMING_DATA_SOURCE_PREFETCH_BATCHES =
+    buildConf("spark.sql.streaming.pythonDataSource.prefetch.batches")
+      .doc("The maximum number of reads a simple Python streaming data source, i.e. one " +
+        "implementing SimpleDataSourceStreamReader, prefetches ahead of the streaming engine " +
+        "in a background thread. Each micro-batch then covers all the data prefetched since " +
+        "the previous one, instead of reading the source when the batch is planned. If set " +
+        "to zero, the source is read synchronously when the latest offset is requested.")
+      .version("4.0.0")
+      .intConf
+      .checkValue(_ >= 0, "The number of prefetched batches must not be negative.")
+      .createWithDefault(0)
+
+  val PYTHON_STREAMING_DATA_SOURCE_PREFETCH_MAX_BYTES =
+    buildConf("spark.sql.streaming.pythonDataSource.prefetch.maxBytes")
+      .doc("The maximum size of the Arrow record batches a simple Python streaming data " +
+        "source keeps prefetched. The data of a micro-batch is released when it is committed. " +
+        s"Only effective if '${PYTHON_STREAMING_DATA_SOURCE_PREFETCH_BATCHES.key}' is positive.")
+      .version("4.0.0")
+      .bytesConf(ByteUnit.BYTE)
+      .checkValue(_ > 0, "The maximum size of prefetched data must be positive.")
+      .createWithDefaultString("64m")
+
   val PANDAS_GROUPED_MAP_ASSIGN_COLUMNS_BY_NAME =
     buildConf("spark.sql.legacy.execution.pandas.groupedMap.assignColumnsByName")
       .internal()
@@ -6010,6 +6074,9 @@ class SQLConf extends Serializable with Logging with SqlApiConf {
 
   def pythonUDFArrowConcurrencyLevel: Option[Int] = getConf(PYTHON_UDF_ARROW_CONCURRENCY_LEVEL)
 
+  def pythonUDFArrowPandasConversionEnabled: Boolean =
+    getConf(PYTHON_UDF_ARROW_PANDAS_CONVERSION_ENABLED)
+
   def pysparkPlotMaxRows: Int = getConf(PYSPARK_PLOT_MAX_ROWS)
 
   def arrowSparkREnabled: Boolean = getConf(ARROW_SPARKR_EXECUTION_ENABLED)
@@ -6018,6 +6085,8 @@ class SQLConf extends Serializable with Logging with SqlApiConf {
 
   def arrowMaxRecordsPerBatch: Int = getConf(ARROW_EXECUTION_MAX_RECORDS_PER_BATCH)
 
+  def arrowMaxBytesPerBatch: Long = getConf(ARROW_EXECUTION_MAX_BYTES_PER_BATCH)
+
   def arrowTransformWithStateInPandasMaxRecordsPerBatch: Int =
     getConf(ARROW_TRANSFORM_WITH_STATE_IN_PANDAS_MAX_RECORDS_PER_BATCH)
 
@@ -6025,6 +6094,10 @@ class SQLConf extends Serializable with Logging with SqlApiConf {
 
   def pandasUDFBufferSize: Int = getConf(PANDAS_UDF_BUFFER_SIZE)
 
+  def pandasUDFSharedMemoryEnabled: Boolean = getConf(PANDAS_UDF_SHARED_MEMORY_ENABLED)
+
+  def pandasUDFSharedMemoryDir: String = getConf(PANDAS_UDF_SHARED_MEMORY_DIR)
+
   def pandasStructHandlingMode: String = getConf(PANDAS_STRUCT_HANDLING_MODE)
 
   def pysparkSimplifiedTraceback: Boolean = getConf(PYSPARK_SIMPLIFIED_TRACEBACK)
@@ -6039,6 +6112,12 @@ class SQLConf extends Serializable with Logging with SqlApiConf {
 
   def pythonPlannerExecMemory: Option[Long] = getConf(PYTHON_PLANNER_EXEC_MEMORY)
 
+  def pythonStreamingDataSourcePrefetchBatches: Int =
+    getConf(PYTHON_STREAMING_DATA_SOURCE_PREFETCH_BATCHES)
+
+  def pythonStreamingDataSourcePrefetchMaxBytes: Long =
+    getConf(PYTHON_STREAMING_DATA_SOURCE_PREFETCH_MAX_BYTES)
+
   def replaceExceptWithFilter: Boolean = getConf(REPLACE_EXCEPT_WITH_FILTER)
 
   def decimalOperationsAllowPrecisionLoss: Boolean = getConf(DECIMAL_OPERATIONS_ALLOW_PREC_LOSS)
@@ -2006,6 +2006,25 @@ class Dataset[T] private[sql](
     EvaluatePython.javaToPython(rdd)
   }
 
+  /**
+   * Converts this Dataset to a JavaRDD of Arrow record batches for PySpark. Unlike
+   * [[javaToPython]], rows are not pickled: each element is a self-contained Arrow IPC stream
+   * that starts with the schema, so Python can decode every batch independently.
+   */
+  private[sql] def toArrowBatchRddToPython: JavaRDD[Array[Byte]] = {
+    val schemaCaptured = this.schema
+    val maxRecordsPerBatch = sparkSession.sessionState.conf.arrowMaxRecordsPerBatch
+    val timeZoneId = sparkSession.sessionState.conf.sessionLocalTimeZone
+    val errorOnDuplicatedFieldNames =
+      sparkSession.sessionState.conf.pandasStructHandlingMode == "legacy"
+    val rdd: RDD[Array[Byte]] = queryExecution.toRdd.mapPartitionsInternal { iter =>
+      // A non-positive size limit means batches are only bounded by `maxRecordsPerBatch`.
+      ArrowConverters.toBatchWithSchemaIterator(
+        iter, schemaCaptured, maxRecordsPerBatch, -1L, timeZoneId, errorOnDuplicatedFieldNames)
+    }
+    rdd.toJavaRDD()
+  }
+
   private[sql] def collectToPython(): Array[Any] = {
     EvaluatePython.registerPicklers()
     withAction("collectToPython", queryExecution) { plan =>
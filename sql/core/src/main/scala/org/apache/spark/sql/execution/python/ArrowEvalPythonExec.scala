@@ -75,7 +75,8 @@ case class ArrowEvalPythonExec(udfs: Seq[PythonUDF], resultAttrs: Seq[Attribute]
       evalType,
       conf.sessionLocalTimeZone,
       conf.arrowUseLargeVarTypes,
-      ArrowPythonRunner.getPythonRunnerConfMap(conf),
+      ArrowPythonRunner.getPythonRunnerConfMap(conf) ++
+        ArrowPythonRunner.getDeterministicUDFsConfMap(udfs),
       pythonMetrics,
       jobArtifactUUID,
       conf.pythonUDFProfiler)
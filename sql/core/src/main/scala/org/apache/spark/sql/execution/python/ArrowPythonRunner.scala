@@ -17,15 +17,18 @@
 
 package org.apache.spark.sql.execution.python
 
-import java.io.DataOutputStream
+import java.io.{DataOutputStream, File}
 
+import org.apache.spark.TaskContext
 import org.apache.spark.api.python._
 import org.apache.spark.sql.catalyst.InternalRow
+import org.apache.spark.sql.catalyst.expressions.PythonUDF
 import org.apache.spark.sql.execution.metric.SQLMetric
 import org.apache.spark.sql.execution.python.EvalPythonExec.ArgumentMetadata
 import org.apache.spark.sql.internal.SQLConf
 import org.apache.spark.sql.types._
 import org.apache.spark.sql.vectorized.ColumnarBatch
+import org.apache.spark.util.Utils
 
 abstract class BaseArrowPythonRunner(
     funcs: Seq[(ChainedPythonFunctions, Long)],
@@ -61,6 +64,26 @@ abstract class BaseArrowPythonRunner(
     bufferSize >= 4,
     "Pandas execution requires more than 4 bytes. Please set higher buffer. " +
       s"Please change '${SQLConf.PANDAS_UDF_BUFFER_SIZE.key}'.")
+
+  // Only the batches of the UDFs which are not evaluated per group can be split.
+  override protected val arrowMaxBytesPerBatch: Long = evalType match {
+    case PythonEvalType.SQL_SCALAR_PANDAS_UDF | PythonEvalType.SQL_SCALAR_PANDAS_ITER_UDF |
+         PythonEvalType.SQL_MAP_PANDAS_ITER_UDF | PythonEvalType.SQL_MAP_ARROW_ITER_UDF |
+         PythonEvalType.SQL_ARROW_BATCHED_UDF => SQLConf.get.arrowMaxBytesPerBatch
+    case _ => 0L
+  }
+
+  override protected lazy val sharedMemoryDir: Option[File] = {
+    if (SQLConf.get.pandasUDFSharedMemoryEnabled) {
+      val dir = Utils.createDirectory(SQLConf.get.pandasUDFSharedMemoryDir, "spark-arrow")
+      Option(TaskContext.get()).foreach(_.addTaskCompletionListener[Unit] { _ =>
+        Utils.deleteRecursively(dir)
+      })
+      Some(dir)
+    } else {
+      None
+    }
+  }
 }
 
 /**
@@ -119,6 +142,23 @@ object ArrowPythonRunner {
     val arrowAyncParallelism = conf.pythonUDFArrowConcurrencyLevel.map(v =>
       Seq(SQLConf.PYTHON_UDF_ARROW_CONCURRENCY_LEVEL.key -> v.toString)
     ).getOrElse(Seq.empty)
-    Map(timeZoneConf ++ pandasColsByName ++ arrowSafeTypeCheck ++ arrowAyncParallelism: _*)
+    val arrowMaxBytesPerBatch = Seq(SQLConf.ARROW_EXECUTION_MAX_BYTES_PER_BATCH.key ->
+      conf.arrowMaxBytesPerBatch.toString)
+    val arrowPandasConversion = Seq(SQLConf.PYTHON_UDF_ARROW_PANDAS_CONVERSION_ENABLED.key ->
+      conf.pythonUDFArrowPandasConversionEnabled.toString)
+    Map(timeZoneConf ++ pandasColsByName ++ arrowSafeTypeCheck ++ arrowAyncParallelism ++
+      arrowMaxBytesPerBatch ++ arrowPandasConversion: _*)
+  }
+
+  /**
+   * The key of the indexes of the deterministic UDFs, including the UDFs they chain. The Python
+   * worker evaluates the functions chained by several of them on the same arguments only once.
+   */
+  val DETERMINISTIC_UDFS_KEY = "spark.sql.execution.pandas.udf.deterministicUDFs"
+
+  /** Return Map with the indexes of the deterministic UDFs evaluated by the runner. */
+  def getDeterministicUDFsConfMap(udfs: Seq[PythonUDF]): Map[String, String] = {
+    Map(DETERMINISTIC_UDFS_KEY ->
+      udfs.zipWithIndex.filter(_._1.deterministic).map(_._2).mkString(","))
   }
 }
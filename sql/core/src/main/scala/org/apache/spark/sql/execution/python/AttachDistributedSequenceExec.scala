@@ -24,7 +24,8 @@ import org.apache.spark.sql.catalyst.InternalRow
 import org.apache.spark.sql.catalyst.expressions._
 import org.apache.spark.sql.catalyst.plans.physical._
 import org.apache.spark.sql.catalyst.util.truncatedString
-import org.apache.spark.sql.execution.{SparkPlan, UnaryExecNode}
+import org.apache.spark.sql.execution.{SparkPlan, SQLExecution, UnaryExecNode}
+import org.apache.spark.sql.execution.metric.{SQLMetric, SQLMetrics}
 import org.apache.spark.sql.internal.SQLConf
 import org.apache.spark.storage.{StorageLevel, StorageLevelMapper}
 
@@ -44,6 +45,9 @@ case class AttachDistributedSequenceExec(
 
   override def outputPartitioning: Partitioning = child.outputPartitioning
 
+  override lazy val metrics: Map[String, SQLMetric] = Map(
+    "numIndexJobs" -> SQLMetrics.createMetric(sparkContext, "number of index attachment jobs"))
+
   @transient private var cached: RDD[InternalRow] = _
 
   override protected def doExecute(): RDD[InternalRow] = {
@@ -92,6 +96,13 @@ case class AttachDistributedSequenceExec(
         cached
     }
 
+    if (childRDD.getNumPartitions > 1) {
+      // zipWithIndex launches a Spark job on the driver to count the rows of each partition.
+      longMetric("numIndexJobs") += 1
+      val executionId = sparkContext.getLocalProperty(SQLExecution.EXECUTION_ID_KEY)
+      SQLMetrics.postDriverMetricUpdates(sparkContext, executionId, metrics.values.toSeq)
+    }
+
     cachedRDD.zipWithIndex().mapPartitions { iter =>
       val unsafeProj = UnsafeProjection.create(output, output)
       val joinedRow = new JoinedRow
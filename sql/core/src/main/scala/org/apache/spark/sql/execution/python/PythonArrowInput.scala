@@ -16,7 +16,9 @@
  */
 package org.apache.spark.sql.execution.python
 
-import java.io.DataOutputStream
+import java.io.{DataOutputStream, File}
+import java.nio.channels.FileChannel
+import java.nio.file.StandardOpenOption
 
 import org.apache.arrow.vector.VectorSchemaRoot
 import org.apache.arrow.vector.ipc.ArrowStreamWriter
@@ -31,11 +33,68 @@ import org.apache.spark.sql.types.StructType
 import org.apache.spark.sql.util.ArrowUtils
 import org.apache.spark.util.Utils
 
+/**
+ * A trait for the runners which can exchange Arrow batches with the Python worker through
+ * files in a directory, usually on a memory-backed file system, instead of the socket.
+ */
+private[python] trait PythonArrowSharedMemory {
+  /**
+   * The directory of the task where the Arrow batches are exchanged with the Python worker,
+   * or None if they are sent through the socket.
+   */
+  protected def sharedMemoryDir: Option[File] = None
+}
+
+private[python] object PythonArrowSharedMemory {
+  /** The key of the worker conf telling the Python worker the directory of the task. */
+  val TASK_DIR_KEY = "spark.sql.execution.pandas.udf.sharedMemory.taskDir"
+}
+
+/**
+ * An [[ArrowStreamWriter]] which writes each batch of `root` as a self-contained Arrow stream
+ * into its own file in `dir`, and only writes the path of the file to `out`. The Python worker
+ * memory-maps the file instead of copying the batch from the socket. The end of the batches is
+ * marked by an empty path.
+ */
+private[python] class SharedMemoryArrowStreamWriter(
+    root: VectorSchemaRoot,
+    dir: File,
+    out: DataOutputStream)
+  extends ArrowStreamWriter(root, null, out) {
+
+  private var numBatches = 0
+  private var numBytes = 0L
+
+  override def start(): Unit = {}
+
+  override def writeBatch(): Unit = {
+    val file = new File(dir, s"input-$numBatches.arrow")
+    numBatches += 1
+    val channel = FileChannel.open(
+      file.toPath, StandardOpenOption.CREATE_NEW, StandardOpenOption.WRITE)
+    Utils.tryWithSafeFinally {
+      val writer = new ArrowStreamWriter(root, null, channel)
+      writer.start()
+      writer.writeBatch()
+      writer.end()
+      numBytes += writer.bytesWritten()
+    } {
+      channel.close()
+    }
+    PythonRDD.writeUTF(file.getPath, out)
+  }
+
+  override def end(): Unit = out.writeInt(0)
+
+  override def bytesWritten(): Long = numBytes
+}
+
 /**
  * A trait that can be mixed-in with [[BasePythonRunner]]. It implements the logic from
  * JVM (an iterator of internal rows + additional data if required) to Python (Arrow).
  */
-private[python] trait PythonArrowInput[IN] { self: BasePythonRunner[IN, _] =>
+private[python] trait PythonArrowInput[IN] extends PythonArrowSharedMemory {
+  self: BasePythonRunner[IN, _] =>
   protected val workerConf: Map[String, String]
 
   protected val schema: StructType
@@ -57,9 +116,11 @@ private[python] trait PythonArrowInput[IN] { self: BasePythonRunner[IN, _] =>
   protected def writeUDF(dataOut: DataOutputStream): Unit
 
   protected def handleMetadataBeforeExec(stream: DataOutputStream): Unit = {
+    val conf = workerConf ++
+      sharedMemoryDir.map(PythonArrowSharedMemory.TASK_DIR_KEY -> _.getPath)
     // Write config for the worker as a number of key -> value pairs of strings
-    stream.writeInt(workerConf.size)
-    for ((k, v) <- workerConf) {
+    stream.writeInt(conf.size)
+    for ((k, v) <- conf) {
       PythonRDD.writeUTF(k, stream)
       PythonRDD.writeUTF(v, stream)
     }
@@ -99,7 +160,10 @@ protected def close(): Unit = {
       override def writeNextInputToStream(dataOut: DataOutputStream): Boolean = {
 
         if (writer == null) {
-          writer = new ArrowStreamWriter(root, null, dataOut)
+          writer = sharedMemoryDir match {
+            case Some(dir) => new SharedMemoryArrowStreamWriter(root, dir, dataOut)
+            case None => new ArrowStreamWriter(root, null, dataOut)
+          }
           writer.start()
         }
 
@@ -114,25 +178,51 @@ private[python] trait BasicPythonArrowInput extends PythonArrowInput[Iterator[In
   self: BasePythonRunner[Iterator[InternalRow], _] =>
   private val arrowWriter: arrow.ArrowWriter = ArrowWriter.create(root)
 
+  /**
+   * The number of bytes an Arrow batch sent to the Python worker should have at most. When
+   * positive, each batch of the input iterator is split into Arrow batches whose number of rows
+   * is derived from the bytes per row observed in the previous Arrow batches, similar to
+   * `AutoBatchedSerializer` in PySpark. Otherwise each batch of the input iterator is sent as
+   * one Arrow batch.
+   */
+  protected val arrowMaxBytesPerBatch: Long = 0L
+
+  // The rest of the batch of the input iterator being sent.
+  private var pendingBatch: Iterator[InternalRow] = Iterator.empty
+
+  // The number of rows of the next Arrow batch when `arrowMaxBytesPerBatch` is positive.
+  // It starts from one row and at most doubles per batch until the batches reach the limit.
+  private var maxRowsPerBatch = 1L
+
   protected def writeNextInputToArrowStream(
       root: VectorSchemaRoot,
       writer: ArrowStreamWriter,
       dataOut: DataOutputStream,
       inputIterator: Iterator[Iterator[InternalRow]]): Boolean = {
 
-    if (inputIterator.hasNext) {
-      val startData = dataOut.size()
-      val nextBatch = inputIterator.next()
+    if (pendingBatch.hasNext || inputIterator.hasNext) {
+      val startData = writer.bytesWritten()
+      if (!pendingBatch.hasNext) {
+        pendingBatch = inputIterator.next()
+      }
+      val maxRows = if (arrowMaxBytesPerBatch > 0) maxRowsPerBatch else Long.MaxValue
 
-      while (nextBatch.hasNext) {
-        arrowWriter.write(nextBatch.next())
+      var numRows = 0L
+      while (numRows < maxRows && pendingBatch.hasNext) {
+        arrowWriter.write(pendingBatch.next())
+        numRows += 1
       }
 
       arrowWriter.finish()
       writer.writeBatch()
       arrowWriter.reset()
-      val deltaData = dataOut.size() - startData
+      val deltaData = writer.bytesWritten() - startData
       pythonMetrics("pythonDataSent") += deltaData
+      pythonMetrics("pythonNumBatchesSent") += 1
+      if (arrowMaxBytesPerBatch > 0 && numRows > 0) {
+        val fittingRows = arrowMaxBytesPerBatch * numRows / math.max(deltaData, 1L)
+        maxRowsPerBatch = math.max(1L, math.min(fittingRows, maxRowsPerBatch * 2))
+      }
       true
     } else {
       super[PythonArrowInput].close()
@@ -16,7 +16,9 @@
  */
 package org.apache.spark.sql.execution.python
 
-import java.io.DataInputStream
+import java.io.{DataInputStream, File}
+import java.nio.channels.FileChannel
+import java.nio.file.StandardOpenOption
 import java.util.concurrent.atomic.AtomicBoolean
 
 import scala.jdk.CollectionConverters._
@@ -25,7 +27,7 @@ import org.apache.arrow.vector.VectorSchemaRoot
 import org.apache.arrow.vector.ipc.ArrowStreamReader
 
 import org.apache.spark.{SparkEnv, TaskContext}
-import org.apache.spark.api.python.{BasePythonRunner, PythonWorker, SpecialLengths}
+import org.apache.spark.api.python._
 import org.apache.spark.sql.execution.metric.SQLMetric
 import org.apache.spark.sql.types.StructType
 import org.apache.spark.sql.util.ArrowUtils
@@ -35,7 +37,8 @@ import org.apache.spark.sql.vectorized.{ArrowColumnVector, ColumnarBatch, Column
  * A trait that can be mixed-in with [[BasePythonRunner]]. It implements the logic from
  * Python (Arrow) to JVM (output type being deserialized from ColumnarBatch).
  */
-private[python] trait PythonArrowOutput[OUT <: AnyRef] { self: BasePythonRunner[_, OUT] =>
+private[python] trait PythonArrowOutput[OUT <: AnyRef] extends PythonArrowSharedMemory {
+  self: BasePythonRunner[_, OUT] =>
 
   protected def pythonMetrics: Map[String, SQLMetric]
 
@@ -73,6 +76,46 @@ private[python] trait PythonArrowOutput[OUT <: AnyRef] { self: BasePythonRunner[
 
       private var batchLoaded = true
 
+      // Whether the Python worker sends the paths of the files holding the output batches
+      // in `sharedMemoryDir` instead of an Arrow stream.
+      private var readingSharedMemoryBatches = false
+
+      private def readSharedMemoryBatch(): OUT = {
+        if (reader != null) {
+          reader.close(false)
+          reader = null
+        }
+        val length = stream.readInt()
+        if (length == 0) {
+          readingSharedMemoryBatches = false
+          allocator.close()
+          // Reach end of stream. Call `read()` again to read control data.
+          read()
+        } else {
+          val file = new File(PythonWorkerUtils.readUTF(length, stream))
+          val channel = FileChannel.open(file.toPath, StandardOpenOption.READ)
+          try {
+            reader = new ArrowStreamReader(channel, allocator)
+            root = reader.getVectorSchemaRoot()
+            schema = ArrowUtils.fromArrowSchema(root.getSchema())
+            vectors = root.getFieldVectors().asScala.map { vector =>
+              new ArrowColumnVector(vector)
+            }.toArray[ColumnVector]
+            reader.loadNextBatch()
+          } finally {
+            channel.close()
+            file.delete()
+          }
+          val batch = new ColumnarBatch(vectors)
+          val rowCount = root.getRowCount
+          batch.setNumRows(rowCount)
+          pythonMetrics("pythonNumRowsReceived") += rowCount
+          pythonMetrics("pythonDataReceived") += reader.bytesRead()
+          pythonMetrics("pythonNumBatchesReceived") += 1
+          deserializeColumnarBatch(batch, schema)
+        }
+      }
+
       protected override def handleEndOfDataSection(): Unit = {
         handleMetadataAfterExec(stream)
         super.handleEndOfDataSection()
@@ -83,7 +126,9 @@ private[python] trait PythonArrowOutput[OUT <: AnyRef] { self: BasePythonRunner[
           throw writer.exception.get
         }
         try {
-          if (reader != null && batchLoaded) {
+          if (readingSharedMemoryBatches) {
+            readSharedMemoryBatch()
+          } else if (reader != null && batchLoaded) {
             val bytesReadStart = reader.bytesRead()
             batchLoaded = reader.loadNextBatch()
             if (batchLoaded) {
@@ -93,6 +138,7 @@ private[python] trait PythonArrowOutput[OUT <: AnyRef] { self: BasePythonRunner[
               val bytesReadEnd = reader.bytesRead()
               pythonMetrics("pythonNumRowsReceived") += rowCount
               pythonMetrics("pythonDataReceived") += bytesReadEnd - bytesReadStart
+              pythonMetrics("pythonNumBatchesReceived") += 1
               deserializeColumnarBatch(batch, schema)
             } else {
               reader.close(false)
@@ -102,6 +148,9 @@ private[python] trait PythonArrowOutput[OUT <: AnyRef] { self: BasePythonRunner[
             }
           } else {
             stream.readInt() match {
+              case SpecialLengths.START_ARROW_STREAM if sharedMemoryDir.isDefined =>
+                readingSharedMemoryBatches = true
+                read()
               case SpecialLengths.START_ARROW_STREAM =>
                 reader = new ArrowStreamReader(stream, allocator)
                 root = reader.getVectorSchemaRoot()
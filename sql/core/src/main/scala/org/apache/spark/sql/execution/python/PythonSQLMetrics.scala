@@ -41,6 +41,10 @@ object PythonSQLMetrics {
   }
 
   val pythonOtherMetricsDesc: Map[String, String] = {
-    Map("pythonNumRowsReceived" -> "number of output rows")
+    Map(
+      "pythonNumRowsReceived" -> "number of output rows",
+      "pythonNumBatchesSent" -> "number of batches sent to Python workers",
+      "pythonNumBatchesReceived" -> "number of batches returned from Python workers"
+    )
   }
 }
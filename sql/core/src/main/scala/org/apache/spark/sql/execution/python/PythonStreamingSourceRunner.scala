@@ -114,6 +114,8 @@ class PythonStreamingSourceRunner(
     PythonWorkerUtils.writeUTF(outputSchema.json, dataOut)
 
     dataOut.writeInt(SQLConf.get.arrowMaxRecordsPerBatch)
+    dataOut.writeInt(SQLConf.get.pythonStreamingDataSourcePrefetchBatches)
+    dataOut.writeLong(SQLConf.get.pythonStreamingDataSourcePrefetchMaxBytes)
 
     dataOut.flush()
 
@@ -151,7 +151,11 @@ class TransformWithStateInPandasStateServer(
           assert(version == 0)
           val message = parseProtoMessage()
           handleRequest(message)
-          outputStream.flush()
+          // The Python client pipelines the requests which do not return a value, so only
+          // flush the responses once there is no further request to handle.
+          if (inputStream.available() == 0) {
+            outputStream.flush()
+          }
         }
       } catch {
         case _: EOFException =>
@@ -172,7 +176,7 @@ class TransformWithStateInPandasStateServer(
   private def parseProtoMessage(): StateRequest = {
     val messageLen = inputStream.readInt()
     val messageBytes = new Array[Byte](messageLen)
-    inputStream.read(messageBytes)
+    inputStream.readFully(messageBytes)
     StateRequest.parseFrom(ByteString.copyFrom(messageBytes))
   }
 
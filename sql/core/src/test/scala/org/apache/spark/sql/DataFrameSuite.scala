@@ -41,6 +41,7 @@ import org.apache.spark.sql.execution.{FilterExec, LogicalRDD, QueryExecution, S
 import org.apache.spark.sql.execution.adaptive.AdaptiveSparkPlanHelper
 import org.apache.spark.sql.execution.aggregate.HashAggregateExec
 import org.apache.spark.sql.execution.exchange.{BroadcastExchangeExec, ReusedExchangeExec, ShuffleExchangeExec, ShuffleExchangeLike}
+import org.apache.spark.sql.execution.python.AttachDistributedSequenceExec
 import org.apache.spark.sql.expressions.{Aggregator, Window}
 import org.apache.spark.sql.functions._
 import org.apache.spark.sql.internal.ExpressionUtils.column
@@ -2322,6 +2323,20 @@ class DataFrameSuite extends QueryTest
     assert(ids.take(5).map(_.getLong(0)).toSet === Range(0, 5).toSet)
   }
 
+  test("distributed_sequence_id reports the number of index attachment jobs") {
+    def numIndexJobs(df: DataFrame): Long = {
+      df.collect()
+      val nodes = collect(df.queryExecution.executedPlan) {
+        case p: AttachDistributedSequenceExec => p
+      }
+      assert(nodes.size === 1)
+      nodes.head.metrics("numIndexJobs").value
+    }
+    val seq = Column.internalFn("distributed_sequence_id").alias("default_index")
+    assert(numIndexJobs(spark.range(10).repartition(5).select(seq, col("id"))) === 1)
+    assert(numIndexJobs(spark.range(10).coalesce(1).select(seq, col("id"))) === 0)
+  }
+
   test("SPARK-38285: Fix ClassCastException: GenericArrayData cannot be cast to InternalRow") {
     withTempView("v1") {
       val sqlText =
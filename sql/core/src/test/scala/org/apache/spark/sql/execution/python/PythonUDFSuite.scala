@@ -17,8 +17,9 @@
 
 package org.apache.spark.sql.execution.python
 
-import org.apache.spark.sql.{AnalysisException, IntegratedUDFTestUtils, QueryTest, Row}
+import org.apache.spark.sql.{AnalysisException, DataFrame, IntegratedUDFTestUtils, QueryTest, Row}
 import org.apache.spark.sql.functions.{array, col, count, transform}
+import org.apache.spark.sql.internal.SQLConf
 import org.apache.spark.sql.test.SharedSparkSession
 import org.apache.spark.sql.types.LongType
 
@@ -105,6 +106,42 @@ class PythonUDFSuite extends QueryTest with SharedSparkSession {
     }
   }
 
+  test("Arrow batches of pandas UDFs are split by spark.sql.execution.arrow.maxBytesPerBatch") {
+    assume(shouldTestPandasUDFs)
+    val pandasTestUDF = TestScalarPandasUDF(name = "pandas_udf", Some(LongType))
+
+    // Returns the result and the number of batches sent to and received from Python.
+    def collectWithNumBatches(df: DataFrame): (Seq[Row], Long, Long) = {
+      val rows = df.collect().toSeq
+      val exec = df.queryExecution.executedPlan.collectFirst {
+        case p: ArrowEvalPythonExec => p
+      }
+      assert(exec.isDefined)
+      (rows, exec.get.metrics("pythonNumBatchesSent").value,
+        exec.get.metrics("pythonNumBatchesReceived").value)
+    }
+
+    withSQLConf(SQLConf.ARROW_EXECUTION_MAX_RECORDS_PER_BATCH.key -> "10000") {
+      val input = spark.range(0, 1000, 1, 1)
+      val (expected, sent, received) =
+        collectWithNumBatches(input.select(pandasTestUDF(input("id"))))
+      assert(expected.length == 1000)
+      assert(sent == 1)
+      assert(received == 1)
+
+      withSQLConf(SQLConf.ARROW_EXECUTION_MAX_BYTES_PER_BATCH.key -> "1024") {
+        val (rows, splitSent, splitReceived) =
+          collectWithNumBatches(input.select(pandasTestUDF(input("id"))))
+        assert(rows == expected)
+        // The batches start from one row and grow up to the limit, so there are more than one
+        // but fewer than one per row.
+        assert(splitSent > 1)
+        assert(splitSent < 1000)
+        assert(splitReceived >= splitSent)
+      }
+    }
+  }
+
   test("PythonUDAF pretty name") {
     assume(shouldTestPandasUDFs)
     val udfName = "pandas_udf"
@@ -16,8 +16,8 @@
  */
 package org.apache.spark.sql.execution.python
 
-import java.io.DataOutputStream
-import java.net.ServerSocket
+import java.io.{ByteArrayInputStream, ByteArrayOutputStream, DataInputStream, DataOutputStream}
+import java.net.{ServerSocket, Socket}
 
 import scala.collection.mutable
 
@@ -32,7 +32,7 @@ import org.apache.spark.sql.catalyst.encoders.ExpressionEncoder
 import org.apache.spark.sql.catalyst.expressions.GenericRowWithSchema
 import org.apache.spark.sql.execution.streaming.{StatefulProcessorHandleImpl, StatefulProcessorHandleState}
 import org.apache.spark.sql.execution.streaming.state.StateMessage
-import org.apache.spark.sql.execution.streaming.state.StateMessage.{AppendList, AppendValue, Clear, ContainsKey, DeleteTimer, Exists, ExpiryTimerRequest, Get, GetProcessingTime, GetValue, GetWatermark, HandleState, Keys, ListStateCall, ListStateGet, ListStatePut, ListTimers, MapStateCall, RegisterTimer, RemoveKey, SetHandleState, StateCallCommand, StatefulProcessorCall, TimerRequest, TimerStateCallCommand, TimerValueRequest, UpdateValue, Values, ValueStateCall, ValueStateUpdate}
+import org.apache.spark.sql.execution.streaming.state.StateMessage.{AppendList, AppendValue, Clear, ContainsKey, DeleteTimer, Exists, ExpiryTimerRequest, Get, GetProcessingTime, GetValue, GetWatermark, HandleState, Keys, ListStateCall, ListStateGet, ListStatePut, ListTimers, MapStateCall, RegisterTimer, RemoveKey, SetHandleState, StateCallCommand, StatefulProcessorCall, StateRequest, StateResponse, StateVariableRequest, TimerRequest, TimerStateCallCommand, TimerValueRequest, UpdateValue, Values, ValueStateCall, ValueStateUpdate}
 import org.apache.spark.sql.streaming.{ListState, MapState, TTLConfig, ValueState}
 import org.apache.spark.sql.types.{IntegerType, StructField, StructType}
 
@@ -249,6 +249,44 @@ class TransformWithStateInPandasStateServerSuite extends SparkFunSuite with Befo
     verify(outputStream).writeInt(0)
   }
 
+  test("pipelined requests are answered with a single flush") {
+    val requests = new ByteArrayOutputStream()
+    val requestStream = new DataOutputStream(requests)
+    Seq(stateName, "nonExist", stateName).foreach { name =>
+      val valueStateCall = ValueStateCall.newBuilder().setStateName(name)
+        .setClear(Clear.newBuilder().build()).build()
+      val message = StateRequest.newBuilder().setStateVariableRequest(
+        StateVariableRequest.newBuilder().setValueStateCall(valueStateCall).build())
+        .build().toByteArray
+      requestStream.writeInt(0)
+      requestStream.writeInt(message.length)
+      requestStream.write(message)
+    }
+    var numFlushes = 0
+    val responses = new ByteArrayOutputStream() {
+      override def flush(): Unit = numFlushes += 1
+    }
+    val socket = mock(classOf[Socket])
+    when(socket.isConnected).thenReturn(true)
+    when(socket.getInputStream).thenReturn(new ByteArrayInputStream(requests.toByteArray))
+    when(socket.getOutputStream).thenReturn(responses)
+    when(serverSocket.accept()).thenReturn(socket)
+
+    stateServer.run()
+
+    verify(valueState, times(2)).clear()
+    // The responses are flushed once, after the last buffered request.
+    assert(numFlushes == 1)
+    val responseStream = new DataInputStream(new ByteArrayInputStream(responses.toByteArray))
+    val statusCodes = (0 until 3).map { _ =>
+      val response = new Array[Byte](responseStream.readInt())
+      responseStream.readFully(response)
+      StateResponse.parseFrom(response).getStatusCode
+    }
+    assert(statusCodes == Seq(0, 1, 0))
+    assert(responseStream.available() == 0)
+  }
+
   test("list state exists") {
     val message = ListStateCall.newBuilder().setStateName(stateName)
       .setExists(Exists.newBuilder().build()).build()